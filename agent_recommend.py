@@ -2,22 +2,40 @@
 Neighborhood recommendations: load pre-scored catalog JSONL, prerank, Claude explanations.
 
 Pillar keys match frontend/lib/pillars.ts PillarKey.
+
+The catalog is compiled into a CatalogIndex (neighborhoods x pillars matrix, raw 2024 lean,
+climate features, display strings, and each row's byte offset in its source JSONL) saved as
+.npz, so pre-ranking is one matrix-vector product plus argpartition and only the returned
+rows' full score payloads are parsed. The index is recompiled when any source catalog or
+the climate profiles file changes (size/mtime); `scripts/catalog/build_agent_catalog_index.py`
+compiles it ahead of deploys. A catalog with a current catalog_store `.sqlite` sibling is
+compiled from the store's columns (no pillar JSON parsed) and stamped by the store file.
+
+Catalog path(s) via env ``HOMEFIT_AGENT_CATALOG_JSONL`` (comma-separated to merge catalogs);
+index path via env ``HOMEFIT_AGENT_CATALOG_INDEX`` (default data_cache/agent_catalog_index.npz).
 """
 from __future__ import annotations
 
 import json
 import os
 import re
+import sqlite3
+import threading
 import time
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Union
 from urllib.parse import urlencode
 
+import numpy as np
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field, field_validator
 
-from climate_preferences import score_climate_match
+import catalog_store
+from climate_preferences import CLIMATE_FEATURES, climate_features, score_climate_matrix
+from logging_config import get_logger
+
+logger = get_logger(__name__)
 
 # Mirrors frontend/lib/pillars.ts PillarKey (order matches validation set)
 PILLAR_KEYS: tuple[str, ...] = (
@@ -45,14 +63,27 @@ VALID_PRIORITY_LEVELS = frozenset({"None", "Low", "Medium", "High"})
 PRIORITY_TO_NUMERIC = {"None": 0, "Low": 33, "Medium": 66, "High": 100}
 
 REPO_ROOT = Path(__file__).resolve().parent
+CLIMATE_PROFILES_PATH = REPO_ROOT / "data" / "catalog_climate_profiles.jsonl"
+DEFAULT_INDEX_PATH = REPO_ROOT / "data_cache" / "agent_catalog_index.npz"
+INDEX_VERSION = 1
+
+_CLIMATE_AXES = ("cold_tolerance", "heat_tolerance", "rain_tolerance", "seasons")
+
 
+def _resolve_repo_path(raw: str) -> Path:
+    p = Path(raw)
+    return p if p.is_absolute() else (REPO_ROOT / p)
 
-def _default_catalog_path() -> Path:
+
+def _catalog_paths() -> List[Path]:
     raw = os.getenv("HOMEFIT_AGENT_CATALOG_JSONL", "").strip()
-    if raw:
-        p = Path(raw)
-        return p if p.is_absolute() else (REPO_ROOT / p)
-    return REPO_ROOT / "data" / "nyc_metro_place_catalog_scores_merged.jsonl"
+    paths = [_resolve_repo_path(part.strip()) for part in raw.split(",") if part.strip()]
+    return paths or [REPO_ROOT / "data" / "nyc_metro_place_catalog_scores_merged.jsonl"]
+
+
+def _index_path() -> Path:
+    raw = os.getenv("HOMEFIT_AGENT_CATALOG_INDEX", "").strip()
+    return _resolve_repo_path(raw) if raw else DEFAULT_INDEX_PATH
 
 
 def _pillar_numeric_score(pillar_obj: Any) -> float:
@@ -115,7 +146,7 @@ def _normalize_catalog_row(line_obj: Dict[str, Any]) -> Optional[Dict[str, Any]]
 @lru_cache(maxsize=1)
 def _load_climate_index() -> Dict[str, Any]:
     """Returns {place_name: climate_dict} from catalog_climate_profiles.jsonl."""
-    path = REPO_ROOT / "data" / "catalog_climate_profiles.jsonl"
+    path = CLIMATE_PROFILES_PATH
     index: Dict[str, Any] = {}
     if not path.is_file():
         return index
@@ -134,25 +165,244 @@ def _load_climate_index() -> Dict[str, Any]:
     return index
 
 
-@lru_cache(maxsize=1)
-def load_catalog_records() -> tuple[Dict[str, Any], ...]:
-    path = _default_catalog_path()
-    if not path.is_file():
-        raise FileNotFoundError(f"Agent catalog not found: {path}")
-    out: List[Dict[str, Any]] = []
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
+def _iter_catalog_lines(path: Path):
+    """(byte offset, normalized row) for each usable line of a catalog JSONL."""
+    with open(path, "rb") as f:
+        offset = 0
+        for raw in f:
+            start, offset = offset, offset + len(raw)
+            line = raw.strip()
             if not line:
                 continue
             try:
                 obj = json.loads(line)
-            except json.JSONDecodeError:
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 continue
             row = _normalize_catalog_row(obj)
             if row:
-                out.append(row)
-    return tuple(out)
+                yield start, row
+
+
+_STORE_COLUMNS = ("success", "name", "state_abbr", "search_query", "archetype", "status_label",
+                  "lean_2024", "failed_pillars") + PILLAR_KEYS
+
+
+def _normalize_store_row(rec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """_normalize_catalog_row from catalog_store columns (no pillar blobs or score body read)."""
+    if rec["success"] == 0:
+        return None
+    search_query = (rec["search_query"] or "").strip()
+    if not search_query:
+        name = (rec["name"] or "").strip()
+        state = (rec["state_abbr"] or "").strip()
+        if name and state:
+            search_query = f"{name}, {state}"
+    if not search_query:
+        return None
+    failed = set((rec["failed_pillars"] or "").split(","))
+    return {
+        "neighborhood": search_query,
+        "search_query": search_query,
+        "place_name": (rec["name"] or "").strip(),
+        "archetype": rec["archetype"] if rec["archetype"] is not None else "Typical",
+        "status_label": rec["status_label"] or "",
+        "pillar_scores": {k: 0.0 if k in failed or rec[k] is None else float(rec[k]) for k in PILLAR_KEYS},
+        "lean_2024": rec["lean_2024"],
+    }
+
+
+def _iter_catalog_source(path: Path):
+    """(offset, normalized row) for a compiled source: store place id, or JSONL byte offset."""
+    if path.suffix == ".sqlite":
+        with catalog_store.CatalogStore(path) as store:
+            for rec in store.rows(columns=_STORE_COLUMNS):
+                row = _normalize_store_row(rec)
+                if row:
+                    yield rec["id"], row
+    else:
+        for offset, row in _iter_catalog_lines(path):
+            row.pop("score_full", None)
+            yield offset, row
+
+
+def _file_stamp(path: Path) -> Dict[str, Any]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {"path": str(path), "size": None, "mtime_ns": None}
+    return {"path": str(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _sources_stamp(sources: Sequence[Path]) -> Dict[str, Any]:
+    return {
+        "version": INDEX_VERSION,
+        "pillar_keys": list(PILLAR_KEYS),
+        "sources": [_file_stamp(catalog_store.resolve_source(p)) for p in sources],
+        "climate": _file_stamp(CLIMATE_PROFILES_PATH),
+    }
+
+
+class CatalogIndex:
+    """
+    Catalog compiled for pre-ranking: row i of every array describes one neighborhood.
+
+      pillars      float64 (N, len(PILLAR_KEYS)) numeric pillar scores
+      lean_2024    float64 (N,) raw 2024 lean, NaN when missing
+      climate      float64 (N, len(CLIMATE_FEATURES)) climate_features, NaN when no profile
+      neighborhood, archetype, status_label, place_name -- str (N,)
+      source, offset  -- source file index and byte offset of the row's JSONL line
+                         (place id when the source is a catalog_store .sqlite)
+    """
+
+    _ARRAYS = ("pillars", "lean_2024", "climate", "neighborhood", "archetype", "status_label",
+               "place_name", "source", "offset")
+
+    def __init__(self, arrays: Dict[str, np.ndarray], stamp: Dict[str, Any]):
+        for name in self._ARRAYS:
+            setattr(self, name, arrays[name])
+        self.stamp = stamp
+        self._source_paths = [Path(s["path"]) if s.get("path") else None for s in stamp.get("sources", [])]
+        # Later rows win on duplicate names, as the dict of records did.
+        self._by_neighborhood = {name: i for i, name in enumerate(self.neighborhood.tolist())}
+        self._score_full: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.neighborhood)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]], climate_index: Dict[str, Any],
+                  stamp: Optional[Dict[str, Any]] = None,
+                  locations: Optional[Sequence[tuple]] = None) -> "CatalogIndex":
+        n = len(rows)
+        climate = np.full((n, len(CLIMATE_FEATURES)), np.nan)
+        for i, row in enumerate(rows):
+            features = climate_features(climate_index.get(row.get("place_name", "")))
+            if features is not None:
+                climate[i] = features
+        in_memory = locations is None
+        if locations is None:
+            locations = [(-1, -1)] * n
+        arrays = {
+            "pillars": np.array([[row["pillar_scores"].get(k, 0.0) for k in PILLAR_KEYS] for row in rows],
+                                dtype=np.float64).reshape(n, len(PILLAR_KEYS)),
+            "lean_2024": np.array([np.nan if row.get("lean_2024") is None else row["lean_2024"] for row in rows],
+                                  dtype=np.float64),
+            "climate": climate,
+            "neighborhood": np.array([row["neighborhood"] for row in rows], dtype=str),
+            "archetype": np.array([row["archetype"] for row in rows], dtype=str),
+            "status_label": np.array([row["status_label"] for row in rows], dtype=str),
+            "place_name": np.array([row.get("place_name", "") for row in rows], dtype=str),
+            "source": np.array([loc[0] for loc in locations], dtype=np.int32),
+            "offset": np.array([loc[1] for loc in locations], dtype=np.int64),
+        }
+        index = cls(arrays, stamp or {"sources": []})
+        # In-memory indexes (no source offsets) keep the payloads they were built from.
+        if in_memory:
+            index._score_full = {i: row.get("score_full") or {} for i, row in enumerate(rows)}
+        return index
+
+    @classmethod
+    def compile(cls, sources: Sequence[Path]) -> "CatalogIndex":
+        """Read the source catalogs once (their stores when usable) and build the index."""
+        stamp = _sources_stamp(sources)
+        rows: List[Dict[str, Any]] = []
+        locations: List[tuple] = []
+        for src_i, source in enumerate(stamp["sources"]):
+            for offset, row in _iter_catalog_source(Path(source["path"])):
+                rows.append(row)
+                locations.append((src_i, offset))
+        _load_climate_index.cache_clear()
+        return cls.from_rows(rows, _load_climate_index(), stamp=stamp, locations=locations)
+
+    @classmethod
+    def load(cls, path: Path) -> "CatalogIndex":
+        with np.load(path, allow_pickle=False) as data:
+            stamp = json.loads(str(data["stamp"]))
+            arrays = {name: data[name] for name in cls._ARRAYS}
+        return cls(arrays, stamp)
+
+    def save(self, path: Path) -> None:
+        """Write the index as .npz (temp file + atomic replace; workers may race)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+        with open(tmp, "wb") as f:
+            np.savez(f, stamp=np.array(json.dumps(self.stamp)),
+                     **{name: getattr(self, name) for name in self._ARRAYS})
+        os.replace(tmp, path)
+
+    def row_index(self, neighborhood: str) -> Optional[int]:
+        return self._by_neighborhood.get(neighborhood)
+
+    def score_full(self, i: int) -> Dict[str, Any]:
+        """Full score payload of row i, read from its JSONL line (or store row) on first use."""
+        if i in self._score_full:
+            return self._score_full[i]
+        payload: Dict[str, Any] = {}
+        src, offset = int(self.source[i]), int(self.offset[i])
+        path = self._source_paths[src] if 0 <= src < len(self._source_paths) else None
+        if path is not None and offset >= 0:
+            try:
+                if path.suffix == ".sqlite":
+                    with catalog_store.CatalogStore(path) as store:
+                        score = (store.row(offset) or {}).get("score")
+                else:
+                    with open(path, "rb") as f:
+                        f.seek(offset)
+                        score = json.loads(f.readline()).get("score")
+                payload = score if isinstance(score, dict) else {}
+            except (OSError, ValueError, sqlite3.Error) as exc:
+                logger.warning("Agent catalog: could not read score payload at %s:%d: %s", path, offset, exc)
+        self._score_full[i] = payload
+        return payload
+
+
+_index_lock = threading.Lock()
+_catalog_index: Optional[CatalogIndex] = None
+
+
+def load_catalog_index() -> CatalogIndex:
+    """
+    Shared CatalogIndex: the saved .npz when its stamp matches the sources, else compiled
+    from the JSONL (and saved for the next process). Reloads when a source changes.
+    """
+    global _catalog_index
+    sources = _catalog_paths()
+    for path in sources:
+        if not path.is_file() and not catalog_store.store_path_for(path).is_file():
+            raise FileNotFoundError(f"Agent catalog not found: {path}")
+    stamp = _sources_stamp(sources)
+    current = _catalog_index
+    if current is not None and current.stamp == stamp:
+        return current
+    with _index_lock:
+        if _catalog_index is not None and _catalog_index.stamp == stamp:
+            return _catalog_index
+        index_path = _index_path()
+        index: Optional[CatalogIndex] = None
+        if index_path.is_file():
+            try:
+                index = CatalogIndex.load(index_path)
+            except Exception as exc:
+                logger.warning("Agent catalog index unreadable (%s): %s", index_path, exc)
+                index = None
+        if index is None or index.stamp != stamp:
+            started = time.time()
+            index = CatalogIndex.compile(sources)
+            logger.info("Compiled agent catalog index: %d neighborhoods (%.1fs)", len(index), time.time() - started)
+            try:
+                index.save(index_path)
+            except OSError as exc:
+                logger.warning("Could not save agent catalog index to %s: %s", index_path, exc)
+        _catalog_index = index
+        return index
+
+
+def reset_catalog_index() -> None:
+    """Drop the shared index (tests, or after swapping catalogs)."""
+    global _catalog_index
+    with _index_lock:
+        _catalog_index = None
+    _load_climate_index.cache_clear()
 
 
 def priorities_to_numeric(priorities: Dict[str, str]) -> Dict[str, int]:
@@ -170,41 +420,73 @@ def _political_lean_score_from_raw(lean_2024: Optional[float], preference: Optio
     return max(0.0, min(100.0, (1.0 - lean_2024) / 2.0 * 100.0))
 
 
+def _political_lean_scores(lean_2024: np.ndarray, preference: Optional[str]) -> np.ndarray:
+    """Vectorized _political_lean_score_from_raw (NaN lean -> 0)."""
+    if preference not in VALID_POLITICAL_PREFERENCES:
+        return np.zeros(len(lean_2024))
+    if preference == "progressive":
+        scores = (lean_2024 + 1.0) / 2.0 * 100.0
+    elif preference == "moderate":
+        scores = (1.0 - np.abs(lean_2024)) * 100.0
+    else:
+        scores = (1.0 - lean_2024) / 2.0 * 100.0
+    return np.nan_to_num(np.clip(scores, 0.0, 100.0), nan=0.0)
+
+
 def prerank_neighborhoods(
-    catalog: tuple[Dict[str, Any], ...],
+    catalog: Union[CatalogIndex, Sequence[Dict[str, Any]]],
     priorities: Dict[str, str],
     top_n: int = 10,
     political_preference: Optional[str] = None,
     climate_preferences: Optional[Dict[str, str]] = None,
 ) -> List[Dict[str, Any]]:
+    if not isinstance(catalog, CatalogIndex):
+        catalog = CatalogIndex.from_rows(list(catalog), _load_climate_index() if climate_preferences else {})
+    n = len(catalog)
+    if n == 0 or top_n <= 0:
+        return []
     numeric = priorities_to_numeric(priorities)
     total_weight = sum(numeric.values()) or 1
-    climate_index = _load_climate_index() if climate_preferences else {}
-    active_climate_axes = sum(1 for k in ("cold_tolerance", "heat_tolerance", "rain_tolerance", "seasons") if climate_preferences and climate_preferences.get(k))
+    active_climate_axes = sum(1 for k in _CLIMATE_AXES if climate_preferences and climate_preferences.get(k))
     climate_weight = min(active_climate_axes * 0.08, 0.28) if active_climate_axes else 0.0
+
+    weights = np.array([numeric[k] for k in PILLAR_KEYS], dtype=np.float64)
+    lean_col = PILLAR_KEYS.index("political_lean")
+    lean_scores = None
+    if numeric.get("political_lean", 0) > 0:
+        lean_scores = _political_lean_scores(catalog.lean_2024, political_preference)
+        weights[lean_col] = 0.0
+    pillar_weighted = catalog.pillars @ weights
+    if lean_scores is not None:
+        pillar_weighted = pillar_weighted + numeric["political_lean"] * lean_scores
+    weighted = pillar_weighted / total_weight
+    if climate_weight > 0:
+        climate_score = score_climate_matrix(catalog.climate, climate_preferences or {})
+        climate_score = np.where(np.isnan(climate_score), 50.0, climate_score)
+        weighted = (1 - climate_weight) * weighted + climate_weight * climate_score
+
+    # Top-N by the rounded match (ties keep catalog order): argpartition finds the N-th best
+    # raw score; anything within rounding distance of it is re-ranked exactly.
+    if top_n < n:
+        kth = weighted[np.argpartition(-weighted, top_n - 1)[top_n - 1]]
+        pool = np.flatnonzero(weighted >= kth - 0.01)
+    else:
+        pool = np.arange(n)
+    ranked = sorted(((round(float(weighted[i]), 2), int(i)) for i in pool), key=lambda x: (-x[0], x[1]))[:top_n]
+
     scored: List[Dict[str, Any]] = []
-    for n in catalog:
-        ps = dict(n["pillar_scores"])
-        if numeric.get("political_lean", 0) > 0:
-            ps["political_lean"] = _political_lean_score_from_raw(n.get("lean_2024"), political_preference)
-        pillar_weighted = sum(numeric.get(pillar, 0) * ps.get(pillar, 0.0) for pillar in PILLAR_KEYS) / total_weight
-        if climate_weight > 0:
-            climate_data = climate_index.get(n.get("place_name", ""))
-            cm = score_climate_match(climate_data, climate_preferences or {})
-            climate_score = cm["score"] if cm else 50.0
-            weighted = (1 - climate_weight) * pillar_weighted + climate_weight * climate_score
-        else:
-            weighted = pillar_weighted
-        payload = {
-            "neighborhood": n["neighborhood"],
-            "archetype": n["archetype"],
-            "percentile_band": n["status_label"],
+    for match, i in ranked:
+        ps = dict(zip(PILLAR_KEYS, catalog.pillars[i].tolist()))
+        if lean_scores is not None:
+            ps["political_lean"] = float(lean_scores[i])
+        scored.append({
+            "neighborhood": str(catalog.neighborhood[i]),
+            "archetype": str(catalog.archetype[i]),
+            "percentile_band": str(catalog.status_label[i]),
             "pillar_scores": ps,
-            "weighted_match": round(weighted, 2),
-        }
-        scored.append(payload)
-    scored.sort(key=lambda x: x["weighted_match"], reverse=True)
-    return scored[:top_n]
+            "weighted_match": match,
+        })
+    return scored
 
 
 def build_results_url(neighborhood_name: str, priorities: Dict[str, str]) -> str:
@@ -275,7 +557,7 @@ def get_recommendations(
 
     model_id = (model or os.getenv("HOMEFIT_ANTHROPIC_MODEL", "") or "").strip() or "claude-haiku-4-5-20251001"
 
-    catalog = load_catalog_records()
+    catalog = load_catalog_index()
     candidates = prerank_neighborhoods(catalog, priorities, top_n=10, political_preference=political_preference, climate_preferences=climate_preferences)
     if not candidates:
         return []
@@ -298,16 +580,14 @@ def get_recommendations(
     if not isinstance(results, list):
         raise HTTPException(status_code=500, detail="Model JSON must be an array")
 
-    by_neighborhood: Dict[str, Dict[str, Any]] = {n["neighborhood"]: n for n in catalog}
-
     for r in results:
         if not isinstance(r, dict):
             continue
         name = r.get("neighborhood")
         if isinstance(name, str) and name:
             r["results_url"] = build_results_url(name, priorities)
-            row = by_neighborhood.get(name)
-            sf = row.get("score_full") if row else None
+            row = catalog.row_index(name)
+            sf = catalog.score_full(row) if row is not None else None
             if isinstance(sf, dict) and sf:
                 r["score"] = sf
 
@@ -346,18 +626,18 @@ def recommend_neighborhoods(req: RecommendRequest) -> Dict[str, Any]:
         if pref and pref.strip().lower() not in VALID_POLITICAL_PREFERENCES:
             pref = None
         results = get_recommendations(req.priorities, req.context, political_preference=pref, climate_preferences=req.climate_preferences or None)
+        evaluated = len(load_catalog_index())
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
-    catalog = load_catalog_records()
     processing_ms = round((time.perf_counter() - start) * 1000)
     return {
         "recommendations": results,
         "meta": {
             "model": model,
-            "neighborhoods_evaluated": len(catalog),
+            "neighborhoods_evaluated": evaluated,
             "processing_ms": processing_ms,
         },
     }
@@ -0,0 +1,419 @@
+"""
+Cache warmer for places we already know people will ask about.
+
+Targets come from data/*_place_catalog.csv plus the most-requested locations in request
+logs (JSONL lines or telemetry exports with location / lat / lon) and, when running inside
+the API, the in-process telemetry collector. A target is warmed when its shared pre-pillar
+entry is missing or within the refresh-ahead window of its soft TTL: the full score is
+recomputed with cache_refresh=True, which rewrites shared_prepillar: and
+location_response_template:. The CLI also sets a refresh-ahead fraction on @cached (the
+last 10% of each function's TTL by default), so upstream entries that recompute touches
+(GEE canopy/landcover, Census tract) are refreshed before they expire too, without
+refetching short-TTL caches that are still fresh.
+
+Work is spread evenly across an off-peak window (local hours) and admitted through the
+upstream token buckets (data_sources.rate_limits), with each location charged
+1/budget_fraction of its normal cost so warming only uses part of every budget.
+
+CLI (from the repo root):
+
+  PYTHONPATH=. python cache_warmer.py --off-peak 1-6 --request-log logs/requests.jsonl
+
+API: HOMEFIT_CACHE_WARMER_ENABLED=1 starts a daemon thread that runs one pass per
+off-peak window (HOMEFIT_CACHE_WARMER_OFF_PEAK, default 2-6).
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import json
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent
+DEFAULT_CATALOG_GLOB = str(REPO_ROOT / "data" / "*_place_catalog.csv")
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return str(raw).strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+@dataclass
+class WarmTarget:
+    location: str
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    source: str = "catalog"
+    hits: int = 0
+
+
+def _norm_query(s: str) -> str:
+    return " ".join((s or "").strip().lower().split())
+
+
+def _coord_key(lat: Optional[float], lon: Optional[float]) -> Optional[Tuple[float, float]]:
+    if lat is None or lon is None:
+        return None
+    return round(float(lat), 4), round(float(lon), 4)
+
+
+def load_catalog_targets(paths: Optional[Iterable[str]] = None) -> List[WarmTarget]:
+    """One target per catalog row (search_query + catalog centroid)."""
+    targets: List[WarmTarget] = []
+    for path in sorted(paths if paths is not None else glob.glob(DEFAULT_CATALOG_GLOB)):
+        try:
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    query = (row.get("search_query") or "").strip()
+                    if not query:
+                        continue
+                    try:
+                        lat, lon = float(row.get("lat") or ""), float(row.get("lon") or "")
+                    except ValueError:
+                        lat = lon = None
+                    targets.append(WarmTarget(query, lat, lon, source=Path(path).stem))
+        except OSError as e:
+            logger.warning(f"Cache warmer: could not read catalog {path}: {e}")
+    return targets
+
+
+def _records_from_log(path: str) -> Iterable[Dict[str, Any]]:
+    """Request records from a JSONL log or a telemetry export ({"raw_requests": [...]})."""
+    with open(path, encoding="utf-8") as f:
+        head = f.read(1)
+        f.seek(0)
+        if head == "{":
+            try:
+                doc = json.load(f)
+                if isinstance(doc, dict) and isinstance(doc.get("raw_requests"), list):
+                    yield from (r for r in doc["raw_requests"] if isinstance(r, dict))
+                    return
+                if isinstance(doc, dict):
+                    yield doc
+                    return
+            except json.JSONDecodeError:
+                f.seek(0)  # JSONL: one object per line
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(rec, dict):
+                yield rec
+
+
+def rank_requested(records: Iterable[Dict[str, Any]], top_n: int, source: str) -> List[WarmTarget]:
+    """Most-requested locations first; records need `location` and/or `lat` + `lon`."""
+    counts: Counter = Counter()
+    first: Dict[Any, WarmTarget] = {}
+    for rec in records:
+        location = str(rec.get("location") or rec.get("input") or "").strip()
+        try:
+            lat = float(rec["lat"]) if rec.get("lat") is not None else None
+            lon = float(rec["lon"]) if rec.get("lon") is not None else None
+        except (TypeError, ValueError):
+            lat = lon = None
+        key = _norm_query(location) or _coord_key(lat, lon)
+        if not key:
+            continue
+        counts[key] += 1
+        if key not in first:
+            first[key] = WarmTarget(location, lat, lon, source=source)
+    ranked = []
+    for key, n in counts.most_common(top_n):
+        target = first[key]
+        target.hits = n
+        ranked.append(target)
+    return ranked
+
+
+def load_request_log_targets(paths: Iterable[str], top_n: int) -> List[WarmTarget]:
+    records: List[Dict[str, Any]] = []
+    for path in paths:
+        try:
+            records.extend(_records_from_log(path))
+        except OSError as e:
+            logger.warning(f"Cache warmer: could not read request log {path}: {e}")
+    return rank_requested(records, top_n, source="request_log")
+
+
+def telemetry_targets(top_n: int) -> List[WarmTarget]:
+    """Most-requested locations seen by this process (API background task only)."""
+    from data_sources.telemetry import telemetry_collector
+
+    with telemetry_collector.lock:
+        records = [{"location": r.location, "lat": r.lat, "lon": r.lon} for r in telemetry_collector.requests]
+    return rank_requested(records, top_n, source="telemetry")
+
+
+def collect_targets(
+    catalog_paths: Optional[Iterable[str]] = None,
+    request_logs: Iterable[str] = (),
+    top_n: int = 200,
+    include_telemetry: bool = False,
+) -> List[WarmTarget]:
+    """Requested locations (most popular first), then catalog rows; de-duplicated."""
+    ordered: List[WarmTarget] = []
+    if include_telemetry:
+        ordered.extend(telemetry_targets(top_n))
+    ordered.extend(load_request_log_targets(request_logs, top_n))
+    ordered.extend(load_catalog_targets(catalog_paths))
+
+    seen: set = set()
+    targets: List[WarmTarget] = []
+    for t in ordered:
+        keys = {k for k in (_norm_query(t.location), _coord_key(t.lat, t.lon)) if k}
+        if keys & seen:
+            continue
+        seen |= keys
+        targets.append(t)
+    return targets
+
+
+def parse_hours(spec: Optional[str]) -> Optional[Tuple[int, int]]:
+    """'1-6' -> (1, 6): local hours [start, end). Wraps midnight for e.g. '22-4'."""
+    if not spec:
+        return None
+    start, _, end = spec.partition("-")
+    window = int(start) % 24, int(end or start) % 24
+    if window[0] == window[1]:
+        raise ValueError(f"Empty off-peak window: {spec!r}")
+    return window
+
+
+def _window_length_seconds(window: Tuple[int, int]) -> float:
+    return ((window[1] - window[0]) % 24) * 3600.0
+
+
+def seconds_until_window(window: Tuple[int, int], now: Optional[float] = None) -> float:
+    """0.0 inside the window, otherwise seconds until it next opens."""
+    since_start = _seconds_since_window_start(window, now)
+    if since_start < _window_length_seconds(window):
+        return 0.0
+    return 86400 - since_start
+
+
+def seconds_left_in_window(window: Tuple[int, int], now: Optional[float] = None) -> float:
+    return max(0.0, _window_length_seconds(window) - _seconds_since_window_start(window, now))
+
+
+def _seconds_since_window_start(window: Tuple[int, int], now: Optional[float]) -> float:
+    dt = datetime.fromtimestamp(time.time() if now is None else now)
+    into_day = dt.hour * 3600 + dt.minute * 60 + dt.second + dt.microsecond / 1e6
+    return (into_day - window[0] * 3600) % 86400
+
+
+def _resolve(target: WarmTarget) -> Optional[Tuple[float, float]]:
+    """Coordinates the API would score for this target (geocoded, as for a user request)."""
+    if target.location:
+        from data_sources.geocoding import geocode_with_full_result
+
+        geo = geocode_with_full_result(target.location)
+        if geo:
+            return float(geo[0]), float(geo[1])
+    if target.lat is not None and target.lon is not None:
+        return target.lat, target.lon
+    return None
+
+
+def warm_target(
+    target: WarmTarget,
+    refresh_ahead_seconds: float,
+    admit: Callable[[], None] = lambda: None,
+) -> str:
+    """
+    Warm one target; returns 'warmed', 'fresh', 'catalog', 'unresolved' or 'failed'.
+
+    `admit` blocks until the upstream budget allows a full score; it is only called when
+    the target actually needs recomputing.
+    """
+    import main as api
+    from data_sources.cache import redis_get_compressed_json
+
+    try:
+        coords = _resolve(target)
+        if coords is None:
+            return "unresolved"
+        lat, lon = coords
+        if _coord_key(lat, lon) in api._CATALOG_INDEX:
+            return "catalog"  # served from the pre-scored catalog, no cold cache to fill
+
+        blob = redis_get_compressed_json(api._generate_shared_prepillar_cache_key(lat, lon))
+        age = api._swr_age(blob)
+        fresh_for = max(0.0, api.SHARED_PREPILLAR_CACHE_TTL_SECONDS - refresh_ahead_seconds)
+        if blob is not None and (age is None or age < fresh_for):
+            return "fresh"
+
+        admit()
+        if target.location:
+            api._compute_single_score_internal(location=target.location, cache_refresh=True)
+        else:
+            # Coordinate-only request records: score the pinned point, as the API did.
+            api._compute_single_score_internal(
+                location=f"{lat},{lon}", lat_override=lat, lon_override=lon, cache_refresh=True
+            )
+        return "warmed"
+    except Exception as e:
+        logger.warning(f"Cache warmer: {target.location or (target.lat, target.lon)} failed: {e}")
+        return "failed"
+
+
+def run_warm_pass(
+    targets: List[WarmTarget],
+    *,
+    off_peak: Optional[Tuple[int, int]] = None,
+    budget_fraction: float = 0.5,
+    refresh_ahead_seconds: float = 6 * 3600,
+    warm: Callable[..., str] = warm_target,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.time,
+) -> Dict[str, int]:
+    """
+    Warm targets in order, spread across the off-peak window and within upstream budgets.
+
+    Returns counts per warm_target outcome, plus 'deferred' for targets left when the
+    window closed (the least popular ones; the next pass starts from the top again).
+    """
+    from data_sources import rate_limits
+
+    fraction = min(1.0, max(0.01, budget_fraction))
+    costs = {u: c / fraction for u, c in rate_limits.location_cost().items()}
+
+    def admit() -> None:
+        while True:
+            wait = rate_limits.try_admit(costs)
+            if wait <= 0:
+                return
+            sleep(wait)
+
+    deadline = float("inf")
+    interval = 0.0
+    if off_peak:
+        wait = seconds_until_window(off_peak, clock())
+        if wait > 0:
+            logger.info(f"Cache warmer: waiting {wait / 3600:.1f}h for off-peak window {off_peak[0]}-{off_peak[1]}h")
+            sleep(wait)
+        left = seconds_left_in_window(off_peak, clock())
+        deadline = clock() + left
+        interval = left / max(1, len(targets))
+
+    outcomes: Counter = Counter()
+    for i, target in enumerate(targets):
+        started = clock()
+        if started >= deadline:
+            outcomes["deferred"] += len(targets) - i
+            break
+        outcome = warm(target, refresh_ahead_seconds, admit)
+        outcomes[outcome] += 1
+        if outcome != "warmed":
+            continue  # nothing fetched upstream: no pacing slot used
+        logger.info(f"Cache warmer [{i + 1}/{len(targets)}]: warmed {target.location} ({target.source})")
+        remaining = interval - (clock() - started)
+        if remaining > 0:
+            sleep(min(remaining, max(0.0, deadline - clock())))
+
+    logger.info(f"Cache warmer pass done: {dict(outcomes)}")
+    return dict(outcomes)
+
+
+_background_started = False
+_background_lock = threading.Lock()
+
+
+def start_background_warmer() -> bool:
+    """
+    Start the in-API warmer thread when HOMEFIT_CACHE_WARMER_ENABLED=1 (idempotent).
+
+    Runs one pass per off-peak window over catalog rows, HOMEFIT_CACHE_WARMER_REQUEST_LOG
+    (comma-separated paths) and this process's telemetry. No @cached refresh-ahead here:
+    that window is process-wide and would also apply to user requests.
+    """
+    global _background_started
+    if not _env_bool("HOMEFIT_CACHE_WARMER_ENABLED"):
+        return False
+    with _background_lock:
+        if _background_started:
+            return False
+        _background_started = True
+
+    off_peak = parse_hours(os.getenv("HOMEFIT_CACHE_WARMER_OFF_PEAK", "2-6"))
+    logs = [p.strip() for p in os.getenv("HOMEFIT_CACHE_WARMER_REQUEST_LOG", "").split(",") if p.strip()]
+    top_n = int(os.getenv("HOMEFIT_CACHE_WARMER_TOP_N", "200"))
+    fraction = float(os.getenv("HOMEFIT_CACHE_WARMER_BUDGET_FRACTION", "0.25"))
+
+    def loop() -> None:
+        while True:
+            try:
+                time.sleep(seconds_until_window(off_peak))
+                targets = collect_targets(request_logs=logs, top_n=top_n, include_telemetry=True)
+                run_warm_pass(targets, off_peak=off_peak, budget_fraction=fraction, refresh_ahead_seconds=0.0)
+                time.sleep(seconds_left_in_window(off_peak) + 60)
+            except Exception as e:
+                logger.warning(f"Cache warmer pass failed: {e}")
+                time.sleep(3600)
+
+    threading.Thread(target=loop, name="cache-warmer", daemon=True).start()
+    logger.info(f"Cache warmer scheduled for off-peak hours {off_peak[0]}-{off_peak[1]}h")
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Pre-populate location/pre-pillar and upstream caches.")
+    ap.add_argument("--catalog", action="append", help="Place catalog CSV (repeatable; default data/*_place_catalog.csv)")
+    ap.add_argument("--request-log", action="append", default=[], help="Request log JSONL or telemetry export (repeatable)")
+    ap.add_argument("--top", type=int, default=200, help="Most-requested locations to take from request logs")
+    ap.add_argument("--off-peak", default=None, help="Local hours window, e.g. 1-6 (default: start now, no pacing)")
+    ap.add_argument("--budget-fraction", type=float, default=0.5, help="Share of each upstream budget warming may use")
+    ap.add_argument("--refresh-ahead-hours", type=float, default=6.0,
+                    help="Re-warm shared pre-pillar entries expiring within this many hours")
+    ap.add_argument("--refresh-ahead-fraction", type=float, default=0.1,
+                    help="Refresh @cached upstream entries in the last fraction of their TTL (max 0.5)")
+    ap.add_argument("--limit", type=int, default=None, help="Warm at most N targets")
+    ap.add_argument("--dry-run", action="store_true", help="List targets and exit")
+    args = ap.parse_args(argv)
+
+    targets = collect_targets(args.catalog, args.request_log, args.top)
+    if args.limit is not None:
+        targets = targets[: args.limit]
+    if args.dry_run:
+        for t in targets:
+            print(f"{t.source}\t{t.hits}\t{t.location}")
+        print(f"{len(targets)} targets")
+        return 0
+
+    from data_sources import cache
+
+    if cache._get_redis_client() is None:
+        logger.warning("Cache warmer: Redis unavailable; warmed entries only reach the local disk cache")
+    refresh_ahead = args.refresh_ahead_hours * 3600
+    cache.set_refresh_ahead(args.refresh_ahead_fraction)
+    outcomes = run_warm_pass(
+        targets,
+        off_peak=parse_hours(args.off_peak),
+        budget_fraction=args.budget_fraction,
+        refresh_ahead_seconds=refresh_ahead,
+    )
+    print(json.dumps(outcomes))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -20,6 +20,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
+from data_sources.utils import SphereIndex
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -46,15 +47,6 @@ def _catalog_key_row(row: Dict[str, str]) -> str:
     return f"{row.get('name', '')}|{row.get('county_borough', '')}|{row.get('state_abbr', '')}"
 
 
-def _haversine_km(
-    lat1: float, lon1: float, lat2: float, lon2: float
-) -> float:
-    r = 6371.0
-    p = math.pi / 180.0
-    a = 0.5 - math.cos((lat2 - lat1) * p) / 2 + math.cos(lat1 * p) * math.cos(lat2 * p) * (1 - math.cos((lon2 - lon1) * p)) / 2
-    return 2 * r * math.asin(math.sqrt(a))
-
-
 class _CatalogLookup:
     """Lazy-loaded search_query / coordinate -> catalog_key."""
 
@@ -63,6 +55,7 @@ class _CatalogLookup:
     def __init__(self) -> None:
         self.by_query: Dict[str, str] = {}
         self.rows: List[Tuple[str, float, float, str]] = []
+        self.index: Optional[SphereIndex] = None
         path = Path(os.getenv("HOMEFIT_CATALOG_CSV", str(DEFAULT_CATALOG_CSV))).resolve()
         if not path.is_file():
             logger.warning("catalog_contribution: catalog CSV not found at %s", path)
@@ -80,6 +73,7 @@ class _CatalogLookup:
                 except (TypeError, ValueError):
                     continue
                 self.rows.append((key, lat, lon, sq))
+        self.index = SphereIndex([r[1] for r in self.rows], [r[2] for r in self.rows])
 
     @classmethod
     def get(cls) -> "_CatalogLookup":
@@ -99,15 +93,9 @@ class _CatalogLookup:
             return None
         if not (math.isfinite(lat) and math.isfinite(lon)):
             return None
-        best_k: Optional[str] = None
-        best_d = float("inf")
-        for key, rlat, rlon, _ in self.rows:
-            d = _haversine_km(lat, lon, rlat, rlon)
-            if d < best_d:
-                best_d = d
-                best_k = key
-        if best_k is not None and best_d <= _MAX_NEAREST_KM:
-            return best_k
+        found = self.index.nearest(lat, lon, max_distance_m=_MAX_NEAREST_KM * 1000.0)
+        if found:
+            return self.rows[found[0][0]][0]
         return None
 
 
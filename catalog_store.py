@@ -0,0 +1,559 @@
+"""
+Columnar catalog store.
+
+The pre-scored catalogs (`data/*_scores_merged.jsonl`) as SQLite: one row per place with
+the fields jobs filter and rank on as columns, and each pillar's full object as its own
+zlib-compressed JSON blob. A job reads only the columns and pillars it asks for, and
+rewriting one pillar rewrites one blob instead of the whole file.
+
+Schema (SQLite):
+  meta(key, value)        -- version; source JSONL path/size/mtime at the last import/export
+  places(id, catalog_key, name, county_borough, state_abbr, search_query, lat, lon,
+         success, total_score, archetype, trajectory, status_label, local_scene_bucket,
+         lean_2024, pct_low_density, failed_pillars, <one column per PILLAR_COLUMNS>,
+         pillar_order, body)
+                          -- id is the JSONL row order (1-based); pillar columns hold the raw
+                             "score"; failed_pillars lists (comma-separated) pillars with
+                             status "failed" or an error; body is the zlib JSON row with
+                             score.livability_pillars emptied (key order in pillar_order)
+  pillars(place_id, pillar, detail)
+                          -- zlib JSON of each score.livability_pillars entry
+  passthrough(after_id, seq, line)
+                          -- JSONL lines that are not catalog rows (blank, unparseable), kept
+                             verbatim after row after_id (0 = file start) so export_jsonl
+                             writes the file back unchanged
+
+Reading: CatalogStore.rows / iter_rows take a column projection, predicates pushed into
+SQL (`where=[("archetype", "in", [...]), ("lean_2024", "<", 0)]`), and which pillars to
+rebuild into the returned JSONL row (or full=True for all of them). iter_rows answers the
+same call from a plain JSONL when no store is available, with the same predicate semantics.
+
+`<catalog>.sqlite` next to `<catalog>.jsonl` is preferred by open_catalog / iter_rows
+unless the JSONL changed after the store last imported or exported it (then the JSONL is
+read and a warning logged). Import/export: `scripts/catalog/convert_catalog_store.py`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+STORE_VERSION = 1
+
+# Matches agent_recommend.PILLAR_KEYS (frontend/lib/pillars.ts PillarKey).
+PILLAR_COLUMNS: Tuple[str, ...] = (
+    "natural_beauty",
+    "built_environment",
+    "neighborhood_amenities",
+    "active_outdoors",
+    "healthcare_access",
+    "public_transit_access",
+    "air_travel_access",
+    "economic_opportunity",
+    "quality_education",
+    "housing_value",
+    "climate_risk",
+    "social_fabric",
+    "diversity",
+    "community_safety",
+    "political_lean",
+)
+
+_SCALAR_TYPES: Dict[str, str] = {
+    "catalog_key": "TEXT",
+    "name": "TEXT",
+    "county_borough": "TEXT",
+    "state_abbr": "TEXT",
+    "search_query": "TEXT",
+    "lat": "REAL",
+    "lon": "REAL",
+    "success": "INTEGER",
+    "total_score": "REAL",
+    "archetype": "TEXT",
+    "trajectory": "TEXT",
+    "status_label": "TEXT",
+    "local_scene_bucket": "TEXT",
+    "lean_2024": "REAL",
+    "pct_low_density": "REAL",
+    "failed_pillars": "TEXT",
+}
+
+COLUMNS: Tuple[str, ...] = ("id",) + tuple(_SCALAR_TYPES) + PILLAR_COLUMNS
+
+_OPS = frozenset({"=", "!=", "<", "<=", ">", ">=", "in", "is_null", "not_null"})
+
+Condition = Tuple[Any, ...]
+
+
+def store_path_for(jsonl_path: Path) -> Path:
+    """Store location for a catalog JSONL: same directory and stem, `.sqlite`."""
+    return Path(jsonl_path).with_suffix(".sqlite")
+
+
+def _pack(obj: Any) -> bytes:
+    return zlib.compress(json.dumps(obj, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+def _num(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+def _str(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) else None
+
+
+def _dict(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def scalars(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values for a catalog JSONL row (places columns other than id/body)."""
+    cat = _dict(row.get("catalog"))
+    score = _dict(row.get("score"))
+    lp = _dict(score.get("livability_pillars"))
+    ss = _dict(score.get("status_signal_breakdown"))
+    pl_bd = _dict(_dict(lp.get("political_lean")).get("breakdown"))
+    success = row.get("success")
+    coords = []
+    for key in ("lat", "lon"):
+        try:
+            coords.append(float(cat[key]))
+        except (KeyError, TypeError, ValueError):
+            coords.append(None)
+    out: Dict[str, Any] = {
+        "catalog_key": f"{cat.get('name', '')}|{cat.get('county_borough', '')}|{cat.get('state_abbr', '')}",
+        "name": _str(cat.get("name")),
+        "county_borough": _str(cat.get("county_borough")),
+        "state_abbr": _str(cat.get("state_abbr")),
+        "search_query": _str(cat.get("search_query")),
+        "lat": coords[0],
+        "lon": coords[1],
+        "success": int(success) if isinstance(success, bool) else None,
+        "total_score": _num(score.get("total_score")),
+        "archetype": _str(ss.get("archetype")),
+        "trajectory": _str(ss.get("trajectory")),
+        "status_label": _str(ss.get("status_label")),
+        "local_scene_bucket": _str(score.get("local_scene_bucket")),
+        "lean_2024": _num(pl_bd.get("lean_2024")),
+        "pct_low_density": _num(_dict(score.get("housing_stock")).get("pct_low_density")),
+        "failed_pillars": ",".join(
+            k for k, p in lp.items() if isinstance(p, dict) and (p.get("status") == "failed" or p.get("error"))
+        ),
+    }
+    for k in PILLAR_COLUMNS:
+        out[k] = _num(_dict(lp.get(k)).get("score"))
+    return out
+
+
+def _split(row: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str], Dict[str, Any]]:
+    """(row with livability_pillars emptied, pillar key order, pillar objects)."""
+    body = dict(row)
+    score = body.get("score")
+    if isinstance(score, dict) and isinstance(score.get("livability_pillars"), dict):
+        lp = score["livability_pillars"]
+        body["score"] = dict(score, livability_pillars={})
+        return body, list(lp), dict(lp)
+    return body, [], {}
+
+
+def _join(body: Dict[str, Any], order: Sequence[str], details: Dict[str, Any]) -> Dict[str, Any]:
+    score = body.get("score")
+    if order and isinstance(score, dict) and "livability_pillars" in score:
+        score["livability_pillars"] = {k: details[k] for k in order if k in details}
+    return body
+
+
+def _only_pillars(row: Dict[str, Any], pillars: Iterable[str]) -> Dict[str, Any]:
+    body, order, details = _split(row)
+    wanted = set(pillars)
+    return _join(body, order, {k: v for k, v in details.items() if k in wanted})
+
+
+def _check_column(col: str) -> str:
+    if col not in COLUMNS:
+        raise ValueError(f"unknown catalog column: {col!r}")
+    return col
+
+
+def _compile_where(where: Optional[Sequence[Condition]]) -> Tuple[str, List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    for col, op, *rest in where or ():
+        _check_column(col)
+        if op not in _OPS:
+            raise ValueError(f"unknown catalog predicate: {op!r}")
+        value = rest[0] if rest else None
+        if op == "in":
+            values = list(value)
+            clauses.append(f"{col} IN ({', '.join('?' * len(values))})" if values else "0")
+            params.extend(values)
+        elif op == "is_null":
+            clauses.append(f"{col} IS NULL")
+        elif op == "not_null":
+            clauses.append(f"{col} IS NOT NULL")
+        elif op == "!=":
+            # Null-safe, like Python's != (a missing archetype is "not Low").
+            clauses.append(f"{col} IS NOT ?")
+            params.append(value)
+        else:
+            clauses.append(f"{col} {op} ?")
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _matches(values: Dict[str, Any], where: Optional[Sequence[Condition]]) -> bool:
+    """_compile_where's semantics evaluated in Python (JSONL fallback)."""
+    for col, op, *rest in where or ():
+        _check_column(col)
+        v = values[col]
+        x = rest[0] if rest else None
+        if op == "is_null":
+            ok = v is None
+        elif op == "not_null":
+            ok = v is not None
+        elif op == "!=":
+            ok = v != x
+        elif v is None:
+            ok = False
+        elif op == "in":
+            ok = v in set(x)
+        elif op == "=":
+            ok = v == x
+        elif op == "<":
+            ok = v < x
+        elif op == "<=":
+            ok = v <= x
+        elif op == ">":
+            ok = v > x
+        elif op == ">=":
+            ok = v >= x
+        else:
+            raise ValueError(f"unknown catalog predicate: {op!r}")
+        if not ok:
+            return False
+    return True
+
+
+def _projection(columns: Optional[Sequence[str]]) -> List[str]:
+    if columns is None:
+        return list(COLUMNS)
+    return ["id"] + [_check_column(c) for c in columns if c != "id"]
+
+
+def _read_lines(path: Path) -> Iterator[Tuple[Optional[Dict[str, Any]], str]]:
+    """(row, raw line) per JSONL line; row is None for blank/unparseable/non-object lines."""
+    with open(path, encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            row = None
+            if line:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    row = None
+            yield (row if isinstance(row, dict) else None), raw.rstrip("\n")
+
+
+def read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    """Catalog JSONL rows (blank and unparseable lines skipped, as every consumer does)."""
+    for row, _raw in _read_lines(path):
+        if row is not None:
+            yield row
+
+
+def _source_stamp(path: Path) -> Dict[str, str]:
+    st = os.stat(path)
+    return {"source_path": str(Path(path).resolve()), "source_size": str(st.st_size),
+            "source_mtime_ns": str(st.st_mtime_ns)}
+
+
+class CatalogStore:
+    """One catalog's SQLite store. Writable stores commit on clean context-manager exit."""
+
+    def __init__(self, path: Path, writable: bool = False):
+        self.path = Path(path)
+        self.writable = writable
+        if writable:
+            self.conn = sqlite3.connect(str(self.path))
+        else:
+            self.conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+
+    @classmethod
+    def create(cls, path: Path) -> "CatalogStore":
+        """Empty store at path (the file must not exist yet)."""
+        store = cls(path, writable=True)
+        pillar_cols = ", ".join(f"{k} REAL" for k in PILLAR_COLUMNS)
+        scalar_cols = ", ".join(f"{k} {t}" for k, t in _SCALAR_TYPES.items())
+        store.conn.executescript(
+            f"""
+            CREATE TABLE meta(key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE places(id INTEGER PRIMARY KEY, {scalar_cols}, {pillar_cols},
+                                pillar_order TEXT, body BLOB);
+            CREATE TABLE pillars(place_id INTEGER, pillar TEXT, detail BLOB,
+                                 PRIMARY KEY(place_id, pillar)) WITHOUT ROWID;
+            CREATE TABLE passthrough(after_id INTEGER, seq INTEGER, line TEXT,
+                                     PRIMARY KEY(after_id, seq)) WITHOUT ROWID;
+            CREATE INDEX places_catalog_key ON places(catalog_key);
+            CREATE INDEX places_search_query ON places(search_query);
+            """
+        )
+        store.conn.execute("INSERT INTO meta VALUES ('version', ?)", (str(STORE_VERSION),))
+        return store
+
+    def __enter__(self) -> "CatalogStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.writable and exc_type is None:
+            self.conn.commit()
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def __len__(self) -> int:
+        return int(self.conn.execute("SELECT COUNT(*) FROM places").fetchone()[0])
+
+    def meta(self) -> Dict[str, str]:
+        return dict(self.conn.execute("SELECT key, value FROM meta"))
+
+    def set_source(self, jsonl_path: Path) -> None:
+        """Record the JSONL this store was imported from / exported to."""
+        self.conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", _source_stamp(jsonl_path).items())
+
+    def matches_source(self, jsonl_path: Path) -> bool:
+        """True when jsonl_path is unchanged since the store's last import/export."""
+        try:
+            stamp = _source_stamp(jsonl_path)
+        except OSError:
+            return False
+        meta = self.meta()
+        return all(meta.get(k) == v for k, v in stamp.items() if k != "source_path")
+
+    # -- reading -------------------------------------------------------------------------
+
+    def _details(self, place_id: int, pillars: Sequence[str]) -> Dict[str, Any]:
+        if not pillars:
+            return {}
+        cur = self.conn.execute(
+            f"SELECT pillar, detail FROM pillars WHERE place_id = ? AND pillar IN ({', '.join('?' * len(pillars))})",
+            (place_id, *pillars),
+        )
+        return {pillar: _unpack(detail) for pillar, detail in cur}
+
+    def rows(self, columns: Optional[Sequence[str]] = None, where: Optional[Sequence[Condition]] = None,
+             pillars: Optional[Iterable[str]] = None, full: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Projected rows in catalog order. Each dict holds "id" plus the requested columns
+        (all columns when None); with pillars (or full=True) it also holds "row", the JSONL
+        row carrying only those pillars (all of them).
+        """
+        cols = _projection(columns)
+        wanted = None if pillars is None else set(pillars)
+        with_body = full or wanted is not None
+        select = ", ".join(cols + (["pillar_order", "body"] if with_body else []))
+        clause, params = _compile_where(where)
+        cur = self.conn.execute(f"SELECT {select} FROM places{clause} ORDER BY id", params)
+        for rec in cur.fetchall() if self.writable else cur:
+            out = dict(zip(cols, rec))
+            if with_body:
+                order = json.loads(rec[len(cols)] or "[]")
+                keys = order if full else [k for k in order if k in wanted]
+                out["row"] = _join(_unpack(rec[len(cols) + 1]), order, self._details(out["id"], keys))
+            yield out
+
+    def count(self, where: Optional[Sequence[Condition]] = None) -> int:
+        """Rows matching where (all rows when None)."""
+        clause, params = _compile_where(where)
+        return int(self.conn.execute(f"SELECT COUNT(*) FROM places{clause}", params).fetchone()[0])
+
+    def row(self, place_id: int) -> Optional[Dict[str, Any]]:
+        """The full JSONL row for place_id, or None."""
+        rec = self.conn.execute("SELECT pillar_order, body FROM places WHERE id = ?", (place_id,)).fetchone()
+        if rec is None:
+            return None
+        order = json.loads(rec[0] or "[]")
+        return _join(_unpack(rec[1]), order, self._details(place_id, order))
+
+    def passthrough(self) -> Dict[int, List[str]]:
+        """{after_id: [line, ...]} for the non-row lines kept at import."""
+        out: Dict[int, List[str]] = {}
+        for after_id, line in self.conn.execute("SELECT after_id, line FROM passthrough ORDER BY after_id, seq"):
+            out.setdefault(int(after_id), []).append(line)
+        return out
+
+    # -- writing -------------------------------------------------------------------------
+
+    def append_row(self, row: Dict[str, Any]) -> int:
+        """Add a row at the end of the catalog; returns its id."""
+        body, order, details = _split(row)
+        values = scalars(row)
+        cols = list(values) + ["pillar_order", "body"]
+        cur = self.conn.execute(
+            f"INSERT INTO places({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+            [*values.values(), json.dumps(order), _pack(body)],
+        )
+        place_id = int(cur.lastrowid)
+        self.conn.executemany(
+            "INSERT INTO pillars VALUES (?, ?, ?)", [(place_id, k, _pack(v)) for k, v in details.items()]
+        )
+        return place_id
+
+    def put_row(self, place_id: int, row: Dict[str, Any]) -> None:
+        """
+        Rewrite place_id from a (possibly partial) JSONL row: the body and columns are
+        replaced, and only the pillars present in the row are rewritten -- pillars it does
+        not carry (e.g. read with rows(pillars=[...])) keep their stored objects.
+        """
+        rec = self.conn.execute("SELECT pillar_order FROM places WHERE id = ?", (place_id,)).fetchone()
+        if rec is None:
+            raise KeyError(place_id)
+        body, order, details = _split(row)
+        old_order = json.loads(rec[0] or "[]")
+        merged_order = old_order + [k for k in order if k not in old_order]
+        kept = self._details(place_id, [k for k in old_order if k not in details])
+        merged = _join(json.loads(json.dumps(body)), merged_order, {**kept, **details})
+        values = scalars(merged)
+        assignments = ", ".join(f"{k} = ?" for k in values)
+        self.conn.execute(
+            f"UPDATE places SET {assignments}, pillar_order = ?, body = ? WHERE id = ?",
+            [*values.values(), json.dumps(merged_order), _pack(body), place_id],
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO pillars VALUES (?, ?, ?)", [(place_id, k, _pack(v)) for k, v in details.items()]
+        )
+
+    def update_pillar(self, place_id: int, pillar: str, obj: Dict[str, Any]) -> None:
+        """Replace one pillar object (and its score column) without touching the others."""
+        rec = self.conn.execute("SELECT body FROM places WHERE id = ?", (place_id,)).fetchone()
+        if rec is None:
+            raise KeyError(place_id)
+        row = _unpack(rec[0])
+        score = row.get("score")
+        if not isinstance(score, dict):
+            raise ValueError(f"catalog row {place_id} has no score to attach {pillar} to")
+        score["livability_pillars"] = {pillar: obj}
+        self.put_row(place_id, row)
+
+
+def import_jsonl(jsonl_path: Path, out_path: Optional[Path] = None) -> int:
+    """Build a fresh store from a catalog JSONL (tmp + replace); returns rows imported."""
+    jsonl_path = Path(jsonl_path)
+    out_path = Path(out_path) if out_path else store_path_for(jsonl_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(f"{out_path.name}.tmp-{os.getpid()}")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    stamp_before = _source_stamp(jsonl_path)
+    store = CatalogStore.create(tmp_path)
+    n = 0
+    kept: List[Tuple[int, int, str]] = []
+    try:
+        place_id = 0
+        for row, raw in _read_lines(jsonl_path):
+            if row is None:
+                kept.append((place_id, len(kept), raw))
+                continue
+            place_id = store.append_row(row)
+            n += 1
+        store.conn.executemany("INSERT INTO passthrough VALUES (?, ?, ?)", kept)
+        store.conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", stamp_before.items())
+        store.commit()
+    finally:
+        store.close()
+    os.replace(tmp_path, out_path)
+    unparsed = sum(1 for _after, _seq, raw in kept if raw.strip())
+    if unparsed:
+        logger.warning("Catalog %s: %d unparseable lines kept verbatim in %s", jsonl_path, unparsed, out_path)
+    return n
+
+
+def export_jsonl(store_path: Path, out_path: Path) -> int:
+    """
+    Write the store back out as catalog JSONL (json.dumps per row, non-row lines kept at
+    import written back in place); returns rows written.
+    """
+    out_path = Path(out_path)
+    tmp_path = out_path.with_name(f"{out_path.name}.tmp-{os.getpid()}")
+    n = 0
+    with CatalogStore(store_path) as store, open(tmp_path, "w", encoding="utf-8") as f:
+        kept = store.passthrough()
+        for line in kept.pop(0, ()):
+            f.write(line + "\n")
+        for rec in store.rows(columns=(), full=True):
+            f.write(json.dumps(rec["row"]) + "\n")
+            n += 1
+            for line in kept.pop(rec["id"], ()):
+                f.write(line + "\n")
+    os.replace(tmp_path, out_path)
+    # The exported file is current with the store: keep preferring the store for it.
+    if store_path_for(out_path).resolve() == Path(store_path).resolve():
+        with CatalogStore(store_path, writable=True) as store:
+            store.set_source(out_path)
+    return n
+
+
+def open_catalog(path: Path, writable: bool = False) -> Optional[CatalogStore]:
+    """
+    The store for a catalog path (a `.sqlite` store, or the JSONL's sibling store), or None
+    when there is none or the JSONL changed after the store last imported/exported it.
+    """
+    path = Path(path)
+    if path.suffix == ".sqlite":
+        return CatalogStore(path, writable) if path.is_file() else None
+    store_path = store_path_for(path)
+    if not store_path.is_file():
+        return None
+    store = CatalogStore(store_path, writable)
+    if path.is_file() and not store.matches_source(path):
+        logger.warning("Catalog %s changed after %s was built; reading the JSONL", path, store_path)
+        store.close()
+        return None
+    return store
+
+
+def resolve_source(path: Path) -> Path:
+    """The file iter_rows(path) actually reads: the store when usable, else the JSONL."""
+    store = open_catalog(path)
+    if store is None:
+        return Path(path)
+    store.close()
+    return store.path
+
+
+def iter_rows(path: Path, columns: Optional[Sequence[str]] = None, where: Optional[Sequence[Condition]] = None,
+              pillars: Optional[Iterable[str]] = None, full: bool = False) -> Iterator[Dict[str, Any]]:
+    """CatalogStore.rows for a catalog path, from its store when usable, else its JSONL."""
+    store = open_catalog(path)
+    if store is not None:
+        with store:
+            yield from store.rows(columns, where, pillars, full)
+        return
+    cols = _projection(columns)
+    for i, row in enumerate(read_jsonl(Path(path)), start=1):
+        values = {"id": i, **scalars(row)}
+        if not _matches(values, where):
+            continue
+        out = {c: values[c] for c in cols}
+        if full:
+            out["row"] = row
+        elif pillars is not None:
+            out["row"] = _only_pillars(row, pillars)
+        yield out
@@ -19,9 +19,17 @@ Score
 -----
 Each active axis contributes 0-100. Overall is the mean of active axes.
 A missing climate profile returns None.
+
+score_climate_matrix scores many places at once from climate_features rows
+(the agent catalog index stores them as a NumPy matrix).
 """
 
-from typing import Optional
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Column order of climate_features() / score_climate_matrix() rows.
+CLIMATE_FEATURES = ("jan_f", "jul_f", "annual_precip_in", "avg_solar")
 
 
 def _clamp(val: float, lo: float, hi: float) -> float:
@@ -89,6 +97,25 @@ def _axis_seasons(swing_f: float, pref: str) -> float:
     return 50.0
 
 
+def climate_features(climate: Optional[dict]) -> Optional[Tuple[float, float, float, float]]:
+    """(jan_f, jul_f, annual_precip_in, avg_solar) from a climate profile, or None if unusable."""
+    if not climate or not climate.get("months"):
+        return None
+
+    months = climate["months"]
+    by_month = {m["month"]: m for m in months}
+
+    jan_f = by_month.get(1, {}).get("avg_temp_f")
+    jul_f = by_month.get(7, {}).get("avg_temp_f")
+    if jan_f is None or jul_f is None:
+        return None
+
+    annual_precip = sum(m.get("avg_precip_in", 0.0) or 0.0 for m in months)
+    solar_vals = [m.get("solar_kwh_m2_day") for m in months if m.get("solar_kwh_m2_day") is not None]
+    avg_solar = sum(solar_vals) / len(solar_vals) if solar_vals else 4.5
+    return jan_f, jul_f, annual_precip, avg_solar
+
+
 def score_climate_match(
     climate: Optional[dict],
     prefs: dict,
@@ -103,20 +130,10 @@ def score_climate_match(
     Returns:
         {score: 0-100, axes: {cold_winter, summer_heat, rain_grey, seasonal}} or None
     """
-    if not climate or not climate.get("months"):
-        return None
-
-    months = climate["months"]
-    by_month = {m["month"]: m for m in months}
-
-    jan_f = by_month.get(1, {}).get("avg_temp_f")
-    jul_f = by_month.get(7, {}).get("avg_temp_f")
-    if jan_f is None or jul_f is None:
+    features = climate_features(climate)
+    if features is None:
         return None
-
-    annual_precip = sum(m.get("avg_precip_in", 0.0) or 0.0 for m in months)
-    solar_vals = [m.get("solar_kwh_m2_day") for m in months if m.get("solar_kwh_m2_day") is not None]
-    avg_solar = sum(solar_vals) / len(solar_vals) if solar_vals else 4.5
+    jan_f, jul_f, annual_precip, avg_solar = features
     swing = jul_f - jan_f
 
     axes = {}
@@ -140,6 +157,57 @@ def score_climate_match(
     return {"score": overall, "axes": axes}
 
 
+def _linear_vec(val: np.ndarray, bad: float, good: float) -> np.ndarray:
+    return np.clip((val - bad) / (good - bad) * 100.0, 0.0, 100.0)
+
+
+def _axis_vec(features: np.ndarray, axis: str, pref: str) -> np.ndarray:
+    """Vectorized _axis_cold / _axis_heat / _axis_rain / _axis_seasons over feature rows."""
+    jan_f, jul_f, precip, solar = (features[:, i] for i in range(4))
+    flat = np.full(len(features), 50.0)
+    if axis == "cold_tolerance":
+        if pref == "dealbreaker":
+            return _linear_vec(jan_f, bad=35.0, good=52.0)
+        if pref == "love":
+            return _linear_vec(jan_f, bad=45.0, good=20.0)
+    elif axis == "heat_tolerance":
+        if pref == "dealbreaker":
+            return _linear_vec(jul_f, bad=80.0, good=65.0)
+        if pref == "love":
+            return _linear_vec(jul_f, bad=70.0, good=85.0)
+    elif axis == "rain_tolerance":
+        if pref in ("dealbreaker", "vibe"):
+            solar_norm = np.clip((solar - 3.4) / (5.8 - 3.4), 0.0, 1.0)
+            precip_norm = np.clip((precip - 6.0) / (55.0 - 6.0), 0.0, 1.0)
+            grey = 0.6 * (1.0 - solar_norm) + 0.4 * precip_norm
+            return np.clip((1.0 - grey if pref == "dealbreaker" else grey) * 100.0, 0.0, 100.0)
+    elif axis == "seasons":
+        swing = jul_f - jan_f
+        if pref == "want_4":
+            return _linear_vec(swing, bad=18.0, good=40.0)
+        if pref == "want_consistency":
+            return _linear_vec(swing, bad=30.0, good=10.0)
+    return flat
+
+
+def score_climate_matrix(features: np.ndarray, prefs: dict) -> np.ndarray:
+    """
+    score_climate_match for every row of an (N, 4) CLIMATE_FEATURES matrix.
+    Rows without a profile (NaN) and preferences with no axes give NaN.
+    """
+    features = np.asarray(features, dtype=np.float64).reshape(-1, len(CLIMATE_FEATURES))
+    axes = [np.round(_axis_vec(features, key, prefs[key]), 1)
+            for key in ("cold_tolerance", "heat_tolerance", "rain_tolerance", "seasons") if key in prefs]
+    if not axes:
+        return np.full(len(features), np.nan)
+    total = axes[0]
+    for axis in axes[1:]:
+        total = total + axis
+    scores = np.round(total / len(axes), 1)
+    scores[np.isnan(features).any(axis=1)] = np.nan
+    return scores
+
+
 def load_climate_index(path: str = "data/catalog_climate_profiles.jsonl") -> dict:
     """Load climate profiles into a dict keyed by (name, source)."""
     import json
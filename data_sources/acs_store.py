@@ -0,0 +1,184 @@
+"""
+Local bulk ACS store.
+
+Serves Census ACS 5-year API requests (detailed B/C tables, DP profiles, S subject tables)
+from one pre-materialized Arrow table per vintage built by
+`scripts/baselines/build_acs_store.py`, so census_api / economic_security_data /
+status_signal do not make a separate api.census.gov round trip per variable group per
+tract. Consulted from census_api._make_request_with_retry: requests it can answer completely
+get a Census-shaped JSON response back; anything else goes to the API unchanged.
+
+Layout:
+  <dir>/acs5_<year>.arrow   -- Arrow IPC file (uncompressed, memory-mapped); one row per
+                               geography keyed by `geo`, one float64 column per variable,
+                               plus NAME
+
+Geo keys:
+  tract:<state><county><tract>   county:<state><county>   place:<state><place>
+  state:<state>   cbsa:<code>   zcta:<zcta>
+
+Override path via env ``HOMEFIT_ACS_STORE_DIR``. Missing directory = backend disabled.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parent.parent / "data_cache" / "acs"
+
+CBSA_GEO = "metropolitan statistical area/micropolitan statistical area"
+ZCTA_GEO = "zip code tabulation area"
+
+# /<year>/acs/acs5[/profile|/subject]
+_URL_RE = re.compile(r"/(\d{4})/acs/acs5(?:/(?:profile|subject))?/?$")
+
+_tables: Dict[int, Optional["AcsTable"]] = {}
+_tables_lock = threading.Lock()
+
+
+def _store_dir() -> Path:
+    env = os.getenv("HOMEFIT_ACS_STORE_DIR")
+    return Path(env).resolve() if env else DEFAULT_STORE_DIR
+
+
+@lru_cache(maxsize=1)
+def available() -> bool:
+    p = _store_dir()
+    exists = p.is_dir() and any(p.glob("acs5_*.arrow"))
+    if exists:
+        logger.info("Local ACS store enabled: %s", p)
+    return exists
+
+
+class AcsTable:
+    """One memory-mapped vintage with a geo -> row index."""
+
+    def __init__(self, path: Path):
+        import pyarrow as pa
+
+        self.table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        self.columns = set(self.table.column_names)
+        self.index: Dict[str, int] = {g: i for i, g in enumerate(self.table.column("geo").to_pylist())}
+
+    def values(self, geo: str, variables: List[str]) -> Optional[List[Any]]:
+        i = self.index.get(geo)
+        if i is None:
+            return None
+        return [self.table.column(v)[i].as_py() for v in variables]
+
+
+def get_table(year: int) -> Optional[AcsTable]:
+    if not available():
+        return None
+    with _tables_lock:
+        if year not in _tables:
+            path = _store_dir() / f"acs5_{year}.arrow"
+            table = None
+            if path.exists():
+                try:
+                    table = AcsTable(path)
+                    logger.info("Local ACS %d loaded: %d geographies", year, len(table.index))
+                except Exception as exc:
+                    logger.warning("Local ACS store %s unreadable: %s", path, exc)
+            _tables[year] = table
+        return _tables[year]
+
+
+def reset() -> None:
+    """Drop loaded vintages (tests, or after rebuilding the store)."""
+    with _tables_lock:
+        _tables.clear()
+    available.cache_clear()
+
+
+def _parse_in(clause: str) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for part in (clause or "").split():
+        name, _, value = part.partition(":")
+        out[name] = value
+    return out
+
+
+def _geographies(for_clause: str, in_clause: str) -> Optional[List[Tuple[str, List[Tuple[str, str]]]]]:
+    """[(geo key, [(response geo column, value), ...])] for a Census for/in pair; None if unsupported."""
+    level, _, values = (for_clause or "").rpartition(":")
+    if not level or not values or "*" in values:
+        return None
+    within = _parse_in(in_clause)
+    out = []
+    for value in values.split(","):
+        if level == "tract":
+            st, co = within.get("state"), within.get("county")
+            if not st or not co:
+                return None
+            out.append((f"tract:{st}{co}{value}", [("state", st), ("county", co), ("tract", value)]))
+        elif level in ("county", "place"):
+            st = within.get("state")
+            if not st:
+                return None
+            out.append((f"{level}:{st}{value}", [("state", st), (level, value)]))
+        elif level == "state":
+            out.append((f"state:{value}", [("state", value)]))
+        elif level == CBSA_GEO:
+            out.append((f"cbsa:{value}", [(CBSA_GEO, value)]))
+        elif level == ZCTA_GEO:
+            out.append((f"zcta:{value}", [(ZCTA_GEO, value)]))
+        else:
+            return None
+    return out
+
+
+def _census_str(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    v = float(value)
+    return str(int(v)) if v.is_integer() else repr(v)
+
+
+def query(url: str, params: Dict[str, Any]) -> Optional[List[List[Optional[str]]]]:
+    """
+    Census API JSON (header row + one row per geography) for an ACS request, or None
+    when the store is absent or lacks the vintage, a variable, or a geography.
+    """
+    if not available():
+        return None
+    m = _URL_RE.search(url.split("?", 1)[0])
+    if not m:
+        return None
+    variables = [v for v in str(params.get("get") or "").split(",") if v]
+    geos = _geographies(str(params.get("for") or ""), str(params.get("in") or ""))
+    if not variables or not geos:
+        return None
+    table = get_table(int(m.group(1)))
+    if table is None or any(v not in table.columns for v in variables):
+        return None
+
+    rows: List[List[Optional[str]]] = [variables + [name for name, _ in geos[0][1]]]
+    for key, geo_cols in geos:
+        values = table.values(key, variables)
+        if values is None:
+            return None
+        rows.append([_census_str(v) for v in values] + [value for _, value in geo_cols])
+    return rows
+
+
+class StoredResponse:
+    """Just enough of requests.Response for census_api callers (status_code, headers, json())."""
+
+    status_code = 200
+    headers: Dict[str, str] = {}
+
+    def __init__(self, rows: List[List[Optional[str]]]):
+        self._rows = rows
+
+    def json(self) -> List[List[Optional[str]]]:
+        return self._rows
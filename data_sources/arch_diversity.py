@@ -2641,7 +2641,7 @@ def score_architectural_diversity_as_beauty(
         compute_block_grain, compute_streetwall_continuity,
         compute_setback_consistency, compute_facade_rhythm
     )
-    from concurrent.futures import ThreadPoolExecutor
+    from .executors import get_pool
     
     # Calculate design metrics raw scores (0-100 scale, normalized to 0-16.67 for weighting)
     height_raw = _score_band(levels_entropy, targets["height"], max_points=16.67)
@@ -2688,7 +2688,7 @@ def score_architectural_diversity_as_beauty(
         try:
             logger.debug("Fetching shared OSM data for form metrics (cached if available)...")
             # Wrap in timeout executor to prevent hanging
-            with ThreadPoolExecutor(max_workers=1) as timeout_executor:
+            with get_pool("upstream") as timeout_executor:
                 future_shared = timeout_executor.submit(_fetch_roads_and_buildings, lat, lon, 2000)
                 try:
                     shared_osm_data = future_shared.result(timeout=15)  # Reduced from 20s to 15s
@@ -2705,8 +2705,8 @@ def score_architectural_diversity_as_beauty(
         
         # Run all 4 metrics in parallel, but make each one independent
         # If one fails, others can still succeed
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            future_block = executor.submit(compute_block_grain, lat, lon, 2000)
+        with get_pool("geometry") as executor:
+            future_block = executor.submit(compute_block_grain, lat, lon, 2000, shared_osm_data)
             future_streetwall = executor.submit(compute_streetwall_continuity, lat, lon, 2000, shared_osm_data)
             future_setback = executor.submit(compute_setback_consistency, lat, lon, 2000, shared_osm_data)
             future_facade = executor.submit(compute_facade_rhythm, lat, lon, 2000, shared_osm_data)
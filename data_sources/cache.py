@@ -1,15 +1,22 @@
 """
 Caching system for HomeFit API calls
-Provides in-memory caching for expensive operations like OSM queries and API calls
+Two tiers for expensive operations like OSM queries and API calls: a bounded in-process
+LRU (L1) in front of Redis (L2), with a disk fallback when Redis is unavailable.
+Functions that opt in with `spatial=SpatialBucket()` are keyed (and called) on an H3
+cell centre sized to their query radius, so nearby coordinates share one result.
 """
 
 import time
 import hashlib
+import inspect
 import os
 import json
 import base64
+import threading
 import zlib
-from typing import Any, Optional, Dict
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Optional, Dict, Iterator, Tuple
 from functools import wraps
 from logging_config import get_logger
 
@@ -41,46 +48,258 @@ except Exception as e:
     _redis_client = None
 
 
+# Redis health is checked at most once per interval, not on every cache lookup.
+# Operation errors in callers mark the client suspect so the next call re-checks.
+_REDIS_HEALTHCHECK_SECONDS = float(os.getenv("HOMEFIT_REDIS_HEALTHCHECK_SECONDS", "30"))
+_redis_last_ok = time.time() if _redis_client is not None else 0.0
+_redis_lock = threading.Lock()
+
+
+def _mark_redis_suspect() -> None:
+    """Force a ping on the next _get_redis_client() call (after a read/write error)."""
+    global _redis_last_ok
+    _redis_last_ok = 0.0
+
+
 def _get_redis_client():
     """
     Get Redis client with lightweight reconnection check.
-    Only reconnects if connection is actually lost (not on every call).
-    This is performance-optimized: ping is fast, reconnection only happens when needed.
-    
+    Pings at most once per HOMEFIT_REDIS_HEALTHCHECK_SECONDS (or after an error was
+    reported via _mark_redis_suspect); reconnects only when the ping fails.
+
     Returns:
         Redis client if available, None otherwise
     """
-    global _redis_client
-    
+    global _redis_client, _redis_last_ok
+
     if _redis_client is None:
         return None
-    
-    # Lightweight ping check (fast, doesn't block)
-    try:
-        _redis_client.ping()
+    if time.time() - _redis_last_ok < _REDIS_HEALTHCHECK_SECONDS:
         return _redis_client
-    except Exception:
-        # Connection lost - try to reconnect once (with short timeout for performance)
+
+    with _redis_lock:
+        if _redis_client is None:
+            return None
+        if time.time() - _redis_last_ok < _REDIS_HEALTHCHECK_SECONDS:
+            return _redis_client
         try:
-            import redis
-            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
-            _redis_client = redis.from_url(
-                redis_url, 
-                decode_responses=True, 
-                socket_connect_timeout=1, 
-                socket_timeout=1
-            )
             _redis_client.ping()
-            logger.info("Redis reconnected successfully")
+            _redis_last_ok = time.time()
             return _redis_client
-        except Exception as reconnect_error:
-            logger.warning(f"Redis reconnection failed: {reconnect_error}")
-            _redis_client = None
-            return None
+        except Exception:
+            # Connection lost - try to reconnect once (with short timeout for performance)
+            try:
+                import redis
+                redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+                _redis_client = redis.from_url(
+                    redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=1,
+                    socket_timeout=1
+                )
+                _redis_client.ping()
+                _redis_last_ok = time.time()
+                logger.info("Redis reconnected successfully")
+                return _redis_client
+            except Exception as reconnect_error:
+                logger.warning(f"Redis reconnection failed: {reconnect_error}")
+                _redis_client = None
+                return None
+
+
+# L1 in-process cache (in front of Redis; sole memory tier when Redis is unavailable).
+# Bounded by entry count and an approximate byte budget (JSON size of the value), LRU
+# eviction. Entries outlive their TTL by a grace window so callers can still fall back
+# to stale data when an upstream fails; past TTL + grace they are swept.
+L1_MAX_ENTRIES = int(os.getenv("HOMEFIT_L1_CACHE_MAX_ENTRIES", "5000"))
+L1_MAX_BYTES = int(float(os.getenv("HOMEFIT_L1_CACHE_MAX_MB", "256")) * 1024 * 1024)
+L1_STALE_GRACE_SECONDS = int(os.getenv("HOMEFIT_L1_STALE_GRACE_SECONDS", str(24 * 3600)))
+_L1_SWEEP_INTERVAL_SECONDS = 60.0
+
+# Lookup counters for /cache/stats (approximate under concurrency; GIL-atomic increments).
+_stats: Dict[str, int] = {
+    "l1_hits": 0,
+    "l2_hits": 0,
+    "disk_hits": 0,
+    "misses": 0,
+    "stale_served": 0,
+    "coalesced": 0,
+    "remote_coalesced": 0,
+    "spatial_snaps": 0,
+}
+
+
+def _approx_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=str))
+    except Exception:
+        return len(str(value))
+
+
+class _LRUCache:
+    """Thread-safe LRU of key -> [value, timestamp, ttl, size] with count and byte limits."""
+
+    def __init__(self, max_entries: int, max_bytes: int, stale_grace_seconds: int):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.stale_grace_seconds = stale_grace_seconds
+        self._data: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self._last_sweep = 0.0
+        self.evictions = 0
+        self.expired_evictions = 0
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """(value, timestamp) regardless of freshness; marks the entry recently used."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            return entry[0], entry[1]
+
+    def set(self, key: str, value: Any, timestamp: Optional[float] = None,
+            ttl: Optional[float] = None, size: Optional[int] = None) -> None:
+        size = _approx_size(value) if size is None else size
+        if size > self.max_bytes:
+            self.pop(key)
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[3]
+                if ttl is None:
+                    ttl = old[2]
+            if ttl is None:
+                ttl = max(CACHE_TTL.values())
+            self._data[key] = [value, time.time() if timestamp is None else timestamp, ttl, size]
+            self._bytes += size
+            self._enforce_limits()
+
+    def set_timestamp(self, key: str, timestamp: float) -> None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                entry[1] = timestamp
+
+    def timestamp(self, key: str) -> Optional[float]:
+        with self._lock:
+            entry = self._data.get(key)
+            return None if entry is None else entry[1]
+
+    def has(self, key: str) -> bool:
+        return key in self._data
+
+    def pop(self, key: str) -> Optional[list]:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[3]
+            return entry
+
+    def keys(self):
+        with self._lock:
+            return list(self._data.keys())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def count_expired(self, now: float) -> int:
+        """Entries past TTL but still held for stale fallback."""
+        with self._lock:
+            return sum(1 for e in self._data.values() if now - e[1] > e[2])
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop entries past TTL + stale grace. Returns how many were removed."""
+        now = time.time() if now is None else now
+        with self._lock:
+            dead = [k for k, e in self._data.items() if now - e[1] > e[2] + self.stale_grace_seconds]
+            for k in dead:
+                self._bytes -= self._data.pop(k)[3]
+            self.expired_evictions += len(dead)
+            self._last_sweep = now
+            return len(dead)
+
+    def _enforce_limits(self) -> None:
+        if len(self._data) <= self.max_entries and self._bytes <= self.max_bytes:
+            return
+        now = time.time()
+        if now - self._last_sweep >= _L1_SWEEP_INTERVAL_SECONDS:
+            self.sweep(now)
+        while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+            _k, entry = self._data.popitem(last=False)
+            self._bytes -= entry[3]
+            self.evictions += 1
+
+
+_l1 = _LRUCache(L1_MAX_ENTRIES, L1_MAX_BYTES, L1_STALE_GRACE_SECONDS)
+
+
+class _L1ValueView(MutableMapping):
+    """Dict-style access to L1 values (kept as `_cache` for existing callers)."""
+
+    def __getitem__(self, key: str) -> Any:
+        entry = _l1.get_entry(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[0]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        _l1.set(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if _l1.pop(key) is None:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and _l1.has(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_l1.keys())
+
+    def __len__(self) -> int:
+        return len(_l1)
+
+
+class _L1TimestampView(MutableMapping):
+    """Dict-style access to L1 write timestamps (kept as `_cache_ttl` for existing callers)."""
+
+    def __getitem__(self, key: str) -> float:
+        ts = _l1.timestamp(key)
+        if ts is None:
+            raise KeyError(key)
+        return ts
+
+    def __setitem__(self, key: str, value: float) -> None:
+        _l1.set_timestamp(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        # Timestamps live with their values; dropping one drops the entry.
+        if _l1.pop(key) is None:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and _l1.has(key)
 
-# Simple in-memory cache (fallback when Redis is unavailable)
-_cache: Dict[str, Dict[str, Any]] = {}
-_cache_ttl: Dict[str, float] = {}
+    def __iter__(self) -> Iterator[str]:
+        return iter(_l1.keys())
+
+    def __len__(self) -> int:
+        return len(_l1)
+
+
+_cache: MutableMapping = _L1ValueView()
+_cache_ttl: MutableMapping = _L1TimestampView()
 
 # Disk cache (persistent fallback when Redis is unavailable).
 # In-memory cache dies with the process -- which means a batch script that makes expensive
@@ -162,107 +381,346 @@ def _generate_cache_key(func_name: str, *args, **kwargs) -> str:
     return f"{CACHE_KEY_PREFIX}:{func_name}:{key_hash}"
 
 
-def cached(ttl_seconds: int = 3600):
+# Spatial cache keys: opt-in per @cached function. Coordinates are snapped to the centre of
+# an H3 cell sized to the query radius, and the snapped coordinate is what the upstream
+# sees, so every caller in the cell shares one (correct-for-the-cell) result.
+SPATIAL_KEYS_ENABLED = os.getenv("HOMEFIT_SPATIAL_CACHE_KEYS", "1").strip().lower() not in {"0", "false", "no", "off"}
+_H3_RESOLUTIONS = range(5, 13)
+
+
+class SpatialBucket:
+    """
+    Snap (lat, lon) arguments to an H3 cell centre whose edge is at most
+    `max_offset_fraction` of the query radius (or `max_offset_m` when given), so the
+    result moves by a bounded fraction of the search area and nearby callers share it.
+
+    `point_args` name arguments derived from the caller's exact point (e.g. pre-computed
+    metrics); when snapping they are reset to their defaults, so they stay out of the key
+    and the function derives them at the cell centre.
     """
-    Decorator to cache function results with Redis (if available) or in-memory cache.
+
+    def __init__(self, lat_arg: str = "lat", lon_arg: str = "lon", radius_arg: Optional[str] = "radius_m",
+                 max_offset_fraction: float = 0.02, max_offset_m: Optional[float] = None,
+                 point_args: Tuple[str, ...] = ()):
+        self.lat_arg = lat_arg
+        self.lon_arg = lon_arg
+        self.radius_arg = radius_arg
+        self.max_offset_fraction = max_offset_fraction
+        self.max_offset_m = max_offset_m
+        self.point_args = tuple(point_args)
+
+    def resolution(self, radius_m: Optional[float]) -> Optional[int]:
+        """Coarsest H3 resolution whose mean edge fits the offset budget (None: no snapping)."""
+        budget = self.max_offset_m
+        if budget is None:
+            if not radius_m:
+                return None
+            budget = float(radius_m) * self.max_offset_fraction
+        try:
+            import h3
+        except ImportError:
+            return None
+        for res in _H3_RESOLUTIONS:
+            if h3.average_hexagon_edge_length(res, unit="m") <= budget:
+                return res
+        return None
+
+    def apply(self, signature: inspect.Signature, args: tuple, kwargs: dict) -> Tuple[tuple, dict]:
+        """(args, kwargs) with the coordinate replaced by its cell centre; unchanged if not applicable."""
+        try:
+            bound = signature.bind(*args, **kwargs)
+        except TypeError:
+            return args, kwargs
+        lat = bound.arguments.get(self.lat_arg)
+        lon = bound.arguments.get(self.lon_arg)
+        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+            return args, kwargs
+        radius = None
+        if self.radius_arg:
+            radius = bound.arguments.get(self.radius_arg, signature.parameters[self.radius_arg].default)
+            if not isinstance(radius, (int, float)):
+                radius = None
+        res = self.resolution(radius)
+        if res is None:
+            return args, kwargs
+        import h3
+
+        c_lat, c_lon = h3.cell_to_latlng(h3.latlng_to_cell(float(lat), float(lon), res))
+        # Canonical call shape (defaults filled in) so positional and keyword callers share a key.
+        bound.apply_defaults()
+        bound.arguments[self.lat_arg] = round(c_lat, 6)
+        bound.arguments[self.lon_arg] = round(c_lon, 6)
+        for name in self.point_args:
+            bound.arguments[name] = signature.parameters[name].default
+        _stats["spatial_snaps"] += 1
+        return bound.args, bound.kwargs
+
+
+def _execute_and_store(func, args, kwargs, cache_key: str, ttl_seconds: int,
+                       current_time: float, cache_entry: Any, cache_time: float) -> Any:
+    """Run the wrapped function, write the result to every tier, or fall back to stale data."""
+    result = func(*args, **kwargs)
+
+    skip_cache = False
+    if isinstance(result, dict):
+        skip_cache = bool(result.pop('_cache_skip', False))
+
+    # If API call failed (result is None), try using stale cache as fallback
+    if result is None and cache_entry is not None:
+        # Cache is expired but exists - use it as fallback
+        _stats["stale_served"] += 1
+        age_hours = (current_time - cache_time) / 3600
+        logger.warning(f"API failed, using stale cache (age: {age_hours:.1f} hours) for {func.__name__}")
+        # Mark stale cache in result (if it's a dict, add flag)
+        if isinstance(cache_entry, dict):
+            cache_entry = cache_entry.copy()
+            cache_entry['_stale_cache'] = True
+            cache_entry['_cache_age_hours'] = round(age_hours, 1)
+        return cache_entry
+
+    # Only cache non-None results (None indicates error/obfuscated data that shouldn't be cached)
+    if result is not None and not skip_cache:
+        # Store in both Redis (if available) and L1
+        cache_data = {
+            'value': result,
+            'timestamp': current_time
+        }
+        payload = None
+        try:
+            payload = json.dumps(cache_data)
+        except TypeError:
+            pass  # Non-JSON value: L1 only
+
+        redis_client = _get_redis_client()
+        if redis_client and payload is not None:
+            try:
+                redis_client.setex(cache_key, ttl_seconds, payload)
+            except Exception as e:
+                _mark_redis_suspect()
+                logger.warning(f"Redis write error: {e}")
+
+        _l1.set(
+            cache_key, result, current_time, ttl_seconds,
+            size=len(payload) if payload is not None else None,
+        )
+
+        # And persist to disk when Redis is unavailable, so expensive live calls
+        # survive process exit (a batch refetch can be resumed/re-merged for free).
+        if _disk_cache_active():
+            _disk_set(cache_key, result, current_time)
+    else:
+        logger.debug(f"Result is None - not caching (allows retry)")
+
+    return result
+
+
+# Single-flight: concurrent misses for one key wait for a single upstream call.
+# In-process always; across replicas when HOMEFIT_SINGLEFLIGHT_REDIS is on, via a short
+# Redis lease (SET NX PX). Waiters that time out, or whose leader raised, fetch themselves.
+SINGLEFLIGHT_WAIT_SECONDS = float(os.getenv("HOMEFIT_SINGLEFLIGHT_WAIT_SECONDS", "90"))
+SINGLEFLIGHT_LEASE_SECONDS = float(os.getenv("HOMEFIT_SINGLEFLIGHT_LEASE_SECONDS", "20"))
+_SINGLEFLIGHT_REDIS = os.getenv("HOMEFIT_SINGLEFLIGHT_REDIS", "0").strip().lower() in {"1", "true", "yes", "on"}
+_SINGLEFLIGHT_POLL_SECONDS = 0.2
+
+_NO_RESULT = object()
+
+
+class _Flight:
+    __slots__ = ("event", "value", "ok", "owner")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.ok = False
+        self.owner = threading.get_ident()
+
+
+_flights: Dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+
+
+def _flight_begin(cache_key: str) -> Tuple[Optional[_Flight], bool]:
+    """
+    Join or start the in-flight call for cache_key.
+
+    Returns (flight, True) for the leader, (flight, False) for a waiter, and (None, True)
+    for a re-entrant call from the leader's own thread (runs directly, no deadlock).
+    """
+    me = threading.get_ident()
+    with _flights_lock:
+        flight = _flights.get(cache_key)
+        if flight is None:
+            flight = _Flight()
+            _flights[cache_key] = flight
+            return flight, True
+        if flight.owner == me:
+            return None, True
+        return flight, False
+
+
+def _flight_wait(flight: _Flight) -> Any:
+    if not flight.event.wait(SINGLEFLIGHT_WAIT_SECONDS):
+        logger.warning("Single-flight wait timed out; fetching independently")
+        return _NO_RESULT
+    return flight.value if flight.ok else _NO_RESULT
+
+
+def _flight_end(cache_key: str, flight: _Flight) -> None:
+    with _flights_lock:
+        if _flights.get(cache_key) is flight:
+            del _flights[cache_key]
+    flight.event.set()
+
+
+def _leased_execute(func, args, kwargs, cache_key: str, ttl_seconds: int,
+                    current_time: float, cache_entry: Any, cache_time: float) -> Any:
+    """
+    _execute_and_store behind a cross-replica Redis lease (when enabled).
+
+    If another replica holds the lease, poll Redis for the value it writes; if the lease
+    lapses without a fresh value (holder failed or returned None), fetch here.
+    """
+    redis_client = _get_redis_client() if _SINGLEFLIGHT_REDIS else None
+    if redis_client is None:
+        return _execute_and_store(func, args, kwargs, cache_key, ttl_seconds, current_time, cache_entry, cache_time)
+
+    lock_key = f"{CACHE_KEY_PREFIX}:lock:{cache_key}"
+    token = f"{os.getpid()}:{threading.get_ident()}:{time.time()}"
+    acquired = False
+    try:
+        acquired = bool(redis_client.set(lock_key, token, nx=True, px=int(SINGLEFLIGHT_LEASE_SECONDS * 1000)))
+        if not acquired:
+            deadline = time.time() + SINGLEFLIGHT_LEASE_SECONDS
+            while time.time() < deadline:
+                time.sleep(_SINGLEFLIGHT_POLL_SECONDS)
+                cached_data = redis_client.get(cache_key)
+                if cached_data:
+                    data = json.loads(cached_data)
+                    if data['timestamp'] > cache_time and time.time() - data['timestamp'] < ttl_seconds:
+                        _stats["remote_coalesced"] += 1
+                        _l1.set(cache_key, data['value'], data['timestamp'], ttl_seconds, size=len(cached_data))
+                        return data['value']
+                if not redis_client.exists(lock_key):
+                    break
+    except Exception as e:
+        _mark_redis_suspect()
+        logger.warning(f"Redis single-flight lease error, fetching directly: {e}")
+
+    try:
+        return _execute_and_store(func, args, kwargs, cache_key, ttl_seconds, current_time, cache_entry, cache_time)
+    finally:
+        if acquired:
+            try:
+                if redis_client.get(lock_key) == token:
+                    redis_client.delete(lock_key)
+            except Exception:
+                pass
+
+
+# Refresh-ahead window, as a fraction of each function's TTL: when > 0, @cached treats
+# entries in the last `fraction` of their TTL as misses, so they are recomputed (and
+# rewritten to Redis) before they expire. Relative to the TTL so short-TTL caches (OSM,
+# Places, transit) are not refetched on every lookup. Process-wide; set by the cache
+# warmer CLI (cache_warmer.py), never by the API process.
+_MAX_REFRESH_AHEAD_FRACTION = 0.5
+_refresh_ahead_fraction = 0.0
+
+
+def set_refresh_ahead(fraction: float) -> None:
+    """Recompute cached entries within the last `fraction` of their TTL (0 disables; capped at 0.5)."""
+    global _refresh_ahead_fraction
+    _refresh_ahead_fraction = min(_MAX_REFRESH_AHEAD_FRACTION, max(0.0, float(fraction)))
+
+
+def cached(ttl_seconds: int = 3600, spatial: Optional[SpatialBucket] = None):
+    """
+    Decorator to cache function results in the L1 in-process LRU, Redis (if available),
+    and the disk cache (only when Redis is unavailable).
+
+    Lookup order is L1 -> Redis -> disk; a fresh L1 hit never touches the network.
     
     Args:
         ttl_seconds: Time to live for cached results in seconds
+        spatial: Optional SpatialBucket; the function is called (and keyed) with the
+            coordinate snapped to its H3 cell centre
     """
     def decorator(func):
+        signature = inspect.signature(func) if spatial is not None else None
+
         @wraps(func)
         def wrapper(*args, **kwargs):
+            if spatial is not None and SPATIAL_KEYS_ENABLED:
+                args, kwargs = spatial.apply(signature, args, kwargs)
             cache_key = _generate_cache_key(func.__name__, *args, **kwargs)
             current_time = time.time()
+            fresh_for = ttl_seconds * (1.0 - _refresh_ahead_fraction)
             
-            # Try Redis first, fall back to in-memory
             cache_entry = None
             cache_time = 0
-            
+
+            # L1 first: a fresh in-process hit skips Redis entirely.
+            l1_entry = _l1.get_entry(cache_key)
+            if l1_entry is not None:
+                cache_entry, cache_time = l1_entry
+                if (current_time - cache_time) < fresh_for:
+                    _stats["l1_hits"] += 1
+                    logger.debug(f"Cache hit (L1) for {func.__name__}")
+                    return cache_entry
+
+            # L1 miss or stale: Redis may hold a fresher value written by another worker.
             redis_client = _get_redis_client()
             if redis_client:
                 try:
-                    # Try Redis
                     cached_data = redis_client.get(cache_key)
                     if cached_data:
                         data = json.loads(cached_data)
-                        cache_entry = data['value']
-                        cache_time = data['timestamp']
+                        if data['timestamp'] > cache_time:
+                            cache_entry = data['value']
+                            cache_time = data['timestamp']
+                            if (current_time - cache_time) < fresh_for:
+                                _stats["l2_hits"] += 1
+                                _l1.set(cache_key, cache_entry, cache_time, ttl_seconds, size=len(cached_data))
+                                logger.debug(f"Cache hit (Redis) for {func.__name__}")
+                                return cache_entry
                 except Exception as e:
+                    _mark_redis_suspect()
                     logger.warning(f"Redis read error, falling back to in-memory: {e}")
-            
-            # Fall back to in-memory cache if Redis failed or not available
-            if cache_entry is None and cache_key in _cache:
-                cache_entry = _cache[cache_key]
-                cache_time = _cache_ttl.get(cache_key, 0)
 
             # Fall back to disk cache (persists across processes when Redis is unavailable).
-            # Populates in-memory on hit so subsequent calls in this process stay fast.
+            # Populates L1 on hit so subsequent calls in this process stay fast.
             if cache_entry is None and _disk_cache_active():
                 disk_value, disk_time = _disk_get(cache_key)
                 if disk_value is not None:
                     cache_entry = disk_value
                     cache_time = disk_time
-                    _cache[cache_key] = disk_value
-                    _cache_ttl[cache_key] = disk_time
-
-            # Check if cached entry is still valid
-            if cache_entry is not None and (current_time - cache_time) < ttl_seconds:
-                logger.debug(f"Cache hit for {func.__name__}")
-                return cache_entry
+                    _l1.set(cache_key, disk_value, disk_time, ttl_seconds)
+                    if (current_time - cache_time) < fresh_for:
+                        _stats["disk_hits"] += 1
+                        logger.debug(f"Cache hit (disk) for {func.__name__}")
+                        return cache_entry
             
-            # Cache miss or expired - execute function
-            logger.debug(f"Cache miss for {func.__name__} - executing")
-            # Periodic cleanup to prevent memory bloat (every 100 cache operations)
-            if len(_cache) > 100 and len(_cache) % 100 == 0:
-                _cleanup_expired_cache()
-            
-            result = func(*args, **kwargs)
+            # Cache miss or expired - execute function, one caller per key at a time
+            _stats["misses"] += 1
+            flight, leader = _flight_begin(cache_key)
+            if not leader:
+                shared = _flight_wait(flight)
+                if shared is not _NO_RESULT:
+                    _stats["coalesced"] += 1
+                    logger.debug(f"Cache miss for {func.__name__} coalesced onto in-flight call")
+                    return shared
+                # Leader raised or overran the wait: fetch ourselves
+                return _execute_and_store(func, args, kwargs, cache_key, ttl_seconds, current_time, cache_entry, cache_time)
 
-            skip_cache = False
-            if isinstance(result, dict):
-                skip_cache = bool(result.pop('_cache_skip', False))
-            
-            
-            # If API call failed (result is None), try using stale cache as fallback
-            if result is None and cache_entry is not None:
-                # Cache is expired but exists - use it as fallback
-                age_hours = (current_time - cache_time) / 3600
-                logger.warning(f"API failed, using stale cache (age: {age_hours:.1f} hours) for {func.__name__}")
-                # Mark stale cache in result (if it's a dict, add flag)
-                if isinstance(cache_entry, dict):
-                    cache_entry = cache_entry.copy()
-                    cache_entry['_stale_cache'] = True
-                    cache_entry['_cache_age_hours'] = round(age_hours, 1)
-                return cache_entry
-            
-            # Only cache non-None results (None indicates error/obfuscated data that shouldn't be cached)
-            if result is not None and not skip_cache:
-                # Store in both Redis (if available) and in-memory
-                cache_data = {
-                    'value': result,
-                    'timestamp': current_time
-                }
-                
-                redis_client = _get_redis_client()
-                if redis_client:
-                    try:
-                        redis_client.setex(cache_key, ttl_seconds, json.dumps(cache_data))
-                    except Exception as e:
-                        logger.warning(f"Redis write error: {e}")
-                
-                # Also store in in-memory cache
-                _cache[cache_key] = result
-                _cache_ttl[cache_key] = current_time
-
-                # And persist to disk when Redis is unavailable, so expensive live calls
-                # survive process exit (a batch refetch can be resumed/re-merged for free).
-                if _disk_cache_active():
-                    _disk_set(cache_key, result, current_time)
-            else:
-                logger.debug(f"Result is None - not caching (allows retry)")
-            
-            return result
+            logger.debug(f"Cache miss for {func.__name__} - executing")
+            try:
+                result = _leased_execute(func, args, kwargs, cache_key, ttl_seconds, current_time, cache_entry, cache_time)
+                if flight is not None:
+                    flight.value = result
+                    flight.ok = True
+                return result
+            finally:
+                if flight is not None:
+                    _flight_end(cache_key, flight)
         
         return wrapper
     return decorator
@@ -281,8 +739,6 @@ def clear_cache(cache_type: Optional[str] = None):
             score/location caches (api_response, location_response_template, shared_prepillar).
             Otherwise clear decorator caches matching CACHE_KEY_PREFIX:cache_type:*
     """
-    global _cache, _cache_ttl
-
     # Clear Redis if available
     redis_client = _get_redis_client()
     if redis_client:
@@ -311,72 +767,63 @@ def clear_cache(cache_type: Optional[str] = None):
         except Exception as e:
             logger.warning(f"Error clearing Redis cache: {e}")
 
-    # Clear in-memory cache
+    # Clear L1 cache
     if cache_type is None:
-        _cache.clear()
-        _cache_ttl.clear()
+        _l1.clear()
         logger.info("Cleared all cache")
     elif cache_type == "scores":
         keys_to_remove = [
-            k for k in _cache.keys()
+            k for k in _l1.keys()
             if any(k.startswith(p) for p in SCORE_CACHE_PREFIXES)
         ]
         for key in keys_to_remove:
-            _cache.pop(key, None)
-            _cache_ttl.pop(key, None)
+            _l1.pop(key)
         logger.info(f"Cleared {len(keys_to_remove)} score cache entries")
     else:
-        keys_to_remove = [key for key in _cache.keys() if key.startswith(f"{CACHE_KEY_PREFIX}:{cache_type}:")]
+        keys_to_remove = [key for key in _l1.keys() if key.startswith(f"{CACHE_KEY_PREFIX}:{cache_type}:")]
         for key in keys_to_remove:
-            _cache.pop(key, None)
-            _cache_ttl.pop(key, None)
+            _l1.pop(key)
         logger.info(f"Cleared {len(keys_to_remove)} {cache_type} cache entries")
 
 
 def _cleanup_expired_cache():
-    """Clean up expired entries from in-memory cache to prevent memory bloat."""
-    global _cache, _cache_ttl
-    current_time = time.time()
-    keys_to_remove = []
-    
-    # Find expired entries (check against max TTL which is 7 days for OSM)
-    max_ttl = max(CACHE_TTL.values())
-    
-    for key, cache_time in _cache_ttl.items():
-        if current_time - cache_time > max_ttl:
-            keys_to_remove.append(key)
-    
-    # Remove expired entries
-    for key in keys_to_remove:
-        _cache.pop(key, None)
-        _cache_ttl.pop(key, None)
-    
-    if keys_to_remove:
-        logger.debug(f"Cleaned up {len(keys_to_remove)} expired cache entries")
+    """Drop L1 entries past their TTL plus the stale grace window."""
+    removed = _l1.sweep()
+    if removed:
+        logger.debug(f"Cleaned up {removed} expired cache entries")
 
 
 def get_cache_stats() -> Dict[str, Any]:
-    """Get cache statistics from both Redis (if available) and in-memory cache."""
-    # Clean up expired entries periodically
+    """Get cache statistics from the L1 in-process cache and Redis (if available)."""
     _cleanup_expired_cache()
     
     current_time = time.time()
-    
-    # In-memory cache stats
-    total_entries = len(_cache)
-    expired_entries = 0
-    
-    for key, cache_time in _cache_ttl.items():
-        if current_time - cache_time > 3600:  # Assume 1 hour TTL for stats
-            expired_entries += 1
+    expired_entries = _l1.count_expired(current_time)
+    total_entries = len(_l1)
+    lookups = _stats["l1_hits"] + _stats["l2_hits"] + _stats["disk_hits"] + _stats["misses"]
     
     redis_client = _get_redis_client()
     stats = {
         "total_entries": total_entries,
         "expired_entries": expired_entries,
         "active_entries": total_entries - expired_entries,
-        "cache_size_mb": sum(len(str(v)) for v in _cache.values()) / (1024 * 1024),
-        "redis_available": redis_client is not None
+        "cache_size_mb": round(_l1.bytes / (1024 * 1024), 3),
+        "redis_available": redis_client is not None,
+        "l1": {
+            "max_entries": _l1.max_entries,
+            "max_mb": round(_l1.max_bytes / (1024 * 1024), 1),
+            "hits": _stats["l1_hits"],
+            "evictions": _l1.evictions,
+            "expired_evictions": _l1.expired_evictions,
+        },
+        "l2_hits": _stats["l2_hits"],
+        "disk_hits": _stats["disk_hits"],
+        "misses": _stats["misses"],
+        "stale_served": _stats["stale_served"],
+        "coalesced": _stats["coalesced"],
+        "remote_coalesced": _stats["remote_coalesced"],
+        "spatial_snaps": _stats["spatial_snaps"],
+        "hit_rate": round((lookups - _stats["misses"]) / lookups, 3) if lookups else None,
     }
     
     # Add Redis stats if available
@@ -456,18 +903,4 @@ def redis_set_compressed_json(
 
 def cleanup_expired_cache():
     """Remove expired cache entries."""
-    current_time = time.time()
-    expired_keys = []
-    
-    for key, cache_time in _cache_ttl.items():
-        # Use a default TTL of 1 hour if not specified
-        ttl = 3600
-        if current_time - cache_time > ttl:
-            expired_keys.append(key)
-    
-    for key in expired_keys:
-        _cache.pop(key, None)
-        _cache_ttl.pop(key, None)
-    
-    if expired_keys:
-        logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
+    _cleanup_expired_cache()
@@ -10,6 +10,7 @@ import requests
 import time
 from typing import Any, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from . import acs_store, http_client, tract_index
 from .cache import cached, CACHE_TTL
 from .error_handling import with_fallback, safe_api_call, handle_api_timeout, check_api_credentials
 
@@ -79,6 +80,9 @@ if not CENSUS_API_KEY:
 def _make_request_with_retry(url: str, params: Dict, timeout: int = 10, max_retries: int = 3):
     """
     Make an HTTP request with retry logic and rate limit handling.
+
+    ACS requests the local bulk ACS store can answer completely (data_sources/acs_store.py)
+    return its Census-shaped response without touching the network.
     
     Args:
         url: URL to request
@@ -89,11 +93,16 @@ def _make_request_with_retry(url: str, params: Dict, timeout: int = 10, max_retr
     Returns:
         Response object or None if all retries fail
     """
+    if url.startswith(CENSUS_BASE_URL):
+        rows = acs_store.query(url, params)
+        if rows is not None:
+            return acs_store.StoredResponse(rows)
+
     last_exception = None
     
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, params=params, timeout=timeout)
+            response = http_client.get(url, params=params, timeout=timeout)
             
             # Check for rate limiting (429 status code)
             if response.status_code == 429:
@@ -131,6 +140,19 @@ def _make_request_with_retry(url: str, params: Dict, timeout: int = 10, max_retr
     return None
 
 
+def acs_available() -> bool:
+    """ACS data can be fetched: an API key is configured or the local bulk ACS store exists."""
+    return bool(CENSUS_API_KEY) or acs_store.available()
+
+
+def _acs_get(url: str, params: Dict, timeout: int = 10):
+    """Single-attempt ACS GET (no retry), answered from the local bulk ACS store when possible."""
+    rows = acs_store.query(url, params)
+    if rows is not None:
+        return acs_store.StoredResponse(rows)
+    return http_client.get(url, params=params, timeout=timeout)
+
+
 @cached(ttl_seconds=CACHE_TTL['census_data'])
 @safe_api_call("census", required=False)
 @handle_api_timeout(timeout_seconds=15)
@@ -148,6 +170,10 @@ def get_census_tract(lat: float, lon: float) -> Optional[Dict]:
             "basename": str
         }
     """
+    local = tract_index.lookup_tract(lat, lon)
+    if local is not None:
+        return local
+
     try:
         params = {
             "x": lon,
@@ -398,7 +424,7 @@ def get_tree_canopy_usfs(lat: float, lon: float, tract: Optional[Dict] = None) -
             "f": "json",
         }
 
-        response = requests.get(base_url, params=params, timeout=10)
+        response = http_client.get(base_url, params=params, timeout=10)
         if response.status_code != 200:
             return None
 
@@ -604,7 +630,7 @@ def get_commute_time(lat: float, lon: float, tract: Optional[Dict] = None) -> Op
             "key": CENSUS_API_KEY,
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = _acs_get(url, params, timeout=10)
         if response.status_code != 200:
             print(f"   ⚠️  ACS profile API returned status {response.status_code}")
             return None
@@ -642,7 +668,7 @@ def _tract_commute_and_pop(state_fips: str, county_fips: str, tract_fips: str,
         u = f"{CENSUS_BASE_URL}/{year}/acs/acs5/profile"
         p = {"get": "DP03_0025E", "for": f"tract:{tract_fips}",
              "in": f"state:{state_fips} county:{county_fips}", "key": CENSUS_API_KEY}
-        cr = requests.get(u, params=p, timeout=10)
+        cr = _acs_get(u, p, timeout=10)
         cm = None
         if cr.status_code == 200 and len(cr.json()) > 1:
             v = cr.json()[1][0]
@@ -654,7 +680,7 @@ def _tract_commute_and_pop(state_fips: str, county_fips: str, tract_fips: str,
         u2 = f"{CENSUS_BASE_URL}/{year}/acs/acs5"
         p2 = {"get": "B01003_001E", "for": f"tract:{tract_fips}",
               "in": f"state:{state_fips} county:{county_fips}", "key": CENSUS_API_KEY}
-        pr = requests.get(u2, params=p2, timeout=10)
+        pr = _acs_get(u2, p2, timeout=10)
         pop = 0.0
         if pr.status_code == 200 and len(pr.json()) > 1:
             try:
@@ -719,6 +745,18 @@ def get_census_tract_populated(lat: float, lon: float, min_pop: int = 300) -> Op
     seen = set()
     if primary:
         seen.add((primary.get("state_fips"), primary.get("county_fips"), primary.get("tract_fips")))
+    nearby = tract_index.nearest_tracts(lat, lon, 2500)
+    if nearby is not None:
+        # Local index: walk tracts by true distance instead of sampling points.
+        for t in nearby:
+            tid = (t.get("state_fips"), t.get("county_fips"), t.get("tract_fips"))
+            if tid in seen:
+                continue
+            seen.add(tid)
+            pop = get_population(t)
+            if pop and pop >= min_pop:
+                return t
+        return primary
     for rm in (400, 800, 1200, 1800, 2500):
         for ang in range(0, 360, 30):
             dlat = rm / 111000.0 * math.cos(math.radians(ang))
@@ -760,7 +798,7 @@ def get_transit_mode_share(lat: float, lon: float, tract: Optional[Dict] = None)
             "in": f"state:{tract['state_fips']} county:{tract['county_fips']}",
             "key": CENSUS_API_KEY,
         }
-        response = requests.get(url, params=params, timeout=10)
+        response = _acs_get(url, params, timeout=10)
         if response.status_code != 200:
             return None
         data = response.json()
@@ -823,7 +861,7 @@ def get_year_built_data(lat: float, lon: float, tract: Optional[Dict] = None) ->
             "key": CENSUS_API_KEY,
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = _acs_get(url, params, timeout=10)
         if response.status_code != 200:
             print(f"   ⚠️  ACS API returned status {response.status_code}")
             return None
@@ -1094,7 +1132,7 @@ def get_place_fips_for_coordinates(lat: float, lon: float) -> Optional[Dict[str,
 @handle_api_timeout(timeout_seconds=15)
 def get_place_same_house_pct(state_fips: str, place_fips: str) -> Optional[float]:
     """ACS B07003 same-house rate (0–100) for a Census place."""
-    if not CENSUS_API_KEY or not state_fips or not place_fips:
+    if not acs_available() or not state_fips or not place_fips:
         return None
     try:
         url = f"{CENSUS_BASE_URL}/2022/acs/acs5"
@@ -1155,7 +1193,7 @@ def get_tract_long_tenure_housing_pct(tract: Dict) -> Optional[float]:
     % of occupied housing units where householder moved in 2010 or earlier (B25038),
     as a 5+ year rootedness anchor (housing universe, 0-100).
     """
-    if not CENSUS_API_KEY or not tract:
+    if not acs_available() or not tract:
         return None
     try:
         url = f"{CENSUS_BASE_URL}/2022/acs/acs5"
@@ -1190,7 +1228,7 @@ def get_tract_long_tenure_housing_pct(tract: Dict) -> Optional[float]:
 @handle_api_timeout(timeout_seconds=15)
 def get_place_long_tenure_housing_pct(state_fips: str, place_fips: str) -> Optional[float]:
     """B25038 long-tenure % for a Census place (same definition as tract)."""
-    if not CENSUS_API_KEY or not state_fips or not place_fips:
+    if not acs_available() or not state_fips or not place_fips:
         return None
     try:
         url = f"{CENSUS_BASE_URL}/2022/acs/acs5"
@@ -1247,7 +1285,7 @@ def get_acs_b02001_total_for_tract(tract: Dict) -> Optional[int]:
     Used to detect park / non-residential tract pins where full diversity tables are empty.
     Returns None if the request fails; 0 or negative sentinel counts as non-residential for snapping.
     """
-    if not CENSUS_API_KEY:
+    if not acs_available():
         return None
     try:
         url = f"{CENSUS_BASE_URL}/2022/acs/acs5"
@@ -1630,7 +1668,7 @@ def _make_post_request_with_retry(
     last_exc = None
     for attempt in range(max_retries):
         try:
-            resp = requests.post(url, data=data, timeout=timeout)
+            resp = http_client.post(url, data=data, timeout=timeout)
             if resp.status_code == 429:
                 time.sleep(int(resp.headers.get("Retry-After", 2 ** attempt)))
                 continue
@@ -1704,9 +1742,13 @@ def _tigerweb_tracts_intersecting_disk(lat: float, lon: float, radius_m: int) ->
     """
     Query TIGERweb ACS2022 tract layer for features intersecting a geodesic disk.
 
-    Returns raw ArcGIS JSON payload (with features) or None.
+    Returns raw ArcGIS JSON payload (with features) or None. Answered from the local
+    tract index when it covers the disk.
     """
     ring = _geodesic_circle_polygon_wgs84(lat, lon, float(radius_m))
+    local = tract_index.tracts_intersecting_disk(lat, lon, radius_m, ring=ring)
+    if local is not None:
+        return local
     if not ring:
         return None
     geom_obj = {"rings": [ring], "spatialReference": {"wkid": 4326}}
@@ -1734,7 +1776,7 @@ def _tigerweb_tracts_intersecting_disk(lat: float, lon: float, radius_m: int) ->
 def _acs_population_batch(state_fips: str, county_fips: str, tract_fips_list: List[str]) -> Dict[str, int]:
     """Return GEOID -> population for tracts in one county (batch ACS)."""
     out: Dict[str, int] = {}
-    if not CENSUS_API_KEY or not tract_fips_list:
+    if not acs_available() or not tract_fips_list:
         return out
     # Census allows comma-separated tract list in `for=tract:...`
     chunk_size = 35
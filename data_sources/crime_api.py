@@ -15,7 +15,8 @@ Property crime: burglary, motor-vehicle theft, larceny-theft (excl. shoplifting-
                 jurisdictions where this inflates suburban numbers)
 
 Caching: 30 days (same as school_data) — crime statistics change slowly and API
-         calls are expensive/quota-limited for the FBI endpoint.
+         calls are expensive/quota-limited for the FBI endpoint. NYC/LA counts come from
+         the local crime store (data_sources.crime_store) when it covers the window.
 """
 
 from __future__ import annotations
@@ -29,6 +30,7 @@ from typing import Dict, Optional, Tuple
 
 import requests
 
+from data_sources import crime_store
 from data_sources.cache import cached, CACHE_TTL
 from logging_config import get_logger
 
@@ -343,6 +345,14 @@ def _fetch_nyc_crimes(lat: float, lon: float, radius_m: int, start_date: str, en
         return None
 
 
+def _nyc_counts(lat: float, lon: float, radius_m: int, start_date: str, end_date: str) -> Optional[Dict]:
+    """Incident counts from the local crime store when it covers the window, else Socrata."""
+    local = crime_store.circle_counts("nyc", lat, lon, radius_m, start_date, end_date)
+    if local is not None:
+        return local
+    return _fetch_nyc_crimes(lat, lon, radius_m, start_date, end_date)
+
+
 def _get_nyc_rates(
     lat: float, lon: float, population: int, radius_m: int
 ) -> Optional[Dict]:
@@ -350,8 +360,8 @@ def _get_nyc_rates(
     start_cur, end_cur = _date_range(_MONTHS_BACK, offset_months=0)
     start_prv, end_prv = _date_range(_MONTHS_BACK, offset_months=_MONTHS_BACK)
 
-    cur = _fetch_nyc_crimes(lat, lon, radius_m, start_cur, end_cur)
-    prv = _fetch_nyc_crimes(lat, lon, radius_m, start_prv, end_prv)
+    cur = _nyc_counts(lat, lon, radius_m, start_cur, end_cur)
+    prv = _nyc_counts(lat, lon, radius_m, start_prv, end_prv)
 
 
     if cur is None:
@@ -429,6 +439,14 @@ def _fetch_la_crimes(
         return None
 
 
+def _la_counts(lat: float, lon: float, delta_deg: float, start_date: str, end_date: str) -> Optional[Dict]:
+    """Incident counts from the local crime store when it covers the window, else Socrata."""
+    local = crime_store.box_counts("la", lat, lon, delta_deg, start_date, end_date)
+    if local is not None:
+        return local
+    return _fetch_la_crimes(lat, lon, delta_deg, start_date, end_date)
+
+
 def _get_la_rates(lat: float, lon: float, population: int, radius_m: int) -> Optional[Dict]:
     la_max = datetime.date(2024, 12, 31)
     # Current window: most recent 12 months within available data
@@ -436,8 +454,8 @@ def _get_la_rates(lat: float, lon: float, population: int, radius_m: int) -> Opt
     start_prv, end_prv = _date_range(_MONTHS_BACK, offset_months=_MONTHS_BACK, max_date=la_max)
 
     delta_deg = _meters_to_degrees(radius_m)
-    cur = _fetch_la_crimes(lat, lon, delta_deg, start_cur, end_cur)
-    prv = _fetch_la_crimes(lat, lon, delta_deg, start_prv, end_prv)
+    cur = _la_counts(lat, lon, delta_deg, start_cur, end_cur)
+    prv = _la_counts(lat, lon, delta_deg, start_prv, end_prv)
 
     if cur is None:
         return None
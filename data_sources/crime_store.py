@@ -0,0 +1,154 @@
+"""
+Local crime-incident store.
+
+Answers crime_api's NYC (NYPD complaints) and LA (LAPD legacy) incident counts from
+open-data extracts ingested offline by `scripts/baselines/build_crime_store.py`, so a
+community-safety score does not send a Socrata query per location (and per window), and
+dense precincts are no longer silently capped at the query's 10,000-row limit.
+
+Incidents are classified at ingest with crime_api's own `_classify_nyc` / `_classify_la`
+and pre-aggregated by H3 cell and month. A radius (or LA bounding box) and date window is
+answered by summing the cells whose centroid falls inside it.
+
+Schema (SQLite):
+  sources(name, h3_res, min_month, max_month, ingested_on)
+                                      -- per dataset: cell resolution, months loaded, ingest date
+  cell_months(source, cell, month, violent, property, total)
+                                      -- cell = H3 index (int), month = 'YYYY-MM'; total counts
+                                         every incident, classified or not (as the Socrata path)
+
+A window is answered locally only when its first month was ingested and it ends no later
+than MAX_STALENESS_DAYS after the ingest date; otherwise callers keep the Socrata path.
+
+Override path via env ``HOMEFIT_CRIME_DB_PATH`` (opened through local_sqlite.LocalDB).
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import h3
+except ImportError:  # pragma: no cover
+    h3 = None
+
+from logging_config import get_logger
+
+from .local_sqlite import LocalDB
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data_cache" / "crime.sqlite"
+
+# Windows may end this long after the last ingest (monthly re-ingest + open-data publish lag).
+MAX_STALENESS_DAYS = 35
+
+# SQLite caps host parameters per statement; chunk IN (...) lookups below this.
+_IN_CHUNK = 900
+
+_DB = LocalDB("HOMEFIT_CRIME_DB_PATH", DEFAULT_DB_PATH, "crime store", requires=lambda: h3 is not None)
+
+
+@lru_cache(maxsize=1)
+def _sources() -> Dict[str, Tuple[int, str, str, datetime.date]]:
+    conn = _DB.connect()
+    if conn is None:
+        return {}
+    try:
+        rows = conn.execute("SELECT name, h3_res, min_month, max_month, ingested_on FROM sources").fetchall()
+    except Exception as exc:
+        logger.warning("Local crime store has no readable sources table: %s", exc)
+        return {}
+    return {
+        name: (int(res), min_month, max_month, datetime.date.fromisoformat(ingested_on))
+        for name, res, min_month, max_month, ingested_on in rows
+    }
+
+
+def reset() -> None:
+    """Close every thread's connection and drop cached path/source state (tests, or after swapping the DB file)."""
+    _DB.reset()
+    _sources.cache_clear()
+
+
+def covers(source: str, start_date: str, end_date: str) -> bool:
+    """True when the store holds `source` for the whole [start_date, end_date) window (ISO dates)."""
+    meta = _sources().get(source)
+    if meta is None:
+        return False
+    _res, min_month, _max_month, ingested_on = meta
+    end = datetime.date.fromisoformat(end_date[:10])
+    return min_month <= start_date[:7] and end <= ingested_on + datetime.timedelta(days=MAX_STALENESS_DAYS)
+
+
+def _disk_cells(lat: float, lon: float, reach_m: float, res: int) -> List[str]:
+    """H3 cells at `res` whose centroid may lie within reach_m of the point (superset)."""
+    edge_m = h3.average_hexagon_edge_length(res, unit="m")
+    # Adjacent centroids are edge*sqrt(3) apart; 0.7 allows for H3's cell-size distortion.
+    k = int(math.ceil(reach_m / (edge_m * math.sqrt(3) * 0.7))) + 1
+    return list(h3.grid_disk(h3.latlng_to_cell(lat, lon, res), k))
+
+
+def _sum_cells(source: str, cells: List[int], start_date: str, end_date: str) -> Dict[str, int]:
+    conn = _DB.connect()
+    violent = prop = total = 0
+    for i in range(0, len(cells), _IN_CHUNK):
+        chunk = cells[i:i + _IN_CHUNK]
+        row = conn.execute(
+            "SELECT COALESCE(SUM(violent), 0), COALESCE(SUM(property), 0), COALESCE(SUM(total), 0) "
+            "FROM cell_months WHERE source = ? AND month >= ? AND month < ? "
+            f"AND cell IN ({','.join('?' * len(chunk))})",
+            [source, start_date[:7], end_date[:7], *chunk],
+        ).fetchone()
+        violent += int(row[0])
+        prop += int(row[1])
+        total += int(row[2])
+    return {"violent": violent, "property": prop, "total": total}
+
+
+def circle_counts(source: str, lat: float, lon: float, radius_m: float, start_date: str, end_date: str) -> Optional[Dict]:
+    """
+    Violent/property/total incidents within radius_m over [start_date, end_date), shaped like
+    crime_api._fetch_nyc_crimes. None when the window is not covered.
+    """
+    if not covers(source, start_date, end_date):
+        return None
+    from data_sources.utils import haversine_distance
+
+    res = _sources()[source][0]
+    cells = [
+        h3.str_to_int(c)
+        for c in _disk_cells(lat, lon, radius_m, res)
+        if haversine_distance(lat, lon, *h3.cell_to_latlng(c)) <= radius_m
+    ]
+    try:
+        return _sum_cells(source, cells, start_date, end_date)
+    except Exception as exc:
+        logger.warning("Local crime store query failed: %s", exc)
+        return None
+
+
+def box_counts(source: str, lat: float, lon: float, delta_deg: float, start_date: str, end_date: str) -> Optional[Dict]:
+    """
+    Incidents within lat/lon ± delta_deg over [start_date, end_date), shaped like
+    crime_api._fetch_la_crimes. None when the window is not covered.
+    """
+    if not covers(source, start_date, end_date):
+        return None
+    res = _sources()[source][0]
+    # Degrees of latitude are the longest side of the box; reach its corners.
+    reach_m = delta_deg * 111_320.0 * math.sqrt(2)
+    cells = []
+    for c in _disk_cells(lat, lon, reach_m, res):
+        c_lat, c_lon = h3.cell_to_latlng(c)
+        if abs(c_lat - lat) <= delta_deg and abs(c_lon - lon) <= delta_deg:
+            cells.append(h3.str_to_int(c))
+    try:
+        return _sum_cells(source, cells, start_date, end_date)
+    except Exception as exc:
+        logger.warning("Local crime store query failed: %s", exc)
+        return None
@@ -17,6 +17,7 @@ from .census_api import (
     CENSUS_API_KEY,
     CENSUS_BASE_URL,
     _make_request_with_retry,  # type: ignore
+    acs_available,
     get_census_tract,
 )
 from .error_handling import safe_api_call, handle_api_timeout
@@ -147,7 +148,7 @@ def fetch_acs_profile_dp03(
     geo: EconomicGeo,
     variables: List[str],
 ) -> Optional[Dict[str, Optional[float]]]:
-    if not CENSUS_API_KEY:
+    if not acs_available():
         return None
 
     url = f"{CENSUS_BASE_URL}/{year}/acs/acs5/profile"
@@ -180,7 +181,7 @@ def fetch_acs_table(
     variables: List[str],
     dataset: str = "acs/acs5",
 ) -> Optional[Dict[str, Optional[float]]]:
-    if not CENSUS_API_KEY:
+    if not acs_available():
         return None
     url = f"{CENSUS_BASE_URL}/{year}/{dataset}"
     params: Dict[str, str] = {
@@ -0,0 +1,191 @@
+"""
+Process-wide named thread pools for request fan-out.
+
+Score requests used to create fresh ThreadPoolExecutors at every fan-out point (pre-pillar
+work, pillars, per-pillar upstream calls, geometry), so concurrent requests spawned and
+tore down dozens of threads per second with no global bound. Fan-out now goes through a
+few long-lived pools, one per workload class:
+
+  prepillar - census tract / density / business count / coverage before the pillars
+  pillar    - one task per pillar
+  upstream  - I/O fan-out inside pillars and data sources (GEE, Census, OSM, Places)
+  geometry  - CPU-bound street/building geometry (form metrics)
+  aux       - small side calls (NOAA climate profile, form-context fallbacks)
+
+Backpressure: each pool has a bounded queue. A submit that finds the queue full waits up
+to HOMEFIT_POOL_SUBMIT_WAIT_SECONDS and then runs the task in the caller's thread, which
+naturally slows the submitting request down instead of growing the queue. A task that
+submits to its own pool (e.g. a GEE helper called from an upstream task) runs inline
+unless an idle worker is free, so nested fan-out can never deadlock the pool.
+
+Sizes: HOMEFIT_POOL_<NAME>_WORKERS / HOMEFIT_POOL_<NAME>_QUEUE. stats() reports queue
+depth, active workers, queue wait, and inline runs per pool (GET /pools/stats).
+
+Pools support `with get_pool("pillar") as executor:` for drop-in use at existing fan-out
+sites; leaving the block does not shut the shared pool down or wait for stragglers.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_CPU = os.cpu_count() or 2
+
+# name -> (kind, default workers)
+POOL_DEFAULTS: Dict[str, Tuple[str, int]] = {
+    "prepillar": ("io", 32),
+    "pillar": ("io", 48),
+    "upstream": ("io", 96),
+    "geometry": ("cpu", max(2, _CPU)),
+    "aux": ("io", 16),
+}
+_QUEUE_FACTOR = 4
+SUBMIT_WAIT_SECONDS = float(os.getenv("HOMEFIT_POOL_SUBMIT_WAIT_SECONDS", "5"))
+
+_local = threading.local()
+
+
+def _current_pools() -> list:
+    pools = getattr(_local, "pools", None)
+    if pools is None:
+        pools = _local.pools = []
+    return pools
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    try:
+        return max(1, int(raw)) if raw else default
+    except ValueError:
+        logger.warning(f"Ignoring non-integer {name}={raw!r}")
+        return default
+
+
+class ManagedPool:
+    """Bounded, instrumented wrapper around one long-lived ThreadPoolExecutor."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, kind: str = "io"):
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(1, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"pool-{name}")
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._active = 0
+        self.submitted = 0
+        self.completed = 0
+        self.inline_runs = 0
+        self.saturated_waits = 0
+        self.max_queue_depth = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._started = 0
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        nested = self.name in _current_pools()
+        inline = False
+        with self._cond:
+            if nested:
+                # Only queue behind an idle worker; otherwise this worker runs the task itself.
+                inline = self._active + self._pending >= self.max_workers
+            elif self._pending >= self.max_queue:
+                self.saturated_waits += 1
+                deadline = time.monotonic() + SUBMIT_WAIT_SECONDS
+                while self._pending >= self.max_queue:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        inline = True
+                        break
+                    self._cond.wait(remaining)
+            if not inline:
+                self._pending += 1
+                self.submitted += 1
+                self.max_queue_depth = max(self.max_queue_depth, self._pending)
+        if inline:
+            return self._run_inline(fn, args, kwargs)
+        return self._executor.submit(self._run, time.monotonic(), fn, args, kwargs)
+
+    def _run(self, enqueued: float, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        waited = time.monotonic() - enqueued
+        with self._cond:
+            self._pending -= 1
+            self._active += 1
+            self._started += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._cond.notify()
+        stack = _current_pools()
+        stack.append(self.name)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stack.pop()
+            with self._cond:
+                self._active -= 1
+                self.completed += 1
+
+    def _run_inline(self, fn: Callable, args: tuple, kwargs: dict) -> Future:
+        with self._cond:
+            self.inline_runs += 1
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def __enter__(self) -> "ManagedPool":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False  # shared pool: nothing to shut down or wait for
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queue_depth": self._pending,
+                "max_queue_depth": self.max_queue_depth,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "inline_runs": self.inline_runs,
+                "saturated_waits": self.saturated_waits,
+                "avg_wait_ms": round(1000 * self._wait_total / self._started, 2) if self._started else 0.0,
+                "max_wait_ms": round(1000 * self._wait_max, 2),
+            }
+
+
+_pools: Dict[str, ManagedPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str) -> ManagedPool:
+    """Process-wide pool for a workload class (created on first use)."""
+    pool = _pools.get(name)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            kind, default_workers = POOL_DEFAULTS.get(name, ("io", 16))
+            workers = _env_int(f"HOMEFIT_POOL_{name.upper()}_WORKERS", default_workers)
+            queue = _env_int(f"HOMEFIT_POOL_{name.upper()}_QUEUE", workers * _QUEUE_FACTOR)
+            pool = ManagedPool(name, workers, queue, kind)
+            _pools[name] = pool
+        return pool
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    return {name: pool.stats() for name, pool in sorted(_pools.items())}
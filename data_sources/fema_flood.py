@@ -7,10 +7,9 @@ Used by the climate_risk pillar for flood_zone_pts.
 """
 
 import json
-import urllib.parse
-import urllib.request
 from typing import Optional, Dict, Any
 
+from data_sources import http_client
 from data_sources.cache import cached, CACHE_TTL
 from logging_config import get_logger
 
@@ -86,25 +85,22 @@ def get_fema_flood_zone(lat: float, lon: float) -> Optional[Dict[str, Any]]:
     max_pts = FLOOD_MAX_PTS_DEFAULT
     try:
         geometry = json.dumps({"x": float(lon), "y": float(lat)})
-        full_url = (
-            FEMA_NFHL_QUERY_URL
-            + "?"
-            + urllib.parse.urlencode(
-                {
-                    "where": "1=1",
-                    "geometry": geometry,
-                    "geometryType": "esriGeometryPoint",
-                    "inSR": "4326",
-                    "spatialRel": "esriSpatialRelIntersects",
-                    "returnGeometry": "false",
-                    "outFields": "FLD_ZONE,SFHA_TF,LABEL",
-                    "f": "json",
-                }
-            )
+        resp = http_client.get(
+            FEMA_NFHL_QUERY_URL,
+            params={
+                "where": "1=1",
+                "geometry": geometry,
+                "geometryType": "esriGeometryPoint",
+                "inSR": "4326",
+                "spatialRel": "esriSpatialRelIntersects",
+                "returnGeometry": "false",
+                "outFields": "FLD_ZONE,SFHA_TF,LABEL",
+                "f": "json",
+            },
+            timeout=FEMA_REQUEST_TIMEOUT,
         )
-        req = urllib.request.Request(full_url, method="GET")
-        with urllib.request.urlopen(req, timeout=FEMA_REQUEST_TIMEOUT) as resp:
-            data = json.loads(resp.read().decode())
+        resp.raise_for_status()
+        data = resp.json()
     except Exception as e:
         logger.warning("FEMA NFHL query failed for (%s, %s): %s", lat, lon, e)
         return None
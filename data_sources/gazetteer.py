@@ -0,0 +1,192 @@
+"""
+Local US gazetteer.
+
+Resolves the geocoder's most common queries -- ZIP codes, "Town, ST" and catalog-style
+"Neighborhood, Borough, State" -- from a SQLite store built offline by
+`scripts/baselines/build_gazetteer.py` (place catalogs, Census Gazetteer places and ZCTA
+centroids, optional OSM place nodes), so geocoding.geocode / geocode_with_full_result do
+not wait on the Census geocoder, Nominatim's 1 req/s policy or Overpass refinement for them.
+
+Schema (SQLite):
+  places(id, name, kind, state, city, county, zip, lat, lon, priority, rank, source)
+                          -- kind is a Nominatim place type (city, town, village, hamlet,
+                             neighbourhood, suburb, postcode); state is the 2-letter code;
+                             lower priority / higher rank wins among same-name candidates
+  names                   -- FTS5 (norm, place_id): normalize_name() of every place name,
+                             and the 5 digits of every ZIP
+
+Names match exactly after normalization; a query without a state is only answered when
+every candidate lies in one state, and extra comma parts (borough, city, county) must
+match the candidate. Anything else -- street addresses, ambiguous or unknown names --
+returns None and callers keep the network path.
+
+Override path via env ``HOMEFIT_GAZETTEER_DB_PATH`` (opened through local_sqlite.LocalDB).
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from logging_config import get_logger
+
+from .local_sqlite import LocalDB
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data_cache" / "gazetteer.sqlite"
+
+# Abbreviations spelled out so "St. Louis" and "Saint Louis" normalize alike.
+_TOKEN_ALIASES = {"st": "saint", "ste": "sainte", "mt": "mount", "ft": "fort", "pt": "point"}
+# Generic trailing words on context parts ("Westchester County", "Borough of Queens").
+_CONTEXT_NOISE = {"county", "borough", "parish", "of", "city"}
+
+_NEIGHBORHOOD_KINDS = {"neighbourhood", "suburb", "quarter"}
+
+_DB = LocalDB("HOMEFIT_GAZETTEER_DB_PATH", DEFAULT_DB_PATH, "gazetteer")
+
+
+def reset() -> None:
+    """Close every thread's connection and re-check the path (tests, or after swapping the DB file)."""
+    _DB.reset()
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, accent-folded, punctuation-free name with common abbreviations spelled out."""
+    folded = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode("ascii").lower()
+    folded = folded.replace("&", " and ").replace("'", "")
+    tokens = re.sub(r"[^a-z0-9]+", " ", folded).split()
+    return " ".join(_TOKEN_ALIASES.get(t, t) for t in tokens)
+
+
+def _normalize_context(part: str) -> str:
+    return " ".join(t for t in normalize_name(part).split() if t not in _CONTEXT_NOISE)
+
+
+def _split_state(part: str) -> Tuple[str, Optional[str]]:
+    """Strip a trailing state (code or name, optional ZIP) from the last comma part."""
+    from data_sources.geocoding import STATE_ABBREVIATIONS, VALID_STATE_CODES
+
+    text = re.sub(r"\s+\d{5}(-\d{4})?$", "", part.strip())
+    if text.upper() in VALID_STATE_CODES and len(text) == 2:
+        return "", text.upper()
+    if text.lower() in STATE_ABBREVIATIONS:
+        return "", STATE_ABBREVIATIONS[text.lower()]
+    # "Larchmont NY" (code must be upper case without a comma) / "Larchmont New York"
+    m = re.match(r"^(.+?)\s+([A-Z]{2})$", text)
+    if m and m.group(2) in VALID_STATE_CODES:
+        return m.group(1), m.group(2)
+    lower = text.lower()
+    for state_name in sorted(STATE_ABBREVIATIONS, key=len, reverse=True):
+        if len(state_name) > 2 and lower.endswith(" " + state_name):
+            return text[: -len(state_name)].strip(), STATE_ABBREVIATIONS[state_name]
+    return text, None
+
+
+def parse_query(address: str) -> Optional[Tuple[str, List[str], Optional[str], bool]]:
+    """
+    (normalized name, normalized context parts, state code, is_zip) for a place/ZIP query,
+    or None for queries this store does not answer (street addresses, bare states).
+    """
+    text = (address or "").strip()
+    zip_match = re.match(r"^(\d{5})(-\d{4})?$", text)
+    if zip_match:
+        return zip_match.group(1), [], None, True
+    if re.match(r"^\d{1,5}[\s,]", text):
+        return None
+    parts = [p.strip() for p in text.split(",") if p.strip()]
+    if not parts:
+        return None
+    last, state = _split_state(parts[-1])
+    parts = parts[:-1] + ([last] if last else [])
+    if not parts:
+        return None
+    name = normalize_name(parts[0])
+    context = [c for c in (_normalize_context(p) for p in parts[1:]) if c]
+    if not name:
+        return None
+    return name, context, state, False
+
+
+def _candidates(conn: sqlite3.Connection, norm: str, is_zip: bool) -> List[Tuple]:
+    kind_filter = "p.kind = 'postcode'" if is_zip else "p.kind != 'postcode'"
+    return conn.execute(
+        "SELECT p.name, p.kind, p.state, p.city, p.county, p.zip, p.lat, p.lon, p.priority, p.rank "
+        "FROM names n JOIN places p ON p.id = n.place_id "
+        f"WHERE names MATCH ? AND n.norm = ? AND {kind_filter}",
+        (f'"{norm}"', norm),
+    ).fetchall()
+
+
+def _matches_context(row: Tuple, context: List[str]) -> bool:
+    _name, _kind, _state, city, county, *_rest = row
+    known = {_normalize_context(city or ""), _normalize_context(county or "")} - {""}
+    return all(c in known for c in context)
+
+
+def _result(row: Tuple) -> Tuple[float, float, str, str, str, Dict]:
+    from data_sources.geocoding import STATE_ABBREV_TO_NAME
+
+    name, kind, state, city, county, zip_code, lat, lon, _priority, _rank = row
+    state_name = STATE_ABBREV_TO_NAME.get(state, state or "")
+    state_name = "District of Columbia" if state == "DC" else state_name.title()
+    address: Dict[str, str] = {"state": state_name, "country_code": "us"}
+    if county:
+        address["county"] = county
+    if zip_code:
+        address["postcode"] = zip_code
+    if kind == "postcode":
+        address["city"] = city or ""
+        address["town"] = city or ""
+        city_out = city or ""
+    elif kind in _NEIGHBORHOOD_KINDS:
+        address[kind] = name
+        if city:
+            address["city"] = city
+        city_out = city or ""
+    else:
+        address[kind] = name
+        city_out = name
+    display = ", ".join(p for p in (zip_code if kind == "postcode" else name, city if city != name else "",
+                                    county, state_name) if p)
+    full_result = {
+        "lat": str(lat),
+        "lon": str(lon),
+        "display_name": display,
+        "class": "place",
+        "type": kind,
+        "addresstype": kind,
+        "address": address,
+        "source": "local_gazetteer",
+    }
+    return float(lat), float(lon), zip_code or "", state_name, city_out, full_result
+
+
+def lookup(address: str) -> Optional[Tuple[float, float, str, str, str, Dict]]:
+    """
+    (lat, lon, zip_code, state, city, full_result) shaped like
+    geocoding.geocode_with_full_result, or None when the store cannot answer confidently.
+    """
+    parsed = parse_query(address)
+    if parsed is None:
+        return None
+    conn = _DB.connect()
+    if conn is None:
+        return None
+    norm, context, state, is_zip = parsed
+    try:
+        rows = _candidates(conn, norm, is_zip)
+    except Exception as exc:
+        logger.warning("Local gazetteer query failed: %s", exc)
+        return None
+    if state:
+        rows = [r for r in rows if r[2] == state]
+    if context:
+        rows = [r for r in rows if _matches_context(r, context)]
+    if not rows or len({r[2] for r in rows}) > 1:
+        return None
+    best = min(rows, key=lambda r: (r[8], -(r[9] or 0)))
+    return _result(best)
@@ -1,6 +1,14 @@
 """
 Google Earth Engine API Client
 Provides satellite-based tree canopy and environmental analysis.
+
+Natural beauty's canopy (1/2/3 km), greenness (1 km), land cover (3 km) and topography
+(5 km) reductions are resolved together by get_feature_bundle() with one getInfo; the
+per-dataset functions read it for those radii and run their own queries otherwise.
+
+Canopy, land cover, topography, GHSL building height and summer LST are answered from the
+local raster tile store (data_sources/raster_local.py) first when it covers the location,
+so those reductions need neither Earth Engine nor network access.
 """
 
 import ee
@@ -8,10 +16,13 @@ import os
 import json
 from typing import Optional, Dict, Tuple, List
 import math
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError, as_completed
+import threading
 import time
 from functools import wraps
-from data_sources.cache import cached, CACHE_TTL
+from data_sources.cache import cached, CACHE_TTL, SpatialBucket
+from data_sources.executors import get_pool
+from data_sources import raster_local
 
 # Defensive: prevent Earth Engine calls from hanging indefinitely.
 # ee.data.setDeadline sets a per-request deadline (ms) for API calls.
@@ -198,6 +209,371 @@ def _get_nlcd_landcover_canopy(buffer: ee.Geometry) -> Optional[float]:
     return None
 
 
+# ---------------------------------------------------------------------------
+# Feature bundle: natural beauty's canopy / greenness / land cover / topography
+# reductions for one location as a single ee.Dictionary, resolved with one getInfo.
+# ---------------------------------------------------------------------------
+
+GEE_FEATURE_BUNDLE_VERSION = 1  # bump when the bundle's contents or reductions change
+FEATURE_BUNDLE_CANOPY_RADII = (1000, 2000, 3000)
+FEATURE_BUNDLE_GREENNESS_RADIUS_M = 1000
+FEATURE_BUNDLE_LANDCOVER_RADIUS_M = 3000
+FEATURE_BUNDLE_TOPOGRAPHY_RADIUS_M = 5000
+FEATURE_BUNDLE_ENABLED = os.getenv("HOMEFIT_GEE_FEATURE_BUNDLE", "1").strip().lower() not in {"0", "false", "no", "off"}
+_FEATURE_BUNDLE_RETRY_SECONDS = 300
+
+_NLCD_TCC_COLLECTION = 'USGS/NLCD_RELEASES/2023_REL/TCC/v2023-5'
+_nlcd_tcc_year_cache: Optional[int] = None
+_bundle_failures: Dict[Tuple[float, float], float] = {}
+_bundle_failures_lock = threading.Lock()
+
+
+def _nlcd_tcc_year() -> int:
+    """Most recent NLCD TCC year (2023, then 2022, else 2021); queried once per process."""
+    global _nlcd_tcc_year_cache
+    if _nlcd_tcc_year_cache is None:
+        available_years = ee.ImageCollection(_NLCD_TCC_COLLECTION).aggregate_array('year').distinct().getInfo()
+        _nlcd_tcc_year_cache = next((y for y in (2023, 2022) if y in available_years), 2021)
+    return _nlcd_tcc_year_cache
+
+
+def _note_bundle_failure(lat: float, lon: float) -> None:
+    """Record a failed bundle at (lat, lon), dropping failures past the retry window first
+    (during an outage every scored location fails once; only the recent ones matter)."""
+    now = time.time()
+    with _bundle_failures_lock:
+        for key in [k for k, t in _bundle_failures.items() if now - t >= _FEATURE_BUNDLE_RETRY_SECONDS]:
+            del _bundle_failures[key]
+        _bundle_failures[(lat, lon)] = now
+
+
+def _feature_bundle_expr(lat: float, lon: float) -> ee.Dictionary:
+    """Server-side dictionary with every reduction the bundle consumers need."""
+    point = ee.Geometry.Point([lon, lat])
+    masked = lambda band: ee.Image.constant(0).selfMask().rename(band)
+
+    # Canopy: NLCD TCC (latest year), Hansen and NLCD forest classes per radius, one
+    # stacked reduceRegion per disc (same datasets/scale as the per-source helpers).
+    if _nlcd_tcc_year_cache is not None:
+        year = ee.Number(_nlcd_tcc_year_cache)
+    else:
+        years = ee.ImageCollection(_NLCD_TCC_COLLECTION).aggregate_array('year').distinct()
+        year = ee.Number(ee.Algorithms.If(years.contains(2023), 2023,
+                                          ee.Algorithms.If(years.contains(2022), 2022, 2021)))
+    hansen = ee.Image('UMD/hansen/global_forest_change_2024_v1_12').select('treecover2000').rename('hansen')
+    nlcd_landcover = ee.Image('USGS/NLCD_RELEASES/2021_REL/NLCD/2021').select('landcover')
+    forest = (nlcd_landcover.eq(40).Or(nlcd_landcover.eq(41)).Or(nlcd_landcover.eq(42))
+              .Or(nlcd_landcover.eq(43)).rename('forest'))
+    canopy = {}
+    for radius in FEATURE_BUNDLE_CANOPY_RADII:
+        buffer = point.buffer(radius)
+        tcc = ee.ImageCollection(_NLCD_TCC_COLLECTION).filter(ee.Filter.eq('year', year)).filterBounds(buffer)
+        tcc_image = ee.Image(ee.Algorithms.If(
+            tcc.size().gt(0),
+            tcc.first().select('NLCD_Percent_Tree_Canopy_Cover').rename('tcc'),
+            masked('tcc'),
+        ))
+        canopy[str(radius)] = tcc_image.addBands(hansen).addBands(forest).reduceRegion(
+            reducer=ee.Reducer.mean(), geometry=buffer, scale=30, maxPixels=1e9
+        )
+
+    # Land cover histogram (NLCD; ESA WorldCover only evaluated outside NLCD coverage)
+    lc_buffer = point.buffer(FEATURE_BUNDLE_LANDCOVER_RADIUS_M)
+    nlcd_hist = nlcd_landcover.reduceRegion(
+        reducer=ee.Reducer.frequencyHistogram(), geometry=lc_buffer, scale=30, maxPixels=1e9, bestEffort=True
+    ).get('landcover')
+    worldcover_hist = ee.Algorithms.If(nlcd_hist, None, ee.ImageCollection('ESA/WorldCover/v200').first().select('Map').reduceRegion(
+        reducer=ee.Reducer.frequencyHistogram(), geometry=lc_buffer, scale=10, maxPixels=1e9, bestEffort=True
+    ).get('Map'))
+
+    # Topography (mirrors get_topography_context)
+    topo_buffer = point.buffer(FEATURE_BUNDLE_TOPOGRAPHY_RADIUS_M)
+    dem = ee.Image('USGS/SRTMGL1_003')
+    slope = ee.Terrain.slope(dem)
+    topo_kwargs = dict(geometry=topo_buffer, scale=90, maxPixels=1e9, bestEffort=True)
+    prominence_buffer = topo_buffer.difference(point.buffer(2000))
+    topography = {
+        "dem": dem.reduceRegion(
+            reducer=(ee.Reducer.mean()
+                     .combine(ee.Reducer.minMax(), sharedInputs=True)
+                     .combine(ee.Reducer.percentile([10, 90]), sharedInputs=True)),
+            **topo_kwargs),
+        "slope": slope.reduceRegion(
+            reducer=(ee.Reducer.mean()
+                     .combine(ee.Reducer.max(), sharedInputs=True)
+                     .combine(ee.Reducer.stdDev(), sharedInputs=True)
+                     .combine(ee.Reducer.percentile([85]), sharedInputs=True)),
+            **topo_kwargs),
+        "steep": slope.gt(15).reduceRegion(reducer=ee.Reducer.mean(), **topo_kwargs),
+        "dem_std": dem.reduceRegion(reducer=ee.Reducer.stdDev(), **topo_kwargs),
+        "center": dem.reduceRegion(reducer=ee.Reducer.mean(), geometry=point.buffer(100),
+                                   scale=90, maxPixels=1e9, bestEffort=True),
+        "surrounding": ee.Algorithms.If(
+            prominence_buffer.area(1).gt(0),
+            dem.reduceRegion(reducer=ee.Reducer.mean(), geometry=prominence_buffer,
+                             scale=90, maxPixels=1e9, bestEffort=True),
+            None,
+        ),
+    }
+
+    # Greenness (mirrors get_urban_greenness_gee, get_vegetation_health_metrics, get_semantic_gvi)
+    g_buffer = point.buffer(FEATURE_BUNDLE_GREENNESS_RADIUS_M)
+    ndvi_collection = (ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
+                       .filterDate('2020-01-01', '2026-12-31')
+                       .filterBounds(g_buffer)
+                       .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 30))
+                       .map(_ndvi_with_time))
+    ndvi_mean = ndvi_collection.mean()
+    seasons = [
+        ee.Algorithms.If(
+            ndvi_collection.filter(month_filter).size().gt(0),
+            ndvi_collection.filter(month_filter).mean().reduceRegion(
+                reducer=ee.Reducer.mean(), geometry=g_buffer, scale=20, maxPixels=1e9, bestEffort=True
+            ).get('NDVI'),
+            None,
+        )
+        for _, month_filter in _season_filters()
+    ]
+    ndvi_stats = ee.Dictionary({
+        "mean": (ndvi_mean.gt(0.4).rename('tree')
+                 .addBands(ndvi_mean.rename('ndvi'))
+                 .addBands(ndvi_mean.gt(0.2).rename('green'))
+                 .reduceRegion(reducer=ee.Reducer.mean(), geometry=g_buffer, scale=20, maxPixels=1e9)),
+        "seasons": seasons,
+        "visible": ndvi_mean.gt(0.3).reduceRegion(
+            reducer=ee.Reducer.mean(), geometry=g_buffer, scale=10, maxPixels=1e9, bestEffort=True
+        ).get('NDVI'),
+    })
+    recent = (ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
+              .filterDate('2022-06-01', '2026-09-30')
+              .filterBounds(g_buffer)
+              .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20)))
+    median = recent.median()
+    recent_ndvi = median.normalizedDifference(['B8', 'B4']).rename('NDVI')
+    green, red, blue = median.select('B3'), median.select('B4'), median.select('B2')
+    vari = green.subtract(red).divide(green.add(red).subtract(blue)).rename('VARI')
+    recent_stats = ee.Dictionary({
+        "health": recent_ndvi.addBands(vari).reduceRegion(
+            reducer=ee.Reducer.mean(), geometry=g_buffer, scale=20, maxPixels=1e9, bestEffort=True),
+        "street": (recent_ndvi.addBands(recent_ndvi.gt(0.3).And(vari.gt(0.0)).float().rename('vegetation_mask'))
+                   .reduceRegion(reducer=ee.Reducer.mean(), geometry=g_buffer, scale=10, maxPixels=1e9, bestEffort=True)),
+    })
+    greenness = {
+        "size": ndvi_collection.size(),
+        "ndvi": ee.Algorithms.If(ndvi_collection.size().gt(0), ndvi_stats, None),
+        "recent": ee.Algorithms.If(recent.size().gt(0), recent_stats, None),
+    }
+
+    return ee.Dictionary({
+        "version": GEE_FEATURE_BUNDLE_VERSION,
+        "nlcd_tcc_year": year,
+        "canopy": canopy,
+        "landcover": {"nlcd": nlcd_hist, "worldcover": worldcover_hist},
+        "topography": topography,
+        "greenness": greenness,
+    })
+
+
+@cached(ttl_seconds=CACHE_TTL.get('census_data', 48 * 3600))
+def _fetch_feature_bundle(lat: float, lon: float, version: int) -> Optional[Dict]:
+    start_time = time.time()
+    try:
+        bundle = _feature_bundle_expr(lat, lon).getInfo()
+    except Exception as e:
+        print(f"   ⚠️  GEE feature bundle error (falling back to per-dataset queries): {str(e)[:200]}")
+        _note_bundle_failure(lat, lon)
+        return None
+    print(f"🛰️  GEE feature bundle v{version} at {lat}, {lon} resolved in {time.time() - start_time:.1f}s")
+    return bundle
+
+
+def get_feature_bundle(lat: float, lon: float) -> Optional[Dict]:
+    """
+    Canopy (1/2/3 km), greenness (1 km), land cover (3 km) and topography (5 km) for one
+    location from a single getInfo, cached per (lat, lon, bundle version).
+
+    Returns None when GEE or the bundle is unavailable (HOMEFIT_GEE_FEATURE_BUNDLE=0, or a
+    recent failure for this location); callers then run their own per-dataset queries.
+    """
+    global _nlcd_tcc_year_cache
+    if not GEE_AVAILABLE or not FEATURE_BUNDLE_ENABLED:
+        return None
+    failed_at = _bundle_failures.get((lat, lon))
+    if failed_at is not None and time.time() - failed_at < _FEATURE_BUNDLE_RETRY_SECONDS:
+        return None
+    bundle = _fetch_feature_bundle(lat, lon, GEE_FEATURE_BUNDLE_VERSION)
+    if bundle is not None:
+        with _bundle_failures_lock:
+            _bundle_failures.pop((lat, lon), None)
+        if bundle.get("nlcd_tcc_year") is not None:
+            _nlcd_tcc_year_cache = int(bundle["nlcd_tcc_year"])
+    return bundle
+
+
+def _bundle_canopy_sources(lat: float, lon: float, radius_m: int) -> Optional[Tuple[Optional[float], int, Optional[float], Optional[float]]]:
+    """(NLCD TCC %, TCC year, Hansen %, NLCD forest %) from the bundle, validated like the per-source helpers."""
+    bundle = get_feature_bundle(lat, lon)
+    ring = ((bundle or {}).get("canopy") or {}).get(str(radius_m))
+    if ring is None:
+        return None
+    tcc, hansen, forest = ring.get("tcc"), ring.get("hansen"), ring.get("forest")
+    tcc = min(100, max(0, tcc)) if tcc is not None and tcc >= 0.0 else None
+    hansen = min(100, max(0, hansen)) if hansen is not None and hansen >= 0.0 else None
+    forest = min(100, max(0, forest * 100)) if forest is not None and forest > 0 else None
+    return tcc, int(bundle.get("nlcd_tcc_year") or 2021), hansen, forest
+
+
+def _bundle_landcover_histogram(bundle: Dict) -> Optional[Dict]:
+    landcover = bundle.get("landcover") or {}
+    for key, source in (("nlcd", "NLCD 2021"), ("worldcover", "ESA WorldCover v200")):
+        hist = landcover.get(key)
+        if hist:
+            return {"source": source, "histogram": {int(float(k)): v for k, v in hist.items()}}
+    return None
+
+
+def _bundle_greenness(greenness: Optional[Dict]) -> Optional[Dict]:
+    """get_urban_greenness_gee result from the bundle's Sentinel-2 reductions."""
+    if not greenness or not greenness.get("size") or not greenness.get("ndvi"):
+        print(f"   ⚠️  No Sentinel-2 images found for greenness analysis")
+        return None
+    ndvi = greenness["ndvi"]
+    stats = ndvi.get("mean") or {}
+    tree, veg, green = stats.get("tree"), stats.get("ndvi"), stats.get("green")
+    tree_canopy_pct = tree * 100 if tree else 0.0
+    veg_health = veg if veg is not None else 0.0
+    green_ratio_pct = green * 100 if green else 0.0
+
+    season_values = [float(v) for v in ndvi.get("seasons") or [] if v is not None]
+    seasonal_variation = max(season_values) - min(season_values) if len(season_values) > 1 else 0.0
+    visible = ndvi.get("visible")
+    visible_green_fraction = visible * 100 if visible else 0.0
+
+    recent = greenness.get("recent")
+    veg_health_metrics = semantic_gvi_data = None
+    if recent is None:
+        street_level_ndvi = veg_health  # no recent summer scenes: same fallback as the GEE path
+    else:
+        street = recent.get("street") or {}
+        street_ndvi = street.get("NDVI")
+        street_level_ndvi = max(0.0, min(1.0, street_ndvi)) if street_ndvi is not None else 0.0
+        health = recent.get("health") or {}
+        try:
+            veg_health_metrics = _vegetation_health_summary(health.get("NDVI"), health.get("VARI"))
+        except TypeError:
+            veg_health_metrics = None
+        if street.get("vegetation_mask") is not None:
+            semantic_gvi_data = _semantic_gvi_result(street["vegetation_mask"] * 100)
+
+    return _assemble_greenness(
+        tree_canopy_pct, veg_health, green_ratio_pct, seasonal_variation,
+        visible_green_fraction, street_level_ndvi, veg_health_metrics, semantic_gvi_data,
+    )
+
+
+def _combine_canopy_sources(nlcd_tcc_result: Optional[float],
+                            hansen_result: Optional[float],
+                            nlcd_landcover_result: Optional[float]) -> Optional[float]:
+    """Reconcile NLCD TCC with the Hansen / NLCD Land Cover validation sources."""
+    # Multi-source approach: Use highest value to avoid NLCD underestimation bias
+    # Research shows NLCD systematically underestimates by ~10% (up to 13.9% in urban)
+    if nlcd_tcc_result is not None:
+        primary_result = nlcd_tcc_result
+        print(f"   ⚠️  Note: NLCD known to underestimate canopy by ~10% (up to 13.9% in urban)")
+        
+        # Collect validation sources and use highest value if significantly different
+        validation_sources = []
+        if nlcd_landcover_result is not None:
+            validation_sources.append(('NLCD Land Cover', nlcd_landcover_result))
+        if hansen_result is not None:
+            # Cap Hansen at 90% to avoid extreme outliers
+            validation_sources.append(('Hansen', min(90, hansen_result)))
+        
+        # Check agreement and use highest value if validation suggests underestimation
+        # Research shows NLCD systematically underestimates by ~10% (up to 13.9% in urban)
+        # Use higher validation value when available to compensate, even for smaller differences
+        if validation_sources:
+            max_validation_value = primary_result
+            agreements = []
+            underestimation_detected = False
+            
+            for source_name, source_value in validation_sources:
+                diff = abs(primary_result - source_value)
+                diff_pct = source_value - primary_result  # Positive = higher, negative = lower
+                
+                if diff <= 5:  # Within 5% = good agreement
+                    agreements.append(source_name)
+                    # If validation is higher (even slightly), use it to compensate for NLCD underestimation
+                    if source_value > primary_result + 3.0:  # >3% higher = meaningful underestimation
+                        print(f"   ✓ {source_name} validates NLCD TCC (diff: {diff:.1f}%)")
+                        print(f"   💡 {source_name} is {diff_pct:.1f}% higher - using to compensate for NLCD underestimation bias")
+                        max_validation_value = max(max_validation_value, source_value)
+                        underestimation_detected = True
+                    else:
+                        print(f"   ✓ {source_name} validates NLCD TCC (diff: {diff:.1f}%)")
+                elif diff <= 10:  # Within 10% = acceptable
+                    agreements.append(source_name)
+                    # If validation is higher, use it
+                    if source_value > primary_result + 3.0:  # >3% higher = meaningful underestimation
+                        print(f"   ~ {source_name} roughly agrees with NLCD TCC (diff: {diff:.1f}%)")
+                        print(f"   💡 {source_name} is {diff_pct:.1f}% higher - using to compensate for NLCD underestimation bias")
+                        max_validation_value = max(max_validation_value, source_value)
+                        underestimation_detected = True
+                    else:
+                        print(f"   ~ {source_name} roughly agrees with NLCD TCC (diff: {diff:.1f}%)")
+                else:
+                    # Large difference - check if validation source suggests underestimation
+                    if source_value > primary_result + 3.0:  # >3% higher = meaningful underestimation
+                        print(f"   ⚠️  {source_name} ({source_value:.1f}%) significantly higher than NLCD TCC ({primary_result:.1f}%, diff: +{diff_pct:.1f}%)")
+                        print(f"   💡 Using higher value to compensate for NLCD underestimation bias")
+                        max_validation_value = max(max_validation_value, source_value)
+                        underestimation_detected = True
+                    else:
+                        print(f"   ⚠️  {source_name} differs from NLCD TCC ({diff:.1f}% diff)")
+            
+            if agreements:
+                if underestimation_detected:
+                    print(f"   📊 NLCD TCC validated by {len(agreements)} source(s), but using higher value to compensate for underestimation")
+                else:
+                    print(f"   📊 NLCD TCC validated by {len(agreements)} source(s)")
+            else:
+                print(f"   ⚠️  Validation sources disagree - using highest value to compensate for NLCD underestimation")
+            
+            # Use the highest value if validation sources suggest underestimation
+            if max_validation_value > primary_result:
+                print(f"   ✅ Updating canopy from {primary_result:.1f}% to {max_validation_value:.1f}% (compensating for NLCD underestimation)")
+                primary_result = max_validation_value
+        
+        # Validate canopy value for sanity
+        if primary_result is not None:
+            if primary_result > 100.0:
+                primary_result = 100.0
+            elif primary_result > 80.0:
+                print(f"   ⚠️  Unusually high canopy value {primary_result}% - verify data quality")
+            elif primary_result < 0.0:
+                primary_result = 0.0
+        
+        return primary_result
+    
+    # Fallback: If NLCD unavailable, use other sources
+    sources = []
+    if nlcd_landcover_result is not None:
+        sources.append(('NLCD Land Cover', nlcd_landcover_result))
+    if hansen_result is not None:
+        sources.append(('Hansen', hansen_result))
+    
+    if len(sources) == 1:
+        return sources[0][1]
+    elif len(sources) > 1:
+        values = [s[1] for s in sources]
+        combined_result = max(values)  # Use max instead of average
+        source_names = ', '.join([s[0] for s in sources])
+        print(f"   📊 Using highest fallback value ({source_names}): {combined_result:.1f}% (max of {values})")
+        return min(100, max(0, combined_result))
+    
+    return None
+
+
 @cached(ttl_seconds=CACHE_TTL.get('census_data', 48 * 3600))  # Cache for 48 hours (canopy data is very stable)
 def get_tree_canopy_gee(lat: float, lon: float, radius_m: int = 1000, area_type: Optional[str] = None) -> Optional[float]:
     """
@@ -216,8 +592,21 @@ def get_tree_canopy_gee(lat: float, lon: float, radius_m: int = 1000, area_type:
     Returns:
         Tree canopy percentage (0-100) or None if unavailable
     """
+    local = raster_local.canopy_sources(lat, lon, radius_m)
+    if local is not None:
+        nlcd_tcc_result, year_used, hansen_result, nlcd_landcover_result = local
+        print(f"🗂️  Tree canopy at {lat}, {lon} ({radius_m}m) from local raster tiles (NLCD TCC {year_used})")
+        return _combine_canopy_sources(nlcd_tcc_result, hansen_result, nlcd_landcover_result)
+
     if not GEE_AVAILABLE:
         return None
+
+    if radius_m in FEATURE_BUNDLE_CANOPY_RADII:
+        bundled = _bundle_canopy_sources(lat, lon, radius_m)
+        if bundled is not None:
+            nlcd_tcc_result, year_used, hansen_result, nlcd_landcover_result = bundled
+            print(f"🛰️  Tree canopy at {lat}, {lon} ({radius_m}m) from GEE feature bundle (NLCD TCC {year_used})")
+            return _combine_canopy_sources(nlcd_tcc_result, hansen_result, nlcd_landcover_result)
         
     try:
         print(f"🛰️  Analyzing tree canopy with Google Earth Engine at {lat}, {lon}...")
@@ -227,14 +616,8 @@ def get_tree_canopy_gee(lat: float, lon: float, radius_m: int = 1000, area_type:
         point = ee.Geometry.Point([lon, lat])
         buffer = point.buffer(radius_m)
         
-        # Determine most recent NLCD year (one-time check)
-        nlcd_collection = ee.ImageCollection('USGS/NLCD_RELEASES/2023_REL/TCC/v2023-5')
-        available_years = nlcd_collection.aggregate_array('year').distinct().getInfo()
-        year_used = 2021  # Default
-        if 2023 in available_years:
-            year_used = 2023
-        elif 2022 in available_years:
-            year_used = 2022
+        # Most recent NLCD year (resolved once per process)
+        year_used = _nlcd_tcc_year()
         
         # Run all sources in parallel with timeouts (max 8 seconds per source)
         # Total time should be ~8-10 seconds max instead of 15-20+ sequential
@@ -242,7 +625,7 @@ def get_tree_canopy_gee(lat: float, lon: float, radius_m: int = 1000, area_type:
         hansen_result = None
         nlcd_landcover_result = None
         
-        with ThreadPoolExecutor(max_workers=3) as executor:
+        with get_pool("upstream") as executor:
             # Submit all tasks
             nlcd_future = executor.submit(_get_nlcd_tcc_canopy, buffer, year_used)
             hansen_future = executor.submit(_get_hansen_canopy, buffer)
@@ -285,109 +668,31 @@ def get_tree_canopy_gee(lat: float, lon: float, radius_m: int = 1000, area_type:
         elapsed = time.time() - start_time
         print(f"   ⏱️  Multi-source canopy analysis completed in {elapsed:.1f}s")
         
-        # Multi-source approach: Use highest value to avoid NLCD underestimation bias
-        # Research shows NLCD systematically underestimates by ~10% (up to 13.9% in urban)
-        if nlcd_tcc_result is not None:
-            primary_result = nlcd_tcc_result
-            print(f"   ⚠️  Note: NLCD known to underestimate canopy by ~10% (up to 13.9% in urban)")
-            
-            # Collect validation sources and use highest value if significantly different
-            validation_sources = []
-            if nlcd_landcover_result is not None:
-                validation_sources.append(('NLCD Land Cover', nlcd_landcover_result))
-            if hansen_result is not None:
-                # Cap Hansen at 90% to avoid extreme outliers
-                validation_sources.append(('Hansen', min(90, hansen_result)))
-            
-            # Check agreement and use highest value if validation suggests underestimation
-            # Research shows NLCD systematically underestimates by ~10% (up to 13.9% in urban)
-            # Use higher validation value when available to compensate, even for smaller differences
-            if validation_sources:
-                max_validation_value = primary_result
-                agreements = []
-                underestimation_detected = False
-                
-                for source_name, source_value in validation_sources:
-                    diff = abs(primary_result - source_value)
-                    diff_pct = source_value - primary_result  # Positive = higher, negative = lower
-                    
-                    if diff <= 5:  # Within 5% = good agreement
-                        agreements.append(source_name)
-                        # If validation is higher (even slightly), use it to compensate for NLCD underestimation
-                        if source_value > primary_result + 3.0:  # >3% higher = meaningful underestimation
-                            print(f"   ✓ {source_name} validates NLCD TCC (diff: {diff:.1f}%)")
-                            print(f"   💡 {source_name} is {diff_pct:.1f}% higher - using to compensate for NLCD underestimation bias")
-                            max_validation_value = max(max_validation_value, source_value)
-                            underestimation_detected = True
-                        else:
-                            print(f"   ✓ {source_name} validates NLCD TCC (diff: {diff:.1f}%)")
-                    elif diff <= 10:  # Within 10% = acceptable
-                        agreements.append(source_name)
-                        # If validation is higher, use it
-                        if source_value > primary_result + 3.0:  # >3% higher = meaningful underestimation
-                            print(f"   ~ {source_name} roughly agrees with NLCD TCC (diff: {diff:.1f}%)")
-                            print(f"   💡 {source_name} is {diff_pct:.1f}% higher - using to compensate for NLCD underestimation bias")
-                            max_validation_value = max(max_validation_value, source_value)
-                            underestimation_detected = True
-                        else:
-                            print(f"   ~ {source_name} roughly agrees with NLCD TCC (diff: {diff:.1f}%)")
-                    else:
-                        # Large difference - check if validation source suggests underestimation
-                        if source_value > primary_result + 3.0:  # >3% higher = meaningful underestimation
-                            print(f"   ⚠️  {source_name} ({source_value:.1f}%) significantly higher than NLCD TCC ({primary_result:.1f}%, diff: +{diff_pct:.1f}%)")
-                            print(f"   💡 Using higher value to compensate for NLCD underestimation bias")
-                            max_validation_value = max(max_validation_value, source_value)
-                            underestimation_detected = True
-                        else:
-                            print(f"   ⚠️  {source_name} differs from NLCD TCC ({diff:.1f}% diff)")
-                
-                if agreements:
-                    if underestimation_detected:
-                        print(f"   📊 NLCD TCC validated by {len(agreements)} source(s), but using higher value to compensate for underestimation")
-                    else:
-                        print(f"   📊 NLCD TCC validated by {len(agreements)} source(s)")
-                else:
-                    print(f"   ⚠️  Validation sources disagree - using highest value to compensate for NLCD underestimation")
-                
-                # Use the highest value if validation sources suggest underestimation
-                if max_validation_value > primary_result:
-                    print(f"   ✅ Updating canopy from {primary_result:.1f}% to {max_validation_value:.1f}% (compensating for NLCD underestimation)")
-                    primary_result = max_validation_value
-            
-            # Validate canopy value for sanity
-            if primary_result is not None:
-                if primary_result > 100.0:
-                    primary_result = 100.0
-                elif primary_result > 80.0:
-                    print(f"   ⚠️  Unusually high canopy value {primary_result}% - verify data quality")
-                elif primary_result < 0.0:
-                    primary_result = 0.0
-            
-            return primary_result
-        
-        # Fallback: If NLCD unavailable, use other sources
-        sources = []
-        if nlcd_landcover_result is not None:
-            sources.append(('NLCD Land Cover', nlcd_landcover_result))
-        if hansen_result is not None:
-            sources.append(('Hansen', hansen_result))
-        
-        if len(sources) == 1:
-            return sources[0][1]
-        elif len(sources) > 1:
-            values = [s[1] for s in sources]
-            combined_result = max(values)  # Use max instead of average
-            source_names = ', '.join([s[0] for s in sources])
-            print(f"   📊 Using highest fallback value ({source_names}): {combined_result:.1f}% (max of {values})")
-            return min(100, max(0, combined_result))
-        
-        return None
+        return _combine_canopy_sources(nlcd_tcc_result, hansen_result, nlcd_landcover_result)
         
     except Exception as e:
         print(f"   ⚠️  GEE tree canopy analysis error: {e}")
         return None
 
 
+def _vegetation_health_summary(veg_health_ndvi: float, veg_health_vari: float) -> Dict:
+    """Composite NDVI/VARI health score (raises on missing values, like the GEE path)."""
+    # Composite health score (0-100): combines NDVI and VARI
+    # NDVI: 0-1 scale, VARI: -1 to 1 scale (but vegetation typically 0-0.5)
+    # Normalize VARI to 0-1 scale for vegetation (clamp negative values to 0)
+    vari_normalized = max(0.0, min(1.0, (veg_health_vari + 0.2) / 0.7)) if veg_health_vari else 0.0
+    
+    # Combined health score: 60% NDVI, 40% VARI
+    health_score = (veg_health_ndvi * 0.6 + vari_normalized * 0.4) * 100
+    health_score = max(0.0, min(100.0, health_score))
+    
+    return {
+        "vegetation_health_ndvi": round(veg_health_ndvi, 3),
+        "vegetation_health_vari": round(veg_health_vari, 3),
+        "vegetation_health_score": round(health_score, 2)
+    }
+
+
 def get_vegetation_health_metrics(lat: float, lon: float, radius_m: int = 1000) -> Optional[Dict]:
     """
     Calculate enhanced vegetation health metrics using NDVI and VARI.
@@ -447,21 +752,7 @@ def get_vegetation_health_metrics(lat: float, lon: float, radius_m: int = 1000)
         
         veg_health_ndvi = ndvi_mean.getInfo() if ndvi_mean else 0.0
         veg_health_vari = vari_mean.getInfo() if vari_mean else 0.0
-        
-        # Composite health score (0-100): combines NDVI and VARI
-        # NDVI: 0-1 scale, VARI: -1 to 1 scale (but vegetation typically 0-0.5)
-        # Normalize VARI to 0-1 scale for vegetation (clamp negative values to 0)
-        vari_normalized = max(0.0, min(1.0, (veg_health_vari + 0.2) / 0.7)) if veg_health_vari else 0.0
-        
-        # Combined health score: 60% NDVI, 40% VARI
-        health_score = (veg_health_ndvi * 0.6 + vari_normalized * 0.4) * 100
-        health_score = max(0.0, min(100.0, health_score))
-        
-        return {
-            "vegetation_health_ndvi": round(veg_health_ndvi, 3),
-            "vegetation_health_vari": round(veg_health_vari, 3),
-            "vegetation_health_score": round(health_score, 2)
-        }
+        return _vegetation_health_summary(veg_health_ndvi, veg_health_vari)
     except Exception as e:
         print(f"   ⚠️  Vegetation health metrics calculation failed: {e}")
         return None
@@ -524,16 +815,73 @@ def get_semantic_gvi(lat: float, lon: float, radius_m: int = 1000) -> Optional[D
         else:
             semantic_gvi_value = 0.0
         
-        return {
-            "semantic_gvi": round(semantic_gvi_value, 2),
-            "vegetation_pct": round(semantic_gvi_value, 2),
-            "method": "ndvi_enhanced"
-        }
+        return _semantic_gvi_result(semantic_gvi_value)
     except Exception as e:
         print(f"   ⚠️  Semantic GVI calculation failed: {e}")
         return None
 
 
+def _semantic_gvi_result(semantic_gvi_value: float) -> Dict:
+    return {
+        "semantic_gvi": round(semantic_gvi_value, 2),
+        "vegetation_pct": round(semantic_gvi_value, 2),
+        "method": "ndvi_enhanced"
+    }
+
+
+def _ndvi_with_time(image):
+    # normalizedDifference() drops scene timestamps; calendarRange needs system:time_start.
+    ndvi = image.normalizedDifference(['B8', 'B4']).rename('NDVI')
+    return ndvi.copyProperties(image, ['system:time_start', 'system:time_end'])
+
+
+def _season_filters() -> List[Tuple[str, "ee.Filter"]]:
+    return [
+        ("winter", ee.Filter.Or(
+            ee.Filter.calendarRange(12, 12, "month"),
+            ee.Filter.calendarRange(1, 2, "month")
+        )),
+        ("spring", ee.Filter.calendarRange(3, 5, "month")),
+        ("summer", ee.Filter.calendarRange(6, 8, "month")),
+        ("fall", ee.Filter.calendarRange(9, 11, "month")),
+    ]
+
+
+def _assemble_greenness(tree_canopy_pct: float, veg_health: float, green_ratio_pct: float,
+                        seasonal_variation: float, visible_green_fraction: float, street_level_ndvi: float,
+                        veg_health_metrics: Optional[Dict], semantic_gvi_data: Optional[Dict]) -> Dict:
+    """get_urban_greenness_gee result from the Sentinel-2 NDVI summaries plus VARI / semantic GVI."""
+    # NEW: Calculate seasonal consistency (year-round greenery)
+    # Lower seasonal variation = more consistent year-round greenery (better)
+    seasonal_consistency = 1.0 - min(1.0, seasonal_variation / 0.5)  # Normalize to 0-1
+    seasonal_consistency = max(0.0, min(1.0, seasonal_consistency))
+    
+    # Enhanced vegetation health metrics (VARI)
+    veg_health_ndvi = veg_health_metrics.get("vegetation_health_ndvi", veg_health) if veg_health_metrics else veg_health
+    veg_health_vari = veg_health_metrics.get("vegetation_health_vari", 0.0) if veg_health_metrics else 0.0
+    veg_health_score = veg_health_metrics.get("vegetation_health_score", veg_health * 100) if veg_health_metrics else (veg_health * 100)
+    
+    # Semantic GVI
+    semantic_gvi = semantic_gvi_data.get("semantic_gvi", visible_green_fraction) if semantic_gvi_data else visible_green_fraction
+    
+    result = {
+        "tree_canopy_pct": min(100, max(0, tree_canopy_pct)),
+        "vegetation_health": min(1, max(0, veg_health)),  # Legacy key
+        "vegetation_health_ndvi": round(veg_health_ndvi, 3),
+        "vegetation_health_vari": round(veg_health_vari, 3),
+        "vegetation_health_score": round(veg_health_score, 2),
+        "green_space_ratio": min(100, max(0, green_ratio_pct)),
+        "seasonal_variation": min(1, max(0, seasonal_variation)),
+        "visible_green_fraction": min(100, max(0, visible_green_fraction)),
+        "semantic_gvi": round(semantic_gvi, 2),
+        "seasonal_consistency": round(seasonal_consistency, 3),
+        "street_level_ndvi": round(street_level_ndvi, 3)
+    }
+    
+    print(f"   ✅ GEE Greenness Analysis: {tree_canopy_pct:.1f}% canopy, health={veg_health_score:.1f}, SGVI={semantic_gvi:.1f}%, visible green={visible_green_fraction:.1f}%")
+    return result
+
+
 def get_urban_greenness_gee(lat: float, lon: float, radius_m: int = 1000) -> Optional[Dict]:
     """
     Get comprehensive urban greenness analysis using GEE.
@@ -556,6 +904,16 @@ def get_urban_greenness_gee(lat: float, lon: float, radius_m: int = 1000) -> Opt
     """
     if not GEE_AVAILABLE:
         return None
+
+    if radius_m == FEATURE_BUNDLE_GREENNESS_RADIUS_M:
+        bundle = get_feature_bundle(lat, lon)
+        if bundle is not None:
+            print(f"🌿 Urban greenness at {lat}, {lon} ({radius_m}m) from GEE feature bundle")
+            try:
+                return _bundle_greenness(bundle.get("greenness"))
+            except Exception as e:
+                print(f"   ⚠️  GEE greenness analysis error: {e}")
+                return None
         
     try:
         print(f"🌿 Analyzing urban greenness with GEE at {lat}, {lon}...")
@@ -570,11 +928,6 @@ def get_urban_greenness_gee(lat: float, lon: float, radius_m: int = 1000) -> Opt
                    .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 30)))
         
         # Build NDVI collection once, then derive seasonal means from explicit month subsets.
-        # normalizedDifference() drops scene timestamps; calendarRange needs system:time_start.
-        def _ndvi_with_time(image):
-            ndvi = image.normalizedDifference(['B8', 'B4']).rename('NDVI')
-            return ndvi.copyProperties(image, ['system:time_start', 'system:time_end'])
-
         ndvi_collection = sentinel.map(_ndvi_with_time)
         
         # Check if collection is empty
@@ -656,17 +1009,8 @@ def get_urban_greenness_gee(lat: float, lon: float, radius_m: int = 1000) -> Opt
         # Calculate seasonal variation from per-season NDVI means.
         seasonal_variation = 0.0
         try:
-            season_filters = [
-                ("winter", ee.Filter.Or(
-                    ee.Filter.calendarRange(12, 12, "month"),
-                    ee.Filter.calendarRange(1, 2, "month")
-                )),
-                ("spring", ee.Filter.calendarRange(3, 5, "month")),
-                ("summer", ee.Filter.calendarRange(6, 8, "month")),
-                ("fall", ee.Filter.calendarRange(9, 11, "month")),
-            ]
             season_values = []
-            for _, month_filter in season_filters:
+            for _, month_filter in _season_filters():
                 season_collection = ndvi_collection.filter(month_filter)
                 season_count = season_collection.size().getInfo()
                 if season_count == 0:
@@ -709,11 +1053,6 @@ def get_urban_greenness_gee(lat: float, lon: float, radius_m: int = 1000) -> Opt
             # Fallback: use green_ratio_pct as proxy
             visible_green_fraction = green_ratio_pct * 0.8  # Assume 80% of green space is visible
         
-        # NEW: Calculate seasonal consistency (year-round greenery)
-        # Lower seasonal variation = more consistent year-round greenery (better)
-        seasonal_consistency = 1.0 - min(1.0, seasonal_variation / 0.5)  # Normalize to 0-1
-        seasonal_consistency = max(0.0, min(1.0, seasonal_consistency))
-        
         # NEW: Street-level vegetation index (using higher resolution)
         # Calculate NDVI at 10m resolution (street-level) for more accurate eye-level estimate
         street_level_ndvi = 0.0
@@ -743,32 +1082,12 @@ def get_urban_greenness_gee(lat: float, lon: float, radius_m: int = 1000) -> Opt
             # Fallback: use overall NDVI
             street_level_ndvi = veg_health
         
-        # Get enhanced vegetation health metrics (VARI)
-        veg_health_metrics = get_vegetation_health_metrics(lat, lon, radius_m)
-        veg_health_ndvi = veg_health_metrics.get("vegetation_health_ndvi", veg_health) if veg_health_metrics else veg_health
-        veg_health_vari = veg_health_metrics.get("vegetation_health_vari", 0.0) if veg_health_metrics else 0.0
-        veg_health_score = veg_health_metrics.get("vegetation_health_score", veg_health * 100) if veg_health_metrics else (veg_health * 100)
-        
-        # Get semantic GVI
-        semantic_gvi_data = get_semantic_gvi(lat, lon, radius_m)
-        semantic_gvi = semantic_gvi_data.get("semantic_gvi", visible_green_fraction) if semantic_gvi_data else visible_green_fraction
-        
-        result = {
-            "tree_canopy_pct": min(100, max(0, tree_canopy_pct)),
-            "vegetation_health": min(1, max(0, veg_health)),  # Legacy key
-            "vegetation_health_ndvi": round(veg_health_ndvi, 3),
-            "vegetation_health_vari": round(veg_health_vari, 3),
-            "vegetation_health_score": round(veg_health_score, 2),
-            "green_space_ratio": min(100, max(0, green_ratio_pct)),
-            "seasonal_variation": min(1, max(0, seasonal_variation)),
-            "visible_green_fraction": min(100, max(0, visible_green_fraction)),
-            "semantic_gvi": round(semantic_gvi, 2),
-            "seasonal_consistency": round(seasonal_consistency, 3),
-            "street_level_ndvi": round(street_level_ndvi, 3)
-        }
-        
-        print(f"   ✅ GEE Greenness Analysis: {tree_canopy_pct:.1f}% canopy, health={veg_health_score:.1f}, SGVI={semantic_gvi:.1f}%, visible green={visible_green_fraction:.1f}%")
-        return result
+        return _assemble_greenness(
+            tree_canopy_pct, veg_health, green_ratio_pct, seasonal_variation,
+            visible_green_fraction, street_level_ndvi,
+            get_vegetation_health_metrics(lat, lon, radius_m),
+            get_semantic_gvi(lat, lon, radius_m),
+        )
         
     except Exception as e:
         print(f"   ⚠️  GEE greenness analysis error: {e}")
@@ -874,6 +1193,11 @@ def get_building_height_diversity_ghsl(lat: float, lon: float, radius_m: int = 1
         }
         or None if unavailable.
     """
+    local = raster_local.building_height_stats(lat, lon, radius_m)
+    if local is not None:
+        print(f"🗂️  Building height diversity (GHSL) at {lat}, {lon} from local raster tiles")
+        return _summarize_building_height(local)
+
     if not GEE_AVAILABLE:
         return None
 
@@ -899,30 +1223,35 @@ def get_building_height_diversity_ghsl(lat: float, lon: float, radius_m: int = 1
             maxPixels=1e9
         ).getInfo()
 
-        if not stats:
-            return None
+        return _summarize_building_height(stats)
 
-        mean_height = stats.get('built_height_mean')
-        std_height = stats.get('built_height_stdDev')
-        p90_height = stats.get('built_height_p90')
+    except Exception as e:
+        print(f"   ⚠️  GHSL building height error: {e}")
+        return None
 
-        if mean_height is None:
-            return None
 
-        result = {
-            "mean_height_m": float(mean_height),
-            "std_height_m": float(std_height) if std_height is not None else 0.0,
-            "p90_height_m": float(p90_height) if p90_height is not None else float(mean_height)
-        }
+def _summarize_building_height(stats: Optional[Dict]) -> Optional[Dict]:
+    """Mean / std / p90 building height from a built_height mean-stdDev-p90 reduction."""
+    if not stats:
+        return None
 
-        print(f"   ✅ GHSL building height: mean={result['mean_height_m']:.1f}m, "
-              f"std={result['std_height_m']:.1f}m, p90={result['p90_height_m']:.1f}m")
-        return result
+    mean_height = stats.get('built_height_mean')
+    std_height = stats.get('built_height_stdDev')
+    p90_height = stats.get('built_height_p90')
 
-    except Exception as e:
-        print(f"   ⚠️  GHSL building height error: {e}")
+    if mean_height is None:
         return None
 
+    result = {
+        "mean_height_m": float(mean_height),
+        "std_height_m": float(std_height) if std_height is not None else 0.0,
+        "p90_height_m": float(p90_height) if p90_height is not None else float(mean_height)
+    }
+
+    print(f"   ✅ GHSL building height: mean={result['mean_height_m']:.1f}m, "
+          f"std={result['std_height_m']:.1f}m, p90={result['p90_height_m']:.1f}m")
+    return result
+
 
 @cached(ttl_seconds=CACHE_TTL.get('census_data', 48 * 3600))  # Building footprints are very stable
 def get_building_coverage_ms_footprints(lat: float, lon: float, radius_m: int = 1000) -> Optional[Dict]:
@@ -992,6 +1321,80 @@ def get_building_coverage_ms_footprints(lat: float, lon: float, radius_m: int =
         return None
 
 
+def _summarize_topography(dem_info: Optional[Dict], slope_info: Optional[Dict], steep_info: Optional[Dict],
+                          dem_std_info: Optional[Dict], center_elev: Optional[Dict],
+                          surrounding_elev: Optional[Dict], radius_m: int) -> Optional[Dict]:
+    """Relief, prominence, ruggedness and slope summary from the SRTM reductions."""
+    if not dem_info or not slope_info:
+        return None
+
+    elevation_min = dem_info.get('elevation_min')
+    elevation_max = dem_info.get('elevation_max')
+    elevation_mean = dem_info.get('elevation_mean')
+    relief = None
+    if elevation_min is not None and elevation_max is not None:
+        relief = elevation_max - elevation_min
+
+    # Calculate prominence: center elevation - mean surrounding elevation
+    prominence = None
+    if center_elev and elevation_mean is not None:
+        center_elev_val = center_elev.get('elevation_mean') or center_elev.get('elevation')
+        if center_elev_val is not None:
+            if surrounding_elev:
+                surrounding_elev_val = surrounding_elev.get('elevation_mean') or surrounding_elev.get('elevation')
+                if surrounding_elev_val is not None:
+                    prominence = max(0.0, center_elev_val - surrounding_elev_val)
+            else:
+                # Fallback: use p10 as proxy for surrounding elevation
+                if elevation_min is not None:
+                    prominence = max(0.0, center_elev_val - elevation_min)
+
+    # Calculate ruggedness index: standard deviation of elevation
+    ruggedness_index = None
+    if dem_std_info:
+        ruggedness_index = dem_std_info.get('elevation_stdDev') or dem_std_info.get('elevation')
+
+    # Calculate local relief intensity: relief per unit area (m/km²)
+    # Buffer area in km²
+    buffer_area_km2 = (math.pi * (radius_m / 1000.0) ** 2) if radius_m else None
+    relief_intensity = None
+    if relief is not None and buffer_area_km2 and buffer_area_km2 > 0:
+        relief_intensity = relief / buffer_area_km2
+
+    topography = {
+        "source": "USGS/SRTMGL1_003",
+        "elevation_mean_m": elevation_mean,
+        "elevation_min_m": elevation_min,
+        "elevation_max_m": elevation_max,
+        "elevation_p10_m": dem_info.get('elevation_p10'),
+        "elevation_p90_m": dem_info.get('elevation_p90'),
+        "relief_range_m": relief,
+        "relief_intensity_m_per_km2": relief_intensity,
+        "terrain_prominence_m": prominence,
+        "ruggedness_index_m": ruggedness_index,
+        "slope_mean_deg": slope_info.get('slope_mean'),
+        "slope_max_deg": slope_info.get('slope_max'),
+        "slope_std_deg": slope_info.get('slope_stdDev'),
+        "slope_p85_deg": slope_info.get('slope_p85'),
+        "steep_fraction": steep_info.get('slope') if steep_info else None
+    }
+
+    # Validate slope values against elevation (sanity check - doesn't affect scoring)
+    # Design principle: Transparent and documented - flag data quality issues
+    if elevation_mean is not None and topography["slope_mean_deg"] is not None:
+        # Rough heuristic: higher elevation should generally have higher slope
+        # This is not a hard rule, but can flag anomalies
+        expected_min_slope = min(5.0, elevation_mean / 1000.0)  # Conservative estimate
+        if elevation_mean > 500 and topography["slope_mean_deg"] < expected_min_slope * 0.3:
+            print(
+                f"   ⚠️  Slope {topography['slope_mean_deg']:.1f}° seems unusually low "
+                f"for elevation {elevation_mean:.0f}m - verify data quality"
+            )
+
+    print(f"   ✅ GEE Topography: relief={relief:.1f}m, prominence={prominence:.1f}m, ruggedness={ruggedness_index:.1f}m, mean slope={topography['slope_mean_deg']:.1f}°")
+    return topography
+
+
 def get_topography_context(lat: float, lon: float, radius_m: int = 5000) -> Optional[Dict]:
     """
     Analyze elevation and slope context around a location.
@@ -999,9 +1402,35 @@ def get_topography_context(lat: float, lon: float, radius_m: int = 5000) -> Opti
     Returns statistics describing terrain relief which can be used to boost
     scenic scoring for hillside and mountain locations.
     """
+    local = raster_local.topography_reductions(lat, lon, radius_m)
+    if local is not None:
+        print(f"🗂️  Topography at {lat}, {lon} ({radius_m}m) from local raster tiles")
+        try:
+            return _summarize_topography(
+                local["dem"], local["slope"], local["steep"], local["dem_std"],
+                local["center"], local["surrounding"], radius_m,
+            )
+        except Exception as e:
+            print(f"⚠️  Local topography analysis error: {e}")
+            return None
+
     if not GEE_AVAILABLE:
         return None
 
+    if radius_m == FEATURE_BUNDLE_TOPOGRAPHY_RADIUS_M:
+        bundle = get_feature_bundle(lat, lon)
+        if bundle is not None and bundle.get("topography"):
+            topo = bundle["topography"]
+            print(f"⛰️  Topography at {lat}, {lon} ({radius_m}m) from GEE feature bundle")
+            try:
+                return _summarize_topography(
+                    topo.get("dem"), topo.get("slope"), topo.get("steep"), topo.get("dem_std"),
+                    topo.get("center"), topo.get("surrounding"), radius_m,
+                )
+            except Exception as e:
+                print(f"⚠️  GEE topography analysis error: {e}")
+                return None
+
     try:
         print(f"⛰️  Analyzing topography with GEE at {lat}, {lon} (radius={radius_m}m)")
         point = ee.Geometry.Point([lon, lat])
@@ -1080,81 +1509,16 @@ def get_topography_context(lat: float, lon: float, radius_m: int = 5000) -> Opti
         center_elev = center_elevation.getInfo()
         surrounding_elev = surrounding_elevation.getInfo() if surrounding_elevation else None
 
-        if not dem_info or not slope_info:
-            return None
-
-        elevation_min = dem_info.get('elevation_min')
-        elevation_max = dem_info.get('elevation_max')
-        elevation_mean = dem_info.get('elevation_mean')
-        relief = None
-        if elevation_min is not None and elevation_max is not None:
-            relief = elevation_max - elevation_min
-
-        # Calculate prominence: center elevation - mean surrounding elevation
-        prominence = None
-        if center_elev and elevation_mean is not None:
-            center_elev_val = center_elev.get('elevation_mean') or center_elev.get('elevation')
-            if center_elev_val is not None:
-                if surrounding_elev:
-                    surrounding_elev_val = surrounding_elev.get('elevation_mean') or surrounding_elev.get('elevation')
-                    if surrounding_elev_val is not None:
-                        prominence = max(0.0, center_elev_val - surrounding_elev_val)
-                else:
-                    # Fallback: use p10 as proxy for surrounding elevation
-                    if elevation_min is not None:
-                        prominence = max(0.0, center_elev_val - elevation_min)
-
-        # Calculate ruggedness index: standard deviation of elevation
-        ruggedness_index = None
-        if dem_std_info:
-            ruggedness_index = dem_std_info.get('elevation_stdDev') or dem_std_info.get('elevation')
-
-        # Calculate local relief intensity: relief per unit area (m/km²)
-        # Buffer area in km²
-        buffer_area_km2 = (math.pi * (radius_m / 1000.0) ** 2) if radius_m else None
-        relief_intensity = None
-        if relief is not None and buffer_area_km2 and buffer_area_km2 > 0:
-            relief_intensity = relief / buffer_area_km2
-
-        topography = {
-            "source": "USGS/SRTMGL1_003",
-            "elevation_mean_m": elevation_mean,
-            "elevation_min_m": elevation_min,
-            "elevation_max_m": elevation_max,
-            "elevation_p10_m": dem_info.get('elevation_p10'),
-            "elevation_p90_m": dem_info.get('elevation_p90'),
-            "relief_range_m": relief,
-            "relief_intensity_m_per_km2": relief_intensity,
-            "terrain_prominence_m": prominence,
-            "ruggedness_index_m": ruggedness_index,
-            "slope_mean_deg": slope_info.get('slope_mean'),
-            "slope_max_deg": slope_info.get('slope_max'),
-            "slope_std_deg": slope_info.get('slope_stdDev'),
-            "slope_p85_deg": slope_info.get('slope_p85'),
-            "steep_fraction": steep_info.get('slope') if steep_info else None
-        }
-
-        # Validate slope values against elevation (sanity check - doesn't affect scoring)
-        # Design principle: Transparent and documented - flag data quality issues
-        if elevation_mean is not None and topography["slope_mean_deg"] is not None:
-            # Rough heuristic: higher elevation should generally have higher slope
-            # This is not a hard rule, but can flag anomalies
-            expected_min_slope = min(5.0, elevation_mean / 1000.0)  # Conservative estimate
-            if elevation_mean > 500 and topography["slope_mean_deg"] < expected_min_slope * 0.3:
-                print(
-                    f"   ⚠️  Slope {topography['slope_mean_deg']:.1f}° seems unusually low "
-                    f"for elevation {elevation_mean:.0f}m - verify data quality"
-                )
-
-        print(f"   ✅ GEE Topography: relief={relief:.1f}m, prominence={prominence:.1f}m, ruggedness={ruggedness_index:.1f}m, mean slope={topography['slope_mean_deg']:.1f}°")
-        return topography
+        return _summarize_topography(dem_info, slope_info, steep_info, dem_std_info,
+                                     center_elev, surrounding_elev, radius_m)
 
     except Exception as e:
         print(f"⚠️  GEE topography analysis error: {e}")
         return None
 
 
-@cached(ttl_seconds=CACHE_TTL.get('census_data', 48 * 3600))  # Cache for 48 hours
+@cached(ttl_seconds=CACHE_TTL.get('census_data', 48 * 3600),
+        spatial=SpatialBucket(point_args=("landcover_metrics",)))  # Cache for 48 hours
 def get_viewshed_proxy(lat: float, lon: float, radius_m: int = 5000, 
                       landcover_metrics: Optional[Dict] = None) -> Optional[Dict]:
     """
@@ -1168,7 +1532,9 @@ def get_viewshed_proxy(lat: float, lon: float, radius_m: int = 5000,
         lat: Latitude
         lon: Longitude
         radius_m: Analysis radius in meters (default 5000m)
-        landcover_metrics: Optional pre-computed landcover metrics (to avoid redundant GEE calls)
+        landcover_metrics: Optional pre-computed landcover metrics (to avoid redundant GEE calls).
+            Ignored when the location is snapped to an H3 cell: landcover is then read at
+            the cell centre, so every point in the cell shares one cache entry.
     
     Returns:
         Dict with keys:
@@ -1388,6 +1754,50 @@ def get_scenic_viewshed_index(lat: float, lon: float, radius_m: int = 5000,
     return get_viewshed_proxy(lat, lon, radius_m, landcover_metrics)
 
 
+def _summarize_landcover(hist_info: Optional[Dict]) -> Optional[Dict]:
+    """Class percentages from a {"source", "histogram"} land cover histogram."""
+    if hist_info is None:
+        return None
+
+    histogram = hist_info["histogram"]
+    total_pixels = sum(histogram.values())
+    if total_pixels <= 0:
+        return None
+
+    def pct(class_ids):
+        count = sum(histogram.get(cid, 0) for cid in class_ids)
+        return round((count / total_pixels) * 100, 2)
+
+    if hist_info["source"].startswith('NLCD'):
+        forest_pct = pct([41, 42, 43])
+        wetland_pct = pct([90, 95])
+        water_pct = pct([11])
+        shrub_pct = pct([52])
+        grass_pct = pct([71])
+        developed_pct = pct([21, 22, 23, 24])
+    else:
+        # ESA WorldCover class mapping (see https://esa-worldcover.org/en/data-access)
+        forest_pct = pct([10, 20, 30])
+        wetland_pct = pct([90])
+        water_pct = pct([80])
+        shrub_pct = pct([40])
+        grass_pct = pct([60])
+        developed_pct = pct([50])
+
+    result = {
+        "source": hist_info["source"],
+        "forest_pct": forest_pct,
+        "wetland_pct": wetland_pct,
+        "water_pct": water_pct,
+        "shrub_pct": shrub_pct,
+        "grass_pct": grass_pct,
+        "developed_pct": developed_pct
+    }
+
+    print(f"   ✅ GEE Land Cover ({hist_info['source']}): forest={forest_pct}%, water={water_pct}%")
+    return result
+
+
 @cached(ttl_seconds=CACHE_TTL.get('census_data', 48 * 3600))  # Landcover is stable; cache aggressively.
 def get_landcover_context_gee(lat: float, lon: float, radius_m: int = 3000) -> Optional[Dict]:
     """
@@ -1395,9 +1805,20 @@ def get_landcover_context_gee(lat: float, lon: float, radius_m: int = 3000) -> O
 
     Attempts NLCD (US-only) first, then falls back to ESA WorldCover for global coverage.
     """
+    local = raster_local.landcover_histogram(lat, lon, radius_m)
+    if local is not None:
+        print(f"🗂️  Land cover at {lat}, {lon} ({radius_m}m) from local raster tiles")
+        return _summarize_landcover(local)
+
     if not GEE_AVAILABLE:
         return None
 
+    if radius_m == FEATURE_BUNDLE_LANDCOVER_RADIUS_M:
+        bundle = get_feature_bundle(lat, lon)
+        if bundle is not None:
+            print(f"🗺️  Land cover at {lat}, {lon} ({radius_m}m) from GEE feature bundle")
+            return _summarize_landcover(_bundle_landcover_histogram(bundle))
+
     def _compute_histogram(image: ee.Image, band: str, source: str) -> Optional[Dict]:
         histogram = image.reduceRegion(
             reducer=ee.Reducer.frequencyHistogram(),
@@ -1429,46 +1850,7 @@ def get_landcover_context_gee(lat: float, lon: float, radius_m: int = 3000) -> O
             worldcover = ee.ImageCollection('ESA/WorldCover/v200').first().select('Map')
             hist_info = _compute_histogram(worldcover, 'Map', 'ESA WorldCover v200')
 
-        if hist_info is None:
-            return None
-
-        histogram = hist_info["histogram"]
-        total_pixels = sum(histogram.values())
-        if total_pixels <= 0:
-            return None
-
-        def pct(class_ids):
-            count = sum(histogram.get(cid, 0) for cid in class_ids)
-            return round((count / total_pixels) * 100, 2)
-
-        if hist_info["source"].startswith('NLCD'):
-            forest_pct = pct([41, 42, 43])
-            wetland_pct = pct([90, 95])
-            water_pct = pct([11])
-            shrub_pct = pct([52])
-            grass_pct = pct([71])
-            developed_pct = pct([21, 22, 23, 24])
-        else:
-            # ESA WorldCover class mapping (see https://esa-worldcover.org/en/data-access)
-            forest_pct = pct([10, 20, 30])
-            wetland_pct = pct([90])
-            water_pct = pct([80])
-            shrub_pct = pct([40])
-            grass_pct = pct([60])
-            developed_pct = pct([50])
-
-        result = {
-            "source": hist_info["source"],
-            "forest_pct": forest_pct,
-            "wetland_pct": wetland_pct,
-            "water_pct": water_pct,
-            "shrub_pct": shrub_pct,
-            "grass_pct": grass_pct,
-            "developed_pct": developed_pct
-        }
-
-        print(f"   ✅ GEE Land Cover ({hist_info['source']}): forest={forest_pct}%, water={water_pct}%")
-        return result
+        return _summarize_landcover(hist_info)
 
     except Exception as e:
         print(f"⚠️  GEE land cover analysis error: {e}")
@@ -1491,6 +1873,11 @@ def get_heat_exposure_lst(
     readings (e.g. barrier islands, peninsulas) and the caller falls back to neutral scoring.
     regional_radius_m kept in signature for backward compatibility but no longer used.
     """
+    local = raster_local.heat_exposure_counts(lat, lon, local_radius_m)
+    if local is not None:
+        local_c, land_count, total_count = local
+        return _summarize_heat_exposure(local_c, land_count, total_count)
+
     if not GEE_AVAILABLE:
         return None
     try:
@@ -1548,28 +1935,34 @@ def get_heat_exposure_lst(
         local_c = local_info.get('lst_c')
         if local_c is None and len(local_info) == 1:
             local_c = next(iter(local_info.values()))
-        if local_c is None:
-            return None
-        try:
-            local_f = float(local_c)
-        except (TypeError, ValueError):
-            return None
-        if not abs(local_f) < 1e6:
-            return None
 
         land_count = (land_count_info or {}).get('lst_c', 0) or 0
         total_count = (total_count_info or {}).get('lst_c', 1) or 1
-        land_fraction = round(land_count / total_count, 3) if total_count > 0 else 0.0
-
-        return {
-            'local_lst_c': round(local_f, 2),
-            'land_pixel_fraction': land_fraction,
-        }
+        return _summarize_heat_exposure(local_c, land_count, total_count)
     except Exception as e:
         print(f"   ⚠️  GEE LST heat exposure error: {e}")
         return None
 
 
+def _summarize_heat_exposure(local_c, land_count: int, total_count: int) -> Optional[Dict]:
+    """Local land LST (deg C) and land pixel fraction of the buffer."""
+    if local_c is None:
+        return None
+    try:
+        local_f = float(local_c)
+    except (TypeError, ValueError):
+        return None
+    if not abs(local_f) < 1e6:
+        return None
+
+    land_fraction = round(land_count / total_count, 3) if total_count > 0 else 0.0
+
+    return {
+        'local_lst_c': round(local_f, 2),
+        'land_pixel_fraction': land_fraction,
+    }
+
+
 @cached(ttl_seconds=CACHE_TTL.get('census_data', 48 * 3600))
 def get_air_quality_aer_ai(lat: float, lon: float, radius_m: int = 2000) -> Optional[Dict]:
     """
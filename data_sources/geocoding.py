@@ -8,6 +8,7 @@ import time
 import logging
 import requests
 from typing import Optional, Tuple, Dict
+from . import gazetteer, http_client
 from .cache import cached, CACHE_TTL
 
 logger = logging.getLogger(__name__)
@@ -47,7 +48,7 @@ def _nominatim_get_with_retries(
             delay = 1.0 * (2 ** (attempt - 1))
             time.sleep(delay)
         try:
-            resp = requests.get(NOMINATIM_URL, params=params, headers=headers, timeout=timeout)
+            resp = http_client.get(NOMINATIM_URL, params=params, headers=headers, timeout=timeout)
             last_status = resp.status_code
             if resp.status_code == 200:
                 last_data = resp.json() if resp.content else None
@@ -270,7 +271,7 @@ def _find_city_relation_for_element(element_type: str, element_id: int, lat: flo
         out skel qt;
         """
         
-        response = requests.post(
+        response = http_client.post(
             get_overpass_url(),
             data={"data": query},
             headers={"User-Agent": "HomeFit/1.0"},
@@ -328,7 +329,7 @@ def _find_place_node(name: str, place_type: str, state: Optional[str] = None) ->
         out;
         """
         
-        response = requests.post(
+        response = http_client.post(
             get_overpass_url(),
             data={"data": query},
             headers={"User-Agent": "HomeFit/1.0"},
@@ -439,7 +440,7 @@ def _get_relation_center_or_admin_centre(osm_id: int, city_name: Optional[str] =
         out skel qt;
         """
         
-        response = requests.post(
+        response = http_client.post(
             get_overpass_url(),
             data={"data": query},
             headers={"User-Agent": "HomeFit/1.0"},
@@ -506,7 +507,7 @@ def _get_relation_center_or_admin_centre(osm_id: int, city_name: Optional[str] =
             """
             
             try:
-                place_response = requests.post(
+                place_response = http_client.post(
                     get_overpass_url(),
                     data={"data": place_query},
                     headers={"User-Agent": "HomeFit/1.0"},
@@ -552,7 +553,7 @@ def _get_relation_center_or_admin_centre(osm_id: int, city_name: Optional[str] =
                 """
                 
                 try:
-                    radius_response = requests.post(
+                    radius_response = http_client.post(
                         get_overpass_url(),
                         data={"data": radius_query},
                         headers={"User-Agent": "HomeFit/1.0"},
@@ -611,7 +612,7 @@ def _get_relation_center_or_admin_centre(osm_id: int, city_name: Optional[str] =
                 node({admin_centre_id});
                 out;
                 """
-                node_response = requests.post(
+                node_response = http_client.post(
                     get_overpass_url(),
                     data={"data": node_query},
                     headers={"User-Agent": "HomeFit/1.0"},
@@ -644,7 +645,7 @@ def _get_relation_center_or_admin_centre(osm_id: int, city_name: Optional[str] =
                 node({label_id});
                 out;
                 """
-                node_response = requests.post(
+                node_response = http_client.post(
                     get_overpass_url(),
                     data={"data": node_query},
                     headers={"User-Agent": "HomeFit/1.0"},
@@ -667,7 +668,7 @@ def _get_relation_center_or_admin_centre(osm_id: int, city_name: Optional[str] =
         out center;
         """
         
-        center_response = requests.post(
+        center_response = http_client.post(
             get_overpass_url(),
             data={"data": center_query},
             headers={"User-Agent": "HomeFit/1.0"},
@@ -715,7 +716,7 @@ def _get_relation_center_or_admin_centre(osm_id: int, city_name: Optional[str] =
                                         out;
                                         """
                                         try:
-                                            inland_response = requests.post(
+                                            inland_response = http_client.post(
                                                 get_overpass_url(),
                                                 data={"data": inland_query},
                                                 headers={"User-Agent": "HomeFit/1.0"},
@@ -776,7 +777,7 @@ def _geocode_census(address: str) -> Optional[Tuple[float, float, str, str, str]
             "benchmark": "Public_AR_Current",
             "format": "json",
         }
-        response = requests.get(
+        response = http_client.get(
             CENSUS_ONELINE_URL, params=oneline_params, headers={"User-Agent": "HomeFit/1.0"}, timeout=10
         )
         if response.status_code == 200:
@@ -824,7 +825,7 @@ def _geocode_census(address: str) -> Optional[Tuple[float, float, str, str, str]
             "vintage": "Current_Current",
             "format": "json",
         }
-        response = requests.get(
+        response = http_client.get(
             CENSUS_GEOCODER_URL, params=params, headers={"User-Agent": "HomeFit/1.0"}, timeout=10
         )
         if response.status_code != 200:
@@ -863,6 +864,12 @@ def geocode(address: str) -> Optional[Tuple[float, float, str, str, str]]:
     Returns:
         (lat, lon, zip_code, state, city) or None if failed
     """
+    # ZIP / "Town, ST" / catalog neighborhoods: local gazetteer before any network geocoder
+    local = gazetteer.lookup(address)
+    if local is not None:
+        lat, lon, zip_code, state, city, _full = local
+        return lat, lon, zip_code, state, city
+
     # Check if this is a US zip code (5-digit number)
     is_us_zip = _is_us_zip_code(address)
     
@@ -889,7 +896,7 @@ def geocode(address: str) -> Optional[Tuple[float, float, str, str, str]]:
                     "vintage": "Current_Current",
                     "format": "json"
                 }
-                response = requests.get(
+                response = http_client.get(
                     CENSUS_GEOCODER_URL, params=params, headers={"User-Agent": "HomeFit/1.0"}, timeout=10)
                 if response.status_code == 200:
                     data = response.json()
@@ -1131,7 +1138,7 @@ def geocode(address: str) -> Optional[Tuple[float, float, str, str, str]]:
             
             # Retry with higher limit to find state match
             params["limit"] = 5
-            retry_response = requests.get(
+            retry_response = http_client.get(
                 NOMINATIM_URL, params=params, headers=headers, timeout=10)
             
             if retry_response.status_code == 200:
@@ -1306,7 +1313,7 @@ def _find_neighborhood_near_coordinates(lat: float, lon: float, name: str, state
         out center;
         """
         
-        response = requests.post(
+        response = http_client.post(
             get_overpass_url(),
             data={"data": query},
             headers={"User-Agent": "HomeFit/1.0"},
@@ -1427,6 +1434,7 @@ def geocode_with_full_result(address: str) -> Optional[Tuple[float, float, str,
     Geocode with full response for neighborhood detection.
     
     Uses hybrid approach:
+    0. Local gazetteer (ZIP, "Town, ST", catalog neighborhoods) when built
     1. Try Census API first (for US addresses with state)
     2. Fall back to Nominatim with state prioritization
     3. If query suggests neighborhood but result is city, retry with limit=5
@@ -1442,6 +1450,12 @@ def geocode_with_full_result(address: str) -> Optional[Tuple[float, float, str,
         full_result: Complete geocoding response including address structure
     """
     t0_geocode = time.perf_counter()
+    # ZIP / "Town, ST" / catalog neighborhoods: local gazetteer before any network geocoder
+    local = gazetteer.lookup(address)
+    if local is not None:
+        _log_timing("gazetteer", t0_geocode)
+        return local
+
     # Check if this is a US zip code (5-digit number)
     is_us_zip = _is_us_zip_code(address)
     
@@ -1486,7 +1500,7 @@ def geocode_with_full_result(address: str) -> Optional[Tuple[float, float, str,
                     "vintage": "Current_Current",
                     "format": "json"
                 }
-                response = requests.get(
+                response = http_client.get(
                     CENSUS_GEOCODER_URL, params=params, headers={"User-Agent": "HomeFit/1.0"}, timeout=10)
                 if response.status_code == 200:
                     data = response.json()
@@ -1890,7 +1904,7 @@ def reverse_geocode(lat: float, lon: float) -> Optional[str]:
             "User-Agent": "HomeFit/1.0"
         }
         
-        response = requests.get(
+        response = http_client.get(
             NOMINATIM_REVERSE_URL, params=params, headers=headers, timeout=10)
         
         if response.status_code != 200:
@@ -1919,7 +1933,7 @@ def zip_from_coordinates(lat: float, lon: float) -> Optional[str]:
     Used as fallback when forward geocoding a city name returns no zip.
     """
     try:
-        response = requests.get(
+        response = http_client.get(
             "https://nominatim.openstreetmap.org/reverse",
             params={"lat": lat, "lon": lon, "format": "json", "addressdetails": 1},
             headers={"User-Agent": "HomeFit/1.0"},
@@ -0,0 +1,235 @@
+"""
+Local GTFS feed store.
+
+Answers the transit pillar's stop, route and schedule lookups (transitland_api
+get_nearby_transit_stops / get_route_schedules and public_transit_access._get_nearby_routes)
+from agency GTFS zips loaded offline by `scripts/baselines/build_gtfs_store.py`, so a
+score does not make several rate-limited Transitland calls for data that only changes
+when agencies publish a new schedule.
+
+Schema (SQLite):
+  feeds(name, min_lat, min_lon, max_lat, max_lon, weekday_date, weekend_date)
+                                                 -- feed extents + service days sampled
+  stops(id, stop_key, name, lat, lon, route_type)
+  stop_index                                     -- RTree over stops
+  routes(id, route_key, short_name, long_name, route_type, agency)
+  stop_routes(stop_id, route_id)
+  stop_service(stop_id, weekday_trips, weekend_trips, service_span_hours,
+               peak_headway_minutes, off_peak_headway_minutes,
+               first_departure, last_departure, headsigns,
+               destinations, route_type_mix)     -- per-stop service-frequency index
+
+Stop keys are ``gtfs:<feed>:<stop_id>`` so callers can tell local stops from Transitland
+onestop ids. Queries whose circle is not inside one feed extent return None and callers
+keep the Transitland path.
+
+Override path via env ``HOMEFIT_GTFS_DB_PATH`` (opened through local_sqlite.LocalDB).
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from logging_config import get_logger
+
+from .local_sqlite import LocalDB, bbox as _bbox
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data_cache" / "gtfs.sqlite"
+
+STOP_KEY_PREFIX = "gtfs:"
+
+# SQLite caps host parameters per statement; chunk IN (...) lookups below this.
+_IN_CHUNK = 900
+
+_DB = LocalDB("HOMEFIT_GTFS_DB_PATH", DEFAULT_DB_PATH, "GTFS store")
+
+
+@lru_cache(maxsize=1)
+def _extents() -> Tuple[Tuple[float, float, float, float], ...]:
+    conn = _DB.connect()
+    if conn is None:
+        return ()
+    try:
+        rows = conn.execute("SELECT min_lat, min_lon, max_lat, max_lon FROM feeds").fetchall()
+    except Exception as exc:
+        logger.warning("Local GTFS store has no readable feeds table: %s", exc)
+        return ()
+    return tuple((float(a), float(b), float(c), float(d)) for a, b, c, d in rows)
+
+
+def reset() -> None:
+    """Close every thread's connection and drop cached path/extent state (tests, or after swapping the DB file)."""
+    _DB.reset()
+    _extents.cache_clear()
+
+
+def covers(lat: float, lon: float, radius_m: float) -> bool:
+    """True when the whole query circle lies inside one feed extent."""
+    extents = _extents()
+    if not extents:
+        return False
+    min_lat, min_lon, max_lat, max_lon = _bbox(lat, lon, radius_m)
+    return any(
+        e_min_lat <= min_lat and e_min_lon <= min_lon and e_max_lat >= max_lat and e_max_lon >= max_lon
+        for e_min_lat, e_min_lon, e_max_lat, e_max_lon in extents
+    )
+
+
+def owns(stop_id: Optional[str]) -> bool:
+    """True for stop ids handed out by this store."""
+    return bool(stop_id) and str(stop_id).startswith(STOP_KEY_PREFIX)
+
+
+def _stops_within(conn: sqlite3.Connection, lat: float, lon: float, radius_m: float) -> List[Tuple[float, int, str, str, float, float, Optional[int]]]:
+    from data_sources.utils import haversine_distance
+
+    min_lat, min_lon, max_lat, max_lon = _bbox(lat, lon, radius_m)
+    rows = conn.execute(
+        "SELECT s.id, s.stop_key, s.name, s.lat, s.lon, s.route_type FROM stop_index i "
+        "JOIN stops s ON s.id = i.id "
+        "WHERE i.min_lat <= ? AND i.max_lat >= ? AND i.min_lon <= ? AND i.max_lon >= ?",
+        (max_lat, min_lat, max_lon, min_lon),
+    ).fetchall()
+    out = []
+    for sid, key, name, s_lat, s_lon, route_type in rows:
+        dist = haversine_distance(lat, lon, s_lat, s_lon)
+        if dist <= radius_m:
+            out.append((dist, sid, key, name, s_lat, s_lon, route_type))
+    out.sort()
+    return out
+
+
+def nearby_stops(lat: float, lon: float, radius_m: float, limit: Optional[int] = None) -> Optional[List[Dict]]:
+    """
+    Stops within radius_m, nearest first, shaped like transitland_api's processed stops
+    (id, name, lat, lon, distance_m, route_type). None when the circle is not covered.
+    """
+    if not covers(lat, lon, radius_m):
+        return None
+    conn = _DB.connect()
+    try:
+        found = _stops_within(conn, lat, lon, radius_m)
+    except Exception as exc:
+        logger.warning("Local GTFS stop query failed: %s", exc)
+        return None
+    if limit is not None:
+        found = found[:limit]
+    return [
+        {
+            "id": key,
+            "name": name,
+            "lat": s_lat,
+            "lon": s_lon,
+            "distance_m": round(dist, 0),
+            "route_type": route_type,
+        }
+        for dist, _sid, key, name, s_lat, s_lon, route_type in found
+    ]
+
+
+def nearby_routes(lat: float, lon: float, radius_m: float, limit: Optional[int] = None) -> Optional[List[Dict]]:
+    """
+    Routes serving a stop within radius_m, shaped like public_transit_access._get_nearby_routes
+    (located at their nearest such stop). None when the circle is not covered.
+    """
+    if not covers(lat, lon, radius_m):
+        return None
+    conn = _DB.connect()
+    try:
+        found = _stops_within(conn, lat, lon, radius_m)
+        by_stop = {sid: (dist, s_lat, s_lon) for dist, sid, _key, _name, s_lat, s_lon, _rt in found}
+        stop_ids = list(by_stop)
+        nearest_stop: Dict[int, Tuple[float, float, float]] = {}
+        for i in range(0, len(stop_ids), _IN_CHUNK):
+            chunk = stop_ids[i:i + _IN_CHUNK]
+            for sid, rid in conn.execute(
+                f"SELECT stop_id, route_id FROM stop_routes WHERE stop_id IN ({','.join('?' * len(chunk))})", chunk
+            ):
+                if rid not in nearest_stop or by_stop[sid][0] < nearest_stop[rid][0]:
+                    nearest_stop[rid] = by_stop[sid]
+        route_ids = sorted(nearest_stop, key=lambda rid: nearest_stop[rid][0])
+        if limit is not None:
+            route_ids = route_ids[:limit]
+        meta = {}
+        for i in range(0, len(route_ids), _IN_CHUNK):
+            chunk = route_ids[i:i + _IN_CHUNK]
+            for row in conn.execute(
+                "SELECT id, route_key, short_name, long_name, route_type, agency FROM routes "
+                f"WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ):
+                meta[row[0]] = row[1:]
+    except Exception as exc:
+        logger.warning("Local GTFS route query failed: %s", exc)
+        return None
+
+    routes = []
+    for rid in route_ids:
+        route_key, short_name, long_name, route_type, agency = meta[rid]
+        dist, r_lat, r_lon = nearest_stop[rid]
+        routes.append({
+            "name": long_name or short_name or "Unknown",
+            "short_name": short_name,
+            "route_type": route_type,
+            "agency": agency or "Unknown",
+            "distance_km": dist / 1000.0,
+            "lat": r_lat,
+            "lon": r_lon,
+            "route_id": route_key,
+        })
+    return routes
+
+
+def stop_frequency(stop_keys: List[str]) -> Dict[str, Dict]:
+    """
+    Service-frequency index rows for local stops with weekday service, keyed by stop key:
+    schedule metrics shaped like transitland_api.get_route_schedules (minus raw
+    departures) plus weekend_trips, weekday headsigns, destinations (terminal stations)
+    and route_type_mix ({route_type: weekday trips}).
+    """
+    keys = [k for k in stop_keys if owns(k)]
+    conn = _DB.connect()
+    if conn is None or not keys:
+        return {}
+    out: Dict[str, Dict] = {}
+    try:
+        for i in range(0, len(keys), _IN_CHUNK):
+            chunk = keys[i:i + _IN_CHUNK]
+            rows = conn.execute(
+                "SELECT s.stop_key, v.weekday_trips, v.weekend_trips, v.service_span_hours, "
+                "v.peak_headway_minutes, v.off_peak_headway_minutes, v.first_departure, v.last_departure, "
+                "v.headsigns, v.destinations, v.route_type_mix "
+                "FROM stops s JOIN stop_service v ON v.stop_id = s.id "
+                f"WHERE s.stop_key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for key, weekday_trips, weekend_trips, span, peak, off_peak, first, last, headsigns, dests, mix in rows:
+                if not weekday_trips:
+                    continue
+                out[key] = {
+                    "service_span_hours": span,
+                    "peak_headway_minutes": peak,
+                    "off_peak_headway_minutes": off_peak,
+                    "weekday_trips": weekday_trips,
+                    "weekend_trips": weekend_trips,
+                    "first_departure": first,
+                    "last_departure": last,
+                    "headsigns": json.loads(headsigns) if headsigns else [],
+                    "destinations": json.loads(dests) if dests else [],
+                    "route_type_mix": {int(k): v for k, v in json.loads(mix).items()} if mix else {},
+                }
+    except Exception as exc:
+        logger.warning("Local GTFS frequency query failed: %s", exc)
+        return {}
+    return out
+
+
+def stop_schedule(stop_key: str) -> Optional[Dict]:
+    """Frequency index row for one local stop (see stop_frequency), or None."""
+    return stop_frequency([stop_key]).get(stop_key)
@@ -0,0 +1,70 @@
+"""
+Pooled HTTP client for the data-source layer.
+
+get()/post() are drop-in replacements for requests.get/requests.post backed by one
+process-wide requests.Session with a per-host urllib3 connection pool, so repeated calls
+to Overpass, Census, Nominatim, Google Places, ... reuse TCP+TLS connections instead of
+paying setup on every call. Cookies are never persisted between calls (the shared session
+must not leak state from one user's request into another's).
+
+Pool size: HOMEFIT_HTTP_POOL_MAXSIZE (connections kept per host, default 32).
+"""
+
+from __future__ import annotations
+
+import http.cookiejar
+import os
+import threading
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+POOL_MAXSIZE = int(os.getenv("HOMEFIT_HTTP_POOL_MAXSIZE", "32"))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    s = requests.Session()
+    # pool_block=False: a burst beyond the pool opens extra connections (discarded after use)
+    # rather than blocking pillar threads that have their own timeouts.
+    adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE, pool_block=False)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return s
+
+
+def sync_session() -> requests.Session:
+    """Process-wide pooled session (thread-safe for request/response use)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """requests.get over the pooled session."""
+    return sync_session().get(url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    """requests.post over the pooled session."""
+    return sync_session().post(url, **kwargs)
+
+
+def close_sync_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
@@ -13,20 +13,20 @@ Returns a 0–100 score (or None if the LODES grid doesn't cover the area — ca
 back to the regional market score).
 
 Data: data/lodes_h8_commuter.parquet (build: scripts/baselines/build_lodes_h8_commuter.py
---states ...). H3 resolution 8 (~0.46 km edge).
+--states ...), read through the shared memory-mapped table in data_sources.lodes_h8_table.
+H3 resolution 8 (~0.46 km edge). Each query reads only the hexes under an H3 grid_disk
+around the point instead of scanning the whole grid.
 """
 from __future__ import annotations
 
 import math
-import os
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import logging
 
-logger = logging.getLogger(__name__)
+from data_sources.lodes_h8_table import PARENT_RES, get_table
 
-_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-_PARQUET = os.path.join(_REPO_ROOT, "data", "lodes_h8_commuter.parquet")
+logger = logging.getLogger(__name__)
 
 D0_KM = 20.0           # commute distance decay (mean metro commute ~25-30 km by car)
 CUTOFF_KM = 75.0       # ignore jobs beyond a plausible commute
@@ -35,55 +35,102 @@ CUTOFF_KM = 75.0       # ignore jobs beyond a plausible commute
 _LOG_LO = 2.5
 _LOG_HI = 6.6
 
+# Neighbourhood lookup: the query point's H3 res-5 cell plus a grid_disk of res-5 cells wide
+# enough to contain every res-8 hex within CUTOFF_KM; each res-5 parent is one contiguous
+# slice of the shared, id-sorted LODES H8 table.
 _LOADED = False
-_CLAT = None  # radians
-_CLON = None
-_JOBS = None
+_TABLE = None
+_DISK_K = None
 
 
 def _load():
-    global _LOADED, _CLAT, _CLON, _JOBS
+    global _LOADED, _TABLE, _DISK_K
     if _LOADED:
         return
     _LOADED = True
     try:
-        import numpy as np
-        import pyarrow.parquet as pq
         import h3
-        d = pq.read_table(_PARQUET).to_pydict()
-        cells = d["h8"]
-        centers = np.array([h3.cell_to_latlng(c) for c in cells])
-        _CLAT = np.radians(centers[:, 0])
-        _CLON = np.radians(centers[:, 1])
-        _JOBS = np.array(d["workplace_jobs"], dtype=float)
-        logger.info("Loaded LODES job-accessibility grid: %d hexes", len(cells))
+        _TABLE = get_table()
+        if _TABLE is None:
+            return
+        # Parent centroids can sit a parent edge past the cutoff; 0.7 allows for H3's
+        # cell-size distortion away from the icosahedron face centres.
+        edge = h3.average_hexagon_edge_length(PARENT_RES, unit="km")
+        _DISK_K = int(math.ceil((CUTOFF_KM + 2 * edge) / (edge * math.sqrt(3) * 0.7)))
     except Exception as e:
         logger.warning("Job-accessibility grid unavailable: %s", e)
-        _CLAT = _CLON = _JOBS = None
+        _TABLE = None
+
+
+def reset() -> None:
+    """Forget the loaded grid (tests, or after rebuilding the Parquet)."""
+    global _LOADED, _TABLE
+    _LOADED = False
+    _TABLE = None
+
+
+def _candidates(lat: float, lon: float):
+    """Indices of hexes in the res-5 neighbourhood of (lat, lon) (superset of the cutoff disk)."""
+    import h3
+    origin = h3.latlng_to_cell(lat, lon, PARENT_RES)
+    return _TABLE.parent_rows([h3.str_to_int(c) for c in h3.grid_disk(origin, _DISK_K)])
+
+
+def _gravity(la, lo, idx):
+    """Decayed job sums for origins (radians, arrays) over hexes idx; NaN where nothing is in range."""
+    import numpy as np
+    clat = np.asarray(_TABLE.clat[idx])
+    clon = np.asarray(_TABLE.clon[idx])
+    jobs = np.asarray(_TABLE.workplace_jobs[idx])
+    la = np.asarray(la, dtype=float)[:, None]
+    lo = np.asarray(lo, dtype=float)[:, None]
+    a = np.sin((clat - la) / 2) ** 2 + np.cos(la) * np.cos(clat) * np.sin((clon - lo) / 2) ** 2
+    dist = 6371.0 * 2 * np.arcsin(np.sqrt(a))
+    m = dist < CUTOFF_KM
+    total = np.where(m, jobs * np.exp(-dist / D0_KM), 0.0).sum(axis=1)
+    return np.where(m.any(axis=1), total, np.nan)
 
 
 def gravity_jobs(lat: float, lon: float) -> Optional[float]:
     """Distance-decayed reachable-job sum, or None if the grid doesn't cover this point."""
     _load()
-    if _JOBS is None:
+    if _TABLE is None:
         return None
-    import numpy as np
-    la, lo = math.radians(lat), math.radians(lon)
-    dlat = _CLAT - la
-    dlon = _CLON - lo
-    a = np.sin(dlat / 2) ** 2 + np.cos(la) * np.cos(_CLAT) * np.sin(dlon / 2) ** 2
-    dist = 6371.0 * 2 * np.arcsin(np.sqrt(a))
-    m = dist < CUTOFF_KM
-    if not m.any():
+    idx = _candidates(lat, lon)
+    if len(idx) == 0:
         return None
-    total = float(np.sum(_JOBS[m] * np.exp(-dist[m] / D0_KM)))
+    total = float(_gravity([math.radians(lat)], [math.radians(lon)], idx)[0])
     # No reachable jobs within range but grid covers the area => genuinely isolated (not "no data")
-    return total
+    return None if math.isnan(total) else total
 
 
-def job_access_score(lat: float, lon: float) -> Optional[float]:
-    """0–100 reachable-market score. None if the LODES grid doesn't cover the area."""
-    g = gravity_jobs(lat, lon)
+def gravity_jobs_many(points: Iterable[Tuple[float, float]]) -> List[Optional[float]]:
+    """
+    gravity_jobs for many (lat, lon) points (catalog rescoring). Points sharing a res-5 cell
+    share one neighbourhood lookup and are summed as one vectorized block.
+    """
+    points = [(float(la), float(lo)) for la, lo in points]
+    _load()
+    if _TABLE is None:
+        return [None] * len(points)
+    import h3
+    import numpy as np
+    groups: Dict[str, List[int]] = {}
+    for i, (la, lo) in enumerate(points):
+        groups.setdefault(h3.latlng_to_cell(la, lo, PARENT_RES), []).append(i)
+    out: List[Optional[float]] = [None] * len(points)
+    for members in groups.values():
+        idx = _candidates(*points[members[0]])
+        if len(idx) == 0:
+            continue
+        la = np.radians([points[i][0] for i in members])
+        lo = np.radians([points[i][1] for i in members])
+        for i, total in zip(members, _gravity(la, lo, idx)):
+            out[i] = None if math.isnan(total) else float(total)
+    return out
+
+
+def _score(g: Optional[float]) -> Optional[float]:
     if g is None:
         return None
     if g <= 0:
@@ -91,3 +138,13 @@ def job_access_score(lat: float, lon: float) -> Optional[float]:
     log_g = math.log10(g + 1.0)
     score = (log_g - _LOG_LO) / (_LOG_HI - _LOG_LO) * 100.0
     return round(max(0.0, min(100.0, score)), 1)
+
+
+def job_access_score(lat: float, lon: float) -> Optional[float]:
+    """0–100 reachable-market score. None if the LODES grid doesn't cover the area."""
+    return _score(gravity_jobs(lat, lon))
+
+
+def job_access_score_many(points: Iterable[Tuple[float, float]]) -> List[Optional[float]]:
+    """job_access_score for many (lat, lon) points, via gravity_jobs_many."""
+    return [_score(g) for g in gravity_jobs_many(points)]
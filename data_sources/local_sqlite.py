@@ -0,0 +1,124 @@
+"""
+Read-only SQLite files behind the local data-source backends.
+
+osm_local, gtfs_store, crime_store, gazetteer and nrhp each answer queries from a SQLite
+file built offline. LocalDB is the part they share: the path (env override, default under
+data_cache/), a cached existence check (missing file = backend disabled), and one
+read-only connection per thread, since pillars query concurrently.
+
+Every thread's connection is registered (weakly: a finished thread's connection is
+dropped with it), so reset() closes them all and the next query on any thread opens the
+current file. A query running on another thread during reset() fails; callers already
+treat local errors as "not covered" and fall back to the remote source.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Smallest metres-per-degree of latitude on WGS84 (and below the 111,195 of the sphere
+# haversine_distance uses), so bbox() is a superset of the haversine circle.
+_M_PER_DEG = 110_540.0
+
+
+def bbox(lat: float, lon: float, radius_m: float) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lon, max_lat, max_lon) enclosing the radius_m circle around (lat, lon)."""
+    d_lat = float(radius_m) / _M_PER_DEG
+    d_lon = float(radius_m) / (_M_PER_DEG * max(0.01, math.cos(math.radians(lat))))
+    return lat - d_lat, lon - d_lon, lat + d_lat, lon + d_lon
+
+
+class _Slot:
+    """One thread's connection (threading.local holds it; LocalDB tracks it weakly)."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn: Optional[sqlite3.Connection] = conn
+
+
+class LocalDB:
+    """
+    A local backend's SQLite file.
+
+    label names the backend in logs ("Local <label> enabled: <path>"); with warn_missing a
+    missing file is logged as a warning. requires adds a precondition (e.g. an optional
+    import) to availability; pragmas run on every new connection, errors ignored.
+    """
+
+    def __init__(self, env_var: str, default_path: Path, label: str, *, warn_missing: bool = False,
+                 requires: Optional[Callable[[], bool]] = None, pragmas: Sequence[str] = ()):
+        self.env_var = env_var
+        self.default_path = default_path
+        self.label = label
+        self.warn_missing = warn_missing
+        self.requires = requires
+        self.pragmas = tuple(pragmas)
+        self._available: Optional[bool] = None
+        self._local = threading.local()
+        self._slots: "weakref.WeakSet[_Slot]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def path(self) -> Path:
+        env = os.getenv(self.env_var)
+        return Path(env).resolve() if env else self.default_path
+
+    def available(self) -> bool:
+        """True when the file exists (checked once until reset())."""
+        if self._available is None:
+            p = self.path()
+            ok = p.exists() and (self.requires is None or self.requires())
+            if ok:
+                logger.info("Local %s enabled: %s", self.label, p)
+            elif self.warn_missing:
+                logger.warning("%s DB missing at %s; %s signals disabled.", self.label, p, self.label)
+            self._available = ok
+        return self._available
+
+    def connect(self) -> Optional[sqlite3.Connection]:
+        """This thread's read-only connection, or None when the backend is disabled."""
+        if not self.available():
+            return None
+        slot = getattr(self._local, "slot", None)
+        if slot is not None and slot.conn is not None:
+            return slot.conn
+        p = self.path()
+        # check_same_thread=False only so reset() can close it; one thread uses it.
+        try:
+            conn = sqlite3.connect(f"file:{p}?mode=ro", uri=True, check_same_thread=False)
+        except Exception:
+            conn = sqlite3.connect(str(p), check_same_thread=False)
+        for pragma in self.pragmas:
+            try:
+                conn.execute(pragma)
+            except Exception:
+                pass
+        slot = _Slot(conn)
+        with self._lock:
+            self._slots.add(slot)
+        self._local.slot = slot
+        return conn
+
+    def reset(self) -> None:
+        """Close every thread's connection and re-check the path (tests, or after swapping the file)."""
+        with self._lock:
+            slots = list(self._slots)
+            self._slots.clear()
+            self._available = None
+        for slot in slots:
+            conn, slot.conn = slot.conn, None
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
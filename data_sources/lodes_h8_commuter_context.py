@@ -20,13 +20,13 @@ Schema (Parquet):
   rac_c000 (BIGINT): sum of RAC C000 in cell (see build script — proxy for resident jobs)
   wrr_jobs (DOUBLE): workplace_jobs / max(1, rac_c000)
 
-Override path via env ``LODES_H8_COMMUTER_PARQUET``.
+Override path via env ``LODES_H8_COMMUTER_PARQUET``. Rows are read through the shared,
+memory-mapped table in ``data_sources.lodes_h8_table`` (one binary search per lookup).
 """
 
 from __future__ import annotations
 
 import math
-import os
 from typing import Any, Dict, Optional, Tuple
 
 try:
@@ -34,18 +34,11 @@ try:
 except ImportError:  # pragma: no cover
     h3 = None
 
+from data_sources.lodes_h8_table import get_table
 from logging_config import get_logger
 
 logger = get_logger(__name__)
 
-_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-_DEFAULT_PARQUET = os.path.join(_REPO_ROOT, "data", "lodes_h8_commuter.parquet")
-
-_PARQUET_PATH = os.getenv("LODES_H8_COMMUTER_PARQUET", _DEFAULT_PARQUET)
-
-_TABLE_LOADED = False
-_H8_INDEX: Dict[str, Dict[str, float]] = {}
-
 
 def _lat_lon_to_h8(lat: float, lon: float) -> Optional[str]:
     if h3 is None:
@@ -57,40 +50,6 @@ def _lat_lon_to_h8(lat: float, lon: float) -> Optional[str]:
         return None
 
 
-def _ensure_table() -> None:
-    global _TABLE_LOADED, _H8_INDEX
-    if _TABLE_LOADED:
-        return
-    path = _PARQUET_PATH
-    if not path or not os.path.isfile(path):
-        logger.debug("LODES H8 commuter Parquet missing: %s", path)
-        _TABLE_LOADED = True
-        return
-    try:
-        import pyarrow.parquet as pq
-
-        tbl = pq.read_table(
-            path,
-            columns=["h8", "workplace_jobs", "rac_c000", "wrr_jobs"],
-        )
-        df = tbl.to_pydict()
-        for i in range(len(df["h8"])):
-            hid = df["h8"][i]
-            if hid is None:
-                continue
-            _H8_INDEX[str(hid)] = {
-                "workplace_jobs": float(df["workplace_jobs"][i] or 0),
-                "rac_c000": float(df["rac_c000"][i] or 0),
-                "wrr_jobs": float(df["wrr_jobs"][i] or 0),
-            }
-        logger.info("Loaded LODES commuter H8 lookup: %d cells from %s", len(_H8_INDEX), path)
-    except ImportError:
-        logger.warning("PyArrow unavailable — cannot load LODES commuter Parquet")
-    except Exception as e:
-        logger.warning("Failed to load LODES commuter Parquet: %s", e)
-    _TABLE_LOADED = True
-
-
 # Gated commuter denominator boost (aligned with pillar PRD iterations)
 _MIN_WRR = 5.0
 _MIN_PROPERTY_VIOLENT_RATIO = 10.0
@@ -112,7 +71,7 @@ def compute_commuter_denominator_boost(
 
     Telemetry includes `wrr_jobs`, raw jobs counts, confidence_delta, flags.
     """
-    _ensure_table()
+    table = get_table() if h3 is not None else None
     multiplier = 1.0
     meta: Dict[str, Any] = {
         "h8_available": False,
@@ -121,25 +80,25 @@ def compute_commuter_denominator_boost(
         "flags": [],
     }
 
-    if not _H8_INDEX:
+    if table is None or not len(table):
         return multiplier, meta
 
     hcell = _lat_lon_to_h8(lat, lon)
     if not hcell:
         return multiplier, meta
 
-    row = _H8_INDEX.get(hcell)
-    if not row:
+    i = table.find(hcell)
+    if i is None:
         meta["flags"].append("h8_unknown_cell")
         return multiplier, meta
 
-    wjobs = row["workplace_jobs"]
-    rac = max(1.0, row["rac_c000"])
-    wrr = row["wrr_jobs"]
+    wjobs = float(table.workplace_jobs[i])
+    rac_c000 = float(table.rac_c000[i])
+    wrr = float(table.wrr_jobs[i])
 
     meta["h8_available"] = True
     meta["workplace_jobs"] = int(wjobs)
-    meta["rac_c000"] = int(max(0, row["rac_c000"]))
+    meta["rac_c000"] = int(max(0, rac_c000))
     meta["wrr_jobs"] = round(wrr, 4)
 
     if wrr <= _MIN_WRR:
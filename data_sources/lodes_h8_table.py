@@ -0,0 +1,199 @@
+"""
+Shared, memory-mapped LODES H8 commuter table.
+
+Both consumers of ``data/lodes_h8_commuter.parquet`` -- the commuter denominator boost
+(`lodes_h8_commuter_context`) and the gravity job-access score (`job_accessibility`) -- read
+it through this module instead of each parsing the Parquet into per-process Python objects.
+
+On first use the Parquet is exported once to sorted, columnar .npy arrays; every later load
+(any process, any uvicorn worker) memory-maps them, so the pages are shared through the OS
+page cache and startup does no per-row work. Cell lookups binary-search the sorted id column.
+
+Layout (directory, re-exported when the Parquet's size or mtime changes):
+  manifest.json        -- version, source size/mtime, parent resolution, row count
+  h8.npy               -- uint64 (N,) H3 res-8 cell ids, sorted
+  parents.npy          -- uint64 (N,) res-PARENT_RES parent of each cell (sorted as a result)
+  clat.npy, clon.npy   -- float64 (N,) cell centroid, radians
+  workplace_jobs.npy   -- float64 (N,)
+  rac_c000.npy         -- float64 (N,)
+  wrr_jobs.npy         -- float64 (N,)
+
+Source path via env ``LODES_H8_COMMUTER_PARQUET``; export directory via env
+``HOMEFIT_LODES_H8_DIR`` (default ``data_cache/lodes_h8``). Missing Parquet = table disabled.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PARQUET = _REPO_ROOT / "data" / "lodes_h8_commuter.parquet"
+DEFAULT_TABLE_DIR = _REPO_ROOT / "data_cache" / "lodes_h8"
+TABLE_VERSION = 1
+
+# Res-8 ids sorted ascending are grouped by any coarser ancestor, so each res-5 parent is a
+# contiguous slice (job_accessibility's neighbourhood lookup reads whole parents).
+PARENT_RES = 5
+
+_COLUMNS = ("h8", "parents", "clat", "clon", "workplace_jobs", "rac_c000", "wrr_jobs")
+
+_load_lock = threading.Lock()
+_table: Optional["LodesH8Table"] = None
+_load_failed = False
+
+
+def parquet_path() -> Path:
+    env = os.getenv("LODES_H8_COMMUTER_PARQUET")
+    return Path(env) if env else DEFAULT_PARQUET
+
+
+def _table_dir() -> Path:
+    env = os.getenv("HOMEFIT_LODES_H8_DIR")
+    return Path(env).resolve() if env else DEFAULT_TABLE_DIR
+
+
+def _source_stamp(src: Path) -> Dict[str, Any]:
+    st = os.stat(src)
+    return {"source_size": st.st_size, "source_mtime_ns": st.st_mtime_ns}
+
+
+def _is_current(out_dir: Path, src: Path) -> bool:
+    try:
+        with open(out_dir / "manifest.json", "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        stamp = _source_stamp(src)
+    except (OSError, ValueError):
+        return False
+    return (
+        manifest.get("version") == TABLE_VERSION
+        and manifest.get("parent_res") == PARENT_RES
+        and all(manifest.get(k) == v for k, v in stamp.items())
+    )
+
+
+def export_table(src: Path, out_dir: Path) -> int:
+    """Parquet -> sorted .npy columns in out_dir (atomic directory swap). Returns row count."""
+    import h3
+    import numpy as np
+    import pyarrow.parquet as pq
+
+    d = pq.read_table(str(src), columns=["h8", "workplace_jobs", "rac_c000", "wrr_jobs"]).to_pydict()
+    keep = [i for i, c in enumerate(d["h8"]) if c]
+    ids = np.array([h3.str_to_int(str(d["h8"][i])) for i in keep], dtype=np.uint64)
+    order = np.argsort(ids, kind="stable")
+    ids = ids[order]
+    rows = [keep[i] for i in order]
+    cells = [str(d["h8"][i]) for i in rows]
+
+    def column(name: str) -> np.ndarray:
+        return np.array([float(d[name][i] or 0) for i in rows], dtype=np.float64)
+
+    centers = np.array([h3.cell_to_latlng(c) for c in cells], dtype=np.float64).reshape(-1, 2)
+    arrays = {
+        "h8": ids,
+        "parents": np.array([h3.str_to_int(h3.cell_to_parent(c, PARENT_RES)) for c in cells], dtype=np.uint64),
+        "clat": np.radians(centers[:, 0]),
+        "clon": np.radians(centers[:, 1]),
+        "workplace_jobs": column("workplace_jobs"),
+        "rac_c000": column("rac_c000"),
+        "wrr_jobs": column("wrr_jobs"),
+    }
+
+    # Per-process temp dir: several workers may find the export stale at the same time.
+    tmp_dir = out_dir.with_name(f"{out_dir.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    for name, arr in arrays.items():
+        np.save(tmp_dir / f"{name}.npy", arr)
+    manifest = {"version": TABLE_VERSION, "parent_res": PARENT_RES, "rows": int(len(ids)), **_source_stamp(src)}
+    with open(tmp_dir / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    try:
+        os.replace(tmp_dir, out_dir)
+    except OSError:
+        # Another worker swapped its export in first; use that one.
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not _is_current(out_dir, src):
+            raise
+    return int(len(ids))
+
+
+class LodesH8Table:
+    """Sorted H3 res-8 id column with parallel float columns, all memory-mapped."""
+
+    def __init__(self, path: Path):
+        import numpy as np
+
+        for name in _COLUMNS:
+            setattr(self, name, np.load(path / f"{name}.npy", mmap_mode="r"))
+
+    def __len__(self) -> int:
+        return len(self.h8)
+
+    def find(self, cell: str) -> Optional[int]:
+        """Row index of an H3 res-8 cell, or None when the grid has no such cell."""
+        import h3
+        import numpy as np
+
+        key = np.uint64(h3.str_to_int(cell))
+        i = int(np.searchsorted(self.h8, key))
+        if i < len(self.h8) and self.h8[i] == key:
+            return i
+        return None
+
+    def parent_rows(self, parent_ids):
+        """Row indices of every cell under the given res-PARENT_RES parents (ids as uint64)."""
+        import numpy as np
+
+        ids = np.sort(np.asarray(parent_ids, dtype=np.uint64))
+        lo = np.searchsorted(self.parents, ids, side="left")
+        hi = np.searchsorted(self.parents, ids, side="right")
+        keep = hi > lo
+        if not keep.any():
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(a, b) for a, b in zip(lo[keep], hi[keep])])
+
+
+def get_table() -> Optional[LodesH8Table]:
+    """Shared table (exported/mapped on first use), or None when the Parquet is absent or unreadable."""
+    global _table, _load_failed
+    if _table is not None:
+        return _table
+    if _load_failed:
+        return None
+    with _load_lock:
+        if _table is None and not _load_failed:
+            src = parquet_path()
+            if not src.is_file():
+                logger.debug("LODES H8 commuter Parquet missing: %s", src)
+                _load_failed = True
+                return None
+            out_dir = _table_dir()
+            try:
+                if not _is_current(out_dir, src):
+                    n = export_table(src, out_dir)
+                    logger.info("Exported LODES H8 table: %d cells -> %s", n, out_dir)
+                _table = LodesH8Table(out_dir)
+                logger.info("Loaded LODES H8 table: %d cells (memory-mapped)", len(_table))
+            except Exception as exc:
+                _load_failed = True
+                logger.warning("LODES H8 table unavailable: %s", exc)
+        return _table
+
+
+def reset() -> None:
+    """Drop the mapped table (tests, or after rebuilding the Parquet)."""
+    global _table, _load_failed
+    with _load_lock:
+        _table = None
+        _load_failed = False
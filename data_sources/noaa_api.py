@@ -9,9 +9,9 @@ Gracefully degrades to None if key absent or API unavailable.
 
 import os
 import time
-import requests
 from typing import Optional, Dict, Any, List
 from logging_config import get_logger
+from data_sources import http_client
 
 logger = get_logger(__name__)
 
@@ -36,7 +36,7 @@ def _noaa_get(path: str, params: Dict[str, Any], timeout: int = 10) -> Optional[
     if not NOAA_CDO_API_KEY:
         return None
     try:
-        r = requests.get(
+        r = http_client.get(
             f"{NOAA_CDO_BASE}{path}",
             params=params,
             headers={"token": NOAA_CDO_API_KEY},
@@ -8,78 +8,114 @@ Why this approach:
 - No per-request external API calls (performance + reliability)
 - No hosted DB required (it is just a file shipped with the backend build)
 - Scales to any city/neighborhood (full dataset)
+
+Rows carry unit-sphere x/y/z columns, so the exact radius filter and the nearest
+distance run inside SQLite on top of the RTree bbox prefilter (older DBs without
+them fall back to per-row haversine in Python).
 """
 
 from __future__ import annotations
 
 import math
-import os
 import sqlite3
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from logging_config import get_logger
 
+from .local_sqlite import LocalDB, bbox as _bbox
 from .osm_api import haversine_distance
 
 logger = get_logger(__name__)
 
 DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data_cache" / "nrhp.sqlite"
 
+# Mean Earth radius used by haversine_distance; the unit-sphere columns scale by it.
+EARTH_RADIUS_M = 6371000.0
+# Memory-map the (read-only) DB so concurrent readers share the OS page cache.
+MMAP_SIZE = 256 * 1024 * 1024
 
-def _db_path() -> Path:
-    env = os.getenv("NRHP_DB_PATH")
-    return Path(env).resolve() if env else DEFAULT_DB_PATH
-
-
-@lru_cache(maxsize=1)
-def _has_db() -> bool:
-    p = _db_path()
-    exists = p.exists()
-    if not exists:
-        logger.warning("NRHP DB missing at %s; NRHP signals disabled.", p)
-    return exists
+_DB = LocalDB("NRHP_DB_PATH", DEFAULT_DB_PATH, "NRHP", warn_missing=True,
+              pragmas=(f"PRAGMA mmap_size={MMAP_SIZE};",))
 
 
 @lru_cache(maxsize=1)
-def _connect_ro_cached() -> Optional[sqlite3.Connection]:
-    if not _has_db():
-        return None
-    p = _db_path()
+def _has_unit_vectors() -> bool:
+    """True when the DB carries pre-projected x/y/z columns (build_nrhp_db.py since they were added)."""
+    conn = _DB.connect()
+    if conn is None:
+        return False
     try:
-        return sqlite3.connect(f"file:{p}?mode=ro", uri=True, check_same_thread=False)
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(nrhp);")}
     except Exception:
-        return sqlite3.connect(str(p), check_same_thread=False)
+        return False
+    has = {"x", "y", "z"} <= cols
+    if not has:
+        logger.info("NRHP DB has no unit-vector columns; distances computed in Python (rebuild to enable SQL filter).")
+    return has
 
 
-def query_nrhp(lat: float, lon: float, radius_m: int = 2000) -> Dict[str, Any]:
-    """
-    Query local NRHP SQLite (RTree) index within `radius_m` of (lat, lon).
+def reset() -> None:
+    """Close every thread's connection and drop cached path/schema state (tests, or after swapping the DB file)."""
+    _DB.reset()
+    _has_unit_vectors.cache_clear()
 
-    Returns summary signals suitable for scoring and metadata.
-    """
-    conn = _connect_ro_cached()
-    if conn is None:
-        return {
-            "count": 0,
-            "nearest_distance_m": None,
-            "styles": [],
-            "periods": [],
-        }
-
-    # Bounding-box prefilter (rough degrees conversion; lon scaled by latitude).
-    radius_deg_lat = float(radius_m) / 111_000.0
-    cos_lat = math.cos(math.radians(lat))
-    radius_deg_lon = float(radius_m) / (111_000.0 * max(0.2, cos_lat))
-    min_lat = lat - radius_deg_lat
-    max_lat = lat + radius_deg_lat
-    min_lon = lon - radius_deg_lon
-    max_lon = lon + radius_deg_lon
 
-    try:
-        cur = conn.cursor()
-        cur.execute(
+def unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    """Point on the unit sphere; squared chord length between two of these encodes their distance."""
+    phi = math.radians(lat)
+    lam = math.radians(lon)
+    return math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi)
+
+
+def _chord2_to_m(chord2: float) -> float:
+    return 2.0 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(max(0.0, chord2)) / 2.0))
+
+
+def _empty_result() -> Dict[str, Any]:
+    return {
+        "count": 0,
+        "nearest_distance_m": None,
+        "styles": [],
+        "periods": [],
+    }
+
+
+_SQL_COUNT_NEAREST = """
+    SELECT COUNT(*), MIN(d2) FROM (
+        SELECT (n.x - :x) * (n.x - :x) + (n.y - :y) * (n.y - :y) + (n.z - :z) * (n.z - :z) AS d2
+        FROM nrhp_index i
+        JOIN nrhp n ON n.id = i.id
+        WHERE i.min_lon <= :max_lon AND i.max_lon >= :min_lon
+          AND i.min_lat <= :max_lat AND i.max_lat >= :min_lat
+    )
+    WHERE d2 <= :max_d2;
+"""
+
+
+def _query(conn: sqlite3.Connection, lat: float, lon: float, radius_m: int) -> Dict[str, Any]:
+    min_lat, min_lon, max_lat, max_lon = _bbox(lat, lon, radius_m)
+    count = 0
+    nearest: Optional[float] = None
+
+    if _has_unit_vectors():
+        # Exact great-circle radius filter and nearest distance inside SQLite:
+        # chord^2 between unit vectors is monotonic in distance.
+        x, y, z = unit_vector(lat, lon)
+        max_chord = 2.0 * math.sin(min(math.pi, float(radius_m) / EARTH_RADIUS_M) / 2.0)
+        count, min_d2 = conn.execute(
+            _SQL_COUNT_NEAREST,
+            {
+                "x": x, "y": y, "z": z,
+                "min_lat": min_lat, "min_lon": min_lon, "max_lat": max_lat, "max_lon": max_lon,
+                "max_d2": max_chord * max_chord,
+            },
+        ).fetchone()
+        if min_d2 is not None:
+            nearest = _chord2_to_m(min_d2)
+    else:
+        candidates = conn.execute(
             """
             SELECT n.lat, n.lon
             FROM nrhp_index i
@@ -88,37 +124,60 @@ def query_nrhp(lat: float, lon: float, radius_m: int = 2000) -> Dict[str, Any]:
               AND i.min_lat <= ? AND i.max_lat >= ?;
             """,
             (max_lon, min_lon, max_lat, min_lat),
-        )
-        candidates = cur.fetchall()
-    except Exception as exc:
-        logger.warning("NRHP DB query failed: %s", exc)
-        return {
-            "count": 0,
-            "nearest_distance_m": None,
-            "styles": [],
-            "periods": [],
-        }
+        ).fetchall()
+        for (c_lat, c_lon) in candidates:
+            if not isinstance(c_lat, (int, float)) or not isinstance(c_lon, (int, float)):
+                continue
+            d = haversine_distance(lat, lon, float(c_lat), float(c_lon))
+            if d > radius_m:
+                continue
+            count += 1
+            if nearest is None or d < nearest:
+                nearest = d
 
-    count = 0
-    nearest: Optional[float] = None
     # The current NPS layer does not expose consistent style/period fields.
     styles: List[str] = []
     periods: List[str] = []
 
-    for (c_lat, c_lon) in candidates:
-        if not isinstance(c_lat, (int, float)) or not isinstance(c_lon, (int, float)):
-            continue
-        d = haversine_distance(lat, lon, float(c_lat), float(c_lon))
-        if d > radius_m:
-            continue
-        count += 1
-        if nearest is None or d < nearest:
-            nearest = d
-
     return {
-        "count": int(count),
+        "count": int(count or 0),
         "nearest_distance_m": round(nearest, 0) if nearest is not None else None,
         "styles": sorted(set(styles)),
         "periods": sorted(set(periods)),
     }
 
+
+def query_nrhp(lat: float, lon: float, radius_m: int = 2000) -> Dict[str, Any]:
+    """
+    Query local NRHP SQLite (RTree) index within `radius_m` of (lat, lon).
+
+    Returns summary signals suitable for scoring and metadata.
+    """
+    conn = _DB.connect()
+    if conn is None:
+        return _empty_result()
+    try:
+        return _query(conn, lat, lon, radius_m)
+    except Exception as exc:
+        logger.warning("NRHP DB query failed: %s", exc)
+        return _empty_result()
+
+
+def query_nrhp_many(points: Iterable[Tuple[float, float]], radius_m: int = 2000) -> List[Dict[str, Any]]:
+    """
+    query_nrhp for many (lat, lon) points on one connection (catalog scripts).
+
+    Results are in input order; a failed point gets the empty result.
+    """
+    conn = _DB.connect()
+    out: List[Dict[str, Any]] = []
+    for lat, lon in points:
+        if conn is None:
+            out.append(_empty_result())
+            continue
+        try:
+            out.append(_query(conn, float(lat), float(lon), radius_m))
+        except Exception as exc:
+            logger.warning("NRHP DB query failed for %s, %s: %s", lat, lon, exc)
+            out.append(_empty_result())
+    return out
@@ -11,10 +11,11 @@ import threading
 import random
 import json
 from typing import Dict, List, Tuple, Optional, Any
-from .cache import cached, CACHE_TTL, _generate_cache_key, _get_redis_client, _cache, _cache_ttl
+from .cache import cached, CACHE_TTL, SpatialBucket, _generate_cache_key, _get_redis_client, _cache, _cache_ttl
 from .error_handling import with_fallback, safe_api_call, handle_api_timeout
 from .utils import haversine_distance, get_way_center
 from .retry_config import RetryConfig, get_retry_config, RetryProfile
+from . import http_client, osm_local, overpass_planner
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -377,24 +378,35 @@ def _overpass_rlock_for(key: str) -> threading.RLock:
         return lk
 
 
-@cached(ttl_seconds=CACHE_TTL['osm_queries'])
-@safe_api_call("osm", required=False)
-@handle_api_timeout(timeout_seconds=20)  # Reduced from 30s
-def query_green_spaces(lat: float, lon: float, radius_m: int = 1000) -> Optional[Dict]:
+# Per-location union bundles (see overpass_planner): prefetch_location_bundle() fetches every
+# consumer's selectors in one or two round-trips; each query_* function asks the bundle first
+# and only issues its own request when the bundle does not cover its selectors/radius.
+_OVERPASS_BUNDLE_ENABLED = (
+    os.getenv("HOMEFIT_OVERPASS_BUNDLE", "1").strip().lower() not in {"0", "false", "no", "off"}
+)
+
+
+def _bundle_elements(query: str, lat: float, lon: float) -> Optional[List[Dict]]:
     """
-    Query OSM for parks, playgrounds, recreational facilities, and tree features.
-    INCLUDES RELATIONS to catch all parks!
+    Elements for `query` from the local OSM extract or the location bundle.
 
-    Returns:
-        {
-            "parks": [...],
-            "playgrounds": [...],
-            "recreational_facilities": [...],  # NEW: tennis courts, baseball fields, dog parks, etc.
-            "tree_features": [...]
-        }
+    Returns None to fall back to a live request.
     """
-    # Core parks/playgrounds query used by Active Outdoors and Natural Beauty fallback.
-    query = f"""
+    local = osm_local.local_elements(query, lat, lon)
+    if local is not None:
+        return local
+    if not _OVERPASS_BUNDLE_ENABLED:
+        return None
+    try:
+        return overpass_planner.planned_elements(query, lat, lon)
+    except Exception as e:
+        logger.debug(f"Overpass bundle lookup failed, using live query: {e}")
+        return None
+
+
+def _green_spaces_query(lat: float, lon: float, radius_m: int) -> str:
+    """Overpass QL for query_green_spaces (parks, playgrounds, recreation, greenways)."""
+    return f"""
     [out:json][timeout:30];
     (
       // PARKS & GREEN SPACES - core (skip nodes except playgrounds)
@@ -436,88 +448,110 @@ def query_green_spaces(lat: float, lon: float, radius_m: int = 1000) -> Optional
     out body center;
     """
 
+
+@cached(ttl_seconds=CACHE_TTL['osm_queries'])
+@safe_api_call("osm", required=False)
+@handle_api_timeout(timeout_seconds=20)  # Reduced from 30s
+def query_green_spaces(lat: float, lon: float, radius_m: int = 1000) -> Optional[Dict]:
+    """
+    Query OSM for parks, playgrounds, recreational facilities, and tree features.
+    INCLUDES RELATIONS to catch all parks!
+
+    Returns:
+        {
+            "parks": [...],
+            "playgrounds": [...],
+            "recreational_facilities": [...],  # NEW: tennis courts, baseball fields, dog parks, etc.
+            "tree_features": [...]
+        }
+    """
+    # Core parks/playgrounds query used by Active Outdoors and Natural Beauty fallback.
+    query = _green_spaces_query(lat, lon, radius_m)
+
     _gs_key = f"query_green_spaces:{lat:.5f}:{lon:.5f}:{int(radius_m)}"
     with _overpass_rlock_for(_gs_key):
         try:
-            def _do_request():
-                r = requests.post(
-                    get_overpass_url(),
-                    data={"data": query},
-                    timeout=_overpass_timeout(20),  # Reduced from 40s for faster failure
-                    headers={"User-Agent": "HomeFit/1.0"}
-                )
-                # IMPORTANT: Non-200 responses (e.g., 504) must trigger retry/endpoint rotation.
-                # If we just return the response, _retry_overpass() will treat it as "success"
-                # and we will never fall back to alternate endpoints.
-                if r.status_code != 200:
-                    raise RuntimeError(f"Overpass status={r.status_code}")
-                return r
-
-            # Parks are critical - use CRITICAL profile (retry all attempts)
-            resp = _retry_overpass(_do_request, query_type="parks")
-
-            if resp is None or resp.status_code != 200:
-                # Check for stale cache before returning None
-                # This allows us to use previously successful data when API temporarily fails
-                cache_key = _generate_cache_key("query_green_spaces", lat, lon, radius_m)
-                current_time = time.time()
-                stale_cache_entry = None
-                stale_cache_time = 0
+            elements = _bundle_elements(query, lat, lon)
+            if elements is None:
+                def _do_request():
+                    r = http_client.post(
+                        get_overpass_url(),
+                        data={"data": query},
+                        timeout=_overpass_timeout(20),  # Reduced from 40s for faster failure
+                        headers={"User-Agent": "HomeFit/1.0"}
+                    )
+                    # IMPORTANT: Non-200 responses (e.g., 504) must trigger retry/endpoint rotation.
+                    # If we just return the response, _retry_overpass() will treat it as "success"
+                    # and we will never fall back to alternate endpoints.
+                    if r.status_code != 200:
+                        raise RuntimeError(f"Overpass status={r.status_code}")
+                    return r
+
+                # Parks are critical - use CRITICAL profile (retry all attempts)
+                resp = _retry_overpass(_do_request, query_type="parks")
+
+                if resp is None or resp.status_code != 200:
+                    # Check for stale cache before returning None
+                    # This allows us to use previously successful data when API temporarily fails
+                    cache_key = _generate_cache_key("query_green_spaces", lat, lon, radius_m)
+                    current_time = time.time()
+                    stale_cache_entry = None
+                    stale_cache_time = 0
             
-                # Try Redis first
-                redis_client = _get_redis_client()
-                if redis_client:
-                    try:
-                        cached_data = redis_client.get(cache_key)
-                        if cached_data:
-                            data = json.loads(cached_data)
-                            stale_cache_entry = data.get('value')
-                            stale_cache_time = data.get('timestamp', 0)
-                    except Exception:
-                        pass
+                    # Try Redis first
+                    redis_client = _get_redis_client()
+                    if redis_client:
+                        try:
+                            cached_data = redis_client.get(cache_key)
+                            if cached_data:
+                                data = json.loads(cached_data)
+                                stale_cache_entry = data.get('value')
+                                stale_cache_time = data.get('timestamp', 0)
+                        except Exception:
+                            pass
             
-                # Fall back to in-memory cache
-                if stale_cache_entry is None and cache_key in _cache:
-                    stale_cache_entry = _cache.get(cache_key)
-                    stale_cache_time = _cache_ttl.get(cache_key, 0)
+                    # Fall back to in-memory cache
+                    if stale_cache_entry is None and cache_key in _cache:
+                        stale_cache_entry = _cache.get(cache_key)
+                        stale_cache_time = _cache_ttl.get(cache_key, 0)
             
-                # Use stale cache if it exists and is less than 24 hours old
-                # Only use if it doesn't have an error (has actual data)
-                if stale_cache_entry and isinstance(stale_cache_entry, dict):
-                    cache_age_hours = (current_time - stale_cache_time) / 3600
-                    has_error = stale_cache_entry.get('error') is not None
-                    has_data = (
-                        len(stale_cache_entry.get('parks', [])) > 0 or
-                        len(stale_cache_entry.get('playgrounds', [])) > 0 or
-                        len(stale_cache_entry.get('recreational_facilities', [])) > 0
-                    )
-
-                    if not has_error and has_data and cache_age_hours < 24:
-                        logger.warning(
-                            f"OSM parks API failed, using stale cache (age: {cache_age_hours:.1f} hours) "
-                            f"for lat={lat}, lon={lon}, radius={radius_m}m"
+                    # Use stale cache if it exists and is less than 24 hours old
+                    # Only use if it doesn't have an error (has actual data)
+                    if stale_cache_entry and isinstance(stale_cache_entry, dict):
+                        cache_age_hours = (current_time - stale_cache_time) / 3600
+                        has_error = stale_cache_entry.get('error') is not None
+                        has_data = (
+                            len(stale_cache_entry.get('parks', [])) > 0 or
+                            len(stale_cache_entry.get('playgrounds', [])) > 0 or
+                            len(stale_cache_entry.get('recreational_facilities', [])) > 0
                         )
-                        result = stale_cache_entry.copy()
-                        result['_stale_cache'] = True
-                        result['_cache_age_hours'] = round(cache_age_hours, 1)
-                        result['data_warning'] = 'stale_cache_used'
-                        if "_overpass_outcome" not in result:
-                            result["_overpass_outcome"] = OVERPASS_OUTCOME_OK
-                        return result
-
-                # No usable stale cache - log error and return explicit failure dict
-                if resp and resp.status_code == 429:
-                    logger.warning("OSM parks query rate limited (429)")
-                elif resp:
-                    logger.warning(f"OSM parks query failed with status {resp.status_code}")
-                else:
-                    logger.warning("OSM parks query returned no response")
-                return _greens_skeleton(OVERPASS_OUTCOME_ERROR)
 
-            data = _safe_overpass_json(resp, context="parks query")
-            if data is None:
-                return _greens_skeleton(OVERPASS_OUTCOME_ERROR)
-            elements = data.get("elements", [])
+                        if not has_error and has_data and cache_age_hours < 24:
+                            logger.warning(
+                                f"OSM parks API failed, using stale cache (age: {cache_age_hours:.1f} hours) "
+                                f"for lat={lat}, lon={lon}, radius={radius_m}m"
+                            )
+                            result = stale_cache_entry.copy()
+                            result['_stale_cache'] = True
+                            result['_cache_age_hours'] = round(cache_age_hours, 1)
+                            result['data_warning'] = 'stale_cache_used'
+                            if "_overpass_outcome" not in result:
+                                result["_overpass_outcome"] = OVERPASS_OUTCOME_OK
+                            return result
+
+                    # No usable stale cache - log error and return explicit failure dict
+                    if resp and resp.status_code == 429:
+                        logger.warning("OSM parks query rate limited (429)")
+                    elif resp:
+                        logger.warning(f"OSM parks query failed with status {resp.status_code}")
+                    else:
+                        logger.warning("OSM parks query returned no response")
+                    return _greens_skeleton(OVERPASS_OUTCOME_ERROR)
+
+                data = _safe_overpass_json(resp, context="parks query")
+                if data is None:
+                    return _greens_skeleton(OVERPASS_OUTCOME_ERROR)
+                elements = data.get("elements", [])
         
             # DIAGNOSTIC: Log raw park elements before processing
             raw_park_elements = [
@@ -638,26 +672,8 @@ def query_green_spaces(lat: float, lon: float, radius_m: int = 1000) -> Optional
             return _greens_skeleton(_classify_overpass_exception(e))
 
 
-@cached(ttl_seconds=CACHE_TTL['osm_queries'])
-@safe_api_call("osm", required=False)
-@handle_api_timeout(timeout_seconds=25)  # Reduced from 40s
-def query_nature_features(
-    lat: float,
-    lon: float,
-    radius_m: int = 15000,
-    include_hiking: bool = True,
-) -> Optional[Dict]:
-    """
-    Query OSM for outdoor recreation (hiking, swimming, camping).
-    Includes trails within large parks (>50 hectares) to catch urban parks like Prospect Park.
-
-    Returns:
-        {
-            "hiking": [...],
-            "swimming": [...],
-            "camping": [...]
-        }
-    """
+def _nature_features_query(lat: float, lon: float, radius_m: int, include_hiking: bool = True) -> str:
+    """Overpass QL for query_nature_features (hiking, swimming, camping)."""
     hiking_query = f"""
       // HIKING - Optimized: combined boundary types
       relation[\"route\"=\"hiking\"](around:{radius_m},{lat},{lon});
@@ -695,7 +711,7 @@ def query_nature_features(
       relation[\"tourism\"=\"camp_site\"](around:{radius_m},{lat},{lon});
     """
 
-    query = (
+    return (
         f"\n    [out:json][timeout:{_overpass_timeout(30)}];\n    (\n"
         + (hiking_query if include_hiking else "")
         + water_query
@@ -703,28 +719,53 @@ def query_nature_features(
         + "\n    );\n    out center tags;\n    "
     )
 
+
+@cached(ttl_seconds=CACHE_TTL['osm_queries'])
+@safe_api_call("osm", required=False)
+@handle_api_timeout(timeout_seconds=25)  # Reduced from 40s
+def query_nature_features(
+    lat: float,
+    lon: float,
+    radius_m: int = 15000,
+    include_hiking: bool = True,
+) -> Optional[Dict]:
+    """
+    Query OSM for outdoor recreation (hiking, swimming, camping).
+    Includes trails within large parks (>50 hectares) to catch urban parks like Prospect Park.
+
+    Returns:
+        {
+            "hiking": [...],
+            "swimming": [...],
+            "camping": [...]
+        }
+    """
+    query = _nature_features_query(lat, lon, radius_m, include_hiking)
+
     _nf_key = f"query_nature_features:{lat:.5f}:{lon:.5f}:{int(radius_m)}:{1 if include_hiking else 0}"
     with _overpass_rlock_for(_nf_key):
         try:
-            def _do_request():
-                r = requests.post(
-                    get_overpass_url(),
-                    data={"data": query},
-                    timeout=_overpass_timeout(35),  # Match QL timeout; was 25s which cut off before Overpass finished
-                    headers={"User-Agent": "HomeFit/1.0"}
-                )
-                if r.status_code != 200:
-                    raise RuntimeError(f"Overpass status={r.status_code}")
-                return r
-
-            # Nature features are non-critical (nice to have) - use NON_CRITICAL profile
-            resp = _retry_overpass(_do_request, query_type="nature_features")
-            if resp is None or resp.status_code != 200:
-                return _nature_skeleton(OVERPASS_OUTCOME_ERROR)
-            data = _safe_overpass_json(resp, context="nature features query")
-            if data is None:
-                return _nature_skeleton(OVERPASS_OUTCOME_ERROR)
-            elements = data.get("elements", [])
+            elements = _bundle_elements(query, lat, lon)
+            if elements is None:
+                def _do_request():
+                    r = http_client.post(
+                        get_overpass_url(),
+                        data={"data": query},
+                        timeout=_overpass_timeout(35),  # Match QL timeout; was 25s which cut off before Overpass finished
+                        headers={"User-Agent": "HomeFit/1.0"}
+                    )
+                    if r.status_code != 200:
+                        raise RuntimeError(f"Overpass status={r.status_code}")
+                    return r
+
+                # Nature features are non-critical (nice to have) - use NON_CRITICAL profile
+                resp = _retry_overpass(_do_request, query_type="nature_features")
+                if resp is None or resp.status_code != 200:
+                    return _nature_skeleton(OVERPASS_OUTCOME_ERROR)
+                data = _safe_overpass_json(resp, context="nature features query")
+                if data is None:
+                    return _nature_skeleton(OVERPASS_OUTCOME_ERROR)
+                elements = data.get("elements", [])
 
             # DIAGNOSTIC: Log raw camping elements before processing
             raw_camping_elements = [
@@ -801,7 +842,35 @@ def query_nature_features(
             return _nature_skeleton(_classify_overpass_exception(e))
 
 
-@cached(ttl_seconds=CACHE_TTL['osm_queries'])
+def _water_features_query(lat: float, lon: float, radius_m: int) -> str:
+    """Overpass QL for query_water_features (waterways, waterbodies, coastline)."""
+    return f"""
+    [out:json][timeout:{_overpass_timeout(40)}];
+    (
+      // WATERWAYS (rivers, streams)
+      way["waterway"](around:{radius_m},{lat},{lon});
+      way["waterway"="river"](around:{radius_m},{lat},{lon});
+      way["waterway"="stream"](around:{radius_m},{lat},{lon});
+      
+      // WATERBODIES (lakes, reservoirs, ponds)
+      way["natural"="water"](around:{radius_m},{lat},{lon});
+      relation["natural"="water"](around:{radius_m},{lat},{lon});
+      
+      // OCEAN/SEA
+      way["natural"="bay"](around:{radius_m},{lat},{lon});
+      way["natural"="coastline"](around:{radius_m},{lat},{lon});
+      relation["natural"="bay"](around:{radius_m},{lat},{lon});
+      relation["natural"="coastline"](around:{radius_m},{lat},{lon});
+    );
+    out body;
+    >;
+    out skel qt;
+    """
+
+
+# Bucket sized by the consumer, not the 15 km radius: natural_beauty reads
+# nearest_distance_km at 0 km (on the water), 0.5 km (river corridor fade) and 1 km.
+@cached(ttl_seconds=CACHE_TTL['osm_queries'], spatial=SpatialBucket(max_offset_m=25))
 @safe_api_call("osm", required=False)
 @handle_api_timeout(timeout_seconds=30)
 def query_water_features(lat: float, lon: float, radius_m: int = 15000) -> Optional[Dict]:
@@ -825,56 +894,37 @@ def query_water_features(lat: float, lon: float, radius_m: int = 15000) -> Optio
     """
     import math
     
-    query = f"""
-    [out:json][timeout:{_overpass_timeout(40)}];
-    (
-      // WATERWAYS (rivers, streams)
-      way["waterway"](around:{radius_m},{lat},{lon});
-      way["waterway"="river"](around:{radius_m},{lat},{lon});
-      way["waterway"="stream"](around:{radius_m},{lat},{lon});
-      
-      // WATERBODIES (lakes, reservoirs, ponds)
-      way["natural"="water"](around:{radius_m},{lat},{lon});
-      relation["natural"="water"](around:{radius_m},{lat},{lon});
-      
-      // OCEAN/SEA
-      way["natural"="bay"](around:{radius_m},{lat},{lon});
-      way["natural"="coastline"](around:{radius_m},{lat},{lon});
-      relation["natural"="bay"](around:{radius_m},{lat},{lon});
-      relation["natural"="coastline"](around:{radius_m},{lat},{lon});
-    );
-    out body;
-    >;
-    out skel qt;
-    """
+    query = _water_features_query(lat, lon, radius_m)
     
     try:
-        def _do_request():
-            resp = requests.post(
-                get_overpass_url(),
-                data={"data": query},
-                timeout=_overpass_timeout(40),
-                headers={"User-Agent": "HomeFit/1.0"}
-            )
-            # Trigger endpoint rotation in _retry_overpass for non-200 upstream responses
-            # (e.g. 406 from overpass-api.de observed in production runs).
-            if resp is None or resp.status_code != 200:
-                raise requests.exceptions.RequestException(
-                    f"water_features non-200 from {get_overpass_url()}: status={getattr(resp, 'status_code', 'none')}"
+        elements = _bundle_elements(query, lat, lon)
+        if elements is None:
+            def _do_request():
+                resp = http_client.post(
+                    get_overpass_url(),
+                    data={"data": query},
+                    timeout=_overpass_timeout(40),
+                    headers={"User-Agent": "HomeFit/1.0"}
                 )
-            return resp
+                # Trigger endpoint rotation in _retry_overpass for non-200 upstream responses
+                # (e.g. 406 from overpass-api.de observed in production runs).
+                if resp is None or resp.status_code != 200:
+                    raise requests.exceptions.RequestException(
+                        f"water_features non-200 from {get_overpass_url()}: status={getattr(resp, 'status_code', 'none')}"
+                    )
+                return resp
 
-        # Water proximity is critical for perceived natural beauty; use shared retry/throttling.
-        resp = _retry_overpass(_do_request, query_type="water_features")
+            # Water proximity is critical for perceived natural beauty; use shared retry/throttling.
+            resp = _retry_overpass(_do_request, query_type="water_features")
 
-        # IMPORTANT: return None on failure so the cache layer can fall back to stale cache if available.
-        if resp is None or resp.status_code != 200:
-            return None
+            # IMPORTANT: return None on failure so the cache layer can fall back to stale cache if available.
+            if resp is None or resp.status_code != 200:
+                return None
         
-        data = _safe_overpass_json(resp, context="water features query")
-        if data is None:
-            return None
-        elements = data.get("elements", [])
+            data = _safe_overpass_json(resp, context="water features query")
+            if data is None:
+                return None
+            elements = data.get("elements", [])
         nodes_dict = {
             e.get("id"): e for e in elements
             if e.get("type") == "node" and e.get("id") is not None
@@ -1104,19 +1154,9 @@ def query_water_features(lat: float, lon: float, radius_m: int = 15000) -> Optio
         return None
 
 
-def query_enhanced_trees(lat: float, lon: float, radius_m: int = 1000) -> Optional[Dict]:
-    """
-    Enhanced tree query with comprehensive tree data from OSM.
-    
-    Returns:
-        {
-            "tree_rows": [...],
-            "street_trees": [...],
-            "individual_trees": [...],
-            "tree_areas": [...]
-        }
-    """
-    query = f"""
+def _enhanced_trees_query(lat: float, lon: float, radius_m: int) -> str:
+    """Overpass QL for query_enhanced_trees."""
+    return f"""
     [out:json][timeout:30];
     (
       // TREE ROWS
@@ -1141,21 +1181,38 @@ def query_enhanced_trees(lat: float, lon: float, radius_m: int = 1000) -> Option
     out skel qt;
     """
 
+
+def query_enhanced_trees(lat: float, lon: float, radius_m: int = 1000) -> Optional[Dict]:
+    """
+    Enhanced tree query with comprehensive tree data from OSM.
+    
+    Returns:
+        {
+            "tree_rows": [...],
+            "street_trees": [...],
+            "individual_trees": [...],
+            "tree_areas": [...]
+        }
+    """
+    query = _enhanced_trees_query(lat, lon, radius_m)
+
     try:
-        resp = requests.post(
-            get_overpass_url(),
-            data={"data": query},
-            timeout=_overpass_timeout(40),
-            headers={"User-Agent": "HomeFit/1.0"}
-        )
+        elements = _bundle_elements(query, lat, lon)
+        if elements is None:
+            resp = http_client.post(
+                get_overpass_url(),
+                data={"data": query},
+                timeout=_overpass_timeout(40),
+                headers={"User-Agent": "HomeFit/1.0"}
+            )
 
-        if resp.status_code != 200:
-            return None
+            if resp.status_code != 200:
+                return None
 
-        data = _safe_overpass_json(resp, context="enhanced trees query")
-        if data is None:
-            return None
-        elements = data.get("elements", [])
+            data = _safe_overpass_json(resp, context="enhanced trees query")
+            if data is None:
+                return None
+            elements = data.get("elements", [])
 
         tree_rows, street_trees, individual_trees, tree_areas = _process_enhanced_trees(
             elements, lat, lon)
@@ -1172,20 +1229,9 @@ def query_enhanced_trees(lat: float, lon: float, radius_m: int = 1000) -> Option
         return None
 
 
-def query_cultural_assets(lat: float, lon: float, radius_m: int = 1000) -> Optional[Dict]:
-    """
-    Query OSM for cultural and artistic assets.
-    
-    Returns:
-        {
-            "museums": [...],
-            "galleries": [...],
-            "theaters": [...],
-            "public_art": [...],
-            "cultural_venues": [...]
-        }
-    """
-    query = f"""
+def _cultural_assets_query(lat: float, lon: float, radius_m: int) -> str:
+    """Overpass QL for query_cultural_assets."""
+    return f"""
     [out:json][timeout:35];
     (
       // MUSEUMS
@@ -1221,26 +1267,44 @@ def query_cultural_assets(lat: float, lon: float, radius_m: int = 1000) -> Optio
     out skel qt;
     """
 
+
+def query_cultural_assets(lat: float, lon: float, radius_m: int = 1000) -> Optional[Dict]:
+    """
+    Query OSM for cultural and artistic assets.
+    
+    Returns:
+        {
+            "museums": [...],
+            "galleries": [...],
+            "theaters": [...],
+            "public_art": [...],
+            "cultural_venues": [...]
+        }
+    """
+    query = _cultural_assets_query(lat, lon, radius_m)
+
     try:
-        def _do_request():
-            return requests.post(
-                get_overpass_url(),
-                data={"data": query},
-                timeout=_overpass_timeout(45),
-                headers={"User-Agent": "HomeFit/1.0"}
-            )
+        elements = _bundle_elements(query, lat, lon)
+        if elements is None:
+            def _do_request():
+                return http_client.post(
+                    get_overpass_url(),
+                    data={"data": query},
+                    timeout=_overpass_timeout(45),
+                    headers={"User-Agent": "HomeFit/1.0"}
+                )
 
-        # Cultural assets are non-critical; use NON_CRITICAL retry profile via query_type mapping
-        resp = _retry_overpass(_do_request, query_type="cultural_assets")
-        if resp is None or resp.status_code != 200:
-            if resp and resp.status_code == 429:
-                logger.warning("OSM cultural assets query rate limited (429)")
-            return None
+            # Cultural assets are non-critical; use NON_CRITICAL retry profile via query_type mapping
+            resp = _retry_overpass(_do_request, query_type="cultural_assets")
+            if resp is None or resp.status_code != 200:
+                if resp and resp.status_code == 429:
+                    logger.warning("OSM cultural assets query rate limited (429)")
+                return None
         
-        data = _safe_overpass_json(resp, context="cultural assets query")
-        if data is None:
-            return None
-        elements = data.get("elements", [])
+            data = _safe_overpass_json(resp, context="cultural assets query")
+            if data is None:
+                return None
+            elements = data.get("elements", [])
         
         museums, galleries, theaters, public_art, cultural_venues = _process_cultural_assets(
             elements, lat, lon)
@@ -1258,17 +1322,9 @@ def query_cultural_assets(lat: float, lon: float, radius_m: int = 1000) -> Optio
         return None
 
 
-def query_charm_features(lat: float, lon: float, radius_m: int = 500) -> Optional[Dict]:
-    """
-    Query OSM for neighborhood charm features (historic buildings, fountains, public art).
-
-    Returns:
-        {
-            "historic": [...],
-            "artwork": [...]
-        }
-    """
-    query = f"""
+def _charm_features_query(lat: float, lon: float, radius_m: int) -> str:
+    """Overpass QL for query_charm_features (historic, heritage, public art)."""
+    return f"""
     [out:json][timeout:15];
     (
       // HISTORIC BUILDINGS - primary query (standard historic tag)
@@ -1298,26 +1354,41 @@ def query_charm_features(lat: float, lon: float, radius_m: int = 500) -> Optiona
     out skel qt;
     """
 
+
+def query_charm_features(lat: float, lon: float, radius_m: int = 500) -> Optional[Dict]:
+    """
+    Query OSM for neighborhood charm features (historic buildings, fountains, public art).
+
+    Returns:
+        {
+            "historic": [...],
+            "artwork": [...]
+        }
+    """
+    query = _charm_features_query(lat, lon, radius_m)
+
     try:
-        def _do_request():
-            return requests.post(
-                get_overpass_url(),
-                data={"data": query},
-                timeout=_overpass_timeout(35),
-                headers={"User-Agent": "HomeFit/1.0"}
-            )
+        elements = _bundle_elements(query, lat, lon)
+        if elements is None:
+            def _do_request():
+                return http_client.post(
+                    get_overpass_url(),
+                    data={"data": query},
+                    timeout=_overpass_timeout(35),
+                    headers={"User-Agent": "HomeFit/1.0"}
+                )
 
-        # Charm features are non-critical; use NON_CRITICAL retry profile via query_type mapping
-        resp = _retry_overpass(_do_request, query_type="charm_features")
-        if resp is None or resp.status_code != 200:
-            if resp and resp.status_code == 429:
-                logger.warning("OSM charm query rate limited (429)")
-            return None
+            # Charm features are non-critical; use NON_CRITICAL retry profile via query_type mapping
+            resp = _retry_overpass(_do_request, query_type="charm_features")
+            if resp is None or resp.status_code != 200:
+                if resp and resp.status_code == 429:
+                    logger.warning("OSM charm query rate limited (429)")
+                return None
     
-        data = _safe_overpass_json(resp, context="charm features query")
-        if data is None:
-            return None
-        elements = data.get("elements", [])
+            data = _safe_overpass_json(resp, context="charm features query")
+            if data is None:
+                return None
+            elements = data.get("elements", [])
     
         historic, artwork = _process_charm_features(elements, lat, lon)
     
@@ -1343,31 +1414,13 @@ _THIRD_PLACE_CHAIN_FILTER = (
 # brand — independent and local spots (incl. taquerias, halal carts, diners) count.
 _RESTAURANT_CHAIN_FILTER = (
     '["brand"!~"McDonald|Burger King|Wendy|Subway|Taco Bell|KFC|Popeyes|Chipotle'
-    "|Domino|Pizza Hut|Chick-fil-A|Five Guys|Panda Express|Sonic|Arby|Jack in the Box"
-    '|Wingstop|Little Caesars|Papa John"]'
-)
-
-
-@safe_api_call("osm", required=False)
-@handle_api_timeout(timeout_seconds=60)
-def query_civic_nodes(lat: float, lon: float, radius_m: int = 800) -> Dict:
-    """
-    Query OSM for civic gathering places (Social Fabric civic gathering).
-
-    Purpose-built civic infrastructure:
-      - amenity=library, community_centre, townhall
-      - amenity=place_of_worship
-      - leisure=community_garden
-
-    Oldenburg third places (non-chain, named only):
-      - amenity=cafe, bar, pub
-      - shop=barber, hairdresser
+    "|Domino|Pizza Hut|Chick-fil-A|Five Guys|Panda Express|Sonic|Arby|Jack in the Box"
+    '|Wingstop|Little Caesars|Papa John"]'
+)
 
-    Excludes parks/playgrounds (active_outdoors), daily amenities (neighborhood_amenities),
-    and chain establishments via brand/name filter.
 
-    Always returns a dict with source_status, nodes, and optional error.
-    """
+def _civic_nodes_query(lat: float, lon: float, radius_m: int) -> str:
+    """Overpass QL for query_civic_nodes (third places only at radius <= 1200m)."""
     cf = _THIRD_PLACE_CHAIN_FILTER
     rf = _RESTAURANT_CHAIN_FILTER
     # Third places (cafes, bars, barbershops, restaurants) are only queried at ≤1200m.
@@ -1385,7 +1438,7 @@ def query_civic_nodes(lat: float, lon: float, radius_m: int = 800) -> Dict:
       // working-class neighborhoods (taquerias, diners, halal spots, momo shops)
       node["amenity"~"^(restaurant|fast_food)$"]["name"]{rf}(around:{radius_m},{lat},{lon});
       way["amenity"~"^(restaurant|fast_food)$"]["name"]{rf}(around:{radius_m},{lat},{lon});""" if include_third_places else ""
-    query = f"""
+    return f"""
     [out:json][timeout:{_overpass_timeout(40)}];
     (
       // Libraries and community centres
@@ -1421,6 +1474,29 @@ def query_civic_nodes(lat: float, lon: float, radius_m: int = 800) -> Dict:
     out skel qt;
     """
 
+
+@safe_api_call("osm", required=False)
+@handle_api_timeout(timeout_seconds=60)
+def query_civic_nodes(lat: float, lon: float, radius_m: int = 800) -> Dict:
+    """
+    Query OSM for civic gathering places (Social Fabric civic gathering).
+
+    Purpose-built civic infrastructure:
+      - amenity=library, community_centre, townhall
+      - amenity=place_of_worship
+      - leisure=community_garden
+
+    Oldenburg third places (non-chain, named only):
+      - amenity=cafe, bar, pub
+      - shop=barber, hairdresser
+
+    Excludes parks/playgrounds (active_outdoors), daily amenities (neighborhood_amenities),
+    and chain establishments via brand/name filter.
+
+    Always returns a dict with source_status, nodes, and optional error.
+    """
+    query = _civic_nodes_query(lat, lon, radius_m)
+
     def _civic_error(code: str, message: str) -> Dict:
         return {
             "nodes": [],
@@ -1429,32 +1505,34 @@ def query_civic_nodes(lat: float, lon: float, radius_m: int = 800) -> Dict:
         }
 
     try:
-        def _do_request():
-            return requests.post(
-                get_overpass_url(),
-                data={"data": query},
-                timeout=_overpass_timeout(40),
-                headers={"User-Agent": "HomeFit/1.0"},
-            )
+        elements = _bundle_elements(query, lat, lon)
+        if elements is None:
+            def _do_request():
+                return http_client.post(
+                    get_overpass_url(),
+                    data={"data": query},
+                    timeout=_overpass_timeout(40),
+                    headers={"User-Agent": "HomeFit/1.0"},
+                )
 
-        resp = _retry_overpass(_do_request, query_type="civic_nodes")
-        if resp is None or resp.status_code != 200:
-            if resp and resp.status_code == 429:
-                logger.warning("OSM civic nodes query rate limited (429)")
-            if resp is None:
+            resp = _retry_overpass(_do_request, query_type="civic_nodes")
+            if resp is None or resp.status_code != 200:
+                if resp and resp.status_code == 429:
+                    logger.warning("OSM civic nodes query rate limited (429)")
+                if resp is None:
+                    return _civic_error(
+                        "request_failed",
+                        "Overpass request failed (timeout or no response after retries)",
+                    )
                 return _civic_error(
-                    "request_failed",
-                    "Overpass request failed (timeout or no response after retries)",
+                    f"http_{resp.status_code}",
+                    f"Overpass returned HTTP {resp.status_code}",
                 )
-            return _civic_error(
-                f"http_{resp.status_code}",
-                f"Overpass returned HTTP {resp.status_code}",
-            )
 
-        data = _safe_overpass_json(resp, context="civic nodes query")
-        if data is None:
-            return _civic_error("parse_error", "Overpass response was not valid JSON or was empty")
-        elements = data.get("elements", [])
+            data = _safe_overpass_json(resp, context="civic nodes query")
+            if data is None:
+                return _civic_error("parse_error", "Overpass response was not valid JSON or was empty")
+            elements = data.get("elements", [])
 
         nodes = []
         # Use center for ways to compute position
@@ -1554,27 +1632,9 @@ def query_civic_nodes(lat: float, lon: float, radius_m: int = 800) -> Dict:
         }
 
 
-@cached(ttl_seconds=CACHE_TTL['osm_queries'])
-@safe_api_call("osm", required=False)
-@handle_api_timeout(timeout_seconds=60)
-def query_local_businesses(lat: float, lon: float, radius_m: int = 1000, include_chains: bool = True, vacation_mode: bool = False) -> Optional[Dict]:
-    """
-    Query OSM for local businesses within walking distance.
-    By default includes chain establishments. Radius is chosen by callers (e.g. pillar radius profile);
-    there is no second widening pass here—avoid redundant large Overpass queries when amending call sites.
-
-    Args:
-        include_chains: If True, include chain/franchise businesses
-        vacation_mode: If True, extend Tier 3 with tourism infrastructure tags (same network call)
-
-    Returns:
-        {
-            "tier1_daily": [...],
-            "tier2_social": [...],
-            "tier3_culture": [...],
-            "tier4_services": [...]
-        }
-    """
+def _local_businesses_query(lat: float, lon: float, radius_m: int, include_chains: bool = True,
+                            vacation_mode: bool = False) -> str:
+    """Overpass QL for query_local_businesses."""
     # Brand filter: exclude known chains by default
     if not include_chains:
         # Exclude major chains/franchises but allow local businesses with brand tags
@@ -1597,7 +1657,7 @@ def query_local_businesses(lat: float, lon: float, radius_m: int = 1000, include
     # Make name requirement optional - query businesses with or without names
     # We'll filter out unnamed businesses in processing if needed, but this allows us to
     # find businesses that exist in OSM even if they don't have names yet
-    query = f"""
+    return f"""
     [out:json][timeout:60];
     (
       // TIER 1: DAILY ESSENTIALS
@@ -1660,8 +1720,32 @@ def query_local_businesses(lat: float, lon: float, radius_m: int = 1000, include
     out skel qt;
     """
 
+
+@cached(ttl_seconds=CACHE_TTL['osm_queries'])
+@safe_api_call("osm", required=False)
+@handle_api_timeout(timeout_seconds=60)
+def query_local_businesses(lat: float, lon: float, radius_m: int = 1000, include_chains: bool = True, vacation_mode: bool = False) -> Optional[Dict]:
+    """
+    Query OSM for local businesses within walking distance.
+    By default includes chain establishments. Radius is chosen by callers (e.g. pillar radius profile);
+    there is no second widening pass here—avoid redundant large Overpass queries when amending call sites.
+
+    Args:
+        include_chains: If True, include chain/franchise businesses
+        vacation_mode: If True, extend Tier 3 with tourism infrastructure tags (same network call)
+
+    Returns:
+        {
+            "tier1_daily": [...],
+            "tier2_social": [...],
+            "tier3_culture": [...],
+            "tier4_services": [...]
+        }
+    """
+    query = _local_businesses_query(lat, lon, radius_m, include_chains, vacation_mode)
+
     def _do_request():
-        r = requests.post(
+        r = http_client.post(
             get_overpass_url(),
             data={"data": query},
             timeout=_overpass_timeout(30),  # Reduced from 70s for faster failure
@@ -1675,18 +1759,20 @@ def query_local_businesses(lat: float, lon: float, radius_m: int = 1000, include
         return r
     
     try:
-        # Amenities are standard (important but not critical) - use STANDARD profile
-        resp = _retry_overpass(_do_request, query_type="amenities")
+        elements = _bundle_elements(query, lat, lon)
+        if elements is None:
+            # Amenities are standard (important but not critical) - use STANDARD profile
+            resp = _retry_overpass(_do_request, query_type="amenities")
 
-        if resp is None or resp.status_code != 200:
-            if resp and resp.status_code == 429:
-                logger.warning("OSM business query rate limited (429)")
-            return None
+            if resp is None or resp.status_code != 200:
+                if resp and resp.status_code == 429:
+                    logger.warning("OSM business query rate limited (429)")
+                return None
 
-        data = _safe_overpass_json(resp, context="businesses query")
-        if data is None:
-            return None
-        elements = data.get("elements", [])
+            data = _safe_overpass_json(resp, context="businesses query")
+            if data is None:
+                return None
+            elements = data.get("elements", [])
 
         # Diagnostic logging for amenities queries
         if len(elements) == 0:
@@ -2379,7 +2465,7 @@ def _query_trails_in_large_parks(lat: float, lon: float, radius_m: int = 15000)
             
             try:
                 def _do_paths_request():
-                    return requests.post(
+                    return http_client.post(
                         get_overpass_url(),
                         data={"data": paths_query},
                         timeout=_overpass_timeout(25),
@@ -2431,7 +2517,7 @@ def query_local_paths_within_green_areas(lat: float, lon: float, radius_m: int =
         );
         out geom;
         """
-        resp = requests.post(get_overpass_url(), data={"data": q}, timeout=_overpass_timeout(25), headers={"User-Agent":"HomeFit/1.0"})
+        resp = http_client.post(get_overpass_url(), data={"data": q}, timeout=_overpass_timeout(25), headers={"User-Agent":"HomeFit/1.0"})
         if resp.status_code != 200:
             return 0
         data = _safe_overpass_json(resp, context="local paths within green areas query")
@@ -2590,7 +2676,7 @@ def query_beauty_enhancers(lat: float, lon: float, radius_m: int = 1500) -> Dict
         >;
         out skel qt;
         """
-        r = requests.post(
+        r = http_client.post(
             OVERPASS_URL,
             data={"data": q},
             timeout=_overpass_timeout(35),
@@ -2665,7 +2751,7 @@ def query_beauty_enhancers(lat: float, lon: float, radius_m: int = 1500) -> Dict
         way["natural"="coastline"](around:2000,{lat},{lon});
         out center 1;
         """
-        rc = requests.post(get_overpass_url(), data={"data": qc}, timeout=_overpass_timeout(20), headers={"User-Agent": "HomeFit/1.0"})
+        rc = http_client.post(get_overpass_url(), data={"data": qc}, timeout=_overpass_timeout(20), headers={"User-Agent": "HomeFit/1.0"})
         if rc.status_code == 200 and rc.json().get("elements"):
             out["waterfront"] = 1
     except Exception:
@@ -3176,7 +3262,7 @@ def validate_osm_completeness(lat: float, lon: float) -> Dict[str, Any]:
         );
         out count;
         """
-        resp = requests.post(
+        resp = http_client.post(
             OVERPASS_URL,
             data={"data": query},
             timeout=_overpass_timeout(15),
@@ -3353,34 +3439,8 @@ def _process_healthcare_elements(elements: List[Dict], lat: float, lon: float, n
     }
 
 
-@cached(ttl_seconds=CACHE_TTL['osm_queries'])
-@safe_api_call("osm", required=False)
-@handle_api_timeout(timeout_seconds=20)
-def query_healthcare_facilities(lat: float, lon: float, radius_m: int = 10000) -> Optional[Dict]:
-    """
-    Query OSM for comprehensive healthcare facilities.
-    
-    IMPROVED: Split into 4 smaller sequential queries for better reliability.
-    Executes queries sequentially (not parallel) to respect rate limits.
-    
-    Returns:
-        {
-            "hospitals": [...],
-            "urgent_care": [...],
-            "clinics": [...],
-            "pharmacies": [...],
-            "doctors": [...]
-        }
-    """
-    results = {
-        "hospitals": [],
-        "urgent_care": [],
-        "clinics": [],
-        "pharmacies": [],
-        "doctors": [],
-        "_query_failed": False
-    }
-    
+def _healthcare_queries(lat: float, lon: float, radius_m: int) -> List[Tuple[str, str]]:
+    """Overpass QL for query_healthcare_facilities as (category, query) pairs."""
     # Build smaller, focused queries for better reliability
     # Query 1: Hospitals and major medical centers
     hospital_query = f"""
@@ -3442,35 +3502,68 @@ def query_healthcare_facilities(lat: float, lon: float, radius_m: int = 10000) -
     >;
     out skel qt;
     """
-    
-    # Execute queries in parallel for speed — each hits an independent Overpass endpoint.
-    queries = [
+    return [
         ("hospitals", hospital_query),
         ("urgent_care", urgent_query),
         ("clinics", clinic_query),
         ("pharmacies", pharmacy_query)
     ]
 
+
+@cached(ttl_seconds=CACHE_TTL['osm_queries'])
+@safe_api_call("osm", required=False)
+@handle_api_timeout(timeout_seconds=20)
+def query_healthcare_facilities(lat: float, lon: float, radius_m: int = 10000) -> Optional[Dict]:
+    """
+    Query OSM for comprehensive healthcare facilities.
+    
+    IMPROVED: Split into 4 smaller sequential queries for better reliability.
+    Executes queries sequentially (not parallel) to respect rate limits.
+    
+    Returns:
+        {
+            "hospitals": [...],
+            "urgent_care": [...],
+            "clinics": [...],
+            "pharmacies": [...],
+            "doctors": [...]
+        }
+    """
+    results = {
+        "hospitals": [],
+        "urgent_care": [],
+        "clinics": [],
+        "pharmacies": [],
+        "doctors": [],
+        "_query_failed": False
+    }
+    
+    # Build smaller, focused queries for better reliability.
+    # Execute queries in parallel for speed — each hits an independent Overpass endpoint.
+    queries = _healthcare_queries(lat, lon, radius_m)
+
     logger.debug(f"Querying healthcare facilities within {radius_m/1000:.0f}km (parallel)...")
 
     def _fetch_category(category: str, query: str) -> Optional[Dict]:
         """Fetch one healthcare category; returns processed category_results or None on failure."""
         try:
-            def _do_request():
-                return requests.post(
-                    get_overpass_url(),
-                    data={"data": query},
-                    timeout=_overpass_timeout(12),
-                    headers={"User-Agent": "HomeFit/1.0"}
-                )
-            resp = _retry_overpass(_do_request, query_type="healthcare")
-            if resp is None or resp.status_code != 200:
-                logger.warning(f"Healthcare {category} query failed: {resp.status_code if resp else 'no response'}")
-                return None
-            data = _safe_overpass_json(resp, context=f"healthcare {category} query")
-            if data is None:
-                return None
-            elements = data.get("elements", [])
+            elements = _bundle_elements(query, lat, lon)
+            if elements is None:
+                def _do_request():
+                    return http_client.post(
+                        get_overpass_url(),
+                        data={"data": query},
+                        timeout=_overpass_timeout(12),
+                        headers={"User-Agent": "HomeFit/1.0"}
+                    )
+                resp = _retry_overpass(_do_request, query_type="healthcare")
+                if resp is None or resp.status_code != 200:
+                    logger.warning(f"Healthcare {category} query failed: {resp.status_code if resp else 'no response'}")
+                    return None
+                data = _safe_overpass_json(resp, context=f"healthcare {category} query")
+                if data is None:
+                    return None
+                elements = data.get("elements", [])
             nodes_dict = {e["id"]: e for e in elements if e.get("type") == "node"}
             ways_dict = {e["id"]: e for e in elements if e.get("type") == "way"}
             return _process_healthcare_elements(elements, lat, lon, nodes_dict, ways_dict)
@@ -3478,8 +3571,8 @@ def query_healthcare_facilities(lat: float, lon: float, radius_m: int = 10000) -
             logger.warning(f"Healthcare {category} query error: {e}")
             return None
 
-    from concurrent.futures import ThreadPoolExecutor as _HCPool
-    with _HCPool(max_workers=4) as _pool:
+    from .executors import get_pool
+    with get_pool("upstream") as _pool:
         futures = {_pool.submit(_fetch_category, cat, q): cat for cat, q in queries}
         for fut in futures:
             cat = futures[fut]
@@ -3510,21 +3603,9 @@ def query_healthcare_facilities(lat: float, lon: float, radius_m: int = 10000) -
 
 
 
-@cached(ttl_seconds=CACHE_TTL['osm_queries'])
-@safe_api_call("osm", required=False)
-@handle_api_timeout(timeout_seconds=30)
-def query_railway_stations(lat: float, lon: float, radius_m: int = 2000) -> Optional[List[Dict]]:
-    """
-    Query OSM for railway stations within radius.
-    
-    Args:
-        lat, lon: Coordinates
-        radius_m: Search radius in meters (default 2km)
-    
-    Returns:
-        List of railway stations with name, lat, lon, distance
-    """
-    query = f"""
+def _railway_stations_query(lat: float, lon: float, radius_m: int) -> str:
+    """Overpass QL for query_railway_stations."""
+    return f"""
     [out:json][timeout:15];
     (
       // Railway stations
@@ -3546,47 +3627,213 @@ def query_railway_stations(lat: float, lon: float, radius_m: int = 2000) -> Opti
     >;
     out skel qt;
     """
+
+
+@cached(ttl_seconds=CACHE_TTL['osm_queries'])
+@safe_api_call("osm", required=False)
+@handle_api_timeout(timeout_seconds=30)
+def query_railway_stations(lat: float, lon: float, radius_m: int = 2000) -> Optional[List[Dict]]:
+    """
+    Query OSM for railway stations within radius.
+    
+    Args:
+        lat, lon: Coordinates
+        radius_m: Search radius in meters (default 2km)
+    
+    Returns:
+        List of railway stations with name, lat, lon, distance
+    """
+    query = _railway_stations_query(lat, lon, radius_m)
     
     try:
         logger.debug(f"Querying OSM for railway stations within {radius_m/1000:.1f}km...")
-        resp = requests.post(get_overpass_url(), data=query, timeout=_overpass_timeout(30))
-        
-        if resp.status_code == 200:
+        elements = _bundle_elements(query, lat, lon)
+        if elements is None:
+            resp = http_client.post(get_overpass_url(), data=query, timeout=_overpass_timeout(30))
+            if resp.status_code != 200:
+                logger.warning(f"OSM railway station query failed: {resp.status_code}")
+                return None
             data = _safe_overpass_json(resp, context="railway stations query")
             if data is None:
                 return None
             elements = data.get("elements", [])
-            
-            stations = []
-            for elem in elements:
-                if "lat" in elem and "lon" in elem:
-                    tags = elem.get("tags", {})
-                    name = tags.get("name") or tags.get("operator") or "Unnamed Station"
-                    railway_type = tags.get("railway") or tags.get("public_transport") or "station"
-                    
-                    # Calculate distance
-                    distance_km = haversine_distance(lat, lon, elem["lat"], elem["lon"])
-                    distance_m = distance_km * 1000
-                    
-                    stations.append({
-                        "name": name,
-                        "lat": elem["lat"],
-                        "lon": elem["lon"],
-                        "distance_m": round(distance_m),
-                        "distance_km": round(distance_km, 2),
-                        "railway_type": railway_type,
-                        "tags": tags
-                    })
-            
-            # Sort by distance
-            stations.sort(key=lambda x: x["distance_m"])
-            
-            logger.debug(f"Found {len(stations)} railway stations")
-            return stations
-        else:
-            logger.warning(f"OSM railway station query failed: {resp.status_code}")
-            return None
+        
+        stations = []
+        for elem in elements:
+            if "lat" in elem and "lon" in elem:
+                tags = elem.get("tags", {})
+                name = tags.get("name") or tags.get("operator") or "Unnamed Station"
+                railway_type = tags.get("railway") or tags.get("public_transport") or "station"
+                
+                # Calculate distance
+                distance_km = haversine_distance(lat, lon, elem["lat"], elem["lon"])
+                distance_m = distance_km * 1000
+                
+                stations.append({
+                    "name": name,
+                    "lat": elem["lat"],
+                    "lon": elem["lon"],
+                    "distance_m": round(distance_m),
+                    "distance_km": round(distance_km, 2),
+                    "railway_type": railway_type,
+                    "tags": tags
+                })
+        
+        # Sort by distance
+        stations.sort(key=lambda x: x["distance_m"])
+        
+        logger.debug(f"Found {len(stations)} railway stations")
+        return stations
             
     except Exception as e:
         logger.error(f"Error querying OSM for railway stations: {e}", exc_info=True)
-        return None
\ No newline at end of file
+        return None
+
+# ---------------------------------------------------------------------------
+# Per-location Overpass bundle prefetch
+# ---------------------------------------------------------------------------
+
+def _bundle_consumer_queries(lat: float, lon: float, consumer: str, radius_m: int,
+                             vacation_mode: bool = False) -> List[str]:
+    """The Overpass QL a consumer would send for (lat, lon, radius_m)."""
+    if consumer == "green_spaces":
+        return [_green_spaces_query(lat, lon, radius_m)]
+    if consumer == "nature_features":
+        return [_nature_features_query(lat, lon, radius_m, True)]
+    if consumer == "water_features":
+        return [_water_features_query(lat, lon, radius_m)]
+    if consumer == "enhanced_trees":
+        return [_enhanced_trees_query(lat, lon, radius_m)]
+    if consumer == "cultural_assets":
+        return [_cultural_assets_query(lat, lon, radius_m)]
+    if consumer == "charm_features":
+        return [_charm_features_query(lat, lon, radius_m)]
+    if consumer == "civic_nodes":
+        return [_civic_nodes_query(lat, lon, radius_m)]
+    if consumer == "local_businesses":
+        # include_chains=True has a subset of the no-chains filters, so it answers both variants.
+        return [_local_businesses_query(lat, lon, radius_m, True, vacation_mode)]
+    if consumer == "healthcare_facilities":
+        return [q for _, q in _healthcare_queries(lat, lon, radius_m)]
+    if consumer == "railway_stations":
+        return [_railway_stations_query(lat, lon, radius_m)]
+    if consumer == "roads_and_buildings":
+        from .street_geometry import _roads_and_buildings_query
+        return [_roads_and_buildings_query(lat, lon, radius_m)]
+    raise ValueError(f"Unknown Overpass bundle consumer: {consumer}")
+
+
+# Pillar -> (consumer, radius_m). Radii are the largest each pillar requests across area types,
+# so one fetch answers every area-type variant locally. Exceptions stay live queries: the 25km
+# rural regional nature radius (25km of waterways for every city is a net loss) and the 3km
+# rural civic radius. roads_and_buildings is registered for explicit prefetch (batch scripts)
+# but not listed here: arch diversity fetches it in the pre-pillar phase, before this runs.
+# water_features is not listed either: it is cached per H3 cell (SpatialBucket) and called
+# with the cell centre, which never matches a bundle keyed on the request's exact point.
+_BUNDLE_PILLAR_NEEDS: Dict[str, List[Tuple[str, int]]] = {
+    "active_outdoors": [("green_spaces", 2000), ("nature_features", 15000)],
+    "natural_beauty": [("green_spaces", 2000)],
+    "built_environment": [("charm_features", 2000)],
+    "neighborhood_amenities": [("local_businesses", 1500)],
+    "social_fabric": [("civic_nodes", 1200)],
+    "public_transit_access": [("railway_stations", 2500)],
+    "healthcare_access": [("healthcare_facilities", 10000)],
+}
+
+
+def bundle_needs_for(only_pillars: Optional[set] = None) -> List[Tuple[str, int]]:
+    """Consumers (and radii) to prefetch before the pillar fan-out of a score request."""
+    needs: Dict[str, int] = {}
+    for pillar, entries in _BUNDLE_PILLAR_NEEDS.items():
+        if only_pillars is not None and pillar not in only_pillars:
+            continue
+        for consumer, radius_m in entries:
+            needs[consumer] = max(radius_m, needs.get(consumer, 0))
+    return sorted(needs.items())
+
+
+def _fetch_bundle_group(lat: float, lon: float, selectors) -> Optional[overpass_planner.LocationBundle]:
+    query = overpass_planner.build_union_query(selectors, lat, lon, _overpass_timeout(60))
+
+    def _do_request():
+        r = http_client.post(
+            get_overpass_url(),
+            data={"data": query},
+            timeout=_overpass_timeout(60),
+            headers={"User-Agent": "HomeFit/1.0"},
+        )
+        if r.status_code != 200:
+            raise RuntimeError(f"Overpass status={r.status_code}")
+        return r
+
+    resp = _retry_overpass(_do_request, query_type="bundle")
+    if resp is None or resp.status_code != 200:
+        return None
+    data = _safe_overpass_json(resp, context="location bundle query")
+    if data is None:
+        return None
+    if data.get("remark"):
+        # Overpass reports runtime errors/timeouts in `remark` with a partial element list;
+        # a partial union would silently drop features for every consumer, so discard it.
+        logger.warning(f"OSM bundle query returned remark, discarding: {str(data.get('remark'))[:200]}")
+        return None
+    coverage = {sel.key: (sel, radius) for sel, radius in selectors}
+    return overpass_planner.LocationBundle(lat, lon, data.get("elements", []), coverage)
+
+
+def prefetch_location_bundle(
+    lat: float,
+    lon: float,
+    needs: List[Tuple[str, int]],
+    *,
+    vacation_mode: bool = False,
+    background: bool = False,
+) -> bool:
+    """
+    Fetch every consumer's selectors for (lat, lon) in one or two union queries.
+
+    Consumers (query_green_spaces, query_local_businesses, _fetch_roads_and_buildings, ...)
+    then answer from the bundle without their own round-trip. Failure is non-fatal: consumers
+    fall back to live queries. With background=True the fetch runs on a daemon thread and
+    consumers that ask before it lands wait for it instead of racing it.
+
+    Returns True if a fetch was started/completed, False if disabled, already pending, or failed.
+    """
+    if not _OVERPASS_BUNDLE_ENABLED or not needs:
+        return False
+    # Consumers answered by the local extract never reach the union.
+    needs = [(c, r) for c, r in needs if not osm_local.covers(lat, lon, r)]
+    if not needs:
+        return False
+    queries: List[str] = []
+    for consumer, radius_m in needs:
+        queries.extend(_bundle_consumer_queries(lat, lon, consumer, radius_m, vacation_mode))
+    groups = overpass_planner.plan_unions(queries)
+    if not groups or not overpass_planner.mark_pending(lat, lon):
+        return False
+
+    def _run() -> bool:
+        t0 = time.perf_counter()
+        ok = True
+        try:
+            for selectors in groups:
+                bundle = _fetch_bundle_group(lat, lon, selectors)
+                if bundle is None:
+                    ok = False
+                    continue
+                overpass_planner.register_bundle(bundle)
+        except Exception as e:
+            logger.warning(f"OSM bundle prefetch failed (consumers use live queries): {e}")
+            ok = False
+        finally:
+            overpass_planner.finish_pending(lat, lon)
+        logger.info(
+            f"[TIMING] osm_bundle_prefetch {time.perf_counter() - t0:.3f}s "
+            f"(groups={len(groups)}, selectors={sum(len(g) for g in groups)}, ok={ok})"
+        )
+        return ok
+
+    if background:
+        threading.Thread(target=_run, name="osm-bundle-prefetch", daemon=True).start()
+        return True
+    return _run()
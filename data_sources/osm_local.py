@@ -0,0 +1,188 @@
+"""
+Local OSM extract backend.
+
+Answers the same `around:` Overpass queries osm_api / street_geometry build, from a
+regional SQLite (RTree) store built offline by `scripts/baselines/build_osm_extract.py`
+(Geofabrik PBF or Overpass JSON dump). When the store's extent covers the query circle,
+consumers skip `_retry_overpass` entirely, so metro catalog rescoring does not wait on
+public Overpass endpoints or 429 backoff.
+
+Schema (SQLite):
+  extents(name, min_lat, min_lon, max_lat, max_lon)   -- regions the extract is complete for
+  nodes(id, lat, lon, tags)                           -- tags JSON or NULL
+  ways(id, nodes, tags, center_lat, center_lon)       -- nodes JSON array of node ids
+  relations(id, members, tags, center_lat, center_lon)
+  node_index / way_index / relation_index             -- RTree over tagged elements
+
+Override path via env ``OSM_LOCAL_DB_PATH`` (opened through local_sqlite.LocalDB).
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from logging_config import get_logger
+
+from . import overpass_planner
+from .local_sqlite import LocalDB, bbox as _bbox
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data_cache" / "osm_extract.sqlite"
+
+# SQLite caps host parameters per statement; chunk IN (...) lookups below this.
+_IN_CHUNK = 900
+
+_DB = LocalDB("OSM_LOCAL_DB_PATH", DEFAULT_DB_PATH, "OSM extract")
+
+
+@lru_cache(maxsize=1)
+def _extents() -> Tuple[Tuple[float, float, float, float], ...]:
+    conn = _DB.connect()
+    if conn is None:
+        return ()
+    try:
+        rows = conn.execute("SELECT min_lat, min_lon, max_lat, max_lon FROM extents").fetchall()
+    except Exception as exc:
+        logger.warning("Local OSM extract has no readable extents table: %s", exc)
+        return ()
+    return tuple((float(a), float(b), float(c), float(d)) for a, b, c, d in rows)
+
+
+def reset() -> None:
+    """Close every thread's connection and drop cached path/extent state (tests, or after swapping the DB file)."""
+    _DB.reset()
+    _extents.cache_clear()
+
+
+def covers(lat: float, lon: float, radius_m: float) -> bool:
+    """True when the whole query circle lies inside one extract extent."""
+    extents = _extents()
+    if not extents:
+        return False
+    min_lat, min_lon, max_lat, max_lon = _bbox(lat, lon, radius_m)
+    return any(
+        e_min_lat <= min_lat and e_min_lon <= min_lon and e_max_lat >= max_lat and e_max_lon >= max_lon
+        for e_min_lat, e_min_lon, e_max_lat, e_max_lon in extents
+    )
+
+
+def _tag_prefilter(selectors: List[overpass_planner.Selector]) -> Tuple[str, List[str]]:
+    """
+    SQL clause keeping rows that carry at least one key some selector requires.
+
+    Only a coarse prefilter (exact matching happens in Selector.matches); returns an empty
+    clause when any selector has no positive key requirement.
+    """
+    paths: List[str] = []
+    for sel in selectors:
+        required = [k for k, op, _v in sel.filters if op in ("has", "=", "~")]
+        if not required:
+            return "", []
+        paths.append('$."' + required[0].replace('"', '\\"') + '"')
+    paths = sorted(set(paths))
+    clause = " OR ".join("json_extract(t.tags, ?) IS NOT NULL" for _ in paths)
+    return f" AND ({clause})", paths
+
+
+def _fetch_by_ids(conn: sqlite3.Connection, sql: str, ids: List[int]) -> List[Tuple]:
+    rows: List[Tuple] = []
+    for i in range(0, len(ids), _IN_CHUNK):
+        chunk = ids[i:i + _IN_CHUNK]
+        rows.extend(conn.execute(sql.format(",".join("?" * len(chunk))), chunk).fetchall())
+    return rows
+
+
+def _candidates(conn: sqlite3.Connection, table: str, selectors: List[overpass_planner.Selector],
+                bbox: Tuple[float, float, float, float]) -> List[Dict[str, Any]]:
+    min_lat, min_lon, max_lat, max_lon = bbox
+    clause, params = _tag_prefilter(selectors)
+    if table == "nodes":
+        cols = "t.id, t.lat, t.lon, t.tags"
+    elif table == "ways":
+        cols = "t.id, t.nodes, t.tags, t.center_lat, t.center_lon"
+    else:
+        cols = "t.id, t.members, t.tags, t.center_lat, t.center_lon"
+    index = {"nodes": "node_index", "ways": "way_index", "relations": "relation_index"}[table]
+    sql = (
+        f"SELECT {cols} FROM {index} i JOIN {table} t ON t.id = i.id "
+        "WHERE i.min_lat <= ? AND i.max_lat >= ? AND i.min_lon <= ? AND i.max_lon >= ?"
+        f"{clause}"
+    )
+    rows = conn.execute(sql, [max_lat, min_lat, max_lon, min_lon] + params).fetchall()
+
+    etype = {"nodes": "node", "ways": "way", "relations": "relation"}[table]
+    out: List[Dict[str, Any]] = []
+    for row in rows:
+        raw_tags = row[3] if table == "nodes" else row[2]
+        tags = json.loads(raw_tags) if raw_tags else {}
+        if table == "nodes":
+            elem = {"type": "node", "id": row[0], "lat": row[1], "lon": row[2], "tags": tags}
+        else:
+            elem = {"type": etype, "id": row[0], "tags": tags}
+            elem["nodes" if table == "ways" else "members"] = json.loads(row[1]) if row[1] else []
+            if row[3] is not None and row[4] is not None:
+                elem["center"] = {"lat": row[3], "lon": row[4]}
+        if any(sel.matches(elem) for sel in selectors):
+            out.append(elem)
+    return out
+
+
+def _load_geometry(conn: sqlite3.Connection, matched: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Member ways and all referenced nodes, so distances and `>;` recursion work like Overpass."""
+    have_ways = {e["id"] for e in matched if e["type"] == "way"}
+    member_way_ids = sorted({
+        m["ref"] for e in matched if e["type"] == "relation"
+        for m in e.get("members") or [] if m.get("type") == "way" and m.get("ref") not in have_ways
+    })
+    extra: List[Dict[str, Any]] = []
+    for wid, nodes_json in _fetch_by_ids(conn, "SELECT id, nodes FROM ways WHERE id IN ({})", member_way_ids):
+        extra.append({"type": "way", "id": wid, "nodes": json.loads(nodes_json) if nodes_json else []})
+
+    node_ids = set()
+    for e in matched + extra:
+        if e["type"] == "way":
+            node_ids.update(e.get("nodes") or [])
+        elif e["type"] == "relation":
+            node_ids.update(m["ref"] for m in e.get("members") or [] if m.get("type") == "node")
+    node_ids -= {e["id"] for e in matched if e["type"] == "node"}
+    for nid, n_lat, n_lon in _fetch_by_ids(conn, "SELECT id, lat, lon FROM nodes WHERE id IN ({})", sorted(node_ids)):
+        extra.append({"type": "node", "id": nid, "lat": n_lat, "lon": n_lon})
+    return extra
+
+
+def local_elements(query: str, lat: float, lon: float) -> Optional[List[Dict[str, Any]]]:
+    """
+    Elements `query` would return from Overpass, answered from the local extract.
+
+    Returns None when the backend is disabled, the extract does not cover the query circle,
+    or the lookup fails, so the caller falls through to the bundle / live Overpass path.
+    """
+    if not _DB.available():
+        return None
+    selectors, mode = overpass_planner.parse_query(query)
+    if not selectors:
+        return None
+    max_radius = max(r for _s, r in selectors)
+    if not covers(lat, lon, max_radius):
+        return None
+    conn = _DB.connect()
+    if conn is None:
+        return None
+    try:
+        bbox = _bbox(lat, lon, max_radius)
+        matched: List[Dict[str, Any]] = []
+        for table, element in (("nodes", "node"), ("ways", "way"), ("relations", "relation")):
+            typed = [s for s, _r in selectors if s.element == element]
+            if typed:
+                matched.extend(_candidates(conn, table, typed, bbox))
+        elements = matched + _load_geometry(conn, matched)
+    except Exception as exc:
+        logger.warning("Local OSM extract query failed, using Overpass: %s", exc)
+        return None
+    bundle = overpass_planner.LocationBundle(lat, lon, elements, {s.key: (s, r) for s, r in selectors})
+    return bundle.extract(selectors, mode)
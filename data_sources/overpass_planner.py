@@ -0,0 +1,474 @@
+"""
+Overpass query planner: merge per-consumer `around:` queries into one union per location.
+
+Each OSM consumer in osm_api / street_geometry builds an Overpass QL query for a single
+center point. This module parses those queries into selectors (element type + tag filters +
+radius), merges all selectors for a location into one or two union queries (largest radius
+per selector), and splits the union response back into the element list each consumer would
+have received from its own query. No network I/O happens here; osm_api owns the HTTP side.
+"""
+
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Bundles are short-lived: they only need to outlive one score request's pillar fan-out.
+BUNDLE_TTL_SECONDS = 600
+BUNDLE_MAX_ENTRIES = 32
+
+# Selectors at or below this radius go into the "local" union; larger ones into "regional".
+# Keeps dense building/POI payloads and 15km waterway payloads in separate round-trips so one
+# slow family cannot time out the other.
+LOCAL_MAX_RADIUS_M = 5000
+
+_STATEMENT_RE = re.compile(
+    r"^\s*(node|way|relation)((?:\[[^\n]*?\])*)\(around:([0-9.]+),\s*(-?[0-9.]+),\s*(-?[0-9.]+)\)\s*;"
+)
+
+
+class Selector:
+    """One Overpass statement without its `around:` clause, e.g. way["leisure"="park"]."""
+
+    __slots__ = ("element", "filters", "key")
+
+    def __init__(self, element: str, filters: List[Tuple[str, str, Optional[str]]], key: str):
+        self.element = element
+        self.filters = filters
+        self.key = key
+
+    def matches(self, elem: Dict[str, Any]) -> bool:
+        if elem.get("type") != self.element:
+            return False
+        tags = elem.get("tags") or {}
+        for k, op, v in self.filters:
+            actual = tags.get(k)
+            if op == "has":
+                if actual is None:
+                    return False
+            elif op == "=":
+                if actual != v:
+                    return False
+            elif op == "!=":
+                if actual == v:
+                    return False
+            elif op == "~":
+                if actual is None or not _regex(v).search(actual):
+                    return False
+            elif op == "!~":
+                if actual is not None and _regex(v).search(actual):
+                    return False
+        return True
+
+
+_REGEX_CACHE: Dict[str, "re.Pattern[str]"] = {}
+
+
+def _regex(pattern: Optional[str]) -> "re.Pattern[str]":
+    rx = _REGEX_CACHE.get(pattern or "")
+    if rx is None:
+        rx = re.compile(pattern or "")
+        _REGEX_CACHE[pattern or ""] = rx
+    return rx
+
+
+def _split_filters(text: str) -> List[str]:
+    """Split '["a"="b"]["c"]' into bracket bodies, respecting quoted strings."""
+    parts: List[str] = []
+    i, n = 0, len(text)
+    while i < n:
+        if text[i] != "[":
+            i += 1
+            continue
+        j = i + 1
+        in_quote = False
+        while j < n:
+            ch = text[j]
+            if ch == "\\":
+                j += 2
+                continue
+            if ch == '"':
+                in_quote = not in_quote
+            elif ch == "]" and not in_quote:
+                break
+            j += 1
+        parts.append(text[i + 1:j])
+        i = j + 1
+    return parts
+
+
+def _unquote(s: str) -> str:
+    s = s.strip()
+    if len(s) >= 2 and s[0] == '"' and s[-1] == '"':
+        s = s[1:-1]
+    return s.replace('\\"', '"')
+
+
+def _parse_filter(body: str) -> Tuple[str, str, Optional[str]]:
+    for op in ("!~", "!=", "~", "="):
+        # Find operator outside of quotes
+        in_quote = False
+        for idx in range(len(body)):
+            ch = body[idx]
+            if ch == '"' and (idx == 0 or body[idx - 1] != "\\"):
+                in_quote = not in_quote
+            elif not in_quote and body.startswith(op, idx):
+                return _unquote(body[:idx]), op, _unquote(body[idx + len(op):])
+    return _unquote(body), "has", None
+
+
+def parse_query(query: str) -> Tuple[List[Tuple[Selector, float]], Dict[str, bool]]:
+    """
+    Parse an Overpass QL union query into (selector, radius_m) pairs and its output mode.
+
+    Output mode keys:
+        body: element bodies include way node refs / relation members (`out body`)
+        center: ways/relations carry a `center` (`out ... center`)
+        recurse: child nodes/ways are appended as skeletons (`>; out skel qt;`)
+    """
+    selectors: List[Tuple[Selector, float]] = []
+    for line in query.splitlines():
+        m = _STATEMENT_RE.match(line)
+        if not m:
+            continue
+        element, filter_text, radius = m.group(1), m.group(2), m.group(3)
+        filters = [_parse_filter(b) for b in _split_filters(filter_text)]
+        key = element + filter_text.strip()
+        selectors.append((Selector(element, filters, key), float(radius)))
+
+    out_lines = [ln.strip() for ln in query.splitlines() if ln.strip().startswith("out")]
+    first_out = out_lines[0] if out_lines else "out body;"
+    mode = {
+        "body": "tags" not in first_out,
+        "center": "center" in first_out,
+        "recurse": any(ln.strip().startswith(">") for ln in query.splitlines()),
+    }
+    return selectors, mode
+
+
+def build_union_query(selectors: Iterable[Tuple[Selector, float]], lat: float, lon: float,
+                      timeout_s: int) -> str:
+    """Build one union query covering every selector at its radius (body + center + skeletons)."""
+    statements = "\n".join(
+        f"      {sel.key}(around:{int(math.ceil(radius))},{lat},{lon});"
+        for sel, radius in selectors
+    )
+    return (
+        f"\n    [out:json][timeout:{int(timeout_s)}];\n    (\n{statements}\n    );\n"
+        "    out body center;\n    >;\n    out skel qt;\n    "
+    )
+
+
+def _local_xy(lat: float, lon: float, lat0: float, lon0: float) -> Tuple[float, float]:
+    """Equirectangular projection in meters around (lat0, lon0); fine at pillar radii."""
+    return (
+        (lon - lon0) * 111320.0 * math.cos(math.radians(lat0)),
+        (lat - lat0) * 110540.0,
+    )
+
+
+def _point_segment_distance(ax: float, ay: float, bx: float, by: float) -> float:
+    """Distance from the origin to segment a-b."""
+    dx, dy = bx - ax, by - ay
+    seg2 = dx * dx + dy * dy
+    if seg2 == 0.0:
+        return math.hypot(ax, ay)
+    t = max(0.0, min(1.0, -(ax * dx + ay * dy) / seg2))
+    return math.hypot(ax + t * dx, ay + t * dy)
+
+
+class LocationBundle:
+    """Union response for one center point, answering per-consumer element lists locally."""
+
+    def __init__(self, lat: float, lon: float, elements: List[Dict[str, Any]],
+                 coverage: Dict[str, Tuple[Selector, float]]):
+        self.lat = lat
+        self.lon = lon
+        self.coverage = coverage
+        self.created_at = time.time()
+        self._distance_cache: Dict[Tuple[str, int], float] = {}
+        self.nodes: Dict[int, Dict[str, Any]] = {}
+        self.ways: Dict[int, Dict[str, Any]] = {}
+        self.relations: Dict[int, Dict[str, Any]] = {}
+        self.tagged: List[Dict[str, Any]] = []
+        for e in elements:
+            etype, eid = e.get("type"), e.get("id")
+            if eid is None:
+                continue
+            target = {"node": self.nodes, "way": self.ways, "relation": self.relations}.get(etype)
+            if target is None:
+                continue
+            # `out body` copies come before `out skel` copies; keep the tagged one.
+            if eid not in target or (e.get("tags") and not target[eid].get("tags")):
+                target[eid] = e
+            if e.get("tags"):
+                self.tagged.append(e)
+        # Dedupe tagged list by identity of the winning copy
+        seen = set()
+        unique = []
+        for e in self.tagged:
+            k = (e.get("type"), e.get("id"))
+            if k in seen:
+                continue
+            seen.add(k)
+            unique.append(e)
+        self.tagged = unique
+
+    def covers(self, selectors: List[Tuple[Selector, float]]) -> bool:
+        """
+        True when every requested selector is answerable locally.
+
+        A fetched selector covers a requested one when it targets the same element type with
+        a subset of its tag filters (so it returned a superset) at a radius at least as large.
+        This lets e.g. the include_chains=True business query answer include_chains=False.
+        """
+        for sel, radius in selectors:
+            exact = self.coverage.get(sel.key)
+            if exact is not None and exact[1] >= radius:
+                continue
+            wanted = set(sel.filters)
+            if not any(
+                fetched.element == sel.element and fetched_radius >= radius
+                and set(fetched.filters) <= wanted
+                for fetched, fetched_radius in self.coverage.values()
+            ):
+                return False
+        return True
+
+    def _way_distance(self, way: Dict[str, Any]) -> Optional[float]:
+        pts = []
+        for nid in way.get("nodes") or []:
+            n = self.nodes.get(nid)
+            if n is not None and n.get("lat") is not None and n.get("lon") is not None:
+                pts.append(_local_xy(float(n["lat"]), float(n["lon"]), self.lat, self.lon))
+        if not pts:
+            c = way.get("center")
+            if c and c.get("lat") is not None and c.get("lon") is not None:
+                return math.hypot(*_local_xy(float(c["lat"]), float(c["lon"]), self.lat, self.lon))
+            return None
+        if len(pts) == 1:
+            return math.hypot(*pts[0])
+        return min(
+            _point_segment_distance(pts[i][0], pts[i][1], pts[i + 1][0], pts[i + 1][1])
+            for i in range(len(pts) - 1)
+        )
+
+    def distance_m(self, elem: Dict[str, Any]) -> Optional[float]:
+        """Distance from the bundle center to the element's geometry (Overpass `around` semantics)."""
+        key = (elem.get("type"), elem.get("id"))
+        if key in self._distance_cache:
+            return self._distance_cache[key]
+        etype = elem.get("type")
+        dist: Optional[float] = None
+        if etype == "node":
+            if elem.get("lat") is not None and elem.get("lon") is not None:
+                dist = math.hypot(*_local_xy(float(elem["lat"]), float(elem["lon"]), self.lat, self.lon))
+        elif etype == "way":
+            dist = self._way_distance(elem)
+        elif etype == "relation":
+            candidates = []
+            for m in elem.get("members") or []:
+                ref = m.get("ref")
+                if m.get("type") == "way" and ref in self.ways:
+                    d = self._way_distance(self.ways[ref])
+                elif m.get("type") == "node" and ref in self.nodes:
+                    d = self.distance_m(self.nodes[ref])
+                else:
+                    d = None
+                if d is not None:
+                    candidates.append(d)
+            if candidates:
+                dist = min(candidates)
+            else:
+                c = elem.get("center")
+                if c and c.get("lat") is not None and c.get("lon") is not None:
+                    dist = math.hypot(*_local_xy(float(c["lat"]), float(c["lon"]), self.lat, self.lon))
+        self._distance_cache[key] = dist
+        return dist
+
+    def extract(self, selectors: List[Tuple[Selector, float]], mode: Dict[str, bool]) -> List[Dict[str, Any]]:
+        """Return the elements a consumer's own query would have returned, shaped by its output mode."""
+        matched: List[Dict[str, Any]] = []
+        for e in self.tagged:
+            for sel, radius in selectors:
+                if sel.matches(e):
+                    d = self.distance_m(e)
+                    if d is not None and d <= radius:
+                        matched.append(e)
+                        break
+
+        out: List[Dict[str, Any]] = []
+        for e in matched:
+            item = dict(e)
+            if not mode.get("center"):
+                item.pop("center", None)
+            if not mode.get("body"):
+                item.pop("nodes", None)
+                item.pop("members", None)
+            out.append(item)
+
+        if mode.get("recurse"):
+            seen = set()
+
+            def _add_node(nid: int) -> None:
+                if ("node", nid) in seen or nid not in self.nodes:
+                    return
+                n = self.nodes[nid]
+                seen.add(("node", nid))
+                out.append({"type": "node", "id": nid, "lat": n.get("lat"), "lon": n.get("lon")})
+
+            def _add_way(wid: int) -> None:
+                if ("way", wid) in seen or wid not in self.ways:
+                    return
+                w = self.ways[wid]
+                seen.add(("way", wid))
+                out.append({"type": "way", "id": wid, "nodes": list(w.get("nodes") or [])})
+                for nid in w.get("nodes") or []:
+                    _add_node(nid)
+
+            for e in matched:
+                if e.get("type") == "way":
+                    for nid in e.get("nodes") or []:
+                        _add_node(nid)
+                elif e.get("type") == "relation":
+                    for m in e.get("members") or []:
+                        if m.get("type") == "way":
+                            _add_way(m.get("ref"))
+                        elif m.get("type") == "node":
+                            _add_node(m.get("ref"))
+        return out
+
+
+# How long a consumer waits for an in-flight union before issuing its own request.
+PENDING_WAIT_SECONDS = 45.0
+
+_bundles: "OrderedDict[Tuple[float, float], LocationBundle]" = OrderedDict()
+_bundles_lock = threading.Lock()
+_pending: Dict[Tuple[float, float], threading.Event] = {}
+
+
+def _bundle_key(lat: float, lon: float) -> Tuple[float, float]:
+    return (round(float(lat), 6), round(float(lon), 6))
+
+
+def register_bundle(bundle: LocationBundle) -> None:
+    """Store a bundle for its center point, evicting expired and least-recent entries."""
+    key = _bundle_key(bundle.lat, bundle.lon)
+    with _bundles_lock:
+        existing = _bundles.get(key)
+        if existing is not None and time.time() - existing.created_at < BUNDLE_TTL_SECONDS:
+            # Merge coverage: a second union (e.g. regional) extends the first (local).
+            merged_elements = (
+                list(existing.nodes.values()) + list(existing.ways.values())
+                + list(existing.relations.values())
+                + list(bundle.nodes.values()) + list(bundle.ways.values())
+                + list(bundle.relations.values())
+            )
+            coverage = dict(existing.coverage)
+            for k, (sel, r) in bundle.coverage.items():
+                if k not in coverage or r > coverage[k][1]:
+                    coverage[k] = (sel, r)
+            bundle = LocationBundle(bundle.lat, bundle.lon, merged_elements, coverage)
+        _bundles[key] = bundle
+        _bundles.move_to_end(key)
+        now = time.time()
+        for k in [k for k, b in _bundles.items() if now - b.created_at >= BUNDLE_TTL_SECONDS]:
+            _bundles.pop(k, None)
+        while len(_bundles) > BUNDLE_MAX_ENTRIES:
+            _bundles.popitem(last=False)
+
+
+def get_bundle(lat: float, lon: float) -> Optional[LocationBundle]:
+    key = _bundle_key(lat, lon)
+    with _bundles_lock:
+        bundle = _bundles.get(key)
+        if bundle is None:
+            return None
+        if time.time() - bundle.created_at >= BUNDLE_TTL_SECONDS:
+            _bundles.pop(key, None)
+            return None
+        return bundle
+
+
+def clear_bundles() -> None:
+    with _bundles_lock:
+        _bundles.clear()
+        for ev in _pending.values():
+            ev.set()
+        _pending.clear()
+
+
+def mark_pending(lat: float, lon: float) -> bool:
+    """
+    Record that a union fetch for this point is in flight.
+
+    Returns False when one is already pending (caller should not start a duplicate fetch).
+    """
+    key = _bundle_key(lat, lon)
+    with _bundles_lock:
+        if key in _pending:
+            return False
+        _pending[key] = threading.Event()
+        return True
+
+
+def finish_pending(lat: float, lon: float) -> None:
+    """Release consumers waiting on this point, whether or not the fetch succeeded."""
+    key = _bundle_key(lat, lon)
+    with _bundles_lock:
+        ev = _pending.pop(key, None)
+    if ev is not None:
+        ev.set()
+
+
+def _wait_pending(lat: float, lon: float) -> None:
+    with _bundles_lock:
+        ev = _pending.get(_bundle_key(lat, lon))
+    if ev is not None:
+        ev.wait(PENDING_WAIT_SECONDS)
+
+
+def planned_elements(query: str, lat: float, lon: float) -> Optional[List[Dict[str, Any]]]:
+    """
+    Answer a consumer's Overpass query from a registered bundle.
+
+    Returns None when no bundle covers every selector of the query at its radius, so the
+    caller falls through to its own live request. If a union for the point is in flight,
+    waits for it (bounded by PENDING_WAIT_SECONDS) before deciding.
+    """
+    selectors, mode = parse_query(query)
+    if not selectors:
+        return None
+    bundle = get_bundle(lat, lon)
+    if bundle is None or not bundle.covers(selectors):
+        # A union for this point may still be in flight (e.g. started alongside the
+        # pre-pillar Census calls); wait for it rather than racing it with a duplicate query.
+        _wait_pending(lat, lon)
+        bundle = get_bundle(lat, lon)
+        if bundle is None or not bundle.covers(selectors):
+            return None
+    return bundle.extract(selectors, mode)
+
+
+def plan_unions(queries: Iterable[str]) -> List[List[Tuple[Selector, float]]]:
+    """
+    Merge consumer queries into at most two selector groups (local, regional).
+
+    Identical selectors across consumers collapse to one statement at the largest radius.
+    """
+    merged: Dict[str, Tuple[Selector, float]] = {}
+    for q in queries:
+        selectors, _ = parse_query(q)
+        for sel, radius in selectors:
+            prev = merged.get(sel.key)
+            if prev is None or radius > prev[1]:
+                merged[sel.key] = (sel, radius)
+    local = [(s, r) for s, r in merged.values() if r <= LOCAL_MAX_RADIUS_M]
+    regional = [(s, r) for s, r in merged.values() if r > LOCAL_MAX_RADIUS_M]
+    return [g for g in (local, regional) if g]
@@ -25,6 +25,7 @@ import requests
 
 from logging_config import get_logger
 
+from data_sources import http_client
 from data_sources.places_env import google_places_api_key, places_ao_fallback_enabled as env_places_ao_fallback_enabled
 from data_sources.osm_api import OVERPASS_OUTCOME_ERROR, OVERPASS_OUTCOME_TIMEOUT
 from data_sources.utils import haversine_distance
@@ -148,7 +149,7 @@ def _search_nearby(
         "X-Goog-FieldMask": "places.id,places.name,places.displayName,places.location,places.types",
     }
     try:
-        resp = requests.post(PLACES_NEARBY_URL, json=body, headers=headers, timeout=20)
+        resp = http_client.post(PLACES_NEARBY_URL, json=body, headers=headers, timeout=20)
         if resp.status_code != 200:
             logger.warning(
                 "AO Places searchNearby failed: status=%s types=%s body=%s",
@@ -17,6 +17,7 @@ import requests
 
 from logging_config import get_logger
 
+from data_sources import http_client
 from data_sources.data_quality import data_quality_manager
 from data_sources.places_env import google_places_api_key, places_na_fallback_enabled
 
@@ -136,7 +137,7 @@ def _single_search_nearby(
         "X-Goog-FieldMask": "places.id,places.name,places.displayName,places.location,places.types",
     }
     try:
-        resp = requests.post(PLACES_NEARBY_URL, json=body, headers=headers, timeout=20)
+        resp = http_client.post(PLACES_NEARBY_URL, json=body, headers=headers, timeout=20)
         if resp.status_code != 200:
             logger.warning(
                 "Places searchNearby failed: status=%s types=%s body=%s",
@@ -17,6 +17,7 @@ from typing import Any, Dict, List, Optional, Set
 import requests
 
 from logging_config import get_logger
+from data_sources import http_client
 from data_sources.places_env import google_places_api_key, places_hc_fallback_enabled as _env_enabled
 from data_sources.utils import haversine_distance
 
@@ -93,7 +94,7 @@ def _search_nearby(
         "X-Goog-FieldMask": "places.id,places.name,places.displayName,places.location,places.types",
     }
     try:
-        resp = requests.post(PLACES_NEARBY_URL, json=body, headers=headers, timeout=20)
+        resp = http_client.post(PLACES_NEARBY_URL, json=body, headers=headers, timeout=20)
         if resp.status_code != 200:
             logger.warning(
                 "HC Places searchNearby failed: status=%s types=%s body=%s",
@@ -21,6 +21,7 @@ import requests
 
 from logging_config import get_logger
 
+from data_sources import http_client
 from data_sources.places_env import google_places_api_key, places_sf_fallback_enabled
 from data_sources.utils import haversine_distance
 
@@ -156,7 +157,7 @@ def _search_nearby_civic(
         "X-Goog-FieldMask": "places.id,places.name,places.displayName,places.location,places.types",
     }
     try:
-        resp = requests.post(PLACES_NEARBY_URL, json=body, headers=headers, timeout=25)
+        resp = http_client.post(PLACES_NEARBY_URL, json=body, headers=headers, timeout=25)
         if resp.status_code != 200:
             logger.warning(
                 "SF Places searchNearby failed: status=%s body=%s",
@@ -0,0 +1,341 @@
+"""
+Local raster backend.
+
+Answers the stable-layer reductions behind gee_api's canopy, land cover, topography,
+GHSL building height and summer LST functions from a tile store built offline by
+`scripts/baselines/build_raster_tiles.py` (pre-downloaded Cloud-Optimized GeoTIFFs or
+Earth Engine exports). Each read is windowed: only the tiles under the query disc are
+touched, and tiles are memory-mapped `.npy` arrays, so a cold reduction costs a few page
+faults instead of a multi-second Earth Engine round trip and no service-account quota.
+
+Layout (one directory per layer, EPSG:4326 grid, north-up):
+  <root>/<layer>/manifest.json       -- grid origin, pixel size, tile size, dtype, nodata,
+                                        scale/offset, bounds (extent the store is complete for)
+  <root>/<layer>/tiles/r{row}_c{col}.npy
+                                     -- tile_size x tile_size; missing tile = all nodata
+
+Layers: nlcd_tcc, hansen_treecover, nlcd_landcover, worldcover, srtm, ghsl_built_height,
+lst_jja (land-only summer LST composite in deg C, water = nodata).
+
+Functions return the same dicts/tuples the Earth Engine reductions do, so gee_api feeds
+them through its existing summarizers. A layer that is missing, or whose bounds do not
+contain the whole query disc, makes the function return None and the caller uses GEE.
+
+Override path via env ``HOMEFIT_RASTER_DIR``. Missing directory = backend disabled.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_RASTER_DIR = Path(__file__).resolve().parent.parent / "data_cache" / "rasters"
+
+LAYERS = (
+    "nlcd_tcc",
+    "hansen_treecover",
+    "nlcd_landcover",
+    "worldcover",
+    "srtm",
+    "ghsl_built_height",
+    "lst_jja",
+)
+
+# Open tile memmaps kept per process (each is a mapping, not a resident copy).
+_MAX_OPEN_TILES = 512
+
+_M_PER_DEG_LAT = 110_540.0
+_M_PER_DEG_LON = 111_320.0
+
+
+def _root() -> Path:
+    env = os.getenv("HOMEFIT_RASTER_DIR")
+    return Path(env).resolve() if env else DEFAULT_RASTER_DIR
+
+
+@lru_cache(maxsize=1)
+def _has_store() -> bool:
+    p = _root()
+    exists = p.is_dir()
+    if exists:
+        logger.info("Local raster tiles enabled: %s", p)
+    return exists
+
+
+class RasterLayer:
+    """One tiled layer: windowed reads over memory-mapped tiles."""
+
+    def __init__(self, name: str, path: Path, manifest: Dict):
+        self.name = name
+        self.path = path
+        self.manifest = manifest
+        self.west, self.north = (float(v) for v in manifest["origin"])
+        self.px_lon, self.px_lat = (float(v) for v in manifest["pixel_size"])
+        self.width = int(manifest["width"])
+        self.height = int(manifest["height"])
+        self.tile_size = int(manifest["tile_size"])
+        self.nodata = manifest.get("nodata")
+        self.scale = float(manifest.get("scale", 1.0))
+        self.offset = float(manifest.get("offset", 0.0))
+        west, south, east, north = manifest.get("bounds") or (
+            self.west, self.north - self.height * self.px_lat,
+            self.west + self.width * self.px_lon, self.north,
+        )
+        self.bounds = (float(west), float(south), float(east), float(north))
+        self._tiles: "OrderedDict[Tuple[int, int], Optional[np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def source(self) -> Optional[str]:
+        return self.manifest.get("source")
+
+    def covers(self, lat: float, lon: float, radius_m: float) -> bool:
+        min_lat, min_lon, max_lat, max_lon = _bbox(lat, lon, radius_m)
+        west, south, east, north = self.bounds
+        return west <= min_lon and south <= min_lat and east >= max_lon and north >= max_lat
+
+    def _tile(self, row: int, col: int) -> Optional[np.ndarray]:
+        key = (row, col)
+        with self._lock:
+            if key in self._tiles:
+                self._tiles.move_to_end(key)
+                return self._tiles[key]
+        p = self.path / "tiles" / f"r{row}_c{col}.npy"
+        tile = np.load(p, mmap_mode="r") if p.exists() else None
+        with self._lock:
+            self._tiles[key] = tile
+            while len(self._tiles) > _MAX_OPEN_TILES:
+                self._tiles.popitem(last=False)
+        return tile
+
+    def window(self, lat: float, lon: float, radius_m: float, pad: int = 0) -> Optional["Window"]:
+        """Pixels whose centres fall in the disc's bbox (plus `pad` pixels), nodata as NaN."""
+        min_lat, min_lon, max_lat, max_lon = _bbox(lat, lon, radius_m)
+        r0 = max(0, int(math.floor((self.north - max_lat) / self.px_lat)) - pad)
+        r1 = min(self.height, int(math.ceil((self.north - min_lat) / self.px_lat)) + pad)
+        c0 = max(0, int(math.floor((min_lon - self.west) / self.px_lon)) - pad)
+        c1 = min(self.width, int(math.ceil((max_lon - self.west) / self.px_lon)) + pad)
+        if r1 <= r0 or c1 <= c0:
+            return None
+
+        out = np.full((r1 - r0, c1 - c0), np.nan, dtype=np.float64)
+        ts = self.tile_size
+        for tr in range(r0 // ts, (r1 - 1) // ts + 1):
+            for tc in range(c0 // ts, (c1 - 1) // ts + 1):
+                tile = self._tile(tr, tc)
+                if tile is None:
+                    continue
+                rr0, rr1 = max(r0, tr * ts), min(r1, (tr + 1) * ts)
+                cc0, cc1 = max(c0, tc * ts), min(c1, (tc + 1) * ts)
+                block = np.asarray(tile[rr0 - tr * ts:rr1 - tr * ts, cc0 - tc * ts:cc1 - tc * ts], dtype=np.float64)
+                if self.nodata is not None:
+                    block = np.where(block == float(self.nodata), np.nan, block)
+                out[rr0 - r0:rr1 - r0, cc0 - c0:cc1 - c0] = block
+        if self.scale != 1.0 or self.offset != 0.0:
+            out = out * self.scale + self.offset
+
+        # Pixel-centre offsets from the query point in metres (equirectangular; radii <= ~25 km).
+        m_lat = _M_PER_DEG_LAT
+        m_lon = _M_PER_DEG_LON * math.cos(math.radians(lat))
+        ys = (self.north - (np.arange(r0, r1) + 0.5) * self.px_lat - lat) * m_lat
+        xs = (self.west + (np.arange(c0, c1) + 0.5) * self.px_lon - lon) * m_lon
+        dist = np.sqrt(ys[:, None] ** 2 + xs[None, :] ** 2)
+        return Window(out, dist, self.px_lon * m_lon, self.px_lat * m_lat)
+
+
+class Window:
+    __slots__ = ("values", "dist_m", "dx_m", "dy_m")
+
+    def __init__(self, values: np.ndarray, dist_m: np.ndarray, dx_m: float, dy_m: float):
+        self.values = values
+        self.dist_m = dist_m
+        self.dx_m = dx_m
+        self.dy_m = dy_m
+
+    def within(self, radius_m: float, inner_m: float = 0.0, values: Optional[np.ndarray] = None) -> np.ndarray:
+        """Valid (non-NaN) values whose pixel centres lie in the disc / annulus."""
+        arr = self.values if values is None else values
+        sel = (self.dist_m <= radius_m) & (self.dist_m > inner_m) if inner_m > 0 else self.dist_m <= radius_m
+        vals = arr[sel]
+        return vals[~np.isnan(vals)]
+
+    def pixels_within(self, radius_m: float) -> int:
+        return int(np.count_nonzero(self.dist_m <= radius_m))
+
+
+_layers: Dict[str, Optional[RasterLayer]] = {}
+_layers_lock = threading.Lock()
+
+
+def get_layer(name: str) -> Optional[RasterLayer]:
+    """Layer handle, or None when the store / layer / manifest is missing."""
+    if not _has_store():
+        return None
+    with _layers_lock:
+        if name in _layers:
+            return _layers[name]
+        path = _root() / name
+        layer = None
+        manifest_path = path / "manifest.json"
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    layer = RasterLayer(name, path, json.load(f))
+            except Exception as exc:
+                logger.warning("Unreadable raster manifest %s: %s", manifest_path, exc)
+        _layers[name] = layer
+        return layer
+
+
+def reset() -> None:
+    """Drop cached store/layer state (tests, or after rebuilding tiles)."""
+    with _layers_lock:
+        _layers.clear()
+    _has_store.cache_clear()
+
+
+def _bbox(lat: float, lon: float, radius_m: float) -> Tuple[float, float, float, float]:
+    d_lat = float(radius_m) / _M_PER_DEG_LAT
+    d_lon = float(radius_m) / (_M_PER_DEG_LON * max(0.01, math.cos(math.radians(lat))))
+    return lat - d_lat, lon - d_lon, lat + d_lat, lon + d_lon
+
+
+def _covering(name: str, lat: float, lon: float, radius_m: float) -> Optional[RasterLayer]:
+    layer = get_layer(name)
+    if layer is None or not layer.covers(lat, lon, radius_m):
+        return None
+    return layer
+
+
+def _percentile(vals: np.ndarray, q: float) -> float:
+    return float(np.percentile(vals, q))
+
+
+# ---------------------------------------------------------------------------
+# Reductions mirroring gee_api's Earth Engine queries
+# ---------------------------------------------------------------------------
+
+def canopy_sources(lat: float, lon: float, radius_m: float) -> Optional[Tuple[Optional[float], int, Optional[float], Optional[float]]]:
+    """(NLCD TCC %, TCC year, Hansen %, NLCD forest %) like the three GEE canopy helpers."""
+    layers = [_covering(n, lat, lon, radius_m) for n in ("nlcd_tcc", "hansen_treecover", "nlcd_landcover")]
+    if any(layer is None for layer in layers):
+        return None
+    tcc_layer, hansen_layer, landcover_layer = layers
+
+    def mean(layer: RasterLayer, values=None) -> Optional[float]:
+        win = layer.window(lat, lon, radius_m)
+        if win is None:
+            return None
+        vals = win.within(radius_m, values=values(win.values) if values else None)
+        return float(vals.mean()) if vals.size else None
+
+    tcc = mean(tcc_layer)
+    hansen = mean(hansen_layer)
+    forest = mean(landcover_layer, lambda v: np.where(np.isnan(v), np.nan, np.isin(v, (40, 41, 42, 43)).astype(np.float64)))
+
+    year = int(tcc_layer.manifest.get("year") or 2021)
+    tcc = min(100, max(0, tcc)) if tcc is not None and tcc >= 0.0 else None
+    hansen = min(100, max(0, hansen)) if hansen is not None and hansen >= 0.0 else None
+    forest = min(100, max(0, forest * 100)) if forest is not None and forest > 0 else None
+    return tcc, year, hansen, forest
+
+
+def landcover_histogram(lat: float, lon: float, radius_m: float) -> Optional[Dict]:
+    """{"source", "histogram"} from NLCD, else ESA WorldCover; None if neither covers the disc."""
+    for name, source in (("nlcd_landcover", "NLCD 2021"), ("worldcover", "ESA WorldCover v200")):
+        layer = _covering(name, lat, lon, radius_m)
+        if layer is None:
+            continue
+        win = layer.window(lat, lon, radius_m)
+        vals = win.within(radius_m) if win is not None else np.empty(0)
+        if vals.size:
+            classes, counts = np.unique(vals.astype(np.int64), return_counts=True)
+            return {"source": source, "histogram": {int(c): int(n) for c, n in zip(classes, counts)}}
+    return None
+
+
+def topography_reductions(lat: float, lon: float, radius_m: float) -> Optional[Dict]:
+    """DEM / slope / steep / dem_std / center / surrounding dicts keyed like the GEE reductions."""
+    layer = _covering("srtm", lat, lon, radius_m)
+    if layer is None:
+        return None
+    win = layer.window(lat, lon, radius_m, pad=1)
+    if win is None:
+        return None
+
+    dem = win.within(radius_m)
+    if not dem.size:
+        return None
+    # Slope in degrees from central differences on metre spacing (ee.Terrain.slope equivalent).
+    dz_dy, dz_dx = np.gradient(win.values, win.dy_m, win.dx_m)
+    slope_grid = np.degrees(np.arctan(np.hypot(dz_dx, dz_dy)))
+    slope = win.within(radius_m, values=slope_grid)
+
+    center = win.within(100)
+    if not center.size:
+        # 100 m disc smaller than one pixel: nearest pixel centre.
+        center = win.values[np.unravel_index(np.argmin(win.dist_m), win.dist_m.shape)].reshape(1)
+        center = center[~np.isnan(center)]
+    surrounding = win.within(radius_m, inner_m=2000) if radius_m > 2000 else np.empty(0)
+
+    return {
+        "dem": {
+            "elevation_mean": float(dem.mean()),
+            "elevation_min": float(dem.min()),
+            "elevation_max": float(dem.max()),
+            "elevation_p10": _percentile(dem, 10),
+            "elevation_p90": _percentile(dem, 90),
+        },
+        "slope": {
+            "slope_mean": float(slope.mean()),
+            "slope_max": float(slope.max()),
+            "slope_stdDev": float(slope.std()),
+            "slope_p85": _percentile(slope, 85),
+        } if slope.size else None,
+        "steep": {"slope": float((slope > 15).mean())} if slope.size else None,
+        "dem_std": {"elevation": float(dem.std())},
+        "center": {"elevation": float(center.mean())} if center.size else None,
+        "surrounding": {"elevation": float(surrounding.mean())} if surrounding.size else None,
+    }
+
+
+def building_height_stats(lat: float, lon: float, radius_m: float) -> Optional[Dict]:
+    """GHSL built_height mean / stdDev / p90 (GEE reduceRegion keys); None if not covered."""
+    layer = _covering("ghsl_built_height", lat, lon, radius_m)
+    if layer is None:
+        return None
+    win = layer.window(lat, lon, radius_m)
+    vals = win.within(radius_m) if win is not None else np.empty(0)
+    if not vals.size:
+        return None  # no tile pixels in the disc: let GEE answer
+    return {
+        "built_height_mean": float(vals.mean()),
+        "built_height_stdDev": float(vals.std()),
+        "built_height_p90": _percentile(vals, 90),
+    }
+
+
+def heat_exposure_counts(lat: float, lon: float, radius_m: float) -> Optional[Tuple[Optional[float], int, int]]:
+    """(mean land LST deg C, land pixel count, total pixel count) in the disc; None if not covered."""
+    layer = _covering("lst_jja", lat, lon, radius_m)
+    if layer is None:
+        return None
+    win = layer.window(lat, lon, radius_m)
+    if win is None:
+        return None
+    land = win.within(radius_m)
+    total = win.pixels_within(radius_m)
+    return (float(land.mean()) if land.size else None), int(land.size), total
+
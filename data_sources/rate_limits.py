@@ -0,0 +1,174 @@
+"""
+Per-upstream token buckets for batch admission control.
+
+The /batch scheduler scores several locations concurrently. Instead of sleeping a global
+delay between locations, it admits the next location only when every upstream it will hit
+(Overpass, Census, GEE, Google Places, Transitland) has budget for one location's worth of
+calls. Admission happens before scoring starts, so a location never stalls mid-pillar on a
+bucket (pillar futures have 8-10s timeouts that a mid-flight wait would trip).
+
+Budgets are requests/minute with a burst capacity; override per upstream with env
+``HOMEFIT_RATE_<UPSTREAM>_PER_MIN`` (e.g. HOMEFIT_RATE_OVERPASS_PER_MIN=60). Per-location
+call estimates live in LOCATION_COST and can be overridden with
+``HOMEFIT_RATE_<UPSTREAM>_PER_LOCATION``.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# (requests per minute, burst capacity). Conservative public-endpoint budgets:
+#   overpass     - public instances allow ~2 slots/IP; _retry_overpass also paces at 0.5s
+#   census       - ACS/TIGERweb tolerate bursts but throttle sustained >~500/min
+#   gee          - Earth Engine interactive quota (concurrent getInfo)
+#   google_places- Places (New) per-minute project quota
+#   transitland  - REST API key tier
+DEFAULT_BUDGETS: Dict[str, tuple] = {
+    "overpass": (90.0, 30.0),
+    "census": (400.0, 80.0),
+    "gee": (120.0, 40.0),
+    "google_places": (300.0, 60.0),
+    "transitland": (60.0, 20.0),
+}
+
+# Approximate upstream calls one full /score makes (all pillars, cold cache).
+LOCATION_COST: Dict[str, float] = {
+    "overpass": 8.0,
+    "census": 14.0,
+    "gee": 10.0,
+    "google_places": 6.0,
+    "transitland": 3.0,
+}
+
+# Adaptive floor: a 429 never drops an upstream below this fraction of its budget.
+_MIN_RATE_SCALE = 0.25
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        raw = os.getenv(name)
+        return float(raw) if raw not in (None, "") else default
+    except ValueError:
+        logger.warning(f"Ignoring non-numeric {name}={os.getenv(name)!r}")
+        return default
+
+
+class TokenBucket:
+    """Thread-safe token bucket; rate can be scaled down on 429s and recovers on success."""
+
+    def __init__(self, name: str, rate_per_min: float, capacity: float):
+        self.name = name
+        self.base_rate = max(rate_per_min, 1e-6) / 60.0
+        self.capacity = max(capacity, 1.0)
+        self.scale = 1.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.base_rate * self.scale)
+        self._updated = now
+
+    def wait_time(self, tokens: float) -> float:
+        """Seconds until `tokens` are available (0.0 when available now)."""
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            missing = tokens - self._tokens
+            return 0.0 if missing <= 0 else missing / (self.base_rate * self.scale)
+
+    def consume(self, tokens: float) -> None:
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+
+    def penalize(self, factor: float = 0.5) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            new_scale = max(_MIN_RATE_SCALE, self.scale * factor)
+            if new_scale != self.scale:
+                logger.warning(f"Rate limit on {self.name}: scaling budget to {new_scale:.2f}x")
+            self.scale = new_scale
+
+    def relax(self, factor: float = 1.1) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.scale = min(1.0, self.scale * factor)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate_per_min": round(self.base_rate * self.scale * 60.0, 1),
+                "capacity": self.capacity,
+                "tokens": round(self._tokens, 1),
+                "scale": round(self.scale, 2),
+            }
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(upstream: str) -> TokenBucket:
+    """Process-wide bucket for an upstream (shared by concurrent batches)."""
+    with _buckets_lock:
+        bucket = _buckets.get(upstream)
+        if bucket is None:
+            rate, burst = DEFAULT_BUDGETS.get(upstream, (60.0, 10.0))
+            rate = _env_float(f"HOMEFIT_RATE_{upstream.upper()}_PER_MIN", rate)
+            bucket = TokenBucket(upstream, rate, burst)
+            _buckets[upstream] = bucket
+        return bucket
+
+
+def location_cost() -> Dict[str, float]:
+    return {
+        upstream: _env_float(f"HOMEFIT_RATE_{upstream.upper()}_PER_LOCATION", cost)
+        for upstream, cost in LOCATION_COST.items()
+    }
+
+
+def admission_wait(costs: Dict[str, float]) -> float:
+    """Seconds until every upstream can afford `costs`; 0.0 means admit now."""
+    return max((get_bucket(u).wait_time(c) for u, c in costs.items() if c > 0), default=0.0)
+
+
+def try_admit(costs: Dict[str, float]) -> float:
+    """
+    Consume `costs` from every bucket if all can afford it.
+
+    Returns 0.0 on admission, otherwise the wait before retrying. Each batch admits from
+    its own scheduler thread; if two batches race the check, buckets briefly go into debt
+    (negative tokens) and the next admission waits longer, which is the intended outcome.
+    """
+    wait = admission_wait(costs)
+    if wait > 0:
+        return wait
+    for upstream, cost in costs.items():
+        if cost > 0:
+            get_bucket(upstream).consume(cost)
+    return 0.0
+
+
+def penalize(upstream: Optional[str] = None, factor: float = 0.5) -> None:
+    """Scale down one upstream (or all) after a rate-limit signal."""
+    for name in ([upstream] if upstream else list(DEFAULT_BUDGETS)):
+        get_bucket(name).penalize(factor)
+
+
+def relax_all(factor: float = 1.1) -> None:
+    for name in list(DEFAULT_BUDGETS):
+        get_bucket(name).relax(factor)
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    return {name: get_bucket(name).snapshot() for name in DEFAULT_BUDGETS}
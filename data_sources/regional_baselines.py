@@ -7,7 +7,7 @@ import json
 import math
 from typing import Dict, List, Tuple, Optional
 from .census_api import get_population_density, get_census_tract
-from .utils import haversine_distance as haversine_meters
+from .utils import SphereIndex, haversine_distance as haversine_meters
 
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -351,6 +351,13 @@ class RegionalBaselineManager:
                 'principal_city_lon': -86.8104
             }
         }
+
+        # Principal-city index for geographic metro detection (KD-tree built on first query)
+        self._metro_names = list(self.major_metros)
+        self._metro_index = SphereIndex(
+            [m.get('principal_city_lat') for m in self.major_metros.values()],
+            [m.get('principal_city_lon') for m in self.major_metros.values()],
+        )
         
         # Baseline scores by area type and pillar
         self.baseline_scores = {
@@ -473,23 +480,11 @@ class RegionalBaselineManager:
         
         # Geographic detection: find closest principal city within 50km
         # This catches suburbs and edge cities that don't match by name
-        closest_metro = None
-        closest_distance = float('inf')
         max_distance_km = 50.0  # Maximum distance to consider
         
-        for metro_name, metro_data in self.major_metros.items():
-            # Check if metro has principal city coordinates
-            pc_lat = metro_data.get('principal_city_lat')
-            pc_lon = metro_data.get('principal_city_lon')
-            
-            if pc_lat is not None and pc_lon is not None:
-                distance = haversine_distance(lat, lon, pc_lat, pc_lon)
-                if distance < closest_distance and distance <= max_distance_km:
-                    closest_distance = distance
-                    closest_metro = metro_name
-        
-        if closest_metro:
-            return closest_metro
+        found = self._metro_index.nearest(lat, lon, max_distance_m=max_distance_km * 1000.0)
+        if found:
+            return self._metro_names[found[0][0]]
         
         return None
     
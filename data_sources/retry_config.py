@@ -124,6 +124,7 @@ QUERY_TYPE_PROFILES: Dict[str, RetryProfile] = {
     "nature_features": RetryProfile.CRITICAL,  # Changed from NON_CRITICAL
     "water_features": RetryProfile.CRITICAL,  # Water proximity is critical for natural beauty + outdoors
     "civic_nodes": RetryProfile.CRITICAL,  # Social Fabric civic OSM — match other scoring-critical queries
+    "bundle": RetryProfile.CRITICAL,  # Per-location union query feeding every OSM consumer
 }
 
 
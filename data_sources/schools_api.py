@@ -5,10 +5,10 @@ Queries school ratings and data
 
 import os
 import time
-import requests
 import math
 from collections import Counter
 from typing import List, Optional, Dict
+from . import http_client
 from .cache import cached, CACHE_TTL
 from .utils import haversine_distance
 from .radius_profiles import get_radius_profile
@@ -277,7 +277,7 @@ def _find_districts_by_coordinates(
             "distanceMiles": 2.0,  # Conservative radius for district lookup
         }
         
-        resp = requests.get(url, params=params, timeout=10)
+        resp = http_client.get(url, params=params, timeout=10)
         if resp.status_code == 200:
             data = resp.json()
             districts = data.get("districtList", [])
@@ -471,7 +471,7 @@ def _fetch_schools(params: Dict) -> Optional[List[Dict]]:
     
     try:
         url = f"{SCHOOLDIGGER_BASE}/schools"
-        resp = requests.get(url, params=params, timeout=10)
+        resp = http_client.get(url, params=params, timeout=10)
 
         if resp.status_code == 200:
             data = resp.json()
@@ -2,20 +2,45 @@
 Street Geometry Metrics for Phase 2 & Phase 3 Beauty Scoring
 Computes block grain, streetwall continuity, setback consistency, and facade rhythm 
 from OSM road and building data.
+
+All four metrics read one _fetch_roads_and_buildings result through a shared geometry
+engine (_StreetGeometry): projected NumPy coordinate arrays plus one STRtree of road
+segments, built once per OSM payload and reused by every metric.
 """
 
 import math
-import time
+import random
 import sys
-import requests
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Optional
-from .osm_api import get_overpass_url, _retry_overpass, haversine_distance
+
+import numpy as np
+import shapely
+
+from . import http_client
+from .osm_api import get_overpass_url, _retry_overpass, _bundle_elements
 from .cache import cached, CACHE_TTL
 from logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+def _roads_and_buildings_query(lat: float, lon: float, radius_m: int) -> str:
+    """Overpass QL for _fetch_roads_and_buildings (street network + building footprints)."""
+    return f"""
+        [out:json][timeout:30];
+        (
+          way["highway"~"^(residential|primary|secondary|tertiary|unclassified|service|living_street)$"](around:{radius_m},{lat},{lon});
+          way["building"](around:{radius_m},{lat},{lon});
+        );
+        out body;
+        >;
+        out skel qt;
+        """
+
+
 @cached(ttl_seconds=CACHE_TTL['osm_queries'])
 def _fetch_roads_and_buildings(lat: float, lon: float, radius_m: int = 1000) -> Optional[Dict]:
     """
@@ -31,33 +56,29 @@ def _fetch_roads_and_buildings(lat: float, lon: float, radius_m: int = 1000) ->
     """
     step_start = time.time()
     try:
-        query = f"""
-        [out:json][timeout:30];
-        (
-          way["highway"~"^(residential|primary|secondary|tertiary|unclassified|service|living_street)$"](around:{radius_m},{lat},{lon});
-          way["building"](around:{radius_m},{lat},{lon});
-        );
-        out body;
-        >;
-        out skel qt;
-        """
-        
-        def _do_request():
-            return requests.post(get_overpass_url(), data={"data": query}, timeout=20,
-                               headers={"User-Agent": "HomeFit/1.0"})
+        query = _roads_and_buildings_query(lat, lon, radius_m)
         
         fetch_start = time.time()
-        # Phase 2/3 metrics are non-critical - use NON_CRITICAL profile (fail fast on rate limits)
-        resp = _retry_overpass(_do_request, query_type="block_grain")
-        fetch_time = time.time() - fetch_start
-        
-        if resp is None or resp.status_code != 200:
-            logger.warning(f"[FETCH] OSM query failed after {fetch_time:.2f}s")
-            return None
-        
-        parse_start = time.time()
-        data = resp.json()
-        elements = data.get("elements", [])
+        elements = _bundle_elements(query, lat, lon)
+        if elements is None:
+            def _do_request():
+                return http_client.post(get_overpass_url(), data={"data": query}, timeout=20,
+                                   headers={"User-Agent": "HomeFit/1.0"})
+            
+            # Phase 2/3 metrics are non-critical - use NON_CRITICAL profile (fail fast on rate limits)
+            resp = _retry_overpass(_do_request, query_type="block_grain")
+            fetch_time = time.time() - fetch_start
+            
+            if resp is None or resp.status_code != 200:
+                logger.warning(f"[FETCH] OSM query failed after {fetch_time:.2f}s")
+                return None
+            
+            parse_start = time.time()
+            data = resp.json()
+            elements = data.get("elements", [])
+        else:
+            fetch_time = time.time() - fetch_start
+            parse_start = time.time()
         
         # Calculate geometry size (rough estimate in MB)
         import json
@@ -99,51 +120,240 @@ def _fetch_roads_and_buildings(lat: float, lon: float, radius_m: int = 1000) ->
         return None
 
 
-def _compute_point_on_line(point: Tuple[float, float], line_start: Tuple[float, float], 
-                          line_end: Tuple[float, float]) -> Tuple[float, float, float]:
+_EARTH_RADIUS_M = 6371000.0
+_BUILDING_SAMPLE_SIZE = 2000  # for statistical validity, 2000 buildings is plenty
+_NEAREST_NODE_CUTOFF_M = 50.0  # streetwall: buildings >50m from every road node are skipped
+_STREETWALL_BUFFER_M = 30.0  # buildings within 30m of a road count as streetwall
+_MAX_SETBACK_M = 50.0  # setback/facade: only buildings within 50m of a road
+
+
+def _haversine_m(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Vectorized haversine_distance (meters)."""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    a = (np.sin((phi2 - phi1) / 2) ** 2
+         + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * _EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _point_segment_distance(p: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Planar distance from each point p[i] to segment a[i]-b[i] (all (n, 2) arrays)."""
+    ab = b - a
+    denom = np.einsum("ij,ij->i", ab, ab)
+    safe = np.where(denom > 0, denom, 1.0)
+    t = np.clip(np.einsum("ij,ij->i", p - a, ab) / safe, 0.0, 1.0)
+    t = np.where(denom > 0, t, 0.0)
+    closest = a + t[:, None] * ab
+    return np.hypot(p[:, 0] - closest[:, 0], p[:, 1] - closest[:, 1])
+
+
+def _nearest_per_group(groups: np.ndarray, dist: np.ndarray) -> np.ndarray:
+    """Indices into groups/dist of the smallest distance within each group."""
+    order = np.lexsort((dist, groups))
+    g = groups[order]
+    first = np.ones(len(g), dtype=bool)
+    first[1:] = g[1:] != g[:-1]
+    return order[first]
+
+
+def _way_refs(ways: List[Dict], index: Dict[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """(way position, node row) for every node reference that resolves to a fetched node."""
+    way_pos: List[int] = []
+    rows: List[int] = []
+    for pos, way in enumerate(ways):
+        for node_id in way.get("nodes", []):
+            row = index.get(node_id)
+            if row is not None:
+                way_pos.append(pos)
+                rows.append(row)
+    return np.asarray(way_pos, dtype=np.int64), np.asarray(rows, dtype=np.int64)
+
+
+class _StreetGeometry:
     """
-    Find the closest point on a line segment to a given point.
-    
-    Returns:
-        (closest_lat, closest_lon, distance_m)
+    Road segments and building footprints from one _fetch_roads_and_buildings result.
+
+    Coordinates are parsed once into NumPy arrays and projected to meters on a local
+    equirectangular plane centred on the query point (sub-meter error over the 2km form
+    radius). Road segments are indexed in a single shapely STRtree. The per-building
+    nearest-road passes are computed on first use and shared, so setback consistency and
+    facade rhythm read the same setback measurements.
     """
-    px, py = point[1], point[0]  # lon, lat
-    x1, y1 = line_start[1], line_start[0]
-    x2, y2 = line_end[1], line_end[0]
-    
-    # Vector from line_start to line_end
-    dx = x2 - x1
-    dy = y2 - y1
-    
-    # If line segment is a point
-    if dx == 0 and dy == 0:
-        closest_lat, closest_lon = line_start[0], line_start[1]
-    else:
-        # Parameter t where closest point is
-        t = max(0, min(1, ((px - x1) * dx + (py - y1) * dy) / (dx * dx + dy * dy)))
-        closest_lon = x1 + t * dx
-        closest_lat = y1 + t * dy
-    
-    # Calculate distance
-    distance_m = haversine_distance(point[0], point[1], closest_lat, closest_lon)
-    
-    return closest_lat, closest_lon, distance_m
+
+    def __init__(self, osm_data: Dict, lat: float, lon: float):
+        nodes_dict = osm_data["nodes_dict"]
+        road_ways = osm_data["road_ways"]
+        building_ways = osm_data["building_ways"]
+        self.road_count = len(road_ways)
+        self.building_count = len(building_ways)
+        self._lock = threading.Lock()
+        self._streetwall: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._setbacks: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+        index = {node_id: row for row, node_id in enumerate(nodes_dict)}
+        node_lat = np.fromiter((n["lat"] for n in nodes_dict.values()), dtype=np.float64, count=len(index))
+        node_lon = np.fromiter((n["lon"] for n in nodes_dict.values()), dtype=np.float64, count=len(index))
+        kx = _EARTH_RADIUS_M * math.cos(math.radians(lat)) * math.pi / 180.0
+        ky = _EARTH_RADIUS_M * math.pi / 180.0
+        node_xy = np.column_stack(((node_lon - lon) * kx, (node_lat - lat) * ky))
+
+        # Roads: consecutive resolved nodes of the same way form a segment.
+        roads = [w for w in road_ways if len(w.get("nodes", [])) >= 2]
+        way_pos, rows = _way_refs(roads, index)
+        self.road_node_refs = rows  # one entry per way reference (a node shared by 2 ways appears twice)
+        pair = way_pos[1:] == way_pos[:-1] if len(rows) > 1 else np.zeros(0, dtype=bool)
+        a_rows, b_rows = rows[:-1][pair], rows[1:][pair]
+        self.seg_way = way_pos[:-1][pair]
+        self.seg_a = node_xy[a_rows]
+        self.seg_b = node_xy[b_rows]
+        self.seg_len = _haversine_m(node_lat[a_rows], node_lon[a_rows], node_lat[b_rows], node_lon[b_rows])
+        self.tree = shapely.STRtree(shapely.linestrings(np.stack((self.seg_a, self.seg_b), axis=1).reshape(-1, 2, 2)))
+
+        self.node_lat, self.node_lon, self.node_xy = node_lat, node_lon, node_xy
+
+        # Buildings: same deterministic sample for every metric. Sort by stable OSM id
+        # first: Overpass element order isn't guaranteed stable across calls/endpoints,
+        # so seeding alone doesn't make the sample reproducible.
+        sampled = building_ways
+        if len(building_ways) > _BUILDING_SAMPLE_SIZE:
+            sampled = random.Random(42).sample(sorted(building_ways, key=lambda b: b["id"]), _BUILDING_SAMPLE_SIZE)
+        self.sampled_count = len(sampled)
+        b_pos, b_rows = _way_refs(sampled, index)
+        counts = np.bincount(b_pos, minlength=len(sampled))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+        nxt = np.arange(len(b_rows)) + 1  # next vertex on the closed ring
+        ends = starts + counts - 1
+        nxt[ends[counts > 0]] = starts[counts > 0]
+        self.b_pos, self.b_counts = b_pos, counts
+        self.b_xy = node_xy[b_rows]
+        self.b_next = nxt
+        self.b_edge_len = _haversine_m(node_lat[b_rows], node_lon[b_rows], node_lat[b_rows[nxt]], node_lon[b_rows[nxt]])
+
+    def _query(self, points: np.ndarray, distance: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(point index, segment index) pairs within `distance` meters."""
+        if len(points) == 0 or len(self.seg_a) == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        hits = self.tree.query(shapely.points(points), predicate="dwithin", distance=distance)
+        return hits[0].astype(np.int64), hits[1].astype(np.int64)
+
+    def streetwall_pass(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(perimeter_m, nearest segment distance, nearest segment length) for buildings near a road node."""
+        with self._lock:
+            if self._streetwall is None:
+                has = self.b_counts > 0
+                centroid = np.zeros((len(self.b_counts), 2))
+                np.add.at(centroid, self.b_pos, self.b_xy)
+                centroid[has] /= self.b_counts[has, None]
+                perimeter = np.bincount(self.b_pos, weights=self.b_edge_len, minlength=len(self.b_counts))
+
+                bi, si = self._query(centroid[has], _NEAREST_NODE_CUTOFF_M)
+                bi = np.flatnonzero(has)[bi]
+                p = centroid[bi]
+                node_d = np.minimum(np.hypot(*(p - self.seg_a[si]).T), np.hypot(*(p - self.seg_b[si]).T))
+                near_node = np.full(len(self.b_counts), np.inf)
+                np.minimum.at(near_node, bi, node_d)
+                # Any road node within the cutoff is an endpoint of a segment within it, so
+                # the candidate pairs are enough to apply the nearest-node prefilter.
+                keep = near_node[bi] <= _NEAREST_NODE_CUTOFF_M
+                bi, si = bi[keep], si[keep]
+                d = _point_segment_distance(centroid[bi], self.seg_a[si], self.seg_b[si])
+                win = _nearest_per_group(bi, d)
+                self._streetwall = (perimeter[bi[win]], d[win], self.seg_len[si[win]])
+            return self._streetwall
+
+    def setback_pass(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(setback_m, road way position) per building within _MAX_SETBACK_M of a road."""
+        with self._lock:
+            if self._setbacks is None:
+                # Setback = distance from the nearest building edge midpoint to the nearest segment.
+                polygon = self.b_counts[self.b_pos] >= 3
+                mids = ((self.b_xy + self.b_xy[self.b_next]) / 2.0)[polygon]
+                owner = self.b_pos[polygon]
+                mi, si = self._query(mids, _MAX_SETBACK_M)
+                d = _point_segment_distance(mids[mi], self.seg_a[si], self.seg_b[si])
+                win = _nearest_per_group(owner[mi], d)
+                self._setbacks = (d[win], self.seg_way[si[win]])
+            return self._setbacks
+
+
+_GEOMETRY_CACHE: "OrderedDict[Tuple[int, float, float], Tuple[Dict, _StreetGeometry]]" = OrderedDict()
+_GEOMETRY_CACHE_MAX = 4
+_geometry_lock = threading.Lock()
+
+
+def _street_geometry(osm_data: Dict, lat: float, lon: float) -> _StreetGeometry:
+    """Geometry engine for this OSM payload (built once, shared by the form metrics)."""
+    key = (id(osm_data), lat, lon)
+    with _geometry_lock:
+        hit = _GEOMETRY_CACHE.get(key)
+        if hit is not None and hit[0] is osm_data:
+            _GEOMETRY_CACHE.move_to_end(key)
+            return hit[1]
+        build_start = time.time()
+        geometry = _StreetGeometry(osm_data, lat, lon)
+        _GEOMETRY_CACHE[key] = (osm_data, geometry)  # holds osm_data so its id stays unique
+        while len(_GEOMETRY_CACHE) > _GEOMETRY_CACHE_MAX:
+            _GEOMETRY_CACHE.popitem(last=False)
+    logger.info(f"[GEOMETRY] built in {time.time() - build_start:.2f}s | #roads={geometry.road_count} "
+                f"#buildings={geometry.building_count} #segments={len(geometry.seg_len)} "
+                f"#sampled={geometry.sampled_count}")
+    return geometry
+
+
+_BLOCK_GRAIN_EMPTY = {
+    "block_grain": 0.0,
+    "median_block_length_m": 0.0,
+    "intersection_density_per_sqkm": 0.0,
+    "total_blocks": 0,
+    "total_intersections": 0,
+    "coverage_confidence": 0.0
+}
+
+_STREETWALL_EMPTY = {
+    "streetwall_continuity": 0.0,
+    "street_frontage_m": 0.0,
+    "built_frontage_m": 0.0,
+    "continuity_ratio": 0.0,
+    "coverage_confidence": 0.0
+}
+
+_SETBACK_EMPTY = {
+    "setback_consistency": 0.0,
+    "mean_setback_m": 0.0,
+    "setback_variance_m2": 0.0,
+    "setback_std_dev_m": 0.0,
+    "segments_analyzed": 0,
+    "buildings_analyzed": 0,
+    "coverage_confidence": 0.0
+}
+
+_FACADE_EMPTY = {
+    "facade_rhythm": 0.0,
+    "alignment_percentage": 0.0,
+    "mean_setback_m": 0.0,
+    "tolerance_m": 0.0,
+    "segments_analyzed": 0,
+    "buildings_analyzed": 0,
+    "coverage_confidence": 0.0
+}
 
 
 @cached(ttl_seconds=CACHE_TTL['osm_queries'])
-def compute_block_grain(lat: float, lon: float, radius_m: int = 1000) -> Dict[str, float]:
+def compute_block_grain(lat: float, lon: float, radius_m: int = 1000,
+                        osm_data: Optional[Dict] = None) -> Dict[str, float]:
     """
     Compute block grain metric: measures street network fineness.
-    
+
     Block grain = how fine-grained the street network is (higher = finer grain, more walkable).
     Based on:
     - Median block length (shorter = finer grain)
     - Intersection density (higher = finer grain)
-    
+
     Args:
         lat, lon: Center coordinates
         radius_m: Search radius in meters
-    
+        osm_data: Shared _fetch_roads_and_buildings result (fetched if not provided)
+
     Returns:
         {
             "block_grain": float (0-100, normalized),
@@ -156,155 +366,70 @@ def compute_block_grain(lat: float, lon: float, radius_m: int = 1000) -> Dict[st
     """
     step_start = time.time()
     try:
-        # Query OSM for road network (residential, primary, secondary, tertiary, unclassified)
-        query = f"""
-        [out:json][timeout:25];
-        (
-          way["highway"~"^(residential|primary|secondary|tertiary|unclassified|service|living_street)$"](around:{radius_m},{lat},{lon});
-        );
-        out body;
-        >;
-        out skel qt;
-        """
-        
-        def _do_request():
-            return requests.post(get_overpass_url(), data={"data": query}, timeout=20, 
-                               headers={"User-Agent": "HomeFit/1.0"})
-        
-        fetch_start = time.time()
-        # Phase 2/3 metrics are non-critical - use NON_CRITICAL profile (fail fast on rate limits)
-        resp = _retry_overpass(_do_request, query_type="block_grain")
-        fetch_time = time.time() - fetch_start
-        
-        if resp is None or resp.status_code != 200:
+        if osm_data is None:
+            osm_data = _fetch_roads_and_buildings(lat, lon, radius_m)
+        fetch_time = time.time() - step_start
+
+        if osm_data is None:
             logger.warning(f"[BLOCK_GRAIN] fetch failed after {fetch_time:.2f}s")
-            return {
-                "block_grain": 0.0,
-                "median_block_length_m": 0.0,
-                "intersection_density_per_sqkm": 0.0,
-                "total_blocks": 0,
-                "total_intersections": 0,
-                "coverage_confidence": 0.0
-            }
-        
-        parse_start = time.time()
-        data = resp.json()
-        elements = data.get("elements", [])
-        
-        # Build node and way dictionaries
-        nodes_dict = {}
-        ways_dict = {}
-        
-        for elem in elements:
-            if elem["type"] == "node":
-                nodes_dict[elem["id"]] = elem
-            elif elem["type"] == "way":
-                ways_dict[elem["id"]] = elem
-        
-        parse_time = time.time() - parse_start
-        
-        if not ways_dict:
-            logger.warning(f"[BLOCK_GRAIN] no ways found after parse={parse_time:.2f}s")
-            return {
-                "block_grain": 0.0,
-                "median_block_length_m": 0.0,
-                "intersection_density_per_sqkm": 0.0,
-                "total_blocks": 0,
-                "total_intersections": 0,
-                "coverage_confidence": 0.0
-            }
-        
+            return dict(_BLOCK_GRAIN_EMPTY)
+
+        if not osm_data["road_ways"]:
+            logger.warning(f"[BLOCK_GRAIN] no ways found")
+            return dict(_BLOCK_GRAIN_EMPTY)
+
+        geometry = _street_geometry(osm_data, lat, lon)
         compute_start = time.time()
-        # Reconstruct road segments and find intersections
-        road_segments = []
-        node_usage_count = {}  # Count how many ways use each node
-        
-        for way_id, way in ways_dict.items():
-            nodes = way.get("nodes", [])
-            if len(nodes) < 2:
-                continue
-            
-            # Get coordinates for this way
-            coords = []
-            for node_id in nodes:
-                if node_id in nodes_dict:
-                    node = nodes_dict[node_id]
-                    coords.append((node["lat"], node["lon"]))
-                    node_usage_count[node_id] = node_usage_count.get(node_id, 0) + 1
-            
-            if len(coords) < 2:
-                continue
-            
-            # Create segments from consecutive pairs
-            for i in range(len(coords) - 1):
-                segment = {
-                    "start": coords[i],
-                    "end": coords[i + 1],
-                    "length_m": haversine_distance(coords[i][0], coords[i][1], 
-                                                   coords[i + 1][0], coords[i + 1][1])
-                }
-                if segment["length_m"] > 0:
-                    road_segments.append(segment)
-        
-        # Find intersections (nodes used by 2+ ways)
-        intersections = []
-        for node_id, usage_count in node_usage_count.items():
-            if usage_count >= 2 and node_id in nodes_dict:
-                node = nodes_dict[node_id]
-                # Check if within radius
-                dist = haversine_distance(lat, lon, node["lat"], node["lon"])
-                if dist <= radius_m:
-                    intersections.append((node["lat"], node["lon"]))
-        
+
+        positive = geometry.seg_len > 0
+        segment_lengths = geometry.seg_len[positive]
+
+        # Find intersections (nodes used by 2+ ways), in first-seen order
+        refs = geometry.road_node_refs
+        unique_rows, first_seen, usage = np.unique(refs, return_index=True, return_counts=True)
+        order = np.argsort(first_seen, kind="stable")
+        candidates = unique_rows[order][usage[order] >= 2]
+        within = np.hypot(*geometry.node_xy[candidates].T) <= radius_m
+        intersections = candidates[within]
+
         # Calculate block lengths (distance between consecutive intersections along roads)
-        block_lengths = []
-        
-        # For each intersection, find all road segments that connect to it
-        # Then trace paths between intersections to estimate block perimeters
+        block_lengths = np.zeros(0)
+        estimated_block_length = 0.0
+
         # Simplified: use median segment length as proxy for block size
-        if road_segments:
-            segment_lengths = [seg["length_m"] for seg in road_segments]
+        if len(segment_lengths):
             # Blocks are typically 2-4 segments, so median segment length * 2-3 ≈ block length
-            median_segment_length = sorted(segment_lengths)[len(segment_lengths) // 2]
+            median_segment_length = np.sort(segment_lengths)[len(segment_lengths) // 2]
             # Estimate block length as ~2.5x median segment (typical block has 2-3 segments)
-            estimated_block_length = median_segment_length * 2.5
-            
-            # Also use actual distance between nearby intersections
-            # OPTIMIZATION: Limit to first 100 intersections to avoid O(n²) explosion
-            # Most block length info comes from the first few intersections anyway
-            intersections_to_check = intersections[:100] if len(intersections) > 100 else intersections
-            for i, int1 in enumerate(intersections_to_check):
-                # Only check nearby intersections (within 500m) to reduce computation
-                for int2 in intersections_to_check[i + 1:]:
-                    # Quick distance check - if too far, skip expensive calculation
-                    # Use simpler lat/lon distance estimate first (rough but fast)
-                    lat_diff = abs(int1[0] - int2[0])
-                    lon_diff = abs(int1[1] - int2[1])
-                    # Rough estimate: 1 degree ≈ 111km, so 0.005 degrees ≈ 500m
-                    if lat_diff > 0.005 or lon_diff > 0.005:
-                        continue
-                    
-                    dist = haversine_distance(int1[0], int1[1], int2[0], int2[1])
-                    if dist < 500:  # Only consider nearby intersections
-                        block_lengths.append(dist)
-        
+            estimated_block_length = float(median_segment_length) * 2.5
+
+            # Also use actual distance between nearby intersections (within 500m), over the
+            # first 100 intersections; 0.005 degrees ≈ 500m is the same coarse prefilter as before
+            first = intersections[:100]
+            i, j = np.triu_indices(len(first), k=1)
+            ilat, ilon = geometry.node_lat[first], geometry.node_lon[first]
+            close = (np.abs(ilat[i] - ilat[j]) <= 0.005) & (np.abs(ilon[i] - ilon[j]) <= 0.005)
+            i, j = i[close], j[close]
+            dist = _haversine_m(ilat[i], ilon[i], ilat[j], ilon[j])
+            block_lengths = dist[dist < 500]
+
         # Use estimated block length if we don't have enough intersection pairs
-        if not block_lengths and estimated_block_length:
-            block_lengths = [estimated_block_length]
-        
+        if not len(block_lengths) and estimated_block_length:
+            block_lengths = np.array([estimated_block_length])
+
         # Calculate metrics
-        median_block_length_m = sorted(block_lengths)[len(block_lengths) // 2] if block_lengths else 0.0
-        
+        median_block_length_m = float(np.sort(block_lengths)[len(block_lengths) // 2]) if len(block_lengths) else 0.0
+
         # Intersection density per square km
         area_sqkm = math.pi * (radius_m / 1000) ** 2
         intersection_density = len(intersections) / area_sqkm if area_sqkm > 0 else 0.0
-        
+
         # Normalize to 0-100 scale
         # Typical values:
         # - Fine-grained urban (Park Slope, Savannah): block_length < 100m, intersections > 50/sqkm → score > 80
         # - Suburban (Larchmont): block_length 100-200m, intersections 20-40/sqkm → score 50-70
         # - Coarse (rural): block_length > 300m, intersections < 10/sqkm → score < 40
-        
+
         # Block length component (shorter = higher score)
         # 50m = 100, 100m = 80, 200m = 50, 300m = 30, 500m = 10
         if median_block_length_m > 0:
@@ -322,7 +447,7 @@ def compute_block_grain(lat: float, lon: float, radius_m: int = 1000) -> Dict[st
                 block_length_score = max(0.0, 10.0 - (median_block_length_m - 500) / 100)
         else:
             block_length_score = 0.0
-        
+
         # Intersection density component (higher = higher score)
         # 50/sqkm = 100, 30/sqkm = 80, 20/sqkm = 60, 10/sqkm = 40, 5/sqkm = 20
         if intersection_density >= 50:
@@ -337,41 +462,34 @@ def compute_block_grain(lat: float, lon: float, radius_m: int = 1000) -> Dict[st
             intersection_score = 20.0 + (intersection_density - 5) / 5 * 20
         else:
             intersection_score = max(0.0, intersection_density / 5 * 20)
-        
+
         # Weighted combination (block length 60%, intersection density 40%)
         block_grain = 0.6 * block_length_score + 0.4 * intersection_score
         block_grain = max(0.0, min(100.0, block_grain))
-        
+
         # Coverage confidence (based on road density)
-        road_length_km = sum(seg["length_m"] for seg in road_segments) / 1000
+        road_length_km = float(segment_lengths.sum()) / 1000
         expected_road_length = area_sqkm * 10.0  # Typical: 10km roads per sqkm
         coverage_confidence = min(1.0, road_length_km / expected_road_length if expected_road_length > 0 else 0.0)
-        
+
         compute_time = time.time() - compute_start
         total_time = time.time() - step_start
-        
-        logger.info(f"[BLOCK_GRAIN] fetch={fetch_time:.2f}s parse={parse_time:.2f}s compute={compute_time:.2f}s total={total_time:.2f}s | "
-                   f"#roads={len(ways_dict)} #segments={len(road_segments)} #intersections={len(intersections)}")
-        
+
+        logger.info(f"[BLOCK_GRAIN] fetch={fetch_time:.2f}s compute={compute_time:.2f}s total={total_time:.2f}s | "
+                   f"#roads={geometry.road_count} #segments={len(segment_lengths)} #intersections={len(intersections)}")
+
         return {
             "block_grain": round(block_grain, 1),
             "median_block_length_m": round(median_block_length_m, 1),
             "intersection_density_per_sqkm": round(intersection_density, 1),
-            "total_blocks": len(block_lengths),
-            "total_intersections": len(intersections),
+            "total_blocks": int(len(block_lengths)),
+            "total_intersections": int(len(intersections)),
             "coverage_confidence": round(coverage_confidence, 2)
         }
-        
+
     except Exception as e:
         logger.error(f"[BLOCK_GRAIN] calculation error: {e}")
-        return {
-            "block_grain": 0.0,
-            "median_block_length_m": 0.0,
-            "intersection_density_per_sqkm": 0.0,
-            "total_blocks": 0,
-            "total_intersections": 0,
-            "coverage_confidence": 0.0
-        }
+        return dict(_BLOCK_GRAIN_EMPTY)
 
 
 @cached(ttl_seconds=CACHE_TTL['osm_queries'])
@@ -379,14 +497,14 @@ def compute_streetwall_continuity(lat: float, lon: float, radius_m: int = 1000,
                                    osm_data: Optional[Dict] = None) -> Dict[str, float]:
     """
     Compute streetwall continuity metric: measures building facade continuity along streets.
-    
+
     Streetwall continuity = percentage of street frontage with buildings near the sidewalk.
     Higher = more continuous facade line, more urban/enclosed feel.
-    
+
     Args:
         lat, lon: Center coordinates
         radius_m: Search radius in meters
-    
+
     Returns:
         {
             "streetwall_continuity": float (0-100, normalized),
@@ -397,262 +515,51 @@ def compute_streetwall_continuity(lat: float, lon: float, radius_m: int = 1000,
         }
     """
     step_start = time.time()
-    logger.info(f"[STREETWALL] Starting computation at {time.time() - step_start:.2f}s")
     try:
         # Use shared OSM data if provided, otherwise fetch
-        parse_start = time.time()
         if osm_data is None:
             logger.info(f"[STREETWALL] Fetching OSM data (shared data not provided)")
             osm_data = _fetch_roads_and_buildings(lat, lon, radius_m)
-        else:
-            logger.info(f"[STREETWALL] Using shared OSM data")
-        
+
         if osm_data is None:
             logger.warning(f"[STREETWALL] no OSM data available")
-            return {
-                "streetwall_continuity": 0.0,
-                "street_frontage_m": 0.0,
-                "built_frontage_m": 0.0,
-                "continuity_ratio": 0.0,
-                "coverage_confidence": 0.0
-            }
-        
-        nodes_dict = osm_data["nodes_dict"]
-        road_ways = osm_data["road_ways"]
-        building_ways = osm_data["building_ways"]
-        
-        if not road_ways:
+            return dict(_STREETWALL_EMPTY)
+
+        if not osm_data["road_ways"]:
             logger.warning(f"[STREETWALL] no roads found")
-            return {
-                "streetwall_continuity": 0.0,
-                "street_frontage_m": 0.0,
-                "built_frontage_m": 0.0,
-                "continuity_ratio": 0.0,
-                "coverage_confidence": 0.0
-            }
-        
-        parse_time = time.time() - parse_start
-        logger.info(f"[STREETWALL] Parse complete at {parse_time:.2f}s: #roads={len(road_ways)} #buildings={len(building_ways)}")
-        
+            return dict(_STREETWALL_EMPTY)
+
+        geometry = _street_geometry(osm_data, lat, lon)
+        parse_time = time.time() - step_start
+
         buffer_start = time.time()
-        logger.info(f"[STREETWALL] Starting buffer/intersect calculations at {buffer_start - step_start:.2f}s")
-        # Calculate total street frontage (sum of road segment lengths, doubled for both sides)
-        street_frontage_m = 0.0
-        
-        for way in road_ways:
-            nodes = way.get("nodes", [])
-            if len(nodes) < 2:
-                continue
-            
-            # Get coordinates
-            coords = []
-            for node_id in nodes:
-                if node_id in nodes_dict:
-                    node = nodes_dict[node_id]
-                    coords.append((node["lat"], node["lon"]))
-            
-            if len(coords) < 2:
-                continue
-            
-            # Sum segment lengths
-            for i in range(len(coords) - 1):
-                segment_length = haversine_distance(
-                    coords[i][0], coords[i][1],
-                    coords[i + 1][0], coords[i + 1][1]
-                )
-                street_frontage_m += segment_length
-        
-        # Count both sides of streets
-        street_frontage_m *= 2.0
-        
-        # Calculate built frontage (buildings near streets)
-        # For each building, find closest road segment and check distance
-        # OPTIMIZATION: Pre-filter buildings by distance to any road node before expensive segment checks
-        built_frontage_m = 0.0
-        building_coverage_buffer = 30.0  # meters - buildings within 30m count as streetwall
-        
-        # Pre-compute all road node coordinates for spatial filtering
-        all_road_nodes = []
-        for road_way in road_ways:
-            road_nodes = road_way.get("nodes", [])
-            for node_id in road_nodes:
-                if node_id in nodes_dict:
-                    node = nodes_dict[node_id]
-                    all_road_nodes.append((node["lat"], node["lon"]))
-        
-        # Pre-compute road segments once (instead of recomputing for each building)
-        logger.info(f"[STREETWALL] Pre-computing road segments: {len(road_ways)} roads")
-        road_segments_precomputed = []
-        for road_way in road_ways:
-            road_nodes = road_way.get("nodes", [])
-            if len(road_nodes) < 2:
-                continue
-            
-            road_coords = []
-            for node_id in road_nodes:
-                if node_id in nodes_dict:
-                    node = nodes_dict[node_id]
-                    road_coords.append((node["lat"], node["lon"]))
-            
-            if len(road_coords) < 2:
-                continue
-            
-            # Store all segments for this road
-            for i in range(len(road_coords) - 1):
-                segment_length = haversine_distance(
-                    road_coords[i][0], road_coords[i][1],
-                    road_coords[i + 1][0], road_coords[i + 1][1]
-                )
-                road_segments_precomputed.append({
-                    "start": road_coords[i],
-                    "end": road_coords[i + 1],
-                    "length": segment_length
-                })
-        
-        # OPTIMIZATION: Build grid-based spatial index for segments
-        # This reduces O(n*m) to roughly O(n*k) where k << m
-        grid_cell_size = 100.0  # meters - segments within 100m cells
-        # Convert to approximate lat/lon degrees (1 degree ≈ 111km)
-        grid_cell_deg = grid_cell_size / 111000.0
-        
-        # Build grid: map (grid_lat, grid_lon) -> list of segment indices
-        segment_grid = {}
-        if road_segments_precomputed:
-            for seg_idx, segment in enumerate(road_segments_precomputed):
-                # Get bounding box of segment
-                min_lat = min(segment["start"][0], segment["end"][0])
-                max_lat = max(segment["start"][0], segment["end"][0])
-                min_lon = min(segment["start"][1], segment["end"][1])
-                max_lon = max(segment["start"][1], segment["end"][1])
-                
-                # Add segment to all grid cells it might intersect
-                # Use floor division to get grid cell coordinates
-                min_grid_lat = int(min_lat / grid_cell_deg)
-                max_grid_lat = int(max_lat / grid_cell_deg)
-                min_grid_lon = int(min_lon / grid_cell_deg)
-                max_grid_lon = int(max_lon / grid_cell_deg)
-                
-                for grid_lat in range(min_grid_lat, max_grid_lat + 1):
-                    for grid_lon in range(min_grid_lon, max_grid_lon + 1):
-                        key = (grid_lat, grid_lon)
-                        if key not in segment_grid:
-                            segment_grid[key] = []
-                        segment_grid[key].append(seg_idx)
-        
-        if len(segment_grid) == 0 or len(road_segments_precomputed) == 0:
-            logger.warning(f"[STREETWALL] No road segments found - spatial grid empty (0 cells, 0 segments). This may indicate sparse road network or OSM data coverage issue.")
-        else:
-            logger.info(f"[STREETWALL] Built spatial grid: {len(segment_grid)} cells, {len(road_segments_precomputed)} segments")
-        
-        # OPTIMIZATION: Sample buildings if too many (for statistical validity, 2000 is plenty)
-        buildings_to_process = building_ways
-        if len(building_ways) > 2000:
-            import random
-            # Sort by stable OSM id first: Overpass element order isn't guaranteed
-            # stable across calls/endpoints, so seeding alone doesn't make this
-            # reproducible unless the input order is fixed too.
-            sorted_buildings = sorted(building_ways, key=lambda b: b["id"])
-            random.seed(42)
-            buildings_to_process = random.sample(sorted_buildings, 2000)
-            logger.info(f"[STREETWALL] Sampling {len(buildings_to_process)} buildings from {len(building_ways)} total")
-        
-        logger.info(f"[STREETWALL] Pre-computed {len(road_segments_precomputed)} segments, processing {len(buildings_to_process)} buildings")
-        building_count = 0
-        for building in buildings_to_process:
-            building_count += 1
-            if building_count % 50 == 0:
-                logger.info(f"[STREETWALL] Processing building {building_count}/{len(buildings_to_process)} at {time.time() - buffer_start:.2f}s")
-            nodes = building.get("nodes", [])
-            if not nodes:
-                continue
-                
-            # Get building centroid
-            building_coords = []
-            for node_id in nodes:
-                if node_id in nodes_dict:
-                    node = nodes_dict[node_id]
-                    building_coords.append((node["lat"], node["lon"]))
-            
-            if not building_coords:
-                continue
-            
-            # Calculate centroid
-            building_lat = sum(c[0] for c in building_coords) / len(building_coords)
-            building_lon = sum(c[1] for c in building_coords) / len(building_coords)
-            
-            # OPTIMIZATION: Quick distance check to nearest road node first
-            # If building is far from all road nodes, skip expensive segment checks
-            min_node_distance = float('inf')
-            for road_node_lat, road_node_lon in all_road_nodes:
-                dist = haversine_distance(building_lat, building_lon, road_node_lat, road_node_lon)
-                if dist < min_node_distance:
-                    min_node_distance = dist
-            
-            # If building is >50m from all road nodes, it's definitely not a streetwall
-            # (buffer is 30m, so 50m gives us a safe margin)
-            if min_node_distance > 50.0:
-                continue
-            
-            # OPTIMIZATION: Use grid to find nearby segments only
-            grid_lat = int(building_lat / grid_cell_deg)
-            grid_lon = int(building_lon / grid_cell_deg)
-            
-            # Check segments in this cell and adjacent cells (3x3 grid)
-            candidate_segment_indices = set()
-            for dlat in [-1, 0, 1]:
-                for dlon in [-1, 0, 1]:
-                    key = (grid_lat + dlat, grid_lon + dlon)
-                    if key in segment_grid:
-                        candidate_segment_indices.update(segment_grid[key])
-            
-            # Find closest road segment (only checking nearby segments from grid)
-            min_distance = float('inf')
-            closest_segment_length = 0.0
-            
-            for seg_idx in candidate_segment_indices:
-                segment = road_segments_precomputed[seg_idx]
-                _, _, dist = _compute_point_on_line(
-                    (building_lat, building_lon),
-                    segment["start"],
-                    segment["end"]
-                )
-                
-                if dist < min_distance:
-                    min_distance = dist
-                    closest_segment_length = segment["length"]
-            
-            # If building is within buffer, count its frontage
-            if min_distance <= building_coverage_buffer:
-                # Estimate building frontage (simplified: use building perimeter / 4 as frontage)
-                # Better: use building's closest edge to road
-                building_perimeter = 0.0
-                for i in range(len(building_coords)):
-                    next_i = (i + 1) % len(building_coords)
-                    building_perimeter += haversine_distance(
-                        building_coords[i][0], building_coords[i][1],
-                        building_coords[next_i][0], building_coords[next_i][1]
-                    )
-                
-                # Assume ~25% of perimeter faces street (typical for rectangular lots)
-                building_frontage = building_perimeter * 0.25
-                # Scale up if we sampled buildings
-                if len(buildings_to_process) < len(building_ways):
-                    scale_factor = len(building_ways) / len(buildings_to_process)
-                    building_frontage *= scale_factor
-                built_frontage_m += min(building_frontage, closest_segment_length)
-        
+        # Total street frontage (sum of road segment lengths, doubled for both sides)
+        street_frontage_m = float(geometry.seg_len.sum()) * 2.0
+        if not len(geometry.seg_len):
+            logger.warning(f"[STREETWALL] No road segments found. This may indicate sparse road network or OSM data coverage issue.")
+
+        # Built frontage: buildings whose centroid is within the buffer of the nearest segment
+        perimeter, distance, segment_length = geometry.streetwall_pass()
+        in_buffer = distance <= _STREETWALL_BUFFER_M
+        # Assume ~25% of perimeter faces street (typical for rectangular lots)
+        building_frontage = perimeter[in_buffer] * 0.25
+        # Scale up if we sampled buildings
+        if geometry.sampled_count < geometry.building_count:
+            building_frontage = building_frontage * (geometry.building_count / geometry.sampled_count)
+        built_frontage_m = float(np.minimum(building_frontage, segment_length[in_buffer]).sum())
+
         buffer_time = time.time() - buffer_start
-        
+
         # Calculate continuity ratio
         continuity_ratio = built_frontage_m / street_frontage_m if street_frontage_m > 0 else 0.0
-        
+
         # Normalize to 0-100 scale
         # Typical values:
         # - Urban core (Park Slope): > 0.6 ratio → score > 80
         # - Urban historic (Savannah): > 0.5 ratio → score > 70
         # - Suburban (Larchmont): 0.3-0.5 ratio → score 40-60
         # - Estate suburbs (Beverly Hills): < 0.3 ratio → score < 40
-        
+
         if continuity_ratio >= 0.6:
             streetwall_continuity = 80.0 + (continuity_ratio - 0.6) / 0.4 * 20
         elif continuity_ratio >= 0.5:
@@ -663,22 +570,21 @@ def compute_streetwall_continuity(lat: float, lon: float, radius_m: int = 1000,
             streetwall_continuity = 20.0 + (continuity_ratio - 0.1) / 0.2 * 20
         else:
             streetwall_continuity = continuity_ratio / 0.1 * 20
-        
+
         streetwall_continuity = max(0.0, min(100.0, streetwall_continuity))
-        
+
         # Coverage confidence (based on building density near roads)
         area_sqkm = math.pi * (radius_m / 1000) ** 2
-        buildings_per_sqkm = len(building_ways) / area_sqkm if area_sqkm > 0 else 0.0
+        buildings_per_sqkm = geometry.building_count / area_sqkm if area_sqkm > 0 else 0.0
         # Typical: 50-200 buildings/sqkm for urban, 20-50 for suburban
         expected_buildings = 50.0  # Minimum for good coverage
         coverage_confidence = min(1.0, buildings_per_sqkm / expected_buildings if expected_buildings > 0 else 0.0)
-        
+
         total_time = time.time() - step_start
-        total_segments = len(road_segments_precomputed)
-        
+
         logger.info(f"[STREETWALL] parse={parse_time:.2f}s buffer/intersect={buffer_time:.2f}s total={total_time:.2f}s | "
-                   f"#roads={len(road_ways)} #buildings={len(building_ways)} #segments={total_segments}")
-        
+                   f"#roads={geometry.road_count} #buildings={geometry.building_count} #segments={len(geometry.seg_len)}")
+
         return {
             "streetwall_continuity": round(streetwall_continuity, 1),
             "street_frontage_m": round(street_frontage_m, 1),
@@ -686,16 +592,22 @@ def compute_streetwall_continuity(lat: float, lon: float, radius_m: int = 1000,
             "continuity_ratio": round(continuity_ratio, 3),
             "coverage_confidence": round(coverage_confidence, 2)
         }
-        
+
     except Exception as e:
         logger.error(f"[STREETWALL] calculation error: {e}")
-        return {
-            "streetwall_continuity": 0.0,
-            "street_frontage_m": 0.0,
-            "built_frontage_m": 0.0,
-            "continuity_ratio": 0.0,
-            "coverage_confidence": 0.0
-        }
+        return dict(_STREETWALL_EMPTY)
+
+
+def _setback_groups(geometry: _StreetGeometry, min_buildings: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Setbacks grouped by the road they front.
+
+    Returns (all setbacks, group index per setback, buildings per group, valid-group mask);
+    a group is valid with at least `min_buildings` buildings.
+    """
+    setbacks, road = geometry.setback_pass()
+    _, group, sizes = np.unique(road, return_inverse=True, return_counts=True)
+    return setbacks, group.reshape(-1), sizes, sizes >= min_buildings
 
 
 @cached(ttl_seconds=CACHE_TTL['osm_queries'])
@@ -703,14 +615,14 @@ def compute_setback_consistency(lat: float, lon: float, radius_m: int = 1000,
                                 osm_data: Optional[Dict] = None) -> Dict[str, float]:
     """
     Compute setback consistency metric: measures uniformity of building setbacks along streets.
-    
+
     Setback consistency = how uniform building setbacks are per road segment (lower variance = higher score).
     Higher = more consistent setbacks, more cohesive streetscape.
-    
+
     Args:
         lat, lon: Center coordinates
         radius_m: Search radius in meters
-    
+
     Returns:
         {
             "setback_consistency": float (0-100, normalized),
@@ -723,248 +635,55 @@ def compute_setback_consistency(lat: float, lon: float, radius_m: int = 1000,
         }
     """
     step_start = time.time()
-    logger.info(f"[SETBACK] Starting computation at {time.time() - step_start:.2f}s")
     try:
         # Use shared OSM data if provided, otherwise fetch
-        parse_start = time.time()
         if osm_data is None:
             logger.info(f"[SETBACK] Fetching OSM data (shared data not provided)")
             osm_data = _fetch_roads_and_buildings(lat, lon, radius_m)
-        else:
-            logger.info(f"[SETBACK] Using shared OSM data")
-        
+
         if osm_data is None:
             logger.warning(f"[SETBACK] no OSM data available")
-            return {
-                "setback_consistency": 0.0,
-                "mean_setback_m": 0.0,
-                "setback_variance_m2": 0.0,
-                "setback_std_dev_m": 0.0,
-                "segments_analyzed": 0,
-                "buildings_analyzed": 0,
-                "coverage_confidence": 0.0
-            }
-        
-        nodes_dict = osm_data["nodes_dict"]
-        road_ways = osm_data["road_ways"]
-        building_ways = osm_data["building_ways"]
-        
-        if not road_ways or not building_ways:
+            return dict(_SETBACK_EMPTY)
+
+        if not osm_data["road_ways"] or not osm_data["building_ways"]:
             logger.warning(f"[SETBACK] no roads or buildings found")
-            return {
-                "setback_consistency": 0.0,
-                "mean_setback_m": 0.0,
-                "setback_variance_m2": 0.0,
-                "setback_std_dev_m": 0.0,
-                "segments_analyzed": 0,
-                "buildings_analyzed": 0,
-                "coverage_confidence": 0.0
-            }
-        
-        parse_time = time.time() - parse_start
-        logger.info(f"[SETBACK] Parse complete at {parse_time:.2f}s: #roads={len(road_ways)} #buildings={len(building_ways)}")
-        
+            return dict(_SETBACK_EMPTY)
+
+        geometry = _street_geometry(osm_data, lat, lon)
+        if not len(geometry.seg_len):
+            return dict(_SETBACK_EMPTY)
+        parse_time = time.time() - step_start
+
         compute_start = time.time()
-        logger.info(f"[SETBACK] Starting compute at {compute_start - step_start:.2f}s")
-        # Pre-compute road segments
-        road_segments_precomputed = []
-        for road_way in road_ways:
-            road_nodes = road_way.get("nodes", [])
-            if len(road_nodes) < 2:
-                continue
-            
-            road_coords = []
-            for node_id in road_nodes:
-                if node_id in nodes_dict:
-                    node = nodes_dict[node_id]
-                    road_coords.append((node["lat"], node["lon"]))
-            
-            if len(road_coords) < 2:
-                continue
-            
-            # Store all segments for this road
-            for i in range(len(road_coords) - 1):
-                segment_length = haversine_distance(
-                    road_coords[i][0], road_coords[i][1],
-                    road_coords[i + 1][0], road_coords[i + 1][1]
-                )
-                road_segments_precomputed.append({
-                    "start": road_coords[i],
-                    "end": road_coords[i + 1],
-                    "length": segment_length,
-                    "road_id": road_way.get("id")  # Group buildings by road
-                })
-        
-        if not road_segments_precomputed:
-            return {
-                "setback_consistency": 0.0,
-                "mean_setback_m": 0.0,
-                "setback_variance_m2": 0.0,
-                "setback_std_dev_m": 0.0,
-                "segments_analyzed": 0,
-                "buildings_analyzed": 0,
-                "coverage_confidence": 0.0
-            }
-        
-        # OPTIMIZATION: Build grid-based spatial index for segments (same as streetwall)
-        grid_cell_size = 100.0  # meters
-        grid_cell_deg = grid_cell_size / 111000.0
-        
-        segment_grid = {}
-        for seg_idx, segment in enumerate(road_segments_precomputed):
-            min_lat = min(segment["start"][0], segment["end"][0])
-            max_lat = max(segment["start"][0], segment["end"][0])
-            min_lon = min(segment["start"][1], segment["end"][1])
-            max_lon = max(segment["start"][1], segment["end"][1])
-            
-            min_grid_lat = int(min_lat / grid_cell_deg)
-            max_grid_lat = int(max_lat / grid_cell_deg)
-            min_grid_lon = int(min_lon / grid_cell_deg)
-            max_grid_lon = int(max_lon / grid_cell_deg)
-            
-            for grid_lat in range(min_grid_lat, max_grid_lat + 1):
-                for grid_lon in range(min_grid_lon, max_grid_lon + 1):
-                    key = (grid_lat, grid_lon)
-                    if key not in segment_grid:
-                        segment_grid[key] = []
-                    segment_grid[key].append(seg_idx)
-        
-        # OPTIMIZATION: Sample buildings if too many
-        buildings_to_process = building_ways
-        if len(building_ways) > 2000:
-            import random
-            sorted_buildings = sorted(building_ways, key=lambda b: b["id"])
-            random.seed(42)
-            buildings_to_process = random.sample(sorted_buildings, 2000)
-            logger.info(f"[SETBACK] Sampling {len(buildings_to_process)} buildings from {len(building_ways)} total")
-        
-        # For each building, find closest road segment and calculate setback
-        # Group setbacks by road segment for statistical analysis
-        logger.info(f"[SETBACK] Pre-computed {len(road_segments_precomputed)} segments, processing {len(buildings_to_process)} buildings")
-        segment_setbacks = {}  # segment_id -> list of setbacks
-        
-        building_count = 0
-        for building in buildings_to_process:
-            building_count += 1
-            if building_count % 50 == 0:
-                logger.info(f"[SETBACK] Processing building {building_count}/{len(buildings_to_process)} at {time.time() - compute_start:.2f}s")
-            nodes = building.get("nodes", [])
-            if not nodes:
-                continue
-                
-            # Get building polygon coordinates
-            building_coords = []
-            for node_id in nodes:
-                if node_id in nodes_dict:
-                    node = nodes_dict[node_id]
-                    building_coords.append((node["lat"], node["lon"]))
-            
-            if len(building_coords) < 3:  # Need at least 3 points for a polygon
-                continue
-            
-            # Calculate building centroid for grid lookup
-            building_lat = sum(c[0] for c in building_coords) / len(building_coords)
-            building_lon = sum(c[1] for c in building_coords) / len(building_coords)
-            
-            # OPTIMIZATION: Use grid to find nearby segments only
-            grid_lat = int(building_lat / grid_cell_deg)
-            grid_lon = int(building_lon / grid_cell_deg)
-            
-            candidate_segment_indices = set()
-            for dlat in [-1, 0, 1]:
-                for dlon in [-1, 0, 1]:
-                    key = (grid_lat + dlat, grid_lon + dlon)
-                    if key in segment_grid:
-                        candidate_segment_indices.update(segment_grid[key])
-            
-            # Find closest edge of building to nearest road segment
-            min_setback = float('inf')
-            closest_segment_id = None
-            
-            for seg_idx in candidate_segment_indices:
-                segment = road_segments_precomputed[seg_idx]
-                # Find closest point on building edge to this road segment
-                for i in range(len(building_coords)):
-                    edge_start = building_coords[i]
-                    edge_end = building_coords[(i + 1) % len(building_coords)]
-                    
-                    # Use the midpoint of the building edge as proxy
-                    edge_mid_lat = (edge_start[0] + edge_end[0]) / 2
-                    edge_mid_lon = (edge_start[1] + edge_end[1]) / 2
-                    
-                    # Calculate distance from edge midpoint to road segment
-                    _, _, dist = _compute_point_on_line(
-                        (edge_mid_lat, edge_mid_lon),
-                        segment["start"],
-                        segment["end"]
-                    )
-                    
-                    if dist < min_setback:
-                        min_setback = dist
-                        closest_segment_id = segment["road_id"]
-            
-            # Only consider buildings within reasonable distance (50m) of a road
-            if min_setback <= 50.0 and closest_segment_id is not None:
-                if closest_segment_id not in segment_setbacks:
-                    segment_setbacks[closest_segment_id] = []
-                segment_setbacks[closest_segment_id].append(min_setback)
-        
-        # Calculate variance per segment (need at least 3 buildings per segment for meaningful stats)
+        # Variance per road (need at least 3 buildings per road for meaningful stats)
         MIN_BUILDINGS_PER_SEGMENT = 3
-        all_setbacks = []
-        segment_variances = []
-        
-        for segment_id, setbacks in segment_setbacks.items():
-            if len(setbacks) >= MIN_BUILDINGS_PER_SEGMENT and len(setbacks) > 0:
-                # Calculate variance for this segment
-                # Additional safety check (len(setbacks) > 0) even though >= MIN_BUILDINGS_PER_SEGMENT should ensure this
-                mean_setback = sum(setbacks) / len(setbacks)
-                variance = sum((s - mean_setback) ** 2 for s in setbacks) / len(setbacks)
-                segment_variances.append(variance)
-                all_setbacks.extend(setbacks)
-        
+        setbacks, group, sizes, valid = _setback_groups(geometry, MIN_BUILDINGS_PER_SEGMENT)
+        in_valid = valid[group] if len(group) else np.zeros(0, dtype=bool)
+        all_setbacks = setbacks[in_valid]
+
         # Calculate overall statistics
-        if not all_setbacks:
-            return {
-                "setback_consistency": 0.0,
-                "mean_setback_m": 0.0,
-                "setback_variance_m2": 0.0,
-                "setback_std_dev_m": 0.0,
-                "segments_analyzed": 0,
-                "buildings_analyzed": 0,
-                "coverage_confidence": 0.0
-            }
-        
-        mean_setback = sum(all_setbacks) / len(all_setbacks)
-        overall_variance = sum((s - mean_setback) ** 2 for s in all_setbacks) / len(all_setbacks)
+        if not len(all_setbacks):
+            return dict(_SETBACK_EMPTY)
+
+        mean_setback = float(all_setbacks.mean())
+        overall_variance = float(all_setbacks.var())
         std_dev = math.sqrt(overall_variance)
-        
-        # Use weighted average of segment variances (weight by number of buildings)
-        if segment_variances and segment_setbacks:
-            # Get segment IDs that have enough buildings
-            valid_segment_ids = [seg_id for seg_id, setbacks in segment_setbacks.items() 
-                               if len(setbacks) >= MIN_BUILDINGS_PER_SEGMENT]
-            total_buildings_in_valid_segments = sum(len(segment_setbacks[seg_id]) for seg_id in valid_segment_ids)
-            
-            if total_buildings_in_valid_segments > 0:
-                weighted_variance = sum(
-                    segment_variances[i] * len(segment_setbacks[valid_segment_ids[i]])
-                    for i in range(len(segment_variances))
-                ) / total_buildings_in_valid_segments
-            else:
-                weighted_variance = overall_variance
-        else:
-            weighted_variance = overall_variance
-        
+
+        # Weighted average of per-road variances (weight by number of buildings)
+        group_mean = np.bincount(group, weights=setbacks) / sizes
+        group_sq = np.bincount(group, weights=(setbacks - group_mean[group]) ** 2)
+        total_buildings_in_valid_segments = int(sizes[valid].sum())
+        weighted_variance = float(group_sq[valid].sum()) / total_buildings_in_valid_segments
+
         # Normalize to 0-100 scale (lower variance = higher score)
         # Typical values:
         # - Very consistent (urban core): std_dev < 2m → score > 90
         # - Consistent (suburban): std_dev 2-5m → score 70-90
         # - Moderate (exurban): std_dev 5-10m → score 50-70
         # - Inconsistent (rural): std_dev > 10m → score < 50
-        
+
         std_dev_for_scoring = math.sqrt(weighted_variance) if weighted_variance > 0 else float('inf')
-        
+
         if std_dev_for_scoring <= 2.0:
             setback_consistency = 90.0 + (2.0 - std_dev_for_scoring) / 2.0 * 10.0
         elif std_dev_for_scoring <= 5.0:
@@ -975,12 +694,10 @@ def compute_setback_consistency(lat: float, lon: float, radius_m: int = 1000,
             setback_consistency = 30.0 + (15.0 - std_dev_for_scoring) / 5.0 * 20.0
         else:
             setback_consistency = max(0.0, 30.0 - (std_dev_for_scoring - 15.0) / 5.0 * 10.0)
-        
+
         setback_consistency = max(0.0, min(100.0, setback_consistency))
 
-        total_segments = len(road_segments_precomputed)
-        segments_with_buildings = len(segment_setbacks)
-        analyzed_segments = len([s for s in segment_setbacks.values() if len(s) >= MIN_BUILDINGS_PER_SEGMENT])
+        analyzed_segments = int(valid.sum())
 
         # Coverage confidence: share of all buildings found in the search area that actually
         # contributed a usable setback measurement (>=MIN_BUILDINGS_PER_SEGMENT per segment).
@@ -993,39 +710,28 @@ def compute_setback_consistency(lat: float, lon: float, radius_m: int = 1000,
         # against the total building count found is the same pattern used elsewhere in this
         # codebase (e.g. diversity's components_present/expected) and isn't double-penalized
         # by street topology.
-        if building_ways:
-            coverage_confidence = min(1.0, total_buildings_in_valid_segments / len(building_ways))
-        else:
-            coverage_confidence = 0.0
-        
+        coverage_confidence = min(1.0, total_buildings_in_valid_segments / geometry.building_count)
+
         compute_time = time.time() - compute_start
         total_time = time.time() - step_start
-        
+
         logger.info(f"[SETBACK] parse={parse_time:.2f}s compute={compute_time:.2f}s total={total_time:.2f}s | "
-                   f"#roads={len(road_ways)} #buildings={len(building_ways)} #segments={total_segments} "
+                   f"#roads={geometry.road_count} #buildings={geometry.building_count} #segments={len(geometry.seg_len)} "
                    f"analyzed_segments={analyzed_segments} analyzed_buildings={len(all_setbacks)}")
-        
+
         return {
             "setback_consistency": round(setback_consistency, 1),
             "mean_setback_m": round(mean_setback, 2),
             "setback_variance_m2": round(weighted_variance, 2),
             "setback_std_dev_m": round(std_dev_for_scoring, 2),
             "segments_analyzed": analyzed_segments,
-            "buildings_analyzed": len(all_setbacks),
+            "buildings_analyzed": int(len(all_setbacks)),
             "coverage_confidence": round(coverage_confidence, 2)
         }
-        
+
     except Exception as e:
         logger.error(f"[SETBACK] calculation error: {e}")
-        return {
-            "setback_consistency": 0.0,
-            "mean_setback_m": 0.0,
-            "setback_variance_m2": 0.0,
-            "setback_std_dev_m": 0.0,
-            "segments_analyzed": 0,
-            "buildings_analyzed": 0,
-            "coverage_confidence": 0.0
-        }
+        return dict(_SETBACK_EMPTY)
 
 
 @cached(ttl_seconds=CACHE_TTL['osm_queries'])
@@ -1033,14 +739,14 @@ def compute_facade_rhythm(lat: float, lon: float, radius_m: int = 1000,
                           osm_data: Optional[Dict] = None) -> Dict[str, float]:
     """
     Compute facade rhythm metric: measures alignment of building facades along streets.
-    
+
     Facade rhythm = proportion of buildings within tolerance of local mean setback (higher = more aligned).
     Higher = more rhythmic facade alignment, more cohesive visual cadence.
-    
+
     Args:
         lat, lon: Center coordinates
         radius_m: Search radius in meters
-    
+
     Returns:
         {
             "facade_rhythm": float (0-100, normalized),
@@ -1053,211 +759,44 @@ def compute_facade_rhythm(lat: float, lon: float, radius_m: int = 1000,
         }
     """
     step_start = time.time()
-    logger.info(f"[FACADE] Starting computation at {time.time() - step_start:.2f}s")
     try:
         # Use shared OSM data if provided, otherwise fetch
-        parse_start = time.time()
         if osm_data is None:
             logger.info(f"[FACADE] Fetching OSM data (shared data not provided)")
             osm_data = _fetch_roads_and_buildings(lat, lon, radius_m)
-        else:
-            logger.info(f"[FACADE] Using shared OSM data")
-        
+
         if osm_data is None:
             logger.warning(f"[FACADE] no OSM data available")
-            return {
-                "facade_rhythm": 0.0,
-                "alignment_percentage": 0.0,
-                "mean_setback_m": 0.0,
-                "tolerance_m": 0.0,
-                "segments_analyzed": 0,
-                "buildings_analyzed": 0,
-                "coverage_confidence": 0.0
-            }
-        
-        nodes_dict = osm_data["nodes_dict"]
-        road_ways = osm_data["road_ways"]
-        building_ways = osm_data["building_ways"]
-        
-        if not road_ways or not building_ways:
+            return dict(_FACADE_EMPTY)
+
+        if not osm_data["road_ways"] or not osm_data["building_ways"]:
             logger.warning(f"[FACADE] no roads or buildings found")
-            return {
-                "facade_rhythm": 0.0,
-                "alignment_percentage": 0.0,
-                "mean_setback_m": 0.0,
-                "tolerance_m": 0.0,
-                "segments_analyzed": 0,
-                "buildings_analyzed": 0,
-                "coverage_confidence": 0.0
-            }
-        
-        parse_time = time.time() - parse_start
-        logger.info(f"[FACADE] Parse complete at {parse_time:.2f}s: #roads={len(road_ways)} #buildings={len(building_ways)}")
-        
+            return dict(_FACADE_EMPTY)
+
+        geometry = _street_geometry(osm_data, lat, lon)
+        if not len(geometry.seg_len):
+            return dict(_FACADE_EMPTY)
+        parse_time = time.time() - step_start
+
         compute_start = time.time()
-        logger.info(f"[FACADE] Starting compute at {compute_start - step_start:.2f}s")
-        # Pre-compute road segments
-        road_segments_precomputed = []
-        for road_way in road_ways:
-            road_nodes = road_way.get("nodes", [])
-            if len(road_nodes) < 2:
-                continue
-            
-            road_coords = []
-            for node_id in road_nodes:
-                if node_id in nodes_dict:
-                    node = nodes_dict[node_id]
-                    road_coords.append((node["lat"], node["lon"]))
-            
-            if len(road_coords) < 2:
-                continue
-            
-            # Store all segments for this road
-            for i in range(len(road_coords) - 1):
-                segment_length = haversine_distance(
-                    road_coords[i][0], road_coords[i][1],
-                    road_coords[i + 1][0], road_coords[i + 1][1]
-                )
-                road_segments_precomputed.append({
-                    "start": road_coords[i],
-                    "end": road_coords[i + 1],
-                    "length": segment_length,
-                    "road_id": road_way.get("id")  # Group buildings by road
-                })
-        
-        if not road_segments_precomputed:
-            return {
-                "facade_rhythm": 0.0,
-                "alignment_percentage": 0.0,
-                "mean_setback_m": 0.0,
-                "tolerance_m": 0.0,
-                "segments_analyzed": 0,
-                "buildings_analyzed": 0,
-                "coverage_confidence": 0.0
-            }
-        
-        # OPTIMIZATION: Build grid-based spatial index for segments (same as streetwall)
-        grid_cell_size = 100.0  # meters
-        grid_cell_deg = grid_cell_size / 111000.0
-        
-        segment_grid = {}
-        for seg_idx, segment in enumerate(road_segments_precomputed):
-            min_lat = min(segment["start"][0], segment["end"][0])
-            max_lat = max(segment["start"][0], segment["end"][0])
-            min_lon = min(segment["start"][1], segment["end"][1])
-            max_lon = max(segment["start"][1], segment["end"][1])
-            
-            min_grid_lat = int(min_lat / grid_cell_deg)
-            max_grid_lat = int(max_lat / grid_cell_deg)
-            min_grid_lon = int(min_lon / grid_cell_deg)
-            max_grid_lon = int(max_lon / grid_cell_deg)
-            
-            for grid_lat in range(min_grid_lat, max_grid_lat + 1):
-                for grid_lon in range(min_grid_lon, max_grid_lon + 1):
-                    key = (grid_lat, grid_lon)
-                    if key not in segment_grid:
-                        segment_grid[key] = []
-                    segment_grid[key].append(seg_idx)
-        
-        # OPTIMIZATION: Sample buildings if too many
-        buildings_to_process = building_ways
-        if len(building_ways) > 2000:
-            import random
-            sorted_buildings = sorted(building_ways, key=lambda b: b["id"])
-            random.seed(42)
-            buildings_to_process = random.sample(sorted_buildings, 2000)
-            logger.info(f"[FACADE] Sampling {len(buildings_to_process)} buildings from {len(building_ways)} total")
-        
-        # For each building, find closest road segment and calculate setback
-        # Group setbacks by road segment
-        logger.info(f"[FACADE] Pre-computed {len(road_segments_precomputed)} segments, processing {len(buildings_to_process)} buildings")
-        segment_setbacks = {}  # segment_id -> list of setbacks
-        
-        building_count = 0
-        for building in buildings_to_process:
-            building_count += 1
-            if building_count % 50 == 0:
-                logger.info(f"[FACADE] Processing building {building_count}/{len(buildings_to_process)} at {time.time() - compute_start:.2f}s")
-            nodes = building.get("nodes", [])
-            if not nodes:
-                continue
-            
-            # Get building polygon coordinates
-            building_coords = []
-            for node_id in nodes:
-                if node_id in nodes_dict:
-                    node = nodes_dict[node_id]
-                    building_coords.append((node["lat"], node["lon"]))
-            
-            if len(building_coords) < 3:
-                continue
-            
-            # Calculate building centroid for grid lookup
-            building_lat = sum(c[0] for c in building_coords) / len(building_coords)
-            building_lon = sum(c[1] for c in building_coords) / len(building_coords)
-            
-            # OPTIMIZATION: Use grid to find nearby segments only
-            grid_lat = int(building_lat / grid_cell_deg)
-            grid_lon = int(building_lon / grid_cell_deg)
-            
-            candidate_segment_indices = set()
-            for dlat in [-1, 0, 1]:
-                for dlon in [-1, 0, 1]:
-                    key = (grid_lat + dlat, grid_lon + dlon)
-                    if key in segment_grid:
-                        candidate_segment_indices.update(segment_grid[key])
-            
-            # Find closest edge of building to nearest road segment
-            min_setback = float('inf')
-            closest_segment_id = None
-            
-            for seg_idx in candidate_segment_indices:
-                segment = road_segments_precomputed[seg_idx]
-                # Find closest edge of building to road segment
-                for i in range(len(building_coords)):
-                    edge_start = building_coords[i]
-                    edge_end = building_coords[(i + 1) % len(building_coords)]
-                    
-                    edge_mid_lat = (edge_start[0] + edge_end[0]) / 2
-                    edge_mid_lon = (edge_start[1] + edge_end[1]) / 2
-                    
-                    _, _, dist = _compute_point_on_line(
-                        (edge_mid_lat, edge_mid_lon),
-                        segment["start"],
-                        segment["end"]
-                    )
-                    
-                    if dist < min_setback:
-                        min_setback = dist
-                        closest_segment_id = segment["road_id"]
-            
-            if min_setback <= 50.0 and closest_segment_id is not None:
-                if closest_segment_id not in segment_setbacks:
-                    segment_setbacks[closest_segment_id] = []
-                segment_setbacks[closest_segment_id].append(min_setback)
-        
-        # Calculate alignment per segment (need at least 3 buildings per segment)
+        # Alignment per road (need at least 3 buildings per road)
         MIN_BUILDINGS_PER_SEGMENT = 3
         TOLERANCE_M = 2.0  # Buildings within ±2m of mean count as aligned
-        
-        total_buildings = 0
-        aligned_buildings = 0
-        analyzed_segments = 0
-        
-        for segment_id, setbacks in segment_setbacks.items():
-            if len(setbacks) >= MIN_BUILDINGS_PER_SEGMENT:
-                analyzed_segments += 1
-                mean_setback = sum(setbacks) / len(setbacks)
-                
-                # Count buildings within tolerance
-                for setback in setbacks:
-                    total_buildings += 1
-                    if abs(setback - mean_setback) <= TOLERANCE_M:
-                        aligned_buildings += 1
-        
+        setbacks, group, sizes, valid = _setback_groups(geometry, MIN_BUILDINGS_PER_SEGMENT)
+
+        if len(setbacks):
+            group_mean = np.bincount(group, weights=setbacks) / sizes
+            in_valid = valid[group]
+            aligned = np.abs(setbacks - group_mean[group]) <= TOLERANCE_M
+            total_buildings = int(in_valid.sum())
+            aligned_buildings = int((aligned & in_valid).sum())
+        else:
+            total_buildings = aligned_buildings = 0
+        analyzed_segments = int(valid.sum())
+
         # Calculate alignment percentage
         alignment_percentage = (aligned_buildings / total_buildings * 100.0) if total_buildings > 0 else 0.0
-        
+
         # Normalize to 0-100 scale (alignment percentage = score)
         facade_rhythm = alignment_percentage
 
@@ -1267,24 +806,18 @@ def compute_facade_rhythm(lat: float, lon: float, radius_m: int = 1000,
         # ratio (segment coverage x per-segment validity) reads near-zero almost everywhere
         # regardless of real data quality, since most street grids have plenty of segments
         # (parks, intersections, short blocks) that structurally fail the per-segment bar.
-        if building_ways:
-            coverage_confidence = min(1.0, total_buildings / len(building_ways))
-        else:
-            coverage_confidence = 0.0
-        
-        # Calculate overall mean setback
-        all_setbacks = []
-        for setbacks in segment_setbacks.values():
-            all_setbacks.extend(setbacks)
-        mean_setback = sum(all_setbacks) / len(all_setbacks) if all_setbacks else 0.0
-        
+        coverage_confidence = min(1.0, total_buildings / geometry.building_count)
+
+        # Overall mean setback (all buildings near a road, including sparse roads)
+        mean_setback = float(setbacks.mean()) if len(setbacks) else 0.0
+
         compute_time = time.time() - compute_start
         total_time = time.time() - step_start
-        
+
         logger.info(f"[FACADE] parse={parse_time:.2f}s compute={compute_time:.2f}s total={total_time:.2f}s | "
-                   f"#roads={len(road_ways)} #buildings={len(building_ways)} #segments={len(road_segments_precomputed)} "
+                   f"#roads={geometry.road_count} #buildings={geometry.building_count} #segments={len(geometry.seg_len)} "
                    f"analyzed_segments={analyzed_segments} analyzed_buildings={total_buildings}")
-        
+
         return {
             "facade_rhythm": round(facade_rhythm, 1),
             "alignment_percentage": round(alignment_percentage, 1),
@@ -1294,16 +827,7 @@ def compute_facade_rhythm(lat: float, lon: float, radius_m: int = 1000,
             "buildings_analyzed": total_buildings,
             "coverage_confidence": round(coverage_confidence, 2)
         }
-        
+
     except Exception as e:
         logger.error(f"[FACADE] calculation error: {e}")
-        return {
-            "facade_rhythm": 0.0,
-            "alignment_percentage": 0.0,
-            "mean_setback_m": 0.0,
-            "tolerance_m": 0.0,
-            "segments_analyzed": 0,
-            "buildings_analyzed": 0,
-            "coverage_confidence": 0.0
-        }
-
+        return dict(_FACADE_EMPTY)
@@ -0,0 +1,257 @@
+"""
+Local Census tract index.
+
+Answers point -> tract and disk -> intersecting tracts from TIGER/Line (or cartographic
+boundary) tract polygons packed offline by `scripts/baselines/build_tract_index.py`, so
+census_api does not round-trip to the Census geocoder / TIGERweb for every new coordinate.
+
+Layout (directory; arrays are memory-mapped, so forked API workers share one copy):
+  manifest.json             -- version, vintage, extents, per-tract attributes, county CBSA/CSA
+  vertices.npy              -- float64 (V, 2) lon/lat
+  ring_offsets.npy          -- int64 (R + 1,)  ring i = vertices[ring_offsets[i]:ring_offsets[i+1]]
+  part_ring_offsets.npy     -- int64 (P + 1,)  polygon part j = rings [..j..j+1); first ring is the shell
+  tract_part_offsets.npy    -- int64 (T + 1,)  tract k = parts [..k..k+1)
+  bounds.npy                -- float64 (T, 4) minx, miny, maxx, maxy per tract
+
+An STRtree over the tract bounding boxes is built on first use; only candidate tracts are
+materialized as Shapely polygons. Points not inside any indexed tract, and disks not inside
+an indexed extent, return None so callers keep their remote path.
+
+Override path via env ``HOMEFIT_TRACT_INDEX_DIR``. Missing directory = backend disabled.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_INDEX_DIR = Path(__file__).resolve().parent.parent / "data_cache" / "tract_index"
+INDEX_VERSION = 1
+
+_load_lock = threading.Lock()
+_index: Optional["TractIndex"] = None
+_load_failed = False
+
+
+def _index_dir() -> Path:
+    env = os.getenv("HOMEFIT_TRACT_INDEX_DIR")
+    return Path(env).resolve() if env else DEFAULT_INDEX_DIR
+
+
+@lru_cache(maxsize=1)
+def _has_index() -> bool:
+    p = _index_dir()
+    exists = (p / "manifest.json").exists()
+    if exists:
+        logger.info("Local tract index enabled: %s", p)
+    return exists
+
+
+class TractIndex:
+    """Packed tract polygons with an STRtree over their bounding boxes."""
+
+    def __init__(self, path: Path):
+        from shapely import STRtree, box
+
+        with open(path / "manifest.json", "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if int(manifest.get("version", 0)) != INDEX_VERSION:
+            raise ValueError(f"tract index version {manifest.get('version')} != {INDEX_VERSION}")
+        self.vintage = manifest.get("vintage")
+        self.extents: List[Tuple[float, float, float, float]] = [tuple(e) for e in manifest.get("extents") or []]
+        # [geoid, name, basename, aland, awater]
+        self.tracts: List[List[Any]] = manifest["tracts"]
+        self.counties: Dict[str, Dict[str, str]] = manifest.get("counties") or {}
+
+        def load(name: str) -> np.ndarray:
+            return np.load(path / f"{name}.npy", mmap_mode="r")
+
+        self.vertices = load("vertices")
+        self.ring_offsets = load("ring_offsets")
+        self.part_ring_offsets = load("part_ring_offsets")
+        self.tract_part_offsets = load("tract_part_offsets")
+        self.bounds = load("bounds")
+        b = np.asarray(self.bounds)
+        self._tree = STRtree(box(b[:, 0], b[:, 1], b[:, 2], b[:, 3]))
+
+    def __len__(self) -> int:
+        return len(self.tracts)
+
+    def _ring(self, r: int) -> np.ndarray:
+        return self.vertices[self.ring_offsets[r]:self.ring_offsets[r + 1]]
+
+    def parts(self, k: int) -> List[List[np.ndarray]]:
+        """Rings (shell first) of each polygon part of tract k."""
+        out = []
+        for p in range(int(self.tract_part_offsets[k]), int(self.tract_part_offsets[k + 1])):
+            out.append([self._ring(r) for r in range(int(self.part_ring_offsets[p]), int(self.part_ring_offsets[p + 1]))])
+        return out
+
+    def polygon(self, k: int):
+        from shapely import MultiPolygon, Polygon
+
+        polys = [Polygon(rings[0], rings[1:]) for rings in self.parts(k)]
+        return polys[0] if len(polys) == 1 else MultiPolygon(polys)
+
+    def covers_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> bool:
+        return any(
+            e_min_lat <= min_lat and e_min_lon <= min_lon and e_max_lat >= max_lat and e_max_lon >= max_lon
+            for e_min_lat, e_min_lon, e_max_lat, e_max_lon in self.extents
+        )
+
+    def tract_at(self, lat: float, lon: float) -> Optional[int]:
+        import shapely
+
+        for k in sorted(int(i) for i in self._tree.query(shapely.Point(lon, lat))):
+            if shapely.intersects_xy(self.polygon(k), lon, lat):
+                return k
+        return None
+
+    def tracts_intersecting(self, geom) -> List[int]:
+        candidates = sorted(int(i) for i in self._tree.query(geom))
+        return [k for k in candidates if self.polygon(k).intersects(geom)]
+
+    def attributes(self, k: int) -> Dict[str, Any]:
+        geoid, name, basename, aland, awater = self.tracts[k]
+        return {"geoid": geoid, "name": name, "basename": basename, "aland": aland, "awater": awater}
+
+
+def get_index() -> Optional[TractIndex]:
+    """Shared index (loaded on first use), or None when absent or unreadable."""
+    global _index, _load_failed
+    if _index is not None:
+        return _index
+    if _load_failed or not _has_index():
+        return None
+    with _load_lock:
+        if _index is None and not _load_failed:
+            try:
+                _index = TractIndex(_index_dir())
+                logger.info("Local tract index loaded: %d tracts (%s)", len(_index), _index.vintage)
+            except Exception as exc:
+                _load_failed = True
+                logger.warning("Local tract index unusable: %s", exc)
+        return _index
+
+
+def reset() -> None:
+    """Drop the loaded index (tests, or after rebuilding it)."""
+    global _index, _load_failed
+    with _load_lock:
+        _index = None
+        _load_failed = False
+    _has_index.cache_clear()
+
+
+def lookup_tract(lat: float, lon: float) -> Optional[Dict]:
+    """
+    Tract containing the point, shaped like census_api.get_census_tract's result
+    (plus cbsa_/csa_ fields when the index carries the county delineation).
+    """
+    idx = get_index()
+    if idx is None:
+        return None
+    k = idx.tract_at(lat, lon)
+    if k is None:
+        return None
+    return _tract_dict(idx, k)
+
+
+def _tract_dict(idx: TractIndex, k: int) -> Dict[str, Any]:
+    attrs = idx.attributes(k)
+    geoid = attrs["geoid"]
+    result: Dict[str, Any] = {
+        "state_fips": geoid[:2],
+        "county_fips": geoid[2:5],
+        "tract_fips": geoid[5:11],
+        "geoid": geoid,
+        "name": attrs["name"] or "Unknown",
+        "basename": attrs["basename"] or "",
+    }
+    for key, value in (idx.counties.get(geoid[:5]) or {}).items():
+        if value:
+            result[key] = value
+    return result
+
+
+def _disk_bbox(lat: float, lon: float, radius_m: float) -> Tuple[float, float]:
+    d_lat = float(radius_m) / 110_540.0
+    d_lon = float(radius_m) / (111_320.0 * max(0.01, math.cos(math.radians(lat))))
+    return d_lat, d_lon
+
+
+def nearest_tracts(lat: float, lon: float, radius_m: float) -> Optional[List[Dict]]:
+    """
+    Tracts within radius_m of the point, nearest first (polygon edge distance; the
+    containing tract comes first at distance 0). None when the disk is not indexed.
+    """
+    idx = get_index()
+    if idx is None:
+        return None
+    d_lat, d_lon = _disk_bbox(lat, lon, radius_m)
+    if not idx.covers_bbox(lat - d_lat, lon - d_lon, lat + d_lat, lon + d_lon):
+        return None
+
+    import shapely
+
+    window = shapely.box(lon - d_lon, lat - d_lat, lon + d_lon, lat + d_lat)
+    kx = 111_320.0 * math.cos(math.radians(lat))
+    ranked = []
+    for k in idx.tracts_intersecting(window):
+        # Local metres: scale lon/lat offsets so the distance is isotropic.
+        poly = shapely.transform(idx.polygon(k), lambda c: (c - [lon, lat]) * [kx, 110_540.0])
+        dist = shapely.distance(poly, shapely.Point(0.0, 0.0))
+        if dist <= radius_m:
+            ranked.append((dist, k))
+    return [_tract_dict(idx, k) for _dist, k in sorted(ranked)]
+
+
+def tracts_intersecting_disk(lat: float, lon: float, radius_m: float, ring: Optional[List[List[float]]] = None) -> Optional[Dict]:
+    """
+    Tracts intersecting a disk as a TIGERweb-style ArcGIS JSON payload (one feature per
+    polygon part), or None when the disk is not inside an indexed extent.
+    """
+    idx = get_index()
+    if idx is None:
+        return None
+    d_lat, d_lon = _disk_bbox(lat, lon, radius_m)
+    if not idx.covers_bbox(lat - d_lat, lon - d_lon, lat + d_lat, lon + d_lon):
+        return None
+
+    from shapely import Polygon
+
+    if ring:
+        disk = Polygon(ring)
+    else:
+        angles = np.linspace(0.0, 2 * math.pi, 48, endpoint=False)
+        disk = Polygon(np.column_stack([lon + d_lon * np.sin(angles), lat + d_lat * np.cos(angles)]))
+
+    features = []
+    for k in idx.tracts_intersecting(disk):
+        attrs = idx.attributes(k)
+        geoid = attrs["geoid"]
+        esri_attrs = {
+            "GEOID": geoid,
+            "STATE": geoid[:2],
+            "COUNTY": geoid[2:5],
+            "TRACT": geoid[5:11],
+            "AREALAND": attrs["aland"],
+            "AREAWATER": attrs["awater"],
+        }
+        for rings in idx.parts(k):
+            features.append({
+                "attributes": esri_attrs,
+                "geometry": {"rings": [r.tolist() for r in rings]},
+            })
+    return {"features": features, "source": "local_tract_index"}
@@ -4,11 +4,12 @@ Queries transit stops using Transitland v2 REST API
 """
 
 import os
-import requests
 import statistics
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
+from data_sources import gtfs_store, http_client
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -36,6 +37,13 @@ def get_nearby_transit_stops(
             "summary": {...}
         }
     """
+    local_stops = gtfs_store.nearby_stops(lat, lon, radius_m, limit=100)
+    if local_stops is not None:
+        if not local_stops:
+            print(f"⚠️  No transit stops found within {radius_m}m (local GTFS)")
+            return None
+        return _stops_result(local_stops)
+
     if not TRANSITLAND_API_KEY:
         print("⚠️  TRANSITLAND_API_KEY not found in .env file")
         return None
@@ -52,7 +60,7 @@ def get_nearby_transit_stops(
             "include": "routes"  # Include routes in response to get route_type (may not be supported by all API versions)
         }
         
-        response = requests.get(url, params=params, timeout=15)
+        response = http_client.get(url, params=params, timeout=15)
         
         if response.status_code != 200:
             print(f"⚠️  Transitland API returned status {response.status_code}")
@@ -129,36 +137,40 @@ def get_nearby_transit_stops(
                 "route_type": route_type  # Preserve route_type if available
             })
         
-        # Sort by distance
-        processed_stops.sort(key=lambda x: x["distance_m"])
-        
-        # Build summary
-        closest = processed_stops[0] if processed_stops else None
-        
-        summary = {
-            "total_stops": len(processed_stops),
-            "closest_stop": {
-                "name": closest["name"],
-                "distance_m": closest["distance_m"]
-            } if closest else None,
-            "within_400m": len([s for s in processed_stops if s["distance_m"] <= 400]),
-            "within_800m": len([s for s in processed_stops if s["distance_m"] <= 800])
-        }
-        
         print(f"✅ Found {len(processed_stops)} transit stops within {radius_m}m")
-        
-        return {
-            "stops": processed_stops[:10],  # Return top 10 closest
-            "all_stops": processed_stops,  # Include all stops for counting by route_type
-            "count": len(processed_stops),
-            "summary": summary
-        }
+        return _stops_result(processed_stops)
         
     except Exception as e:
         print(f"Transitland API error: {e}")
         return None
 
 
+def _stops_result(processed_stops: List[Dict]) -> Dict:
+    """Shape processed stops (any source) as get_nearby_transit_stops' result."""
+    # Sort by distance
+    processed_stops = sorted(processed_stops, key=lambda x: x["distance_m"])
+    
+    # Build summary
+    closest = processed_stops[0] if processed_stops else None
+    
+    summary = {
+        "total_stops": len(processed_stops),
+        "closest_stop": {
+            "name": closest["name"],
+            "distance_m": closest["distance_m"]
+        } if closest else None,
+        "within_400m": len([s for s in processed_stops if s["distance_m"] <= 400]),
+        "within_800m": len([s for s in processed_stops if s["distance_m"] <= 800])
+    }
+    
+    return {
+        "stops": processed_stops[:10],  # Return top 10 closest
+        "all_stops": processed_stops,  # Include all stops for counting by route_type
+        "count": len(processed_stops),
+        "summary": summary
+    }
+
+
 def get_stop_departures(stop_onestop_id: str, limit: int = 200, service_date: Optional[str] = None) -> Optional[List[Dict]]:
     """
     Get scheduled departures for a stop using Transitland v2 stop departures endpoint.
@@ -171,8 +183,9 @@ def get_stop_departures(stop_onestop_id: str, limit: int = 200, service_date: Op
     
     Returns:
         List of departure dictionaries with schedule information, or None if unavailable
+        (always None for local GTFS stops, which only carry precomputed metrics)
     """
-    if not TRANSITLAND_API_KEY:
+    if not TRANSITLAND_API_KEY or gtfs_store.owns(stop_onestop_id):
         return None
     
     try:
@@ -198,7 +211,7 @@ def get_stop_departures(stop_onestop_id: str, limit: int = 200, service_date: Op
             "service_date": service_date
         }
         
-        response = requests.get(url, params=params, timeout=30)  # Increased timeout for larger responses
+        response = http_client.get(url, params=params, timeout=30)  # Increased timeout for larger responses
         
         if response.status_code != 200:
             return None
@@ -238,8 +251,14 @@ def get_route_schedules(route_onestop_id: str, sample_stop_id: Optional[str] = N
             "weekday_trips": int,  # Number of trips on a typical weekday
             "first_departure": str,  # HH:MM format
             "last_departure": str,  # HH:MM format
+            "weekend_trips": int,  # Local GTFS stops only
+            "headsigns": [str],  # Local GTFS stops only (weekday trip headsigns)
         } or None if unavailable
     """
+    if gtfs_store.owns(sample_stop_id):
+        # Local GTFS stop: precomputed metrics (weekday and weekend), no departures call
+        return gtfs_store.stop_schedule(sample_stop_id)
+    
     if not TRANSITLAND_API_KEY:
         return None
     
@@ -297,56 +316,70 @@ def get_route_schedules(route_onestop_id: str, sample_stop_id: Optional[str] = N
         if len(departure_times) < 2:
             return None
         
-        departure_times.sort()
-        
-        # Calculate service span
-        first_minutes = departure_times[0]
-        last_minutes = departure_times[-1]
-        service_span_hours = (last_minutes - first_minutes) / 60.0
-        
-        # Calculate headways (time between consecutive departures)
-        headways = []
-        for i in range(1, len(departure_times)):
-            headway = departure_times[i] - departure_times[i-1]
-            if headway > 0:  # Ignore same-time departures
-                headways.append(headway)
-        
-        if not headways:
+        schedule = summarize_departure_minutes(departure_times)
+        if schedule is None:
             return None
-        
-        # Peak period: 7-9 AM (420-540 min) and 5-7 PM (1020-1140 min)
-        peak_headways = []
-        off_peak_headways = []
-        
-        for i, headway in enumerate(headways):
-            # Use the earlier departure time to determine if it's peak
-            dep_time = departure_times[i]
-            is_peak = (420 <= dep_time <= 540) or (1020 <= dep_time <= 1140)
-            
-            if is_peak:
-                peak_headways.append(headway)
-            else:
-                off_peak_headways.append(headway)
-        
-        peak_headway = statistics.mean(peak_headways) if peak_headways else None
-        off_peak_headway = statistics.mean(off_peak_headways) if off_peak_headways else None
-        
-        # Format first/last departure
-        first_hour = first_minutes // 60
-        first_min = first_minutes % 60
-        last_hour = last_minutes // 60
-        last_min = last_minutes % 60
-        
-        return {
-            "service_span_hours": round(service_span_hours, 1),
-            "peak_headway_minutes": round(peak_headway, 1) if peak_headway else None,
-            "off_peak_headway_minutes": round(off_peak_headway, 1) if off_peak_headway else None,
-            "weekday_trips": len(departure_times),  # Approximate - actual count may vary by day
-            "first_departure": f"{first_hour:02d}:{first_min:02d}",
-            "last_departure": f"{last_hour:02d}:{last_min:02d}",
-            "departures": departures,  # Include raw departures for reuse (avoids redundant API call)
-        }
+        schedule["departures"] = departures  # Include raw departures for reuse (avoids redundant API call)
+        return schedule
         
     except Exception as e:
         print(f"Transitland schedule query error for {route_onestop_id}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def summarize_departure_minutes(departure_times: List[int]) -> Optional[Dict]:
+    """
+    Service span, peak/off-peak headways and trip count from one day's departure times
+    at a stop (minutes after midnight). Shared by the Transitland path and the local GTFS
+    store builder so both report the same metrics.
+    """
+    if len(departure_times) < 2:
+        return None
+    
+    departure_times = sorted(departure_times)
+    
+    # Calculate service span
+    first_minutes = departure_times[0]
+    last_minutes = departure_times[-1]
+    service_span_hours = (last_minutes - first_minutes) / 60.0
+    
+    # Calculate headways (time between consecutive departures)
+    headways = []
+    for i in range(1, len(departure_times)):
+        headway = departure_times[i] - departure_times[i-1]
+        if headway > 0:  # Ignore same-time departures
+            headways.append(headway)
+    
+    if not headways:
+        return None
+    
+    # Peak period: 7-9 AM (420-540 min) and 5-7 PM (1020-1140 min)
+    peak_headways = []
+    off_peak_headways = []
+    
+    for i, headway in enumerate(headways):
+        # Use the earlier departure time to determine if it's peak
+        dep_time = departure_times[i]
+        is_peak = (420 <= dep_time <= 540) or (1020 <= dep_time <= 1140)
+        
+        if is_peak:
+            peak_headways.append(headway)
+        else:
+            off_peak_headways.append(headway)
+    
+    peak_headway = statistics.mean(peak_headways) if peak_headways else None
+    off_peak_headway = statistics.mean(off_peak_headways) if off_peak_headways else None
+    
+    # Format first/last departure
+    first_hour = first_minutes // 60
+    first_min = first_minutes % 60
+    last_hour = last_minutes // 60
+    last_min = last_minutes % 60
+    
+    return {
+        "service_span_hours": round(service_span_hours, 1),
+        "peak_headway_minutes": round(peak_headway, 1) if peak_headway else None,
+        "off_peak_headway_minutes": round(off_peak_headway, 1) if off_peak_headway else None,
+        "weekday_trips": len(departure_times),  # Approximate - actual count may vary by day
+        "first_departure": f"{first_hour:02d}:{first_min:02d}",
+        "last_departure": f"{last_hour:02d}:{last_min:02d}",
+    }
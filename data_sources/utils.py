@@ -3,8 +3,14 @@ Shared utilities for HomeFit data sources
 Consolidates common functions like distance calculations and scoring helpers
 """
 
+import heapq
 import math
-from typing import List, Dict, Tuple, Optional
+import threading
+from typing import List, Dict, Tuple, Optional, Sequence
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000  # Earth radius in meters
 
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -18,7 +24,7 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Returns:
         Distance in meters
     """
-    R = 6371000  # Earth radius in meters
+    R = EARTH_RADIUS_M
     phi1 = math.radians(lat1)
     phi2 = math.radians(lat2)
     delta_phi = math.radians(lat2 - lat1)
@@ -273,3 +279,164 @@ def format_distance(distance_m: float) -> str:
         return f"{int(distance_m)}m"
     else:
         return f"{distance_m/1000:.1f}km"
+
+
+# Unit-sphere chord slack: keeps float noise in the xyz pruning from dropping a point
+# whose exact haversine distance is inside the query (~1 cm at Earth scale).
+_CHORD_SLACK = 1e-9
+
+
+def _chord_for_meters(distance_m: float) -> float:
+    """Unit-sphere chord length for a great-circle distance (monotonic in distance)."""
+    theta = distance_m / EARTH_RADIUS_M
+    if theta >= math.pi:
+        return 2.0
+    return 2.0 * math.sin(theta / 2.0)
+
+
+class SphereIndex:
+    """
+    Nearest / radius index over a static table of lat/lon points.
+
+    Points are stored as unit-sphere (x, y, z) vectors in a KD-tree (median splits on the
+    widest axis, bucketed leaves), built on the first query. Subtrees are pruned by chord
+    distance to their bounding box; surviving points are re-measured with
+    haversine_distance, so results match a linear scan of the same table. Rows with
+    missing or non-finite coordinates are skipped; returned indices refer to positions in
+    the sequences passed in.
+    """
+
+    def __init__(self, lats: Sequence[Optional[float]], lons: Sequence[Optional[float]], leaf_size: int = 16):
+        self._lats: List[float] = []
+        self._lons: List[float] = []
+        self._rows: List[int] = []
+        for i, (lat, lon) in enumerate(zip(lats, lons)):
+            if lat is None or lon is None:
+                continue
+            lat, lon = float(lat), float(lon)
+            if math.isfinite(lat) and math.isfinite(lon):
+                self._rows.append(i)
+                self._lats.append(lat)
+                self._lons.append(lon)
+        self.leaf_size = max(1, int(leaf_size))
+        self._lock = threading.Lock()
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @staticmethod
+    def _unit(lat: float, lon: float) -> Tuple[float, float, float]:
+        phi, lam = math.radians(lat), math.radians(lon)
+        return math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi)
+
+    def _ensure_built(self) -> None:
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            phi = np.radians(np.asarray(self._lats, dtype=float))
+            lam = np.radians(np.asarray(self._lons, dtype=float))
+            xyz = np.column_stack((np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)))
+            order = np.arange(len(self._rows))
+            self._lo: List[Tuple[float, ...]] = []
+            self._hi: List[Tuple[float, ...]] = []
+            self._spans: List[Tuple[int, int]] = []
+            self._children: List[Optional[Tuple[int, int]]] = []
+            if len(order):
+                self._split(xyz, order, 0, len(order))
+            self._xyz = xyz[order]
+            self._order = order
+            self._built = True
+
+    def _split(self, xyz: np.ndarray, order: np.ndarray, start: int, end: int) -> int:
+        pts = xyz[order[start:end]]
+        lo, hi = pts.min(axis=0), pts.max(axis=0)
+        node = len(self._spans)
+        self._lo.append(tuple(lo.tolist()))
+        self._hi.append(tuple(hi.tolist()))
+        self._spans.append((start, end))
+        self._children.append(None)
+        if end - start > self.leaf_size:
+            dim = int(np.argmax(hi - lo))
+            mid = (start + end) // 2
+            part = np.argpartition(pts[:, dim], mid - start)
+            order[start:end] = order[start:end][part]
+            left = self._split(xyz, order, start, mid)
+            right = self._split(xyz, order, mid, end)
+            self._children[node] = (left, right)
+        return node
+
+    def _box_chord(self, node: int, q: Tuple[float, float, float]) -> float:
+        total = 0.0
+        for qv, lo, hi in zip(q, self._lo[node], self._hi[node]):
+            d = lo - qv if qv < lo else (qv - hi if qv > hi else 0.0)
+            total += d * d
+        return math.sqrt(total)
+
+    def _leaf_chords(self, node: int, q: Tuple[float, float, float]) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self._spans[node]
+        diff = self._xyz[start:end] - np.asarray(q)
+        return np.sqrt(np.einsum("ij,ij->i", diff, diff)), self._order[start:end]
+
+    def _refine(self, lat: float, lon: float, positions: List[int]) -> List[Tuple[int, float]]:
+        return [
+            (self._rows[p], haversine_distance(lat, lon, self._lats[p], self._lons[p]))
+            for p in positions
+        ]
+
+    def within(self, lat: float, lon: float, radius_m: float) -> List[Tuple[int, float]]:
+        """(row, distance_m) for every point within radius_m, in table order."""
+        if not self._rows or not (radius_m >= 0):
+            return []
+        self._ensure_built()
+        q = self._unit(lat, lon)
+        bound = _chord_for_meters(radius_m) + _CHORD_SLACK
+        candidates: List[int] = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._box_chord(node, q) > bound:
+                continue
+            children = self._children[node]
+            if children is not None:
+                stack.extend(children)
+                continue
+            chords, positions = self._leaf_chords(node, q)
+            candidates.extend(positions[chords <= bound].tolist())
+        return [(row, d) for row, d in self._refine(lat, lon, sorted(candidates)) if d <= radius_m]
+
+    def nearest(self, lat: float, lon: float, k: int = 1,
+                max_distance_m: Optional[float] = None) -> List[Tuple[int, float]]:
+        """
+        Up to k (row, distance_m) pairs, nearest first (ties keep table order); points
+        farther than max_distance_m are left out.
+        """
+        if not self._rows or k <= 0:
+            return []
+        self._ensure_built()
+        q = self._unit(lat, lon)
+        bound = math.inf if max_distance_m is None else _chord_for_meters(max_distance_m) + _CHORD_SLACK
+        candidates: List[Tuple[float, int]] = []
+        heap = [(self._box_chord(0, q), 0)]
+        while heap:
+            box, node = heapq.heappop(heap)
+            if box > bound:
+                break
+            children = self._children[node]
+            if children is not None:
+                for child in children:
+                    heapq.heappush(heap, (self._box_chord(child, q), child))
+                continue
+            chords, positions = self._leaf_chords(node, q)
+            keep = chords <= bound
+            candidates.extend(zip(chords[keep].tolist(), positions[keep].tolist()))
+            if len(candidates) >= k:
+                bound = min(bound, heapq.nsmallest(k, candidates)[-1][0] + _CHORD_SLACK)
+        positions = sorted(p for c, p in candidates if c <= bound)
+        found = self._refine(lat, lon, positions)
+        if max_distance_m is not None:
+            found = [(row, d) for row, d in found if d <= max_distance_m]
+        found.sort(key=lambda item: (item[1], item[0]))
+        return found[:k]
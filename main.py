@@ -15,6 +15,7 @@ import hashlib
 import uuid
 from logging_config import get_logger
 from agent_recommend import router as agent_recommend_router
+import catalog_store
 
 logger = get_logger(__name__)
 
@@ -40,6 +41,7 @@ from data_sources.cache import (
     redis_set_compressed_json,
 )
 from data_sources.error_handling import check_api_credentials
+from data_sources.executors import get_pool, stats as get_pool_stats
 from data_sources.telemetry import record_request_metrics, record_error, get_telemetry_stats
 from pillars.schools import get_school_data
 from pillars.active_outdoors import get_active_outdoors_score_v2
@@ -128,6 +130,8 @@ HOMEFIT_PILLARS_BUDGET_SECONDS = _profile_seconds(
 
 # Batch: hard cap (server-side), do NOT trust client-provided values
 MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "10"))
+# Batch: locations scored at once; upstream token buckets (data_sources.rate_limits) gate admission
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
 
 # Log hygiene: avoid logging raw user-provided addresses by default
 LOG_RAW_LOCATIONS = _env_bool("LOG_RAW_LOCATIONS", default=False)
@@ -205,10 +209,10 @@ class RecomputeCompositesRequest(BaseModel):
 
 def _get_optimal_delay(telemetry_stats: Optional[Dict] = None) -> float:
     """
-    Calculate optimal delay between batch requests based on historical performance.
+    Calculate the batch retry backoff base from historical performance.
     
-    Uses telemetry data to determine safe delay that avoids rate limits while
-    maintaining reasonable throughput.
+    Uses telemetry data to determine a safe wait before retrying a failed batch
+    location (admission itself is governed by the upstream token buckets).
     """
     # Base delay: OSM minimum query interval (0.5s) + safety margin
     base_delay = 0.5
@@ -313,27 +317,24 @@ logger.info(f"API Version: {API_VERSION} (auto-generated from scoring file hash)
 
 
 def _load_catalog_index() -> Dict[Tuple[float, float], Dict[str, Any]]:
-    """Load pre-scored catalog JSONL files into a (lat, lon) → score dict at startup."""
+    """Load pre-scored catalogs (columnar store, else JSONL) into a (lat, lon) → score dict at startup."""
     index: Dict[Tuple[float, float], Dict[str, Any]] = {}
     catalog_files = [
         os.path.join(os.path.dirname(__file__), "data", "nyc_metro_place_catalog_scores_merged.jsonl"),
         os.path.join(os.path.dirname(__file__), "data", "la_metro_place_catalog_scores_merged.jsonl"),
     ]
     for path in catalog_files:
-        if not os.path.exists(path):
+        if not os.path.exists(path) and not os.path.exists(catalog_store.store_path_for(path)):
             continue
         try:
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    entry = json.loads(line)
-                    if not entry.get("success") or not entry.get("score"):
-                        continue
-                    cat = entry["catalog"]
-                    key = (round(float(cat["lat"]), 4), round(float(cat["lon"]), 4))
-                    index[key] = entry["score"]
+            for rec in catalog_store.iter_rows(
+                path, columns=("lat", "lon"), where=[("success", "=", 1)], full=True
+            ):
+                score = rec["row"].get("score")
+                if not score or rec["lat"] is None or rec["lon"] is None:
+                    continue
+                key = (round(rec["lat"], 4), round(rec["lon"], 4))
+                index[key] = score
         except Exception as e:
             logger.warning(f"Could not load catalog index from {path}: {e}")
     logger.info(f"Catalog index loaded: {len(index)} entries")
@@ -346,15 +347,79 @@ _CATALOG_INDEX: Dict[Tuple[float, float], Dict[str, Any]] = _load_catalog_index(
 # Shared, cross-user location cache (Redis)
 # Stores a compressed response template keyed by geocoded lat/lon + request options.
 # This is NOT keyed by IP or user identity, so it benefits all users.
-LOCATION_CACHE_TTL_SECONDS = 12 * 3600  # 12 hours
+# Stale-while-revalidate: entries are fresh until the soft TTL; between soft and hard TTL they
+# are served immediately (metadata.stale=True) while a background refresh recomputes them.
+LOCATION_CACHE_TTL_SECONDS = int(os.getenv("HOMEFIT_LOCATION_CACHE_SOFT_TTL_SECONDS", str(12 * 3600)))  # soft TTL, 12 hours
+LOCATION_CACHE_HARD_TTL_SECONDS = int(os.getenv("HOMEFIT_LOCATION_CACHE_HARD_TTL_SECONDS", str(72 * 3600)))
 LOCATION_CACHE_MAX_BYTES = 256_000      # hard cap per entry (base64 text length)
 
 # Shared pre-pillar cache: census_tract, density, arch_diversity, area_type, tree_canopy, form_context.
 # Keyed only by (lat, lon) so any request for the same location reuses expensive pre-pillar work.
 # Used only when only_pillars is None (full score).
-SHARED_PREPILLAR_CACHE_TTL_SECONDS = 12 * 3600  # 12 hours, match location cache
+SHARED_PREPILLAR_CACHE_TTL_SECONDS = int(os.getenv("HOMEFIT_SHARED_PREPILLAR_SOFT_TTL_SECONDS", str(12 * 3600)))  # soft TTL, match location cache
+SHARED_PREPILLAR_CACHE_HARD_TTL_SECONDS = int(os.getenv("HOMEFIT_SHARED_PREPILLAR_HARD_TTL_SECONDS", str(72 * 3600)))
 SHARED_PREPILLAR_CACHE_SCHEMA = 1
 
+_SWR_WRITTEN_AT_FIELD = "_swr_written_at"
+_SWR_REFRESH_LOCK = threading.Lock()
+_SWR_REFRESH_INFLIGHT: Set[str] = set()
+_SWR_REFRESH_MARKER_SECONDS = 600  # cross-replica de-dupe window for one refresh
+
+
+def _swr_stamp(value: Dict[str, Any]) -> Dict[str, Any]:
+    """Shallow copy of a cache value carrying its write time (for soft-TTL checks on read)."""
+    stamped = dict(value)
+    stamped[_SWR_WRITTEN_AT_FIELD] = time.time()
+    return stamped
+
+
+def _swr_age(value: Any) -> Optional[float]:
+    """Pop the write time from a cached value; returns its age in seconds (None if unstamped)."""
+    if not isinstance(value, dict):
+        return None
+    written_at = value.pop(_SWR_WRITTEN_AT_FIELD, None)
+    if not isinstance(written_at, (int, float)):
+        return None
+    return max(0.0, time.time() - float(written_at))
+
+
+def _schedule_swr_refresh(refresh_key: str, **score_kwargs: Any) -> bool:
+    """
+    Recompute a stale location on the score job executor, once per key.
+
+    De-duplicated in-process (in-flight set) and across replicas (Redis NX marker), so a
+    burst of requests for a popular stale location triggers a single recompute.
+    """
+    with _SWR_REFRESH_LOCK:
+        if refresh_key in _SWR_REFRESH_INFLIGHT:
+            return False
+        _SWR_REFRESH_INFLIGHT.add(refresh_key)
+    try:
+        from data_sources.cache import _get_redis_client
+        redis_client = _get_redis_client()
+        if redis_client is not None and not redis_client.set(
+            f"{CACHE_KEY_PREFIX}:swr_refresh:{refresh_key}", "1", nx=True, ex=_SWR_REFRESH_MARKER_SECONDS
+        ):
+            with _SWR_REFRESH_LOCK:
+                _SWR_REFRESH_INFLIGHT.discard(refresh_key)
+            return False
+    except Exception as e:
+        logger.debug(f"SWR refresh marker unavailable (in-process de-dupe only): {e}")
+
+    def _run_refresh() -> None:
+        t0 = time.perf_counter()
+        try:
+            _compute_single_score_internal(cache_refresh=True, **score_kwargs)
+            logger.info(f"[TIMING] swr_refresh {time.perf_counter() - t0:.3f}s")
+        except Exception as e:
+            logger.warning(f"Stale cache refresh failed (entry keeps serving until hard TTL): {e}")
+        finally:
+            with _SWR_REFRESH_LOCK:
+                _SWR_REFRESH_INFLIGHT.discard(refresh_key)
+
+    _SCORE_JOB_EXECUTOR.submit(_run_refresh)
+    return True
+
 
 def parse_priority_allocation(priorities: Optional[Dict[str, str]]) -> Dict[str, float]:
     """
@@ -1147,6 +1212,23 @@ app.add_middleware(
 app.include_router(agent_recommend_router, dependencies=[Depends(require_proxy_auth)])
 
 
+@app.on_event("startup")
+def _start_cache_warmer() -> None:
+    """Off-peak cache warming for catalog/popular places (HOMEFIT_CACHE_WARMER_ENABLED=1)."""
+    try:
+        from cache_warmer import start_background_warmer
+        start_background_warmer()
+    except Exception as e:
+        logger.warning(f"Cache warmer not started: {e}")
+
+
+@app.on_event("shutdown")
+async def _close_http_pools() -> None:
+    """Release pooled upstream connections."""
+    from data_sources import http_client
+    http_client.close_sync_session()
+
+
 @app.get("/")
 def root():
     """Health check endpoint."""
@@ -1404,12 +1486,15 @@ def _compute_single_score_internal(
     trip_type: Optional[str] = None,
     travel_month: Optional[int] = None,
     traveler_profile: Optional[str] = None,
+    cache_refresh: bool = False,
 ) -> Dict[str, Any]:
     """
     Internal function to compute score for a single location.
     Extracted from get_livability_score for reuse in batch processing.
 
     This contains the core scoring logic without FastAPI-specific caching.
+    cache_refresh=True skips the location/pre-pillar cache reads (background
+    stale-while-revalidate recompute) but still writes fresh entries.
     """
     # Determine if school scoring should be enabled for this request (gated)
     use_school_scoring = _is_schools_allowed(request, enable_schools, premium_code=premium_code)
@@ -1568,7 +1653,21 @@ def _compute_single_score_internal(
     # Shared cross-user cache (Redis): return cached response template if available.
     # Vacation mode is allowed: apply vacation weights + only_pillars filter.
     # ------------------------------------------------------------------
-    if not test_mode_enabled and not is_vacation_mode and (only_pillars is None or is_vacation_mode):
+    def _schedule_stale_refresh(refresh_key: str) -> bool:
+        # Full-score recompute with the same cache-key inputs; preferences only affect
+        # allocation, which is re-applied on every cache hit.
+        return _schedule_swr_refresh(
+            refresh_key,
+            location=location,
+            include_chains=include_chains,
+            enable_schools=use_school_scoring,
+            job_categories=job_categories,
+            premium_code=premium_code or (request.headers.get("X-HomeFit-Premium-Code") if request else None),
+            lat_override=lat_override,
+            lon_override=lon_override,
+        )
+
+    if not test_mode_enabled and not cache_refresh and not is_vacation_mode and (only_pillars is None or is_vacation_mode):
         try:
             t_location_cache = time.perf_counter()
             location_cache_key = _generate_location_cache_key(
@@ -1583,6 +1682,7 @@ def _compute_single_score_internal(
             cached_template = redis_get_compressed_json(location_cache_key)
             _log_place_timing("location_cache_read", t_location_cache)
             if isinstance(cached_template, dict) and cached_template.get("livability_pillars"):
+                cache_age = _swr_age(cached_template)
                 cached_template["input"] = location
                 response = _apply_allocation_to_cached_response(
                     cached_template,
@@ -1593,6 +1693,12 @@ def _compute_single_score_internal(
                     natural_beauty_preference=natural_beauty_preference,
                     forced_token_allocation=_vacation_token_alloc,
                 )
+                if cache_age is not None and isinstance(response.get("metadata"), dict):
+                    stale = cache_age > LOCATION_CACHE_TTL_SECONDS
+                    response["metadata"]["stale"] = stale
+                    response["metadata"]["cache_age_seconds"] = int(cache_age)
+                    if stale:
+                        response["metadata"]["refresh_scheduled"] = _schedule_stale_refresh(location_cache_key)
                 _log_place_timing("total", start_perf)
                 return response
         except Exception as e:
@@ -1626,11 +1732,18 @@ def _compute_single_score_internal(
         return name in only_pillars
 
     shared_blob = None
-    if not test_mode_enabled and only_pillars is None:
+    shared_prepillar_stale = False
+    if not test_mode_enabled and not cache_refresh and only_pillars is None:
         try:
             t_shared_read = time.perf_counter()
-            shared_blob = redis_get_compressed_json(_generate_shared_prepillar_cache_key(lat, lon))
+            shared_prepillar_key = _generate_shared_prepillar_cache_key(lat, lon)
+            shared_blob = redis_get_compressed_json(shared_prepillar_key)
             _log_place_timing("shared_prepillar_cache_read", t_shared_read)
+            shared_age = _swr_age(shared_blob)
+            if shared_age is not None and shared_age > SHARED_PREPILLAR_CACHE_TTL_SECONDS:
+                # Use the stale pre-pillar data now; the refresh recomputes it (and the template).
+                shared_prepillar_stale = True
+                _schedule_stale_refresh(shared_prepillar_key)
         except Exception as e:
             logger.warning(f"Shared pre-pillar cache read failed (non-fatal): {e}")
 
@@ -1701,7 +1814,7 @@ def _compute_single_score_internal(
                     return None
 
             # Execute all independent calls truly in parallel (density runs with tract=None internally)
-            with ThreadPoolExecutor(max_workers=6) as executor:
+            with get_pool("prepillar") as executor:
                 future_census_tract = executor.submit(_fetch_census_tract)
                 future_density = executor.submit(_fetch_density, None)
                 future_business_count = executor.submit(_fetch_business_count)
@@ -1795,7 +1908,7 @@ def _compute_single_score_internal(
                     except Exception:
                         return None
 
-                with ThreadPoolExecutor(max_workers=2) as _fc_pool:
+                with get_pool("aux") as _fc_pool:
                     _f_charm = _fc_pool.submit(_fetch_charm)
                     _f_year = _fc_pool.submit(_fetch_year_built)
                     try:
@@ -1846,13 +1959,24 @@ def _compute_single_score_internal(
                 }
                 redis_set_compressed_json(
                     _generate_shared_prepillar_cache_key(lat, lon),
-                    blob,
-                    SHARED_PREPILLAR_CACHE_TTL_SECONDS,
+                    _swr_stamp(blob),
+                    SHARED_PREPILLAR_CACHE_HARD_TTL_SECONDS,
                     max_bytes=LOCATION_CACHE_MAX_BYTES,
                 )
             except Exception as e:
                 logger.debug(f"Shared pre-pillar cache write skipped/failed: {e}")
 
+    # Prefetch every OSM consumer the pillars will call in one or two Overpass union queries.
+    # Runs in the background so non-OSM pillar work starts immediately; OSM consumers wait for it.
+    try:
+        from data_sources import osm_api as _osm_bundle
+        _osm_bundle.prefetch_location_bundle(
+            lat, lon, _osm_bundle.bundle_needs_for(only_pillars),
+            vacation_mode=is_vacation_mode, background=True,
+        )
+    except Exception as e:
+        logger.debug(f"OSM bundle prefetch skipped (non-fatal): {e}")
+
     # Step 2: Calculate all pillar scores in parallel
     logger.debug("Calculating pillar scores in parallel...")
     t_pillars = time.perf_counter()
@@ -2079,7 +2203,7 @@ def _compute_single_score_internal(
                     _score = 0.0
             _pillar_done_notify(name, _score)
     else:
-        with ThreadPoolExecutor(max_workers=8) as executor:
+        with get_pool("pillar") as executor:
             future_to_pillar = {
                 executor.submit(_execute_pillar, name, func, **kwargs): name
                 for name, func, kwargs in pillar_tasks
@@ -2713,14 +2837,16 @@ def _compute_single_score_internal(
             )
             wrote = redis_set_compressed_json(
                 location_cache_key,
-                response,
-                LOCATION_CACHE_TTL_SECONDS,
+                _swr_stamp(response),
+                LOCATION_CACHE_HARD_TTL_SECONDS,
                 max_bytes=LOCATION_CACHE_MAX_BYTES,
             )
             if wrote and isinstance(response.get("metadata"), dict):
                 response["metadata"]["location_cache_write"] = True
         except Exception as e:
             logger.debug(f"Location cache write skipped/failed: {e}")
+    if shared_prepillar_stale and isinstance(response.get("metadata"), dict):
+        response["metadata"]["shared_prepillar_stale"] = True
 
     # Vacation result cache write.
     if not test_mode_enabled and _vacation_cache_key:
@@ -2732,7 +2858,7 @@ def _compute_single_score_internal(
     # Attach climate profile for all score requests.
     try:
         from data_sources.noaa_api import get_climate_profile
-        with ThreadPoolExecutor(max_workers=1) as _noaa_pool:
+        with get_pool("aux") as _noaa_pool:
             _f_noaa = _noaa_pool.submit(get_climate_profile, lat, lon)
             try:
                 climate_profile = _f_noaa.result(timeout=8)
@@ -3424,6 +3550,7 @@ async def _stream_score_with_progress(
                 cached_template = redis_get_compressed_json(location_cache_key)
                 _log_place_timing("location_cache_read", t_location_cache)
                 if isinstance(cached_template, dict) and cached_template.get("livability_pillars"):
+                    cache_age = _swr_age(cached_template)
                     cached_template["input"] = location
                     response = _apply_allocation_to_cached_response(
                         cached_template,
@@ -3433,6 +3560,17 @@ async def _stream_score_with_progress(
                         only_pillars=None,
                         natural_beauty_preference=natural_beauty_preference,
                     )
+                    if cache_age is not None and isinstance(response.get("metadata"), dict):
+                        stale = cache_age > LOCATION_CACHE_TTL_SECONDS
+                        response["metadata"]["stale"] = stale
+                        response["metadata"]["cache_age_seconds"] = int(cache_age)
+                        if stale:
+                            response["metadata"]["refresh_scheduled"] = _schedule_swr_refresh(
+                                location_cache_key,
+                                location=location,
+                                include_chains=include_chains,
+                                enable_schools=use_school_scoring,
+                            )
 
                     # Emit pillar completion events quickly (match existing behavior: omit school pillar when disabled)
                     pillar_order = [
@@ -3598,6 +3736,14 @@ async def _stream_score_with_progress(
                 form_context = None
             _log_place_timing("form_context", t_form)
         
+        try:
+            from data_sources import osm_api as _osm_bundle
+            _osm_bundle.prefetch_location_bundle(
+                lat, lon, _osm_bundle.bundle_needs_for(only_pillars), background=True,
+            )
+        except Exception as e:
+            logger.debug(f"OSM bundle prefetch skipped (non-fatal): {e}")
+
         # Build pillar tasks
         use_school_scoring = enable_schools if enable_schools is not None else ENABLE_SCHOOL_SCORING
         
@@ -3777,7 +3923,7 @@ async def _stream_score_with_progress(
 
             def run_pillars_parallel():
                 try:
-                    with ThreadPoolExecutor(max_workers=8) as executor:
+                    with get_pool("pillar") as executor:
                         future_to_pillar = {
                             executor.submit(_execute_pillar, name, func, **kwargs): name
                             for name, func, kwargs in pillar_tasks
@@ -4400,8 +4546,8 @@ async def _stream_score_with_progress(
                 )
                 wrote = redis_set_compressed_json(
                     location_cache_key,
-                    final_response,
-                    LOCATION_CACHE_TTL_SECONDS,
+                    _swr_stamp(final_response),
+                    LOCATION_CACHE_HARD_TTL_SECONDS,
                     max_bytes=LOCATION_CACHE_MAX_BYTES,
                 )
                 if wrote and isinstance(final_response.get("metadata"), dict):
@@ -4563,21 +4709,99 @@ async def stream_score(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _score_batch_location(
+    location: str,
+    batch_request: BatchLocationRequest,
+    priorities_dict: Optional[Dict],
+    retry_base_wait: float,
+) -> Tuple[BatchLocationResult, bool]:
+    """
+    Score one batch location with per-location retries.
+
+    Never raises; returns (result, rate_limited) so the scheduler can feed 429 signals back
+    into the upstream buckets.
+    """
+    location_start_time = time.time()
+    rate_limited = False
+    retry_count = 0
+    max_location_retries = 2
+    for retry_attempt in range(max_location_retries + 1):
+        try:
+            result = _compute_single_score_internal(
+                location=location,
+                tokens=batch_request.tokens,
+                priorities_dict=priorities_dict,
+                include_chains=batch_request.include_chains,
+                enable_schools=batch_request.enable_schools,
+                test_mode=False,
+                request=None  # No request object for batch processing
+            )
+            if schedule_catalog_contribution:
+                try:
+                    schedule_catalog_contribution(result)
+                except Exception as e:
+                    logger.debug(f"catalog_contribution schedule (batch): {e}")
+            if result.get("rate_limited") or "429" in str(result.get("error", "")):
+                rate_limited = True
+            return BatchLocationResult(
+                location=location,
+                success=True,
+                result=result,
+                response_time=round(time.time() - location_start_time, 2),
+                retry_count=retry_attempt
+            ), rate_limited
+        except HTTPException as e:
+            if e.status_code == 429 or "rate limit" in str(e.detail).lower():
+                rate_limited = True
+                if retry_attempt < max_location_retries:
+                    wait_time = min(retry_base_wait * 2 * (retry_attempt + 1), 15.0)
+                    logger.warning(f"Rate limited for {location}, waiting {wait_time}s before retry {retry_attempt + 1}")
+                    time.sleep(wait_time)
+                    retry_count += 1
+                    continue
+                error_msg = f"Rate limited after {max_location_retries} retries"
+            else:
+                # Other HTTP errors - don't retry
+                error_msg = str(e.detail)
+        except Exception as e:
+            if retry_attempt < max_location_retries:
+                wait_time = retry_base_wait * (retry_attempt + 1)
+                logger.warning(f"Error for {location}: {e}, retrying in {wait_time}s")
+                time.sleep(wait_time)
+                retry_count += 1
+                continue
+            error_msg = str(e)
+        break
+    return BatchLocationResult(
+        location=location,
+        success=False,
+        error=error_msg,
+        response_time=round(time.time() - location_start_time, 2),
+        retry_count=retry_count
+    ), rate_limited
+
+
 def _generate_batch_results(batch_request: BatchLocationRequest):
-    """Generator function that yields batch results incrementally with keep-alive messages."""
+    """
+    Generator that scores batch locations concurrently and yields NDJSON as they complete.
+
+    Up to BATCH_CONCURRENCY locations run at once; the next location is admitted only when
+    every upstream token bucket (data_sources.rate_limits) can afford one location's worth
+    of calls. Result lines carry the location's original 1-based "index" since they arrive
+    in completion order. Keep-alive lines are sent while waiting.
+    """
+    from data_sources import rate_limits
+
     try:
-        # Get telemetry stats for adaptive delay calculation
+        # Telemetry sets the per-location retry backoff
         telemetry_stats = None
         if batch_request.adaptive_delays:
             try:
                 telemetry_stats = get_telemetry_stats()
             except Exception as e:
                 logger.warning(f"Could not fetch telemetry stats: {e}")
-        
-        # Calculate optimal delay based on historical performance
-        base_delay = _get_optimal_delay(telemetry_stats)
-        current_delay = base_delay
-        
+        retry_base_wait = _get_optimal_delay(telemetry_stats)
+
         # Parse priorities if provided
         priorities_dict = None
         if batch_request.priorities:
@@ -4586,230 +4810,129 @@ def _generate_batch_results(batch_request: BatchLocationRequest):
             except Exception as e:
                 logger.warning(f"Could not parse priorities: {e}")
                 priorities_dict = None
-        
-        results = []
+
+        locations = list(batch_request.locations)
+        total = len(locations)
+        concurrency = max(1, min(BATCH_CONCURRENCY, total))
+        costs = rate_limits.location_cost()
+
+        results: List[Optional[BatchLocationResult]] = [None] * total
+        done: "queue.Queue[Tuple[int, Any]]" = queue.Queue()
         total_start_time = time.time()
         consecutive_errors = 0
         rate_limit_detected = False
+        admission_wait_total = 0.0
         last_keepalive = time.time()
         KEEPALIVE_INTERVAL = 25  # Send keep-alive every 25 seconds
-        
-        logger.info(f"Batch request: {len(batch_request.locations)} locations, base delay: {base_delay}s")
-        
+
+        logger.info(f"Batch request: {total} locations, concurrency: {concurrency}")
+
         # Send initial status
-        yield json.dumps({"status": "processing", "total_locations": len(batch_request.locations), "message": "Starting batch processing..."}) + "\n"
-        
-        for i, location in enumerate(batch_request.locations):
-            location_start_time = time.time()
-            retry_count = 0
-            location_success = False
-            
-            # Retry logic for individual locations (max 2 retries with backoff)
-            max_location_retries = 2
-            for retry_attempt in range(max_location_retries + 1):
-                try:
-                    # Call the internal scoring function
-                    result = _compute_single_score_internal(
-                        location=location,
-                        tokens=batch_request.tokens,
-                        priorities_dict=priorities_dict,
-                        include_chains=batch_request.include_chains,
-                        enable_schools=batch_request.enable_schools,
-                        test_mode=False,
-                        request=None  # No request object for batch processing
-                    )
-                    if schedule_catalog_contribution:
-                        try:
-                            schedule_catalog_contribution(result)
-                        except Exception as e:
-                            logger.debug(f"catalog_contribution schedule (batch): {e}")
-
-                    location_time = time.time() - location_start_time
-                    location_success = True
-                    
-                    # Check for rate limit indicators in response
-                    if result.get("rate_limited") or "429" in str(result.get("error", "")):
-                        rate_limit_detected = True
-                        # Increase delay for subsequent requests
-                        current_delay = min(current_delay * 2, 15.0)  # Cap at 15s
-                        logger.warning(f"Rate limit detected for {location}, increasing delay to {current_delay}s")
-                    
-                    logger.info(f"Batch [{i+1}/{len(batch_request.locations)}]: {location} completed in {location_time:.1f}s (retry: {retry_attempt})")
-                    
-                    batch_result = BatchLocationResult(
-                        location=location,
-                        success=True,
-                        result=result,
-                        response_time=round(location_time, 2),
-                        retry_count=retry_attempt
-                    )
-                    results.append(batch_result)
-                    
-                    # Yield result immediately
-                    yield json.dumps({
-                        "type": "result",
-                        "index": i + 1,
-                        "total": len(batch_request.locations),
-                        "result": batch_result.dict()
-                    }) + "\n"
-                    
-                    # Reset consecutive error counter on success
-                    consecutive_errors = 0
-                    
-                    # Gradually reduce delay if no errors (adaptive backoff)
-                    if not rate_limit_detected and current_delay > base_delay:
-                        current_delay = max(base_delay, current_delay * 0.9)
-                    
-                    break  # Success, exit retry loop
-                    
-                except HTTPException as e:
-                    # HTTP exceptions (like 429) - retry with backoff
-                    if e.status_code == 429 or "rate limit" in str(e.detail).lower():
-                        rate_limit_detected = True
-                        current_delay = min(current_delay * 2, 15.0)
-                        
-                        if retry_attempt < max_location_retries:
-                            wait_time = current_delay * (retry_attempt + 1)
-                            logger.warning(f"Rate limited for {location}, waiting {wait_time}s before retry {retry_attempt + 1}")
-                            time.sleep(wait_time)
-                            retry_count += 1
-                            continue
-                        else:
-                            # Max retries reached
-                            location_time = time.time() - location_start_time
-                            error_msg = f"Rate limited after {max_location_retries} retries"
-                            logger.error(f"Batch [{i+1}/{len(batch_request.locations)}]: {location} failed: {error_msg}")
-                            batch_result = BatchLocationResult(
-                                location=location,
-                                success=False,
-                                error=error_msg,
-                                response_time=round(location_time, 2),
-                                retry_count=retry_count
-                            )
-                            results.append(batch_result)
-                            yield json.dumps({
-                                "type": "result",
-                                "index": i + 1,
-                                "total": len(batch_request.locations),
-                                "result": batch_result.dict()
-                            }) + "\n"
-                            consecutive_errors += 1
-                            break
-                    else:
-                        # Other HTTP errors - don't retry
-                        location_time = time.time() - location_start_time
-                        error_msg = str(e.detail)
-                        logger.error(f"Batch [{i+1}/{len(batch_request.locations)}]: {location} failed: {error_msg}")
-                        batch_result = BatchLocationResult(
-                            location=location,
-                            success=False,
-                            error=error_msg,
-                            response_time=round(location_time, 2),
-                            retry_count=retry_count
-                        )
-                        results.append(batch_result)
-                        yield json.dumps({
-                            "type": "result",
-                            "index": i + 1,
-                            "total": len(batch_request.locations),
-                            "result": batch_result.dict()
-                        }) + "\n"
-                        consecutive_errors += 1
-                        break
-                        
-                except Exception as e:
-                    # Other exceptions - retry once with backoff
-                    if retry_attempt < max_location_retries:
-                        wait_time = base_delay * (retry_attempt + 1)
-                        logger.warning(f"Error for {location}: {e}, retrying in {wait_time}s")
-                        time.sleep(wait_time)
-                        retry_count += 1
-                        continue
-                    else:
-                        # Max retries reached
-                        location_time = time.time() - location_start_time
-                        error_msg = str(e)
-                        logger.error(f"Batch [{i+1}/{len(batch_request.locations)}]: {location} failed after {max_location_retries} retries: {error_msg}")
-                        batch_result = BatchLocationResult(
-                            location=location,
-                            success=False,
-                            error=error_msg,
-                            response_time=round(location_time, 2),
-                            retry_count=retry_count
-                        )
-                        results.append(batch_result)
-                        yield json.dumps({
-                            "type": "result",
-                            "index": i + 1,
-                            "total": len(batch_request.locations),
-                            "result": batch_result.dict()
-                        }) + "\n"
-                        consecutive_errors += 1
+        yield json.dumps({"status": "processing", "total_locations": total, "concurrency": concurrency, "message": "Starting batch processing..."}) + "\n"
+
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch-score")
+        next_index = 0
+        in_flight = 0
+        completed = 0
+        try:
+            while completed < total:
+                # Admit as many locations as concurrency and upstream budgets allow
+                wait = float(KEEPALIVE_INTERVAL)
+                while next_index < total and in_flight < concurrency:
+                    admit_wait = rate_limits.try_admit(costs)
+                    if admit_wait > 0:
+                        wait = min(wait, admit_wait)
                         break
-            
-            # Adaptive delay adjustment based on consecutive errors
-            if consecutive_errors >= 3:
-                # Multiple consecutive errors - significantly increase delay
-                current_delay = min(current_delay * 1.5, 20.0)
-                logger.warning(f"Multiple consecutive errors detected, increasing delay to {current_delay}s")
-            elif consecutive_errors > 0:
-                # Some errors - moderate increase
-                current_delay = min(current_delay * 1.2, 10.0)
-            
-            # Wait before next request (except for last one)
-            if i < len(batch_request.locations) - 1:
-                # Use current_delay (which may have been adjusted)
-                # Send keep-alive messages during long waits
+                    future = executor.submit(
+                        _score_batch_location, locations[next_index], batch_request, priorities_dict, retry_base_wait
+                    )
+                    future.add_done_callback(lambda f, idx=next_index: done.put((idx, f)))
+                    next_index += 1
+                    in_flight += 1
+
                 wait_start = time.time()
-                while time.time() - wait_start < current_delay:
-                    elapsed = time.time() - wait_start
-                    remaining = current_delay - elapsed
-                    sleep_time = min(remaining, KEEPALIVE_INTERVAL)
-                    time.sleep(sleep_time)
-                    
-                    # Send keep-alive if needed
+                try:
+                    idx, future = done.get(timeout=max(0.05, wait))
+                except queue.Empty:
+                    if in_flight == 0:
+                        admission_wait_total += time.time() - wait_start
                     if time.time() - last_keepalive >= KEEPALIVE_INTERVAL:
                         yield json.dumps({
                             "type": "keepalive",
-                            "message": f"Processing... {i+1}/{len(batch_request.locations)} locations completed",
+                            "message": f"Processing... {completed}/{total} locations completed",
                             "elapsed_seconds": round(time.time() - total_start_time, 1)
                         }) + "\n"
                         last_keepalive = time.time()
-        
+                    continue
+
+                in_flight -= 1
+                completed += 1
+                batch_result, location_rate_limited = future.result()
+                results[idx] = batch_result
+
+                if location_rate_limited:
+                    rate_limit_detected = True
+                    if batch_request.adaptive_delays:
+                        # OSM helpers are the ones that surface rate_limited on results
+                        rate_limits.penalize("overpass" if batch_result.success else None)
+                elif batch_result.success and batch_request.adaptive_delays:
+                    rate_limits.relax_all()
+
+                if batch_result.success:
+                    consecutive_errors = 0
+                    logger.info(f"Batch [{idx+1}/{total}]: {batch_result.location} completed in {batch_result.response_time:.1f}s (retry: {batch_result.retry_count})")
+                else:
+                    consecutive_errors += 1
+                    logger.error(f"Batch [{idx+1}/{total}]: {batch_result.location} failed: {batch_result.error}")
+                    if consecutive_errors >= 3 and batch_request.adaptive_delays:
+                        # Several failures in a row usually means an upstream is throttling us
+                        rate_limits.penalize(factor=0.75)
+
+                # Yield result immediately (completion order, original index)
+                yield json.dumps({
+                    "type": "result",
+                    "index": idx + 1,
+                    "total": total,
+                    "result": batch_result.dict()
+                }) + "\n"
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
         total_time = time.time() - total_start_time
-        successful = sum(1 for r in results if r.success)
-        failed = len(results) - successful
-        
+        finished = [r for r in results if r is not None]
+        successful = sum(1 for r in finished if r.success)
+        failed = len(finished) - successful
+
         # Calculate performance metrics
-        successful_results = [r for r in results if r.success]
+        successful_results = [r for r in finished if r.success]
         avg_response_time = sum(r.response_time for r in successful_results) / len(successful_results) if successful_results else 0
-        total_retries = sum(r.retry_count for r in results)
-        
-        logger.info(f"Batch completed: {successful}/{len(batch_request.locations)} successful in {total_time:.1f}s (avg: {avg_response_time:.1f}s, retries: {total_retries})")
-        
+        total_retries = sum(r.retry_count for r in finished)
+
+        logger.info(f"Batch completed: {successful}/{total} successful in {total_time:.1f}s (avg: {avg_response_time:.1f}s, retries: {total_retries}, concurrency: {concurrency})")
+
         # Yield final summary
         final_response = {
             "type": "complete",
             "batch_summary": {
-                "batch_size": len(batch_request.locations),
+                "batch_size": total,
                 "successful": successful,
                 "failed": failed,
-                "success_rate": round((successful / len(batch_request.locations)) * 100, 1) if batch_request.locations else 0,
+                "success_rate": round((successful / total) * 100, 1) if total else 0,
                 "total_time_seconds": round(total_time, 2),
                 "average_response_time": round(avg_response_time, 2),
                 "total_retries": total_retries,
-                "base_delay_used": base_delay,
-                "final_delay_used": round(current_delay, 2)
+                "concurrency": concurrency,
+                "admission_wait_seconds": round(admission_wait_total, 2)
             },
             "performance_insights": {
                 "rate_limits_detected": rate_limit_detected,
-                "adaptive_delay_adjustments": current_delay != base_delay,
-                "consecutive_errors": consecutive_errors
+                "consecutive_errors": consecutive_errors,
+                "upstream_budgets": rate_limits.stats()
             },
-            "results": [r.dict() for r in results]
+            "results": [r.dict() for r in finished]
         }
         yield json.dumps(final_response) + "\n"
-        
+
     except Exception as e:
         error_msg = f"Batch processing failed: {str(e)}"
         logger.error(f"Unhandled exception in batch generator: {e}", exc_info=True)
@@ -4821,9 +4944,10 @@ def batch_livability_scores(request: Request, batch_request: BatchLocationReques
     """
     Calculate livability scores for multiple locations in a batch.
     
-    Uses historical performance data to optimize delays and error handling.
-    Processes locations sequentially to avoid rate limits.
-    Returns streaming results to prevent client timeouts.
+    Scores up to BATCH_CONCURRENCY locations concurrently; each location is admitted
+    only when the per-upstream token buckets (Overpass, Census, GEE, Google Places,
+    Transitland) have budget for it. Results stream in completion order, each tagged
+    with the location's original 1-based index.
     
     Parameters:
         locations: List of addresses or ZIP codes (server-capped)
@@ -4832,7 +4956,7 @@ def batch_livability_scores(request: Request, batch_request: BatchLocationReques
         include_chains: Include chain/franchise businesses (default: True)
         enable_schools: Enable school scoring (default: uses global flag)
         max_batch_size: Deprecated client hint (ignored; server uses MAX_BATCH_SIZE)
-        adaptive_delays: Use telemetry to adjust delays (default: True)
+        adaptive_delays: Use telemetry for retry backoff and scale upstream budgets on 429s (default: True)
     
     Returns:
         Streaming JSON with results for each location, including performance metrics.
@@ -5583,6 +5707,15 @@ def cache_stats_endpoint():
         raise HTTPException(status_code=500, detail=f"Cache stats failed: {e}")
 
 
+@app.get("/pools/stats", dependencies=[Depends(require_proxy_auth)])
+def pool_stats_endpoint():
+    """Shared fan-out pool stats: queue depth, active workers, queue wait, inline runs."""
+    return {
+        "status": "success",
+        "pools": get_pool_stats()
+    }
+
+
 @app.get("/telemetry", dependencies=[Depends(require_proxy_auth)])
 def telemetry_endpoint():
     """Get telemetry and analytics data."""
@@ -4,10 +4,14 @@ Scores access to airports for air travel
 """
 
 import json
-import math
+from functools import lru_cache
 from typing import Dict, Tuple, List, Optional
 from data_sources.data_quality import assess_pillar_data_quality
 from data_sources.regional_baselines import get_area_classification, get_contextual_expectations
+from data_sources.utils import SphereIndex
+from logging_config import get_logger
+
+logger = get_logger(__name__)
 
 # Load comprehensive airport database
 def _load_airport_database() -> List[Dict]:
@@ -22,13 +26,13 @@ def _load_airport_database() -> List[Dict]:
         with open(airport_file, 'r') as f:
             data = json.load(f)
             airports = data.get('airports', [])
-            print(f"✅ Loaded {len(airports)} airports from {airport_file}")
+            logger.debug("Loaded %d airports from %s", len(airports), airport_file)
             return airports
     except FileNotFoundError:
-        print(f"⚠️  Airport database not found at {airport_file}, using fallback")
+        logger.warning("Airport database not found at %s, using fallback", airport_file)
         return []
     except Exception as e:
-        print(f"⚠️  Error loading airport database: {e}, using fallback")
+        logger.warning("Error loading airport database: %s, using fallback", e)
         return []
 
 # Load airports on module import
@@ -111,6 +115,31 @@ MAJOR_AIRPORTS = [
 ]
 
 
+@lru_cache(maxsize=1)
+def _airport_index() -> Tuple[List[Dict], SphereIndex]:
+    """Airport rows (comprehensive database, else legacy list) and their spatial index."""
+    airports = []
+    # Use comprehensive database if available, otherwise fallback to legacy
+    for airport in AIRPORT_DATABASE if AIRPORT_DATABASE else MAJOR_AIRPORTS:
+        if isinstance(airport, dict):
+            # New format from JSON
+            airports.append({
+                "code": airport.get('code'),
+                "name": airport.get('name'),
+                "type": airport.get('type'),
+                "lat": airport.get('lat'),
+                "lon": airport.get('lon'),
+                "service_level": airport.get('service_level', 'unknown'),
+            })
+        else:
+            # Legacy format
+            code, name, apt_lat, apt_lon, apt_type = airport
+            airports.append({"code": code, "name": name, "type": apt_type, "lat": apt_lat, "lon": apt_lon,
+                             "service_level": 'unknown'})
+    # Airports missing coordinates are skipped by the index
+    return airports, SphereIndex([a["lat"] for a in airports], [a["lon"] for a in airports])
+
+
 def get_air_travel_score(lat: float, lon: float, area_type: Optional[str] = None,
                          density: Optional[float] = None) -> Tuple[float, Dict]:
     """
@@ -157,38 +186,20 @@ def get_air_travel_score(lat: float, lon: float, area_type: Optional[str] = None
     # Locations 100-150km away get reduced scores to avoid hard cutoff
     airports_with_distance = []
     
-    # Use comprehensive database if available, otherwise fallback to legacy
-    airport_list = AIRPORT_DATABASE if AIRPORT_DATABASE else MAJOR_AIRPORTS
-    
-    for airport in airport_list:
-        if isinstance(airport, dict):
-            # New format from JSON
-            apt_lat = airport.get('lat')
-            apt_lon = airport.get('lon')
-            code = airport.get('code')
-            name = airport.get('name')
-            apt_type = airport.get('type')
-        else:
-            # Legacy format
-            code, name, apt_lat, apt_lon, apt_type = airport
-        
-        # Skip if coordinates are missing
-        if apt_lat is None or apt_lon is None:
-            continue
-        
-        distance_km = _haversine_distance(lat, lon, apt_lat, apt_lon) / 1000
-        
-        # Include airports within 150km (extended range for smoother distribution)
-        if distance_km <= 150:
-            airports_with_distance.append({
-                "code": code,
-                "name": name,
-                "type": apt_type,
-                "distance_km": round(distance_km, 1),
-                "lat": apt_lat,
-                "lon": apt_lon,
-                "service_level": airport.get('service_level', 'unknown') if isinstance(airport, dict) else 'unknown'
-            })
+    # Include airports within 150km (extended range for smoother distribution)
+    airports, index = _airport_index()
+    for i, distance_m in index.within(lat, lon, 150_000):
+        airport = airports[i]
+        distance_km = distance_m / 1000
+        airports_with_distance.append({
+            "code": airport["code"],
+            "name": airport["name"],
+            "type": airport["type"],
+            "distance_km": round(distance_km, 1),
+            "lat": airport["lat"],
+            "lon": airport["lon"],
+            "service_level": airport["service_level"]
+        })
 
     # Sort by distance
     airports_with_distance.sort(key=lambda x: x["distance_km"])
@@ -324,21 +335,6 @@ def _calculate_multi_airport_score(
     return round(min(100.0, final_score), 1), primary_airport, airport_category
 
 
-def _haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate distance between two points in meters."""
-    R = 6371000  # Earth radius in meters
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lon2 - lon1)
-
-    a = math.sin(delta_phi/2)**2 + math.cos(phi1) * \
-        math.cos(phi2) * math.sin(delta_lambda/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-
-    return R * c
-
-
 def _build_summary(nearest_large: Optional[Dict], nearest_medium: Optional[Dict], score: float) -> Dict:
     """Build summary of airport access."""
     summary = {
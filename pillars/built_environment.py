@@ -6,13 +6,13 @@ from __future__ import annotations
 
 import math
 import os
-from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 
 from logging_config import get_logger
 
 from data_sources import osm_api
 from data_sources.data_quality import assess_pillar_data_quality, get_effective_area_type
+from data_sources.executors import get_pool
 from data_sources.radius_profiles import get_radius_profile
 from pillars.beauty_common import BUILT_ENHANCER_CAP, normalize_beauty_score
 
@@ -83,7 +83,7 @@ def _fetch_historic_data(lat: float, lon: float, radius_m: int = 1000) -> Dict:
             logger.warning("NRHP lookup failed for %s, %s: %s", lat, lon, exc)
             return {}
 
-    with ThreadPoolExecutor(max_workers=3) as executor:
+    with get_pool("upstream") as executor:
         f_year = executor.submit(_year_built)
         f_charm = executor.submit(_charm)
         f_nrhp = executor.submit(_nrhp)
@@ -8,7 +8,6 @@ All sub-scores are inverse: higher raw value = worse; pillar score 0 = very high
 100 = very low risk.
 """
 
-from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Tuple, Optional
 
 from data_sources.gee_api import (
@@ -18,6 +17,7 @@ from data_sources.gee_api import (
     GEE_AVAILABLE,
 )
 from data_sources.fema_flood import get_fema_flood_zone
+from data_sources.executors import get_pool
 from data_sources.data_quality import assess_pillar_data_quality, detect_area_type
 from logging_config import get_logger
 
@@ -57,7 +57,7 @@ def get_climate_risk_score(
         Score is inverse risk: 100 = very low risk, 0 = very high risk.
     """
     # Fetch all four data sources in parallel (same requests, less wall time; no extra error risk).
-    with ThreadPoolExecutor(max_workers=4) as executor:
+    with get_pool("upstream") as executor:
         f_heat = executor.submit(get_heat_exposure_lst, lat, lon)
         f_air = executor.submit(get_air_quality_aer_ai, lat, lon)
         f_flood = executor.submit(get_fema_flood_zone, lat, lon)
@@ -30,6 +30,7 @@ from data_sources.regional_baselines import get_contextual_expectations, get_are
 from data_sources.radius_profiles import get_radius_profile
 from data_sources.places_healthcare_client import maybe_augment_healthcare_with_places
 from data_sources.npi_specialty_client import get_specialty_count as _npi_specialty_count, state_from_latlon as _state_from_latlon
+from data_sources.utils import SphereIndex
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -379,6 +380,10 @@ MAJOR_URGENT_CARE_CHAINS = [
     ("MedExpress Boulder", 40.0153, -105.2703, "urgent_care"),
 ]
 
+# Spatial indexes over the static tables above (KD-tree built on first query)
+_HOSPITAL_INDEX = SphereIndex([h[1] for h in MAJOR_HOSPITALS], [h[2] for h in MAJOR_HOSPITALS])
+_URGENT_CARE_INDEX = SphereIndex([u[1] for u in MAJOR_URGENT_CARE_CHAINS], [u[2] for u in MAJOR_URGENT_CARE_CHAINS])
+
 
 def _get_fallback_urgent_care(lat: float, lon: float) -> List[Dict]:
     """
@@ -386,16 +391,13 @@ def _get_fallback_urgent_care(lat: float, lon: float) -> List[Dict]:
     """
     urgent_care_facilities = []
     
-    for name, facility_lat, facility_lon, facility_type in MAJOR_URGENT_CARE_CHAINS:
-        distance_km = _haversine_distance(lat, lon, facility_lat, facility_lon)
-        
-        # Only include facilities within 10km
-        if distance_km <= 10000:
-            urgent_care_facilities.append({
-                "name": name,
-                "distance_km": round(distance_km / 1000.0, 1),  # Convert to km
-                "source": "fallback_database"
-            })
+    # Only include facilities within 10km
+    for i, distance_m in _URGENT_CARE_INDEX.within(lat, lon, 10000):
+        urgent_care_facilities.append({
+            "name": MAJOR_URGENT_CARE_CHAINS[i][0],
+            "distance_km": round(distance_m / 1000.0, 1),  # Convert to km
+            "source": "fallback_database"
+        })
     
     return urgent_care_facilities
 
@@ -416,22 +418,19 @@ def _get_fallback_hospitals(lat: float, lon: float, max_distance_km: float = 60.
     """
     hospitals = []
     
-    for name, hosp_lat, hosp_lon, size in MAJOR_HOSPITALS:
-        distance_m = _haversine_distance(lat, lon, hosp_lat, hosp_lon)
-        distance_km = distance_m / 1000.0
-        
-        # Only include hospitals within max_distance_km
-        if distance_km <= max_distance_km:
-            hospitals.append({
-                "name": name,
-                "distance_km": round(distance_km, 1),
-                "size": size,
-                "source": "major_hospitals_database",
-                "tags": {
-                    "emergency": "yes",  # Major hospitals typically have ER
-                    "healthcare": "hospital"
-                }
-            })
+    # Only include hospitals within max_distance_km
+    for i, distance_m in _HOSPITAL_INDEX.within(lat, lon, max_distance_km * 1000.0):
+        name, _hosp_lat, _hosp_lon, size = MAJOR_HOSPITALS[i]
+        hospitals.append({
+            "name": name,
+            "distance_km": round(distance_m / 1000.0, 1),
+            "size": size,
+            "source": "major_hospitals_database",
+            "tags": {
+                "emergency": "yes",  # Major hospitals typically have ER
+                "healthcare": "hospital"
+            }
+        })
     
     return hospitals
 
@@ -963,22 +962,18 @@ def _score_hospitals(lat: float, lon: float) -> Tuple[float, Optional[Dict]]:
     """
     Score hospital access (0-40 points) based on distance to nearest major hospital.
     """
-    nearest = None
-    min_distance = float('inf')
-
-    for name, hosp_lat, hosp_lon, size in MAJOR_HOSPITALS:
-        distance_km = _haversine_distance(lat, lon, hosp_lat, hosp_lon)
-        if distance_km < min_distance:
-            min_distance = distance_km
-            nearest = {
-                "name": name,
-                "distance_km": round(distance_km / 1000, 1),
-                "size": size
-            }
-
-    if not nearest:
+    found = _HOSPITAL_INDEX.nearest(lat, lon)
+    if not found:
         return 0.0, None
 
+    i, distance_m = found[0]
+    name, _hosp_lat, _hosp_lon, size = MAJOR_HOSPITALS[i]
+    nearest = {
+        "name": name,
+        "distance_km": round(distance_m / 1000, 1),
+        "size": size
+    }
+
     dist_km = nearest["distance_km"]
 
     # Scoring based on distance
@@ -1137,21 +1132,6 @@ def _score_clinics(clinics: List[Dict]) -> float:
         return 0.0
 
 
-def _haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate distance between two points in meters."""
-    R = 6371000
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lon2 - lon1)
-
-    a = math.sin(delta_phi/2)**2 + math.cos(phi1) * \
-        math.cos(phi2) * math.sin(delta_lambda/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-
-    return R * c
-
-
 def _with_numeric_distance(features: List[Dict]) -> List[Dict]:
     """Return only features that have a numeric distance_km value."""
     return [f for f in features if isinstance(f.get("distance_km"), (int, float))]
@@ -5,13 +5,14 @@ Natural Beauty pillar implementation (trees, scenic context, and enhancers).
 from __future__ import annotations
 
 import math
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 from typing import Dict, List, Optional, Tuple
 
 from logging_config import get_logger
 
 from data_sources import osm_api
 from data_sources.data_quality import assess_pillar_data_quality
+from data_sources.executors import get_pool
 from data_sources.radius_profiles import get_radius_profile
 from pillars.beauty_common import NATURAL_ENHANCER_CAP, normalize_beauty_score
 
@@ -1693,7 +1694,7 @@ def _score_trees(lat: float, lon: float, city: Optional[str], location_scope: Op
                     logger.warning("Prefetch GVI failed: %s", _e)
                     return None
 
-            with ThreadPoolExecutor(max_workers=6) as _pre_pool:
+            with get_pool("upstream") as _pre_pool:
                 _rad_futs = {_pre_pool.submit(_prefetch_rad, lbl, rad): lbl for lbl, rad in MULTI_RADIUS_CANOPY.items()}
                 _f_cen = _pre_pool.submit(_prefetch_census_fn)
                 _f_gvi = _pre_pool.submit(_prefetch_gvi_fn)
@@ -1791,7 +1792,7 @@ def _score_trees(lat: float, lon: float, city: Optional[str], location_scope: Op
                     return None
 
             if radii_to_fetch or _need_census or _need_gvi:
-                with ThreadPoolExecutor(max_workers=6) as executor:
+                with get_pool("upstream") as executor:
                     canopy_futures = {
                         executor.submit(_fetch_rad, label, rad): label
                         for label, rad in radii_to_fetch
@@ -2065,7 +2066,7 @@ def _score_trees(lat: float, lon: float, city: Optional[str], location_scope: Op
     landcover_metrics: Optional[Dict] = None
     water_proximity_data: Optional[Dict] = None
     
-    with ThreadPoolExecutor(max_workers=3) as executor:
+    with get_pool("upstream") as executor:
         futures = {}
         
         # Submit topography call
@@ -8,7 +8,7 @@ import requests
 import math
 from typing import Dict, Tuple, List, Optional
 from dotenv import load_dotenv
-from data_sources import data_quality
+from data_sources import data_quality, gtfs_store
 from data_sources.data_quality import get_baseline_context
 from data_sources.radius_profiles import get_radius_profile
 from data_sources.transitland_api import get_nearby_transit_stops
@@ -1116,6 +1116,15 @@ def get_public_transit_score(
                         stops = stops_data.get("stops", []) or stops_data.get("items", []) or []
                         # Find a heavy rail stop (route_type 2 = commuter rail)
                         heavy_rail_stop = None
+                        # Local GTFS stops: nearest stop whose frequency index row shows commuter
+                        # rail (route_type 2) service; subway-only stations (type 1) do not count.
+                        local_service = None
+                        local_rows = gtfs_store.stop_frequency([s.get("id") for s in stops[:10]])
+                        for stop in stops[:10]:
+                            row = local_rows.get(stop.get("id"))
+                            if row and row["route_type_mix"].get(2):
+                                heavy_rail_stop, local_service = stop["id"], row
+                                break
                         for stop in stops[:10]:  # Check first 10 stops
                             # For now, use first heavy rail stop as proxy
                             # TODO: Match stop to route more accurately
@@ -1126,30 +1135,36 @@ def get_public_transit_score(
                                     break
                         
                         if heavy_rail_stop:
-                            # PERFORMANCE OPTIMIZATION: Parallelize API calls and reuse departures
-                            from concurrent.futures import ThreadPoolExecutor
-                            
-                            # Find next Saturday for weekend schedule
-                            today = datetime.now()
-                            days_until_saturday = (5 - today.weekday()) % 7
-                            if days_until_saturday == 0:
-                                days_until_saturday = 7  # Next Saturday
-                            saturday = today + timedelta(days=days_until_saturday)
-                            saturday_str = saturday.strftime('%Y-%m-%d')
-                            
-                            # Parallelize weekday schedule and weekend departures
-                            def fetch_weekday_schedule():
-                                return get_route_schedules(route_id, sample_stop_id=heavy_rail_stop)
-                            
-                            def fetch_weekend_departures():
-                                return get_stop_departures(heavy_rail_stop, limit=200, service_date=saturday_str)
-                            
-                            with ThreadPoolExecutor(max_workers=2) as executor:
-                                future_schedule = executor.submit(fetch_weekday_schedule)
-                                future_weekend = executor.submit(fetch_weekend_departures)
+                            if local_service is not None or gtfs_store.owns(heavy_rail_stop):
+                                # Precomputed frequency index row: no schedule or departures calls
+                                schedule = local_service or gtfs_store.stop_schedule(heavy_rail_stop)
+                                weekend_trips = (schedule or {}).get("weekend_trips")
+                            else:
+                                # PERFORMANCE OPTIMIZATION: Parallelize API calls and reuse departures
+                                from data_sources.executors import get_pool
+                                
+                                # Find next Saturday for weekend schedule
+                                today = datetime.now()
+                                days_until_saturday = (5 - today.weekday()) % 7
+                                if days_until_saturday == 0:
+                                    days_until_saturday = 7  # Next Saturday
+                                saturday = today + timedelta(days=days_until_saturday)
+                                saturday_str = saturday.strftime('%Y-%m-%d')
+                                
+                                # Parallelize weekday schedule and weekend departures
+                                def fetch_weekday_schedule():
+                                    return get_route_schedules(route_id, sample_stop_id=heavy_rail_stop)
+                                
+                                def fetch_weekend_departures():
+                                    return get_stop_departures(heavy_rail_stop, limit=200, service_date=saturday_str)
                                 
-                                schedule = future_schedule.result()
-                                weekend_departures = future_weekend.result()
+                                with get_pool("upstream") as executor:
+                                    future_schedule = executor.submit(fetch_weekday_schedule)
+                                    future_weekend = executor.submit(fetch_weekend_departures)
+                                    
+                                    schedule = future_schedule.result()
+                                    weekend_departures = future_weekend.result()
+                                weekend_trips = len(weekend_departures) if weekend_departures else None
                             
                             # Process weekday schedule (reuse departures from schedule to avoid redundant API call)
                             if schedule:
@@ -1170,6 +1185,9 @@ def get_public_transit_score(
                                 
                                 # PERFORMANCE OPTIMIZATION: Reuse departures from schedule instead of calling API again
                                 weekday_departures = schedule.get("departures")
+                                for headsign in schedule.get("headsigns") or []:
+                                    if headsign not in trip_headsigns:
+                                        trip_headsigns.append(headsign)
                                 if weekday_departures:
                                     for dep in weekday_departures:
                                         trip = dep.get("trip", {})
@@ -1178,9 +1196,8 @@ def get_public_transit_score(
                                             trip_headsigns.append(headsign)
                             
                             # Process weekend schedule
-                            if weekend_departures:
-                                weekend_trips = len(weekend_departures)
-                                if weekday_trips and weekend_trips:
+                            if weekend_trips:
+                                if weekday_trips:
                                     weekend_bonus = _calculate_weekend_service_bonus(weekend_trips, weekday_trips)
                                     if weekend_bonus > 0:
                                         logger.info(f"📊 Weekend service bonus: {weekend_bonus:.1f} points (weekend={weekend_trips}, weekday={weekday_trips})",
@@ -1207,7 +1224,8 @@ def get_public_transit_score(
                                                     })
                                     
                                     # Calculate destination diversity bonus
-                                    unique_destinations = len(trip_headsigns)
+                                    # (terminal stations from the frequency index when available)
+                                    unique_destinations = len((schedule or {}).get("destinations") or []) or len(trip_headsigns)
                                     destination_bonus = _calculate_destination_diversity_bonus(unique_destinations)
                                     if destination_bonus > 0:
                                         logger.info(f"📊 Destination diversity bonus: {destination_bonus:.1f} points ({unique_destinations} destinations)",
@@ -1494,6 +1512,18 @@ def _get_nearby_routes(lat: float, lon: float, radius_m: int = 1500) -> List[Dic
     
     Returns list of routes with their types and distances.
     """
+    local_routes = gtfs_store.nearby_routes(lat, lon, radius_m, limit=500)
+    if local_routes is not None:
+        logger.info(f"ℹ️  Found {len(local_routes)} transit routes in local GTFS store (radius={radius_m}m)", extra={
+            "pillar_name": "public_transit_access",
+            "lat": lat,
+            "lon": lon,
+            "api_name": "gtfs_local",
+            "processed_routes": len(local_routes),
+            "radius_m": radius_m
+        })
+        return local_routes
+    
     if not TRANSITLAND_API_KEY:
         logger.warning("⚠️  TRANSITLAND_API_KEY not found in .env", extra={
             "pillar_name": "public_transit_access",
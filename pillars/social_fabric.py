@@ -19,7 +19,6 @@ import json
 import math
 import os
 import time
-from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional, Tuple
 
 from data_sources import census_api, data_quality, osm_api
@@ -29,6 +28,7 @@ from data_sources import social_capital_cohesion
 from data_sources.places_social_fabric_client import maybe_augment_civic_nodes_with_places
 from data_sources import social_fabric_bands
 from data_sources.us_census_divisions import get_division
+from data_sources.executors import get_pool
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -318,7 +318,7 @@ def get_social_fabric_score(
             lat, lon, tract=tract, division_code=division_code, area_type=area_type, counts_mode="auto"
         )
 
-    with ThreadPoolExecutor(max_workers=5) as executor:
+    with get_pool("upstream") as executor:
         f_m = executor.submit(_get_mobility)
         f_p = executor.submit(_get_place_same_house)
         f_lt = executor.submit(_get_tract_long_tenure)
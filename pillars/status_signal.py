@@ -692,8 +692,8 @@ _S2401_MGMT_LEGAL_HEALTH_INDICES = (1, 5, 7)
 
 def _fetch_s2401_occupation_shares(tract: Optional[Dict[str, Any]]) -> Optional[Dict[str, float]]:
     """Fetch S2401 at tract level. Returns white_collar_pct and management_legal_healthcare_pct (Management+Legal+Healthcare)."""
-    from data_sources.census_api import CENSUS_API_KEY, CENSUS_BASE_URL, _make_request_with_retry
-    if not tract or not CENSUS_API_KEY:
+    from data_sources.census_api import CENSUS_API_KEY, CENSUS_BASE_URL, _make_request_with_retry, acs_available
+    if not tract or not acs_available():
         return None
     state_fips = tract.get("state_fips")
     county_fips = tract.get("county_fips")
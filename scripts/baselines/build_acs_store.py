@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Build the local bulk ACS store for data_sources/acs_store.py.
+
+Downloads every ACS 5-year variable the pillars request (detailed, profile and subject
+tables) once per geography level and writes one Arrow file keyed by GEOID, so scoring and
+the status signal / social fabric rescoring scripts read ACS from disk.
+
+Usage (from project root; a CENSUS_API_KEY is strongly recommended for the request volume):
+
+  PYTHONPATH=. python3 scripts/baselines/build_acs_store.py --year 2022
+  PYTHONPATH=. python3 scripts/baselines/build_acs_store.py --year 2022 --states 36,34,09 \\
+      --levels tract,place,county,cbsa
+
+Extra variables (one per line, e.g. a new DP04 field) can be added with --variables-file;
+requests for variables or vintages the store lacks still go to api.census.gov.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CENSUS_API_KEY = os.getenv("CENSUS_API_KEY")
+CENSUS_BASE_URL = "https://api.census.gov/data"
+CBSA_GEO = "metropolitan statistical area/micropolitan statistical area"
+ZCTA_GEO = "zip code tabulation area"
+
+# Census API caps a request at 50 variables (NAME included).
+_VARS_PER_REQUEST = 48
+
+STATE_FIPS = [
+    "01", "02", "04", "05", "06", "08", "09", "10", "11", "12", "13", "15", "16", "17", "18", "19",
+    "20", "21", "22", "23", "24", "25", "26", "27", "28", "29", "30", "31", "32", "33", "34", "35",
+    "36", "37", "38", "39", "40", "41", "42", "44", "45", "46", "47", "48", "49", "50", "51", "53",
+    "54", "55", "56", "72",
+]
+
+
+def _series(table: str, numbers: Iterable[int], suffix: str = "E") -> List[str]:
+    return [f"{table}_{n:03d}{suffix}" for n in numbers]
+
+
+# Variables requested by census_api, economic_security_data, job_category_overlays,
+# status_signal and the baseline builders.
+DEFAULT_VARIABLES: Dict[str, List[str]] = {
+    "acs/acs5": (
+        _series("B01001", [1, *range(3, 26), *range(27, 50)])
+        + ["B01003_001E"]
+        + _series("B02001", range(1, 11))
+        + _series("B07003", [1, 4, 7])
+        + _series("B07013", [1, 5, 6])
+        + _series("B08301", [1, 10, 21])
+        + _series("B15003", [1, 22, 23, 24, 25])
+        + _series("B19001", range(1, 18))
+        + ["B19013_001E", "B19025_001E"]
+        + _series("B24080", [1, 3, 4])
+        + ["B25003_001E", "B25003_003E", "B25018_001E"]
+        + _series("B25034", [1, 8, 9, 10])
+        + ["B25035_001E"]
+        + _series("B25038", range(1, 16))
+        + ["B25064_001E", "B25077_001E"]
+    ),
+    "acs/acs5/profile": (
+        ["DP03_0001E", "DP03_0004E", "DP03_0009PE", "DP03_0025E", "DP03_0092E"]
+        + [f"DP03_{n:04d}PE" for n in range(33, 46)]
+    ),
+    "acs/acs5/subject": (
+        ["S1501_C01_006E", "S1501_C01_007E"]
+        + [f"S2401_C01_{n:03d}E" for n in (1, 4, 5, 7, 8, 12, 13, 17, 19, 23, 24, 25, 27, 28, 31, 32, 34, 35, 36)]
+    ),
+}
+
+
+def _dataset_for(variable: str) -> str:
+    if variable.startswith("DP"):
+        return "acs/acs5/profile"
+    if variable.startswith("S"):
+        return "acs/acs5/subject"
+    return "acs/acs5"
+
+
+def _get(url: str, params: Dict[str, str], sleep: float) -> Optional[List[List[str]]]:
+    if CENSUS_API_KEY:
+        params = dict(params, key=CENSUS_API_KEY)
+    for attempt in range(4):
+        try:
+            resp = requests.get(url, params=params, timeout=120)
+        except requests.RequestException as e:
+            print(f"  request error ({e}); retrying")
+            time.sleep(2 ** attempt)
+            continue
+        if resp.status_code == 429 or resp.status_code >= 500:
+            time.sleep(int(resp.headers.get("Retry-After", 2 ** attempt)))
+            continue
+        time.sleep(sleep)
+        if resp.status_code != 200:
+            print(f"  {resp.status_code} for {params.get('for')} {params.get('in', '')}: {resp.text[:120]}")
+            return None
+        return resp.json()
+    return None
+
+
+def _geo_key(level: str, row: Dict[str, str]) -> str:
+    if level == "tract":
+        return f"tract:{row['state']}{row['county']}{row['tract']}"
+    if level in ("county", "place"):
+        return f"{level}:{row['state']}{row[level]}"
+    if level == "cbsa":
+        return f"cbsa:{row[CBSA_GEO]}"
+    if level == "zcta":
+        return f"zcta:{row[ZCTA_GEO]}"
+    return f"state:{row['state']}"
+
+
+def _requests_for(level: str, states: List[str]) -> List[Dict[str, str]]:
+    if level == "tract":
+        return [{"for": "tract:*", "in": f"state:{st} county:*"} for st in states]
+    if level == "place":
+        return [{"for": "place:*", "in": f"state:{st}"} for st in states]
+    if level == "county":
+        return [{"for": "county:*", "in": f"state:{st}"} for st in states]
+    if level == "state":
+        return [{"for": "state:" + ",".join(states)}]
+    if level == "cbsa":
+        return [{"for": f"{CBSA_GEO}:*"}]
+    if level == "zcta":
+        return [{"for": f"{ZCTA_GEO}:*"}]
+    raise ValueError(f"unknown level {level}")
+
+
+def collect(year: int, levels: List[str], states: List[str], variables: List[str], sleep: float) -> Dict[str, Dict[str, Optional[str]]]:
+    by_dataset: Dict[str, List[str]] = defaultdict(list)
+    for v in variables:
+        by_dataset[_dataset_for(v)].append(v)
+
+    rows: Dict[str, Dict[str, Optional[str]]] = defaultdict(dict)
+    for level in levels:
+        for geo_params in _requests_for(level, states):
+            for dataset, dvars in by_dataset.items():
+                url = f"{CENSUS_BASE_URL}/{year}/{dataset}"
+                for i in range(0, len(dvars), _VARS_PER_REQUEST):
+                    chunk = dvars[i:i + _VARS_PER_REQUEST]
+                    data = _get(url, {"get": ",".join(chunk + ["NAME"]), **geo_params}, sleep)
+                    if not data or len(data) < 2:
+                        continue
+                    header = data[0]
+                    for raw in data[1:]:
+                        rec = dict(zip(header, raw))
+                        out = rows[_geo_key(level, rec)]
+                        out["NAME"] = rec.get("NAME")
+                        for v in chunk:
+                            out[v] = rec.get(v)
+            print(f"ACS store: {level} {geo_params.get('in', geo_params['for'])} -> {len(rows)} geographies")
+    return rows
+
+
+def _to_float(raw: Optional[str]) -> Optional[float]:
+    if raw in (None, ""):
+        return None
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+def write_store(rows: Dict[str, Dict[str, Optional[str]]], variables: List[str], out_path: Path) -> None:
+    import pyarrow as pa
+
+    geos = sorted(rows)
+    columns = {
+        "geo": pa.array(geos, type=pa.string()),
+        "NAME": pa.array([rows[g].get("NAME") for g in geos], type=pa.string()),
+    }
+    for v in variables:
+        columns[v] = pa.array([_to_float(rows[g].get(v)) for g in geos], type=pa.float64())
+    table = pa.table(columns)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+    # Uncompressed IPC file so the reader can memory-map it.
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(str(tmp_path), str(out_path))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the local bulk ACS 5-year store (Arrow, keyed by GEOID).")
+    parser.add_argument("--year", type=int, default=2022, help="ACS 5-year vintage")
+    parser.add_argument("--levels", default="tract,place,county,cbsa,zcta",
+                        help="Comma list of tract, place, county, state, cbsa, zcta")
+    parser.add_argument("--states", default="", help="Comma list of state FIPS (default: all)")
+    parser.add_argument("--variables-file", default=None, help="Extra variables, one per line")
+    parser.add_argument("--sleep", type=float, default=0.1, help="Pause between API requests (s)")
+    parser.add_argument("--out-dir", default="data_cache/acs", help="Store directory (HOMEFIT_ACS_STORE_DIR)")
+    args = parser.parse_args()
+
+    variables = [v for vs in DEFAULT_VARIABLES.values() for v in vs]
+    if args.variables_file:
+        with open(args.variables_file, encoding="utf-8") as f:
+            variables += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    variables = list(dict.fromkeys(variables))
+    states = [s.strip().zfill(2) for s in args.states.split(",") if s.strip()] or STATE_FIPS
+    levels = [lv.strip() for lv in args.levels.split(",") if lv.strip()]
+
+    rows = collect(args.year, levels, states, variables, args.sleep)
+    out_path = Path(args.out_dir).resolve() / f"acs5_{args.year}.arrow"
+    write_store(rows, variables, out_path)
+    print(f"ACS store: {len(rows)} geographies x {len(variables)} variables -> {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Build the local crime-incident store for data_sources/crime_store.py.
+
+Intended usage (monthly; the store answers windows ending up to
+crime_store.MAX_STALENESS_DAYS after the ingest date):
+  python3 scripts/baselines/build_crime_store.py
+  python3 scripts/baselines/build_crime_store.py --sources nyc --months 36 --res 9
+
+Pages each dataset's Socrata endpoint (the same datasets crime_api queries per location),
+classifies every incident with crime_api._classify_nyc / _classify_la, and aggregates
+violent / property / total counts per H3 cell and month. --months must reach back over
+both of crime_api's windows (current + prior year), so keep it at 25 or more.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, DefaultDict, Dict, Iterator, List, Optional, Tuple
+
+import h3
+import requests
+
+from data_sources.crime_api import _LA_SOCRATA, _NYC_SOCRATA, _classify_la, _classify_nyc
+
+_PAGE = 50_000
+_TIMEOUT = 120
+
+# name -> (endpoint, date field, lat field, lon field, classifier field, classifier, last date available)
+_DATASETS: Dict[str, Tuple[str, str, str, str, str, Callable[[str], Optional[str]], Optional[datetime.date]]] = {
+    "nyc": (_NYC_SOCRATA, "cmplnt_fr_dt", "latitude", "longitude", "ofns_desc", _classify_nyc, None),
+    # Legacy LAPD dataset stops at Dec 2024 (crime_api._LA_DATA_MAX_DATE).
+    "la": (_LA_SOCRATA, "date_occ", "lat", "lon", "crm_cd", _classify_la, datetime.date(2024, 12, 31)),
+}
+
+
+def _init_db(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE sources(name TEXT PRIMARY KEY, h3_res INTEGER, min_month TEXT, max_month TEXT,
+                             ingested_on TEXT);
+        CREATE TABLE cell_months(source TEXT, cell INTEGER, month TEXT, violent INTEGER, property INTEGER,
+                                 total INTEGER, PRIMARY KEY(source, cell, month)) WITHOUT ROWID;
+        """
+    )
+
+
+def _month_start(day: datetime.date, months_back: int) -> datetime.date:
+    month = day.month - months_back
+    year = day.year
+    while month <= 0:
+        month += 12
+        year -= 1
+    return datetime.date(year, month, 1)
+
+
+def _pages(endpoint: str, fields: List[str], where: str) -> Iterator[List[Dict]]:
+    offset = 0
+    while True:
+        params = {"$select": ",".join(fields), "$where": where, "$order": ":id", "$limit": _PAGE, "$offset": offset}
+        resp = requests.get(endpoint, params=params, timeout=_TIMEOUT)
+        resp.raise_for_status()
+        rows = resp.json()
+        if not rows:
+            return
+        yield rows
+        offset += len(rows)
+
+
+def aggregate(rows: Iterator[Dict], date_field: str, lat_field: str, lon_field: str, cls_field: str,
+              classify: Callable[[str], Optional[str]], res: int) -> DefaultDict[Tuple[int, str], List[int]]:
+    """(cell, month) -> [violent, property, total] for incident records."""
+    out: DefaultDict[Tuple[int, str], List[int]] = defaultdict(lambda: [0, 0, 0])
+    for r in rows:
+        try:
+            lat = float(r.get(lat_field) or 0)
+            lon = float(r.get(lon_field) or 0)
+        except (TypeError, ValueError):
+            continue
+        month = str(r.get(date_field) or "")[:7]
+        # Redacted locations are published as 0,0.
+        if not lat or not lon or len(month) != 7:
+            continue
+        counts = out[(h3.str_to_int(h3.latlng_to_cell(lat, lon, res)), month)]
+        cat = classify(r.get(cls_field) or "")
+        if cat == "violent":
+            counts[0] += 1
+        elif cat == "property":
+            counts[1] += 1
+        counts[2] += 1
+    return out
+
+
+def load_source(conn: sqlite3.Connection, name: str, rows: Iterator[Dict], since: datetime.date,
+                res: int, ingested_on: datetime.date) -> int:
+    """Aggregate one dataset's records into the store; returns incidents loaded."""
+    _endpoint, date_field, lat_field, lon_field, cls_field, classify, _last = _DATASETS[name]
+    cells = aggregate(rows, date_field, lat_field, lon_field, cls_field, classify, res)
+    conn.executemany(
+        "INSERT INTO cell_months VALUES (?, ?, ?, ?, ?, ?)",
+        [(name, cell, month, v, p, t) for (cell, month), (v, p, t) in sorted(cells.items())],
+    )
+    months = sorted({month for _cell, month in cells})
+    conn.execute(
+        "INSERT INTO sources VALUES (?, ?, ?, ?, ?)",
+        (name, res, since.isoformat()[:7], months[-1] if months else None, ingested_on.isoformat()),
+    )
+    return sum(t for _v, _p, t in cells.values())
+
+
+def _fetch(name: str, since: datetime.date) -> Iterator[Dict]:
+    endpoint, date_field, lat_field, lon_field, cls_field, _classify, _last = _DATASETS[name]
+    where = f"{date_field} >= '{since.isoformat()}T00:00:00.000' AND {lat_field} IS NOT NULL"
+    started = time.time()
+    n = 0
+    for page in _pages(endpoint, [date_field, lat_field, lon_field, cls_field], where):
+        n += len(page)
+        print(f"  {name}: {n:,} records ({time.time() - started:.0f}s)")
+        yield from page
+
+
+def build_store(sources: List[str], out_path: Path, months: int, res: int,
+                today: Optional[datetime.date] = None) -> int:
+    """Write a fresh store at out_path (tmp + replace); returns total incidents."""
+    today = today or datetime.date.today()
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    conn = sqlite3.connect(str(tmp_path))
+    total = 0
+    try:
+        _init_db(conn)
+        for name in sources:
+            last = _DATASETS[name][-1]
+            since = _month_start(min(today, last) if last else today, months)
+            n = load_source(conn, name, _fetch(name, since), since, res, today)
+            conn.commit()
+            total += n
+            print(f"Crime store: {name} -> {n:,} incidents since {since}")
+    finally:
+        conn.close()
+    os.replace(str(tmp_path), str(out_path))
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the local crime-incident store for crime_store.")
+    parser.add_argument("--sources", default="nyc,la", help="Comma-separated datasets (nyc, la)")
+    parser.add_argument("--months", type=int, default=36, help="Months of incidents to load (>= 25)")
+    parser.add_argument("--res", type=int, default=9, help="H3 aggregation resolution")
+    parser.add_argument("--out", default="data_cache/crime.sqlite", help="Output SQLite path (HOMEFIT_CRIME_DB_PATH)")
+    args = parser.parse_args()
+
+    sources = [s.strip().lower() for s in args.sources.split(",") if s.strip()]
+    unknown = [s for s in sources if s not in _DATASETS]
+    if unknown:
+        parser.error(f"unknown sources: {', '.join(unknown)}")
+    started = time.time()
+    out_path = Path(args.out).resolve()
+    total = build_store(sources, out_path, args.months, args.res)
+    print(f"Crime store: {total:,} incidents from {len(sources)} datasets -> {out_path} ({time.time() - started:.0f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
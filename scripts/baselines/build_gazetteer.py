@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Build the local US gazetteer for data_sources/gazetteer.py.
+
+Intended usage (Census Gazetteer files from
+https://www.census.gov/geographies/reference-files/time-series/geo/gazetteer-files.html):
+  python3 scripts/baselines/build_gazetteer.py \\
+      --places 2023_Gaz_place_national.txt --zctas 2023_Gaz_zcta_national.txt
+  python3 scripts/baselines/build_gazetteer.py --places ... --zctas ... \\
+      --osm-extract data_cache/osm_extract.sqlite
+
+Sources, in the order they win among same-name places in a state:
+  1. place catalogs (data/*_place_catalog.csv) -- curated centroids; NYC borough
+     neighborhoods get city "New York" and the borough as county
+  2. Census incorporated places, then CDPs (internal point; LSAD suffix stripped)
+  3. OSM place nodes from a build_osm_extract.py store (city/town/village/hamlet and
+     neighbourhood/suburb/quarter)
+ZCTAs are indexed by their 5 digits. ZCTA and OSM rows carry no state or city, so they take
+them from the nearest Census place (for neighbourhoods without addr:city/is_in:city too).
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import json
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from data_sources.gazetteer import normalize_name
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CATALOG_GLOB = str(REPO_ROOT / "data" / "*_place_catalog.csv")
+
+_NYC_BOROUGHS = {"Manhattan", "Brooklyn", "Queens", "Bronx", "The Bronx", "Staten Island"}
+_CATALOG_KINDS = {"neighborhood": "neighbourhood", "suburb": "town", "city": "city"}
+_OSM_KINDS = {"city", "town", "village", "hamlet", "neighbourhood", "suburb", "quarter"}
+
+# Census place NAME suffixes (LSAD descriptions) -> Nominatim place type, longest first.
+_LSAD_SUFFIXES: List[Tuple[str, str]] = [
+    (" consolidated government (balance)", "city"),
+    (" metropolitan government (balance)", "city"),
+    (" metro government (balance)", "city"),
+    (" unified government (balance)", "city"),
+    (" city and borough", "city"),
+    (" (balance)", "city"),
+    (" urban county", "city"),
+    (" municipality", "town"),
+    (" comunidad", "village"),
+    (" zona urbana", "town"),
+    (" borough", "town"),
+    (" village", "village"),
+    (" city", "city"),
+    (" town", "town"),
+    (" CDP", "village"),
+]
+
+# (priority, name, kind, state, city, county, zip, lat, lon, rank, source); lower priority,
+# then higher rank, wins in gazetteer.lookup
+Row = Tuple[int, str, str, str, str, str, str, float, float, float, str]
+
+
+def _init_db(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE places(id INTEGER PRIMARY KEY, name TEXT, kind TEXT, state TEXT, city TEXT, county TEXT,
+                            zip TEXT, lat REAL, lon REAL, priority INTEGER, rank REAL, source TEXT);
+        CREATE VIRTUAL TABLE names USING fts5(norm, place_id UNINDEXED);
+        """
+    )
+
+
+def _read_gazetteer(path: str) -> Iterator[Dict[str, str]]:
+    """Census Gazetteer files: tab-delimited, last header padded with spaces."""
+    with open(path, newline="", encoding="latin-1") as f:
+        reader = csv.reader(f, delimiter="\t")
+        header = [h.strip() for h in next(reader)]
+        for values in reader:
+            yield {h: v.strip() for h, v in zip(header, values)}
+
+
+def catalog_rows(paths: Iterable[str]) -> Iterator[Row]:
+    for path in sorted(paths):
+        with open(path, newline="", encoding="utf-8") as f:
+            for r in csv.DictReader(f):
+                kind = _CATALOG_KINDS.get((r.get("type") or "").strip().lower(), "town")
+                name = (r.get("name") or "").strip()
+                county = (r.get("county_borough") or "").strip()
+                if kind == "neighbourhood":
+                    city = "New York" if county in _NYC_BOROUGHS else county
+                else:
+                    city = name
+                try:
+                    lat, lon = float(r["lat"]), float(r["lon"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                state = (r.get("state_abbr") or "").strip().upper()
+                if name and state:
+                    yield (0, name, kind, state, city, county, "", lat, lon, 0.0, "catalog")
+
+
+def census_place_rows(path: str) -> Iterator[Row]:
+    for r in _read_gazetteer(path):
+        full = r.get("NAME") or ""
+        name, kind = full, "town"
+        for suffix, suffix_kind in _LSAD_SUFFIXES:
+            if full.endswith(suffix):
+                name, kind = full[: -len(suffix)], suffix_kind
+                break
+        # Consolidated names: "Nashville-Davidson metropolitan government (balance)",
+        # "Louisville/Jefferson County metro government (balance)".
+        if "(balance)" in full:
+            name = re.split(r"[-/]", name)[0]
+        priority = 2 if full.endswith(" CDP") else 1
+        try:
+            lat, lon = float(r["INTPTLAT"]), float(r["INTPTLONG"])
+            aland = float(r.get("ALAND") or 0)
+        except (KeyError, ValueError):
+            continue
+        yield (priority, name, kind, r.get("USPS", ""), name, "", "", lat, lon, aland, "census_place")
+
+
+class _NearestPlace:
+    """Nearest Census place to a point (state/city for ZCTA and OSM rows)."""
+
+    def __init__(self, places: List[Row]):
+        import numpy as np
+        from shapely import STRtree, points
+
+        self.places = places
+        self.tree = STRtree(points(np.array([(p[8], p[7]) for p in places], dtype=float)))
+
+    def __call__(self, lat: float, lon: float) -> Optional[Row]:
+        from shapely import Point
+
+        if not self.places:
+            return None
+        return self.places[int(self.tree.query_nearest(Point(lon, lat))[0])]
+
+
+def zcta_rows(path: str, nearest: _NearestPlace) -> Iterator[Row]:
+    for r in _read_gazetteer(path):
+        zip_code = r.get("GEOID", "")
+        try:
+            lat, lon = float(r["INTPTLAT"]), float(r["INTPTLONG"])
+        except (KeyError, ValueError):
+            continue
+        place = nearest(lat, lon)
+        if not re.match(r"^\d{5}$", zip_code) or place is None:
+            continue
+        yield (0, zip_code, "postcode", place[3], place[1], "", zip_code, lat, lon, 0.0, "census_zcta")
+
+
+def osm_place_rows(db_path: str, nearest: _NearestPlace) -> Iterator[Row]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        for lat, lon, tags_json in conn.execute(
+            "SELECT lat, lon, tags FROM nodes WHERE tags IS NOT NULL AND json_extract(tags, '$.place') IS NOT NULL"
+        ):
+            tags = json.loads(tags_json)
+            kind, name = tags.get("place"), tags.get("name")
+            if kind not in _OSM_KINDS or not name:
+                continue
+            place = nearest(lat, lon)
+            if place is None:
+                continue
+            if kind in ("neighbourhood", "suburb", "quarter"):
+                city = tags.get("addr:city") or tags.get("is_in:city") or place[1]
+                priority = 4
+            else:
+                city = name
+                priority = 3 if kind != "hamlet" else 5
+            rank = float(tags.get("population") or 0) if str(tags.get("population") or "").isdigit() else 0.0
+            yield (priority, name, kind, place[3], city, "", "", lat, lon, rank, "osm")
+    finally:
+        conn.close()
+
+
+def _insert(conn: sqlite3.Connection, rows: Iterable[Row]) -> int:
+    n = 0
+    for priority, name, kind, state, city, county, zip_code, lat, lon, rank, source in rows:
+        norm = zip_code if kind == "postcode" else normalize_name(name)
+        if not norm:
+            continue
+        cur = conn.execute(
+            "INSERT INTO places(name, kind, state, city, county, zip, lat, lon, priority, rank, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (name, kind, state, city, county, zip_code, lat, lon, priority, rank, source),
+        )
+        conn.execute("INSERT INTO names(norm, place_id) VALUES (?, ?)", (norm, cur.lastrowid))
+        n += 1
+    return n
+
+
+def build_gazetteer(out_path: Path, catalogs: List[str], places: Optional[str] = None,
+                    zctas: Optional[str] = None, osm_extract: Optional[str] = None) -> int:
+    """Write a fresh gazetteer at out_path (tmp + replace); returns total names."""
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    census = list(census_place_rows(places)) if places else []
+    nearest = _NearestPlace(census) if census else None
+    conn = sqlite3.connect(str(tmp_path))
+    total = 0
+    try:
+        _init_db(conn)
+        sources = [("catalogs", catalog_rows(catalogs)), ("census places", census)]
+        if zctas and nearest:
+            sources.append(("census ZCTAs", zcta_rows(zctas, nearest)))
+        if osm_extract and nearest:
+            sources.append(("OSM place nodes", osm_place_rows(osm_extract, nearest)))
+        for label, rows in sources:
+            n = _insert(conn, rows)
+            conn.commit()
+            total += n
+            print(f"Gazetteer: {label} -> {n:,} names")
+        conn.execute("INSERT INTO names(names) VALUES ('optimize')")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(str(tmp_path), str(out_path))
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the local US gazetteer for data_sources.gazetteer.")
+    parser.add_argument("--catalog", action="append", help="Place catalog CSV (repeatable; default data/*_place_catalog.csv)")
+    parser.add_argument("--places", help="Census Gazetteer places file (e.g. 2023_Gaz_place_national.txt)")
+    parser.add_argument("--zctas", help="Census Gazetteer ZCTA file (needs --places for state/city)")
+    parser.add_argument("--osm-extract", help="build_osm_extract.py SQLite store to take place nodes from")
+    parser.add_argument("--out", default="data_cache/gazetteer.sqlite", help="Output SQLite path (HOMEFIT_GAZETTEER_DB_PATH)")
+    args = parser.parse_args()
+
+    if (args.zctas or args.osm_extract) and not args.places:
+        parser.error("--zctas/--osm-extract need --places (state and city come from the nearest place)")
+    started = time.time()
+    out_path = Path(args.out).resolve()
+    catalogs = args.catalog or glob.glob(DEFAULT_CATALOG_GLOB)
+    total = build_gazetteer(out_path, catalogs, args.places, args.zctas, args.osm_extract)
+    print(f"Gazetteer: {total:,} names -> {out_path} ({time.time() - started:.0f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Build the local GTFS feed store for data_sources/gtfs_store.py.
+
+Intended usage (whenever agencies publish new schedules; feeds from the agencies or
+Transitland / Mobility Database downloads):
+  python3 scripts/baselines/build_gtfs_store.py --feeds mta_subway.zip lirr.zip mnr.zip nyct_bus_*.zip
+  python3 scripts/baselines/build_gtfs_store.py --feeds septa_rail.zip --date 2026-03-11
+
+Per stop it precomputes the service-frequency index the transit pillar's commuter rail
+bonuses read: weekday and weekend trip counts, peak/off-peak headways, service span,
+weekday headsigns and destinations (terminal stations), and the weekday route-type mix,
+using the same headway metrics as the Transitland schedule path
+(transitland_api.summarize_departure_minutes). Weekday service is sampled on the Wednesday
+on/after --date (default today) and weekend service on the following Saturday, clamped to
+each feed's calendar. Each feed's stop bounds are recorded as an extent: queries are only
+answered locally inside one, so load every feed serving a region together.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import os
+import sqlite3
+import time
+import zipfile
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from data_sources.gtfs_store import STOP_KEY_PREFIX
+from data_sources.transitland_api import summarize_departure_minutes
+
+
+def _init_db(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE feeds(name TEXT PRIMARY KEY, min_lat REAL, min_lon REAL, max_lat REAL, max_lon REAL,
+                           weekday_date TEXT, weekend_date TEXT);
+        CREATE TABLE stops(id INTEGER PRIMARY KEY, stop_key TEXT UNIQUE, name TEXT, lat REAL, lon REAL,
+                           route_type INTEGER);
+        CREATE VIRTUAL TABLE stop_index USING rtree(id, min_lat, max_lat, min_lon, max_lon);
+        CREATE TABLE routes(id INTEGER PRIMARY KEY, route_key TEXT UNIQUE, short_name TEXT, long_name TEXT,
+                            route_type INTEGER, agency TEXT);
+        CREATE TABLE stop_routes(stop_id INTEGER, route_id INTEGER, PRIMARY KEY(stop_id, route_id)) WITHOUT ROWID;
+        CREATE TABLE stop_service(stop_id INTEGER PRIMARY KEY, weekday_trips INTEGER, weekend_trips INTEGER,
+                                  service_span_hours REAL, peak_headway_minutes REAL,
+                                  off_peak_headway_minutes REAL, first_departure TEXT, last_departure TEXT,
+                                  headsigns TEXT, destinations TEXT, route_type_mix TEXT);
+        """
+    )
+
+
+def _read(zf: zipfile.ZipFile, name: str) -> Iterator[Dict[str, str]]:
+    members = {Path(n).name: n for n in zf.namelist()}
+    if name not in members:
+        return
+    with zf.open(members[name]) as raw:
+        yield from csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""))
+
+
+def basic_route_type(raw: str) -> Optional[int]:
+    """GTFS route_type (basic or extended HVT code) -> basic type the pillar scores on."""
+    try:
+        rt = int(raw)
+    except (TypeError, ValueError):
+        return None
+    if rt < 100:
+        return rt
+    if 100 <= rt < 200:  # railway services
+        return 2
+    if 200 <= rt < 300 or 700 <= rt < 800:  # coach / bus
+        return 3
+    if 400 <= rt < 500:  # urban railway, metro, underground
+        return 1
+    if 900 <= rt < 1000:  # tram
+        return 0
+    if 1000 <= rt < 1300:  # water
+        return 4
+    if 1300 <= rt < 1400:  # aerial lift
+        return 6
+    if 1400 <= rt < 1500:  # funicular
+        return 7
+    return None
+
+
+def _minutes(hhmmss: str) -> Optional[int]:
+    parts = (hhmmss or "").strip().split(":")
+    if len(parts) < 2:
+        return None
+    try:
+        return int(parts[0]) * 60 + int(parts[1])
+    except ValueError:
+        return None
+
+
+def _sample_days(zf: zipfile.ZipFile, start: date) -> Tuple[date, date]:
+    """(weekday, weekend) service days: Wednesday on/after start and the next Saturday, inside the feed calendar."""
+    ranges = [
+        (datetime.strptime(r["start_date"], "%Y%m%d").date(), datetime.strptime(r["end_date"], "%Y%m%d").date())
+        for r in _read(zf, "calendar.txt") if r.get("start_date") and r.get("end_date")
+    ]
+    hi = None
+    if ranges:
+        lo, hi = min(r[0] for r in ranges), max(r[1] for r in ranges)
+        start = min(max(start, lo), hi - timedelta(days=6)) if hi - lo >= timedelta(days=6) else lo
+    weekday = start + timedelta(days=(2 - start.weekday()) % 7)
+    weekend = weekday + timedelta(days=3)
+    if hi is not None and weekend > hi:
+        weekend = weekday - timedelta(days=4)  # previous Saturday
+    return weekday, weekend
+
+
+def _active_services(zf: zipfile.ZipFile, day: date) -> Set[str]:
+    dow = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"][day.weekday()]
+    ymd = day.strftime("%Y%m%d")
+    active = {
+        r["service_id"] for r in _read(zf, "calendar.txt")
+        if r.get(dow) == "1" and r.get("start_date", "") <= ymd <= r.get("end_date", "")
+    }
+    for r in _read(zf, "calendar_dates.txt"):
+        if r.get("date") != ymd:
+            continue
+        if r.get("exception_type") == "1":
+            active.add(r["service_id"])
+        elif r.get("exception_type") == "2":
+            active.discard(r["service_id"])
+    return active
+
+
+def _trip_terminals(zf: zipfile.ZipFile, trips: Dict[str, Tuple]) -> Dict[str, str]:
+    """trip_id -> stop_id of its last stop (highest stop_sequence)."""
+    last: Dict[str, Tuple[int, str]] = {}
+    for st in _read(zf, "stop_times.txt"):
+        trip_id = st.get("trip_id", "")
+        if trip_id not in trips:
+            continue
+        try:
+            seq = int(st.get("stop_sequence") or 0)
+        except ValueError:
+            continue
+        if trip_id not in last or seq > last[trip_id][0]:
+            last[trip_id] = (seq, st["stop_id"])
+    return {trip_id: stop_id for trip_id, (_seq, stop_id) in last.items()}
+
+
+def load_feed(conn: sqlite3.Connection, path: str, name: str, start: date) -> int:
+    """Load one GTFS zip; returns the number of stops written."""
+    with zipfile.ZipFile(path) as zf:
+        weekday, weekend = _sample_days(zf, start)
+        weekday_services = _active_services(zf, weekday)
+        weekend_services = _active_services(zf, weekend)
+
+        agencies = {r.get("agency_id", ""): r.get("agency_name", "") for r in _read(zf, "agency.txt")}
+        default_agency = next(iter(agencies.values()), "")
+        route_ids: Dict[str, int] = {}
+        route_types: Dict[str, Optional[int]] = {}
+        for r in _read(zf, "routes.txt"):
+            rt = basic_route_type(r.get("route_type", ""))
+            cur = conn.execute(
+                "INSERT INTO routes(route_key, short_name, long_name, route_type, agency) VALUES (?, ?, ?, ?, ?)",
+                (
+                    f"{STOP_KEY_PREFIX}{name}:{r['route_id']}",
+                    r.get("route_short_name") or None,
+                    r.get("route_long_name") or None,
+                    rt,
+                    agencies.get(r.get("agency_id", ""), default_agency) or None,
+                ),
+            )
+            route_ids[r["route_id"]] = cur.lastrowid
+            route_types[r["route_id"]] = rt
+
+        trips: Dict[str, Tuple[str, bool, bool, str]] = {}
+        for t in _read(zf, "trips.txt"):
+            sid = t.get("service_id", "")
+            trips[t["trip_id"]] = (t["route_id"], sid in weekday_services, sid in weekend_services, t.get("trip_headsign", ""))
+
+        # Destinations are terminal stations, named after the parent station when there is one.
+        stop_rows = {s["stop_id"]: s for s in _read(zf, "stops.txt")}
+        station_names = {
+            stop_id: (stop_rows.get(s.get("parent_station") or "") or s).get("stop_name") or ""
+            for stop_id, s in stop_rows.items()
+        }
+        terminals = _trip_terminals(zf, trips)
+
+        weekday_minutes: Dict[str, List[int]] = defaultdict(list)
+        weekend_counts: Counter = Counter()
+        headsigns: Dict[str, Dict[str, None]] = defaultdict(dict)
+        destinations: Dict[str, Dict[str, None]] = defaultdict(dict)
+        type_mix: Dict[str, Counter] = defaultdict(Counter)
+        stop_route_ids: Dict[str, Set[str]] = defaultdict(set)
+        for st in _read(zf, "stop_times.txt"):
+            trip_id = st.get("trip_id", "")
+            trip = trips.get(trip_id)
+            if trip is None:
+                continue
+            route_id, on_weekday, on_weekend, headsign = trip
+            stop_id = st["stop_id"]
+            stop_route_ids[stop_id].add(route_id)
+            if on_weekday:
+                m = _minutes(st.get("departure_time") or st.get("arrival_time") or "")
+                if m is not None:
+                    weekday_minutes[stop_id].append(m)
+                headsign = st.get("stop_headsign") or headsign
+                if headsign:
+                    headsigns[stop_id][headsign] = None
+                terminal = terminals.get(trip_id)
+                if terminal and terminal != stop_id and station_names.get(terminal):
+                    destinations[stop_id][station_names[terminal]] = None
+                if route_types.get(route_id) is not None:
+                    type_mix[stop_id][route_types[route_id]] += 1
+            if on_weekend:
+                weekend_counts[stop_id] += 1
+
+        lats: List[float] = []
+        lons: List[float] = []
+        n = 0
+        for s in stop_rows.values():
+            if s.get("location_type", "0") not in ("", "0"):
+                continue  # stations / entrances carry no stop_times
+            try:
+                lat, lon = float(s["stop_lat"]), float(s["stop_lon"])
+            except (KeyError, ValueError):
+                continue
+            stop_id = s["stop_id"]
+            served = stop_route_ids.get(stop_id, set())
+            types = [route_types[r] for r in served if route_types.get(r) is not None]
+            cur = conn.execute(
+                "INSERT INTO stops(stop_key, name, lat, lon, route_type) VALUES (?, ?, ?, ?, ?)",
+                (
+                    f"{STOP_KEY_PREFIX}{name}:{stop_id}",
+                    s.get("stop_name"),
+                    lat,
+                    lon,
+                    Counter(types).most_common(1)[0][0] if types else None,
+                ),
+            )
+            sid = cur.lastrowid
+            conn.execute("INSERT INTO stop_index VALUES (?, ?, ?, ?, ?)", (sid, lat, lat, lon, lon))
+            conn.executemany(
+                "INSERT INTO stop_routes VALUES (?, ?)",
+                [(sid, route_ids[r]) for r in served if r in route_ids],
+            )
+            times = weekday_minutes.get(stop_id, [])
+            metrics = summarize_departure_minutes(times) or {}
+            conn.execute(
+                "INSERT INTO stop_service VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    sid,
+                    len(times),
+                    weekend_counts.get(stop_id, 0),
+                    metrics.get("service_span_hours"),
+                    metrics.get("peak_headway_minutes"),
+                    metrics.get("off_peak_headway_minutes"),
+                    metrics.get("first_departure"),
+                    metrics.get("last_departure"),
+                    json.dumps(list(headsigns.get(stop_id, {}))),
+                    json.dumps(list(destinations.get(stop_id, {}))),
+                    json.dumps({str(k): v for k, v in sorted(type_mix.get(stop_id, {}).items())}),
+                ),
+            )
+            lats.append(lat)
+            lons.append(lon)
+            n += 1
+
+        if n:
+            conn.execute(
+                "INSERT INTO feeds VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, min(lats), min(lons), max(lats), max(lons), weekday.isoformat(), weekend.isoformat()),
+            )
+    return n
+
+
+def build_store(feed_paths: List[str], out_path: Path, start: Optional[date] = None) -> int:
+    """Write a fresh store at out_path (tmp + replace); returns total stops."""
+    start = start or date.today()
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    conn = sqlite3.connect(str(tmp_path))
+    total = 0
+    try:
+        _init_db(conn)
+        for path in feed_paths:
+            name = Path(path).stem
+            n = load_feed(conn, path, name, start)
+            conn.commit()
+            total += n
+            print(f"GTFS store: {path} -> {n} stops")
+        conn.execute("CREATE INDEX stop_routes_route ON stop_routes(route_id)")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(str(tmp_path), str(out_path))
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the local GTFS feed store for gtfs_store.")
+    parser.add_argument("--feeds", nargs="+", required=True, help="GTFS zip(s); the file stem names the feed")
+    parser.add_argument("--date", default=None, help="Sample service on/after this date (YYYY-MM-DD, default today)")
+    parser.add_argument("--out", default="data_cache/gtfs.sqlite", help="Output SQLite path (HOMEFIT_GTFS_DB_PATH)")
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.date, "%Y-%m-%d").date() if args.date else None
+    started = time.time()
+    out_path = Path(args.out).resolve()
+    total = build_store(args.feeds, out_path, start)
+    print(f"GTFS store: {total} stops from {len(args.feeds)} feeds -> {out_path} ({time.time() - started:.0f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
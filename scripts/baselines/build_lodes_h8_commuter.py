@@ -22,7 +22,9 @@ WRR semantics (approximate commuter skew):
 per cell. RAC ``C000`` is an employment tally (not Census population).
 
 After the Parquet exists, set ``LODES_H8_COMMUTER_PARQUET`` or rely on the default
-``data/lodes_h8_commuter.parquet`` for ``data_sources.lodes_h8_commuter_context``.
+``data/lodes_h8_commuter.parquet`` for ``data_sources.lodes_h8_commuter_context``. The API
+exports it to memory-mapped columns (``data_cache/lodes_h8/``, see
+``data_sources.lodes_h8_table``) on first use after each rebuild.
 """
 
 from __future__ import annotations
@@ -13,6 +13,7 @@ Data source:
 from __future__ import annotations
 
 import argparse
+import math
 import os
 import sqlite3
 import sys
@@ -129,7 +130,10 @@ def _init_db(conn: sqlite3.Connection) -> None:
             status TEXT,
             state TEXT,
             lat REAL,
-            lon REAL
+            lon REAL,
+            x REAL,
+            y REAL,
+            z REAL
         );
         """
     )
@@ -147,14 +151,22 @@ def _init_db(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
+def _unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    # Same projection as data_sources.nrhp.unit_vector (kept inline: the deploy build runs
+    # this script without the project on sys.path).
+    phi = math.radians(lat)
+    lam = math.radians(lon)
+    return math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi)
+
+
 def _insert_rows(conn: sqlite3.Connection, rows: List[Tuple[int, str, str, str, int, str, str, float, float]]) -> None:
     cur = conn.cursor()
     cur.executemany(
         """
-        INSERT INTO nrhp (id, nris_refnum, name, res_type, is_nhl, status, state, lat, lon)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+        INSERT INTO nrhp (id, nris_refnum, name, res_type, is_nhl, status, state, lat, lon, x, y, z)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
         """,
-        rows,
+        [row + _unit_vector(row[7], row[8]) for row in rows],
     )
     cur.executemany(
         """
@@ -210,6 +222,8 @@ def main() -> int:
         # Basic indexes for attribute lookups (optional; keep minimal)
         conn.execute("CREATE INDEX IF NOT EXISTS idx_nrhp_state ON nrhp(state);")
         conn.commit()
+        # Ship as a single rollback-journal file so read-only opens need no -wal/-shm.
+        conn.execute("PRAGMA journal_mode=DELETE;")
     finally:
         conn.close()
 
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Build a local OSM extract (SQLite + RTree) for data_sources/osm_local.py.
+
+Intended usage (before a metro catalog rescore):
+  # Geofabrik regional PBF (requires `pip install osmium`), clipped to a bbox
+  python3 scripts/baselines/build_osm_extract.py --pbf new-york-latest.osm.pbf \\
+      --bbox 40.40,-74.35,41.10,-73.60 --name nyc_metro --out data_cache/osm_extract.sqlite
+
+  # Or an Overpass JSON dump (`out body; >; out skel qt;`) for the same bbox
+  python3 scripts/baselines/build_osm_extract.py --overpass-json nyc.json \\
+      --bbox 40.40,-74.35,41.10,-73.60 --out data_cache/osm_extract.sqlite
+
+The bbox is recorded as the extract's extent: osm_api consumers only use the local store
+when their whole query circle fits inside it, so choose it a little inside the clip area
+(query radii reach 15-25 km for water/nature features).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_BATCH = 50_000
+
+
+def _init_db(conn: sqlite3.Connection) -> None:
+    cur = conn.cursor()
+    cur.execute("PRAGMA journal_mode=OFF;")
+    cur.execute("PRAGMA synchronous=OFF;")
+    cur.executescript(
+        """
+        CREATE TABLE extents (name TEXT, min_lat REAL, min_lon REAL, max_lat REAL, max_lon REAL);
+        CREATE TABLE nodes (id INTEGER PRIMARY KEY, lat REAL, lon REAL, tags TEXT);
+        CREATE TABLE ways (id INTEGER PRIMARY KEY, nodes TEXT, tags TEXT, center_lat REAL, center_lon REAL);
+        CREATE TABLE relations (id INTEGER PRIMARY KEY, members TEXT, tags TEXT, center_lat REAL, center_lon REAL);
+        CREATE TABLE way_nodes (way_id INTEGER, node_id INTEGER);
+        CREATE TABLE relation_members (relation_id INTEGER, type TEXT, ref INTEGER);
+        CREATE VIRTUAL TABLE node_index USING rtree(id, min_lat, max_lat, min_lon, max_lon);
+        CREATE VIRTUAL TABLE way_index USING rtree(id, min_lat, max_lat, min_lon, max_lon);
+        CREATE VIRTUAL TABLE relation_index USING rtree(id, min_lat, max_lat, min_lon, max_lon);
+        """
+    )
+    conn.commit()
+
+
+class OsmExtractWriter:
+    """Streams nodes/ways/relations into the extract; `finish()` computes bboxes and indexes."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._nodes: List[Tuple] = []
+        self._ways: List[Tuple] = []
+        self._way_nodes: List[Tuple[int, int]] = []
+        self._relations: List[Tuple] = []
+        self._members: List[Tuple[int, str, int]] = []
+        self.counts = {"node": 0, "way": 0, "relation": 0}
+
+    @staticmethod
+    def _tags_json(tags: Optional[Dict[str, str]]) -> Optional[str]:
+        return json.dumps(tags, separators=(",", ":"), ensure_ascii=False) if tags else None
+
+    def add_node(self, nid: int, lat: float, lon: float, tags: Optional[Dict[str, str]]) -> None:
+        self._nodes.append((nid, lat, lon, self._tags_json(tags)))
+        self.counts["node"] += 1
+        if len(self._nodes) >= _BATCH:
+            self._flush()
+
+    def add_way(self, wid: int, node_ids: List[int], tags: Optional[Dict[str, str]]) -> None:
+        self._ways.append((wid, json.dumps(node_ids, separators=(",", ":")), self._tags_json(tags)))
+        self._way_nodes.extend((wid, nid) for nid in node_ids)
+        self.counts["way"] += 1
+        if len(self._way_nodes) >= _BATCH:
+            self._flush()
+
+    def add_relation(self, rid: int, members: List[Dict[str, Any]], tags: Optional[Dict[str, str]]) -> None:
+        self._relations.append((rid, json.dumps(members, separators=(",", ":")), self._tags_json(tags)))
+        self._members.extend((rid, m["type"], m["ref"]) for m in members)
+        self.counts["relation"] += 1
+        if len(self._members) >= _BATCH:
+            self._flush()
+
+    def add_extent(self, name: str, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> None:
+        self.conn.execute(
+            "INSERT INTO extents (name, min_lat, min_lon, max_lat, max_lon) VALUES (?, ?, ?, ?, ?)",
+            (name, min_lat, min_lon, max_lat, max_lon),
+        )
+
+    def _flush(self) -> None:
+        cur = self.conn.cursor()
+        cur.executemany("INSERT OR REPLACE INTO nodes (id, lat, lon, tags) VALUES (?, ?, ?, ?)", self._nodes)
+        cur.executemany("INSERT OR REPLACE INTO ways (id, nodes, tags) VALUES (?, ?, ?)", self._ways)
+        cur.executemany("INSERT INTO way_nodes (way_id, node_id) VALUES (?, ?)", self._way_nodes)
+        cur.executemany("INSERT OR REPLACE INTO relations (id, members, tags) VALUES (?, ?, ?)", self._relations)
+        cur.executemany("INSERT INTO relation_members (relation_id, type, ref) VALUES (?, ?, ?)", self._members)
+        self.conn.commit()
+        for buf in (self._nodes, self._ways, self._way_nodes, self._relations, self._members):
+            buf.clear()
+
+    def finish(self) -> None:
+        """Way/relation bboxes + centers (Overpass `center` = bbox center), then RTree indexes."""
+        self._flush()
+        cur = self.conn.cursor()
+        cur.executescript(
+            """
+            CREATE INDEX idx_way_nodes ON way_nodes(way_id);
+            CREATE TEMP TABLE way_bbox AS
+                SELECT wn.way_id AS id, MIN(n.lat) AS min_lat, MAX(n.lat) AS max_lat,
+                       MIN(n.lon) AS min_lon, MAX(n.lon) AS max_lon
+                FROM way_nodes wn JOIN nodes n ON n.id = wn.node_id
+                GROUP BY wn.way_id;
+            UPDATE ways SET
+                center_lat = (SELECT (min_lat + max_lat) / 2 FROM way_bbox b WHERE b.id = ways.id),
+                center_lon = (SELECT (min_lon + max_lon) / 2 FROM way_bbox b WHERE b.id = ways.id);
+
+            CREATE TEMP TABLE relation_bbox AS
+                SELECT relation_id AS id, MIN(min_lat) AS min_lat, MAX(max_lat) AS max_lat,
+                       MIN(min_lon) AS min_lon, MAX(max_lon) AS max_lon
+                FROM (
+                    SELECT m.relation_id, b.min_lat, b.max_lat, b.min_lon, b.max_lon
+                    FROM relation_members m JOIN way_bbox b ON m.type = 'way' AND b.id = m.ref
+                    UNION ALL
+                    SELECT m.relation_id, n.lat, n.lat, n.lon, n.lon
+                    FROM relation_members m JOIN nodes n ON m.type = 'node' AND n.id = m.ref
+                )
+                GROUP BY relation_id;
+            UPDATE relations SET
+                center_lat = (SELECT (min_lat + max_lat) / 2 FROM relation_bbox b WHERE b.id = relations.id),
+                center_lon = (SELECT (min_lon + max_lon) / 2 FROM relation_bbox b WHERE b.id = relations.id);
+
+            INSERT INTO node_index (id, min_lat, max_lat, min_lon, max_lon)
+                SELECT id, lat, lat, lon, lon FROM nodes WHERE tags IS NOT NULL;
+            INSERT INTO way_index (id, min_lat, max_lat, min_lon, max_lon)
+                SELECT b.id, b.min_lat, b.max_lat, b.min_lon, b.max_lon
+                FROM way_bbox b JOIN ways w ON w.id = b.id WHERE w.tags IS NOT NULL;
+            INSERT INTO relation_index (id, min_lat, max_lat, min_lon, max_lon)
+                SELECT b.id, b.min_lat, b.max_lat, b.min_lon, b.max_lon
+                FROM relation_bbox b JOIN relations r ON r.id = b.id WHERE r.tags IS NOT NULL;
+
+            DROP TABLE way_nodes;
+            DROP TABLE relation_members;
+            """
+        )
+        self.conn.commit()
+
+
+def load_overpass_json(writer: OsmExtractWriter, elements: Iterable[Dict[str, Any]]) -> None:
+    """Feed Overpass JSON elements (`out body; >; out skel qt;`) into the writer."""
+    nodes, ways, relations = [], [], []
+    for e in elements:
+        {"node": nodes, "way": ways, "relation": relations}.get(e.get("type"), []).append(e)
+    # Skeleton copies (no tags) may repeat tagged ids; INSERT OR REPLACE keeps the last, so
+    # write untagged copies first.
+    for bucket in (nodes, ways, relations):
+        bucket.sort(key=lambda e: 1 if e.get("tags") else 0)
+    for n in nodes:
+        if n.get("lat") is not None and n.get("lon") is not None:
+            writer.add_node(int(n["id"]), float(n["lat"]), float(n["lon"]), n.get("tags"))
+    for w in ways:
+        writer.add_way(int(w["id"]), [int(x) for x in w.get("nodes") or []], w.get("tags"))
+    for r in relations:
+        members = [
+            {"type": m.get("type"), "ref": int(m.get("ref")), "role": m.get("role", "")}
+            for m in r.get("members") or [] if m.get("ref") is not None
+        ]
+        writer.add_relation(int(r["id"]), members, r.get("tags"))
+
+
+def load_pbf(writer: OsmExtractWriter, pbf_path: str, bbox: Optional[Tuple[float, float, float, float]]) -> None:
+    """Feed a PBF through pyosmium. Ways/relations are kept whole; nodes are clipped to bbox
+    unless a kept way references them."""
+    try:
+        import osmium
+    except ImportError as exc:  # pragma: no cover
+        raise SystemExit("PBF input requires pyosmium: pip install osmium") from exc
+
+    def _in_bbox(lat: float, lon: float) -> bool:
+        return bbox is None or (bbox[0] <= lat <= bbox[2] and bbox[1] <= lon <= bbox[3])
+
+    class _Handler(osmium.SimpleHandler):
+        def node(self, n):  # noqa: N802 - osmium callback name
+            if n.location.valid() and _in_bbox(n.location.lat, n.location.lon):
+                writer.add_node(n.id, n.location.lat, n.location.lon, {t.k: t.v for t in n.tags} or None)
+
+        def way(self, w):
+            locs = [nd.location for nd in w.nodes if nd.location.valid()]
+            if not locs or not any(_in_bbox(loc.lat, loc.lon) for loc in locs):
+                return
+            for nd in w.nodes:
+                if nd.location.valid() and not _in_bbox(nd.location.lat, nd.location.lon):
+                    writer.add_node(nd.ref, nd.location.lat, nd.location.lon, None)
+            writer.add_way(w.id, [nd.ref for nd in w.nodes], {t.k: t.v for t in w.tags} or None)
+
+        def relation(self, r):
+            members = [{"type": {"n": "node", "w": "way", "r": "relation"}[m.type], "ref": m.ref,
+                        "role": m.role} for m in r.members]
+            writer.add_relation(r.id, members, {t.k: t.v for t in r.tags} or None)
+
+    _Handler().apply_file(pbf_path, locations=True)
+
+
+def _parse_bbox(text: str) -> Tuple[float, float, float, float]:
+    parts = [float(x) for x in text.split(",")]
+    if len(parts) != 4:
+        raise argparse.ArgumentTypeError("bbox must be min_lat,min_lon,max_lat,max_lon")
+    return parts[0], parts[1], parts[2], parts[3]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build local OSM extract (SQLite + RTree) for osm_api.")
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--pbf", type=str, help="Geofabrik .osm.pbf (requires pyosmium)")
+    src.add_argument("--overpass-json", type=str, help="Overpass JSON dump with `>; out skel qt;`")
+    parser.add_argument("--bbox", type=_parse_bbox, required=True,
+                        help="Extent the extract is complete for: min_lat,min_lon,max_lat,max_lon")
+    parser.add_argument("--name", type=str, default="extract", help="Extent label")
+    parser.add_argument("--out", type=str, default="data_cache/osm_extract.sqlite", help="Output SQLite path")
+    args = parser.parse_args()
+
+    out_path = Path(args.out).resolve()
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(str(tmp_path))
+    try:
+        _init_db(conn)
+        writer = OsmExtractWriter(conn)
+        if args.pbf:
+            load_pbf(writer, args.pbf, args.bbox)
+        else:
+            with open(args.overpass_json, encoding="utf-8") as f:
+                load_overpass_json(writer, json.load(f).get("elements") or [])
+        writer.add_extent(args.name, *args.bbox)
+        writer.finish()
+        print(f"OSM extract: {writer.counts['node']} nodes, {writer.counts['way']} ways, "
+              f"{writer.counts['relation']} relations")
+    finally:
+        conn.close()
+
+    os.replace(str(tmp_path), str(out_path))
+    print(f"OSM extract: wrote {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
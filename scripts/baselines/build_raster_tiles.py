@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Build a local raster tile layer for data_sources/raster_local.py from a GeoTIFF / COG.
+
+Intended usage (once per layer and region; the datasets change at most yearly):
+  # Requires `pip install rasterio` (build time only; the API reads the tiles with numpy)
+  python3 scripts/baselines/build_raster_tiles.py --layer srtm --src srtm_conus.tif \\
+      --bbox 24.0,-125.0,50.0,-66.0
+
+  python3 scripts/baselines/build_raster_tiles.py --layer nlcd_tcc --src nlcd_tcc_2023.tif \\
+      --bbox 24.0,-125.0,50.0,-66.0 --year 2023
+
+Sources match the Earth Engine assets gee_api queries (export them with
+Export.image.toCloudStorage(..., formatOptions={'cloudOptimized': True}) or download the
+published COGs):
+  nlcd_tcc           USGS/NLCD_RELEASES/2023_REL/TCC  NLCD_Percent_Tree_Canopy_Cover (pass --year)
+  hansen_treecover   UMD/hansen/global_forest_change_2024_v1_12  treecover2000
+  nlcd_landcover     USGS/NLCD_RELEASES/2021_REL/NLCD/2021  landcover
+  worldcover         ESA/WorldCover/v200  Map
+  srtm               USGS/SRTMGL1_003  elevation
+  ghsl_built_height  JRC/GHSL/P2023A/GHS_BUILT_H mosaic  built_height
+  lst_jja            JJA Landsat 8/9 ST_B10 land-only mean in deg C (water masked), 100 m
+
+Sources in another CRS are warped to EPSG:4326 (nearest neighbour) on read. The bbox,
+clipped to the source's extent, is recorded as the layer's extent: raster_local only
+answers queries whose whole disc fits inside it. Tiles that are entirely nodata are not
+written.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+LAYER_SOURCES = {
+    "nlcd_tcc": "USGS/NLCD_RELEASES/2023_REL/TCC/v2023-5",
+    "hansen_treecover": "UMD/hansen/global_forest_change_2024_v1_12",
+    "nlcd_landcover": "USGS/NLCD_RELEASES/2021_REL/NLCD/2021",
+    "worldcover": "ESA/WorldCover/v200",
+    "srtm": "USGS/SRTMGL1_003",
+    "ghsl_built_height": "JRC/GHSL/P2023A/GHS_BUILT_H",
+    "lst_jja": "LANDSAT/LC08+LC09/C02/T1_L2 ST_B10 JJA",
+}
+
+
+def _parse_bbox(raw: str) -> Tuple[float, float, float, float]:
+    parts = [float(p) for p in raw.split(",")]
+    if len(parts) != 4:
+        raise argparse.ArgumentTypeError("bbox must be min_lat,min_lon,max_lat,max_lon")
+    return parts[0], parts[1], parts[2], parts[3]
+
+
+def layer_bounds(bbox: Tuple[float, float, float, float], origin: Tuple[float, float],
+                 pixel_size: Tuple[float, float], width: int, height: int) -> Tuple[float, float, float, float]:
+    """(west, south, east, north): the requested bbox clipped to the written pixel grid."""
+    min_lat, min_lon, max_lat, max_lon = bbox
+    west, north = origin
+    east = west + width * pixel_size[0]
+    south = north - height * pixel_size[1]
+    return max(min_lon, west), max(min_lat, south), min(max_lon, east), min(max_lat, north)
+
+
+def build_layer(src_path: str, out_dir: Path, layer: str, bbox: Tuple[float, float, float, float],
+                tile_size: int, band: int, nodata, scale: float, offset: float, year) -> dict:
+    try:
+        import rasterio
+        from rasterio.enums import Resampling
+        from rasterio.vrt import WarpedVRT
+        from rasterio.windows import Window, from_bounds
+    except ImportError as exc:
+        raise SystemExit("build_raster_tiles.py requires rasterio (pip install rasterio)") from exc
+
+    min_lat, min_lon, max_lat, max_lon = bbox
+    tiles_dir = out_dir / "tiles"
+    tiles_dir.mkdir(parents=True)
+
+    with rasterio.open(src_path) as src:
+        ds = src if src.crs and src.crs.to_epsg() == 4326 else WarpedVRT(
+            src, crs="EPSG:4326", resampling=Resampling.nearest)
+        try:
+            if nodata is None:
+                nodata = ds.nodata
+            full = from_bounds(min_lon, min_lat, max_lon, max_lat, transform=ds.transform)
+            row_off = max(0, int(np.floor(full.row_off)))
+            col_off = max(0, int(np.floor(full.col_off)))
+            height = min(ds.height, int(np.ceil(full.row_off + full.height))) - row_off
+            width = min(ds.width, int(np.ceil(full.col_off + full.width))) - col_off
+            if height <= 0 or width <= 0:
+                raise SystemExit(f"bbox {bbox} does not intersect {src_path}")
+
+            t = ds.transform
+            origin = (t.c + col_off * t.a, t.f + row_off * t.e)
+            pixel_size = (t.a, -t.e)
+            dtype = np.dtype(ds.dtypes[band - 1])
+
+            written = 0
+            for tr in range(0, (height + tile_size - 1) // tile_size):
+                for tc in range(0, (width + tile_size - 1) // tile_size):
+                    h = min(tile_size, height - tr * tile_size)
+                    w = min(tile_size, width - tc * tile_size)
+                    data = ds.read(band, window=Window(col_off + tc * tile_size, row_off + tr * tile_size, w, h))
+                    if nodata is not None and np.all(data == nodata):
+                        continue
+                    if (h, w) != (tile_size, tile_size):
+                        # Edge tiles are padded to full size so row/col arithmetic stays uniform.
+                        fill = nodata if nodata is not None else 0
+                        padded = np.full((tile_size, tile_size), fill, dtype=dtype)
+                        padded[:h, :w] = data
+                        data = padded
+                    np.save(tiles_dir / f"r{tr}_c{tc}.npy", np.ascontiguousarray(data, dtype=dtype))
+                    written += 1
+        finally:
+            if ds is not src:
+                ds.close()
+
+    bounds = layer_bounds(bbox, origin, pixel_size, width, height)
+    if bounds != (min_lon, min_lat, max_lon, max_lat):
+        print(f"Source covers only {bounds} (west, south, east, north) of the requested bbox; "
+              f"recording that as the layer's extent.")
+
+    manifest = {
+        "layer": layer,
+        "source": LAYER_SOURCES.get(layer, Path(src_path).name),
+        "crs": "EPSG:4326",
+        "origin": list(origin),
+        "pixel_size": list(pixel_size),
+        "width": width,
+        "height": height,
+        "tile_size": tile_size,
+        "dtype": dtype.name,
+        "nodata": nodata.item() if isinstance(nodata, np.generic) else nodata,
+        "scale": scale,
+        "offset": offset,
+        "year": year,
+        "bounds": list(bounds),
+        "tiles_written": written,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    with open(out_dir / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build a local raster tile layer for raster_local.")
+    parser.add_argument("--layer", required=True, choices=sorted(LAYER_SOURCES), help="Layer name")
+    parser.add_argument("--src", required=True, help="Source GeoTIFF / COG path or URL")
+    parser.add_argument("--bbox", type=_parse_bbox, required=True,
+                        help="Extent the layer is complete for: min_lat,min_lon,max_lat,max_lon")
+    parser.add_argument("--band", type=int, default=1, help="Source band (1-based)")
+    parser.add_argument("--tile-size", type=int, default=512, help="Tile edge in pixels")
+    parser.add_argument("--nodata", type=float, default=None, help="Override source nodata value")
+    parser.add_argument("--scale", type=float, default=1.0, help="Value scale applied on read")
+    parser.add_argument("--offset", type=float, default=0.0, help="Value offset applied on read")
+    parser.add_argument("--year", type=int, default=None, help="Dataset year (nlcd_tcc)")
+    parser.add_argument("--out", default="data_cache/rasters", help="Tile store root (HOMEFIT_RASTER_DIR)")
+    args = parser.parse_args()
+
+    root = Path(args.out).resolve()
+    out_dir = root / args.layer
+    tmp_dir = root / f"{args.layer}.tmp"
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+
+    manifest = build_layer(args.src, tmp_dir, args.layer, args.bbox, args.tile_size, args.band,
+                           args.nodata, args.scale, args.offset, args.year)
+
+    old_dir = root / f"{args.layer}.old"
+    if out_dir.exists():
+        os.replace(str(out_dir), str(old_dir))
+    os.replace(str(tmp_dir), str(out_dir))
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+    print(f"Raster tiles: {args.layer} {manifest['width']}x{manifest['height']} px, "
+          f"{manifest['tiles_written']} tiles -> {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
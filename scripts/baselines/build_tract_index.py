@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Build the local Census tract index for data_sources/tract_index.py.
+
+Intended usage (once per TIGER vintage):
+  # National cartographic boundary file (smallest; one zip for all states)
+  python3 scripts/baselines/build_tract_index.py --shapes cb_2022_us_tract_500k.zip \\
+      --cbsa-delineation list1_2023.csv --vintage 2022
+
+  # Or full-resolution TIGER/Line, one zip per state
+  python3 scripts/baselines/build_tract_index.py --shapes tl_2022_36_tract.zip tl_2022_34_tract.zip
+
+--cbsa-delineation is the OMB county delineation file (Census "list1", saved as CSV); with
+it, point lookups carry the same cbsa_code / cbsa_name / csa_code / csa_name fields the
+Census geocoder returns. Each input's total bounds are recorded as an extent: disk queries
+are only answered locally inside one, so pass whole-state (or national) files.
+
+Requires geopandas (already a dependency); the API reads the result with numpy + shapely.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+INDEX_VERSION = 1
+
+
+def load_cbsa_delineation(path: str) -> Dict[str, Dict[str, str]]:
+    """County FIPS (SSCCC) -> cbsa/csa codes and names, geocoder-style names."""
+    out: Dict[str, Dict[str, str]] = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        # list1 has a title row above the header; skip until the header appears.
+        rows = list(csv.reader(f))
+    header_idx = next(i for i, row in enumerate(rows) if "CBSA Code" in row)
+    header = rows[header_idx]
+    col = {name: header.index(name) for name in header}
+    for row in rows[header_idx + 1:]:
+        if len(row) < len(header) or not row[col["CBSA Code"]].strip():
+            continue
+        county = row[col["FIPS State Code"]].zfill(2) + row[col["FIPS County Code"]].zfill(3)
+        kind_col = col.get("Metropolitan/Micropolitan Statistical Area")
+        kind = row[kind_col] if kind_col is not None else ""
+        suffix = " Micro Area" if "Micro" in kind else " Metro Area"
+        entry = {
+            "cbsa_code": row[col["CBSA Code"]].strip(),
+            "cbsa_name": row[col["CBSA Title"]].strip() + suffix,
+        }
+        if "CSA Code" in col and row[col["CSA Code"]].strip():
+            entry["csa_code"] = row[col["CSA Code"]].strip()
+            entry["csa_name"] = row[col["CSA Title"]].strip() + " CSA"
+        out[county] = entry
+    return out
+
+
+def build_index(shape_paths: List[str], out_dir: Path, vintage: str, counties: Dict[str, Dict[str, str]]) -> dict:
+    try:
+        import geopandas as gpd
+    except ImportError as exc:
+        raise SystemExit("build_tract_index.py requires geopandas (pip install geopandas)") from exc
+    from shapely.geometry import MultiPolygon, Polygon
+
+    vertices: List[np.ndarray] = []
+    ring_offsets = [0]
+    part_ring_offsets = [0]
+    tract_part_offsets = [0]
+    bounds: List[tuple] = []
+    tracts: List[list] = []
+    extents: List[list] = []
+    n_vertices = 0
+
+    for path in shape_paths:
+        gdf = gpd.read_file(path).to_crs("EPSG:4326")
+        minx, miny, maxx, maxy = gdf.total_bounds
+        extents.append([float(miny), float(minx), float(maxy), float(maxx)])
+        for row in gdf.itertuples(index=False):
+            geom = row.geometry
+            if geom is None or geom.is_empty:
+                continue
+            polys = [geom] if isinstance(geom, Polygon) else list(geom.geoms) if isinstance(geom, MultiPolygon) else []
+            if not polys:
+                continue
+            for poly in polys:
+                for ring in [poly.exterior, *poly.interiors]:
+                    coords = np.asarray(ring.coords, dtype=np.float64)[:, :2]
+                    vertices.append(coords)
+                    n_vertices += len(coords)
+                    ring_offsets.append(n_vertices)
+                part_ring_offsets.append(len(ring_offsets) - 1)
+            tract_part_offsets.append(len(part_ring_offsets) - 1)
+            bounds.append(geom.bounds)
+            tracts.append([
+                str(row.GEOID),
+                str(getattr(row, "NAMELSAD", "") or ""),
+                str(getattr(row, "NAME", "") or ""),
+                float(getattr(row, "ALAND", 0) or 0),
+                float(getattr(row, "AWATER", 0) or 0),
+            ])
+        print(f"Tract index: {path} -> {len(tracts)} tracts so far")
+
+    out_dir.mkdir(parents=True)
+    np.save(out_dir / "vertices.npy", np.concatenate(vertices) if vertices else np.empty((0, 2)))
+    np.save(out_dir / "ring_offsets.npy", np.asarray(ring_offsets, dtype=np.int64))
+    np.save(out_dir / "part_ring_offsets.npy", np.asarray(part_ring_offsets, dtype=np.int64))
+    np.save(out_dir / "tract_part_offsets.npy", np.asarray(tract_part_offsets, dtype=np.int64))
+    np.save(out_dir / "bounds.npy", np.asarray(bounds, dtype=np.float64).reshape(-1, 4))
+
+    used_counties = {t[0][:5] for t in tracts}
+    manifest = {
+        "version": INDEX_VERSION,
+        "vintage": vintage,
+        "extents": extents,
+        "tracts": tracts,
+        "counties": {k: v for k, v in counties.items() if k in used_counties},
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    with open(out_dir / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    return manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the local Census tract index for tract_index.")
+    parser.add_argument("--shapes", nargs="+", required=True, help="TIGER/Line or cartographic boundary tract shapefile(s) / zip(s)")
+    parser.add_argument("--cbsa-delineation", default=None, help="OMB county delineation CSV (Census list1)")
+    parser.add_argument("--vintage", default="", help="Vintage label recorded in the manifest, e.g. 2022")
+    parser.add_argument("--out", default="data_cache/tract_index", help="Output directory (HOMEFIT_TRACT_INDEX_DIR)")
+    args = parser.parse_args()
+
+    counties = load_cbsa_delineation(args.cbsa_delineation) if args.cbsa_delineation else {}
+    out_dir = Path(args.out).resolve()
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+
+    manifest = build_index(args.shapes, tmp_dir, args.vintage, counties)
+
+    old_dir = out_dir.with_name(out_dir.name + ".old")
+    if out_dir.exists():
+        os.replace(str(out_dir), str(old_dir))
+    os.replace(str(tmp_dir), str(out_dir))
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+    print(f"Tract index: {len(manifest['tracts'])} tracts, {len(manifest['counties'])} counties with CBSA -> {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -41,6 +41,12 @@ import sys
 from pathlib import Path
 from typing import Optional
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import catalog_store  # noqa: E402
+
 # ---------------------------------------------------------------------------
 # Pillar keys (matches Trovamo / agent_recommend.py)
 # ---------------------------------------------------------------------------
@@ -419,28 +425,54 @@ def score_row(row: dict, weights: dict[str, int], nb_prefs: list[str], ao_prefs:
 # Catalog processing
 # ---------------------------------------------------------------------------
 
+# Pillars score_row reads regardless of weights (display fields, built-form/political filters).
+_ROW_PILLARS = frozenset({"natural_beauty", "active_outdoors", "political_lean", "built_environment"})
+
+
+def _pushdown(cfg: dict) -> list[tuple]:
+    """Store predicates implied by cfg; passes_hard_filters still has the final say."""
+    where: list[tuple] = []
+    if cfg.get("archetypes"):
+        where.append(("archetype", "in", cfg["archetypes"]))
+    if cfg.get("trajectories"):
+        where.append(("trajectory", "in", cfg["trajectories"]))
+    local_scene = cfg.get("local_scene")
+    if local_scene == "High":
+        where.append(("local_scene_bucket", "=", "High"))
+    elif local_scene == "Some":
+        where.append(("local_scene_bucket", "!=", "Low"))
+    return where
+
+
 def process_catalog(path: Path, cfg: dict, weights: dict[str, int], results: list) -> tuple[int, int]:
+    """
+    Filter and score one catalog. Reads the catalog_store .sqlite next to the JSONL when it
+    is current: status filters run in SQL and only the pillars scoring needs are decoded.
+    Rows excluded in SQL still count as `failed`, as they do on the JSONL path.
+    """
     nb_prefs = cfg.get("nb_prefs", [])
     ao_prefs = cfg.get("ao_prefs", [])
     waterfront_sub = cfg.get("waterfront_sub")
+    pillars = _ROW_PILLARS | {k for k, w in weights.items() if w > 0}
     passed = failed = 0
-    with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                row = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if not row.get("success", True):
-                continue
-            ok, _ = passes_hard_filters(row, cfg)
-            if ok:
-                results.append(score_row(row, weights, nb_prefs, ao_prefs, waterfront_sub))
-                passed += 1
-            else:
-                failed += 1
+    where: list[tuple] = []
+    store = catalog_store.open_catalog(path)
+    if store is not None:
+        with store:
+            where = _pushdown(cfg)
+            if where:
+                live = [("success", "!=", 0)]  # success=false rows are skipped, not failed
+                failed += store.count(live) - store.count(live + where)
+    for rec in catalog_store.iter_rows(path, columns=(), where=where, pillars=pillars):
+        row = rec["row"]
+        if not row.get("success", True):
+            continue
+        ok, _ = passes_hard_filters(row, cfg)
+        if ok:
+            results.append(score_row(row, weights, nb_prefs, ao_prefs, waterfront_sub))
+            passed += 1
+        else:
+            failed += 1
     return passed, failed
 
 
@@ -596,7 +628,7 @@ def main(argv: Optional[list[str]] = None) -> None:
     results: list[dict] = []
     for p in args.catalog:
         path = Path(p)
-        if not path.exists():
+        if not path.exists() and not catalog_store.store_path_for(path).exists():
             print(f"WARN: {path} not found, skipping")
             continue
         passed, failed = process_catalog(path, cfg, weights, results)
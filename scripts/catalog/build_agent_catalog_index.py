@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compile the /agent/recommend catalog index (agent_recommend.CatalogIndex) ahead of deploys.
+
+The API compiles the index itself when the saved one is missing or stale, but that costs
+one full parse of every catalog on the first request after a catalog update; run this after
+rescoring (or in the deploy step) so the first request only loads the .npz.
+
+Usage:
+    PYTHONPATH=. python3 scripts/catalog/build_agent_catalog_index.py
+    PYTHONPATH=. python3 scripts/catalog/build_agent_catalog_index.py \\
+        --catalog data/nyc_metro_place_catalog_scores_merged.jsonl \\
+        --catalog data/la_metro_place_catalog_scores_merged.jsonl
+
+Merged catalogs must match HOMEFIT_AGENT_CATALOG_JSONL (comma-separated, same order) at
+serve time, or the API treats the index as stale and recompiles.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+from agent_recommend import CatalogIndex, _catalog_paths, _index_path, _resolve_repo_path  # noqa: E402
+from catalog_store import store_path_for  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compile the agent recommendation catalog index (.npz).")
+    parser.add_argument("--catalog", action="append",
+                        help="Catalog JSONL (repeatable; default HOMEFIT_AGENT_CATALOG_JSONL or the NYC catalog)")
+    parser.add_argument("--out", help="Output .npz (default HOMEFIT_AGENT_CATALOG_INDEX or data_cache/agent_catalog_index.npz)")
+    args = parser.parse_args()
+
+    sources = [_resolve_repo_path(c) for c in args.catalog] if args.catalog else _catalog_paths()
+    missing = [str(p) for p in sources if not p.is_file() and not store_path_for(p).is_file()]
+    if missing:
+        parser.error(f"catalog not found: {', '.join(missing)}")
+    out_path = _resolve_repo_path(args.out) if args.out else _index_path()
+    started = time.time()
+    index = CatalogIndex.compile(sources)
+    index.save(out_path)
+    print(f"Agent catalog index: {len(index):,} neighborhoods from {len(sources)} catalogs -> {out_path} "
+          f"({time.time() - started:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
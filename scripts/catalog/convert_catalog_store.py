@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Convert pre-scored catalogs between JSONL and the columnar catalog_store (.sqlite).
+
+`import` builds <catalog>.sqlite next to each JSONL; jobs that read through catalog_store
+(the API catalog map, agent index, apply_preference_filters, rescore_air_travel) then use
+it while the JSONL is unchanged. `export` writes a store back out as JSONL for the jobs
+that still read the file directly (re-export after editing the store in place).
+
+Usage:
+    python3 scripts/catalog/convert_catalog_store.py import data/nyc_metro_place_catalog_scores_merged.jsonl
+    python3 scripts/catalog/convert_catalog_store.py export data/nyc_metro_place_catalog_scores_merged.sqlite \\
+        --out data/nyc_metro_place_catalog_scores_merged.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import catalog_store  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import/export catalog JSONL <-> catalog_store SQLite.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="Build <catalog>.sqlite from catalog JSONL(s)")
+    imp.add_argument("jsonl", nargs="+", help="Catalog JSONL path(s)")
+    exp = sub.add_parser("export", help="Write a store back out as catalog JSONL")
+    exp.add_argument("store", help="Store .sqlite path")
+    exp.add_argument("--out", help="Output JSONL (default: the store's .jsonl sibling)")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        for raw in args.jsonl:
+            path = Path(raw)
+            if not path.is_file():
+                parser.error(f"catalog not found: {path}")
+            started = time.time()
+            n = catalog_store.import_jsonl(path)
+            print(f"{path}: {n:,} rows -> {catalog_store.store_path_for(path)} ({time.time() - started:.1f}s)")
+        return 0
+
+    store_path = Path(args.store)
+    if not store_path.is_file():
+        parser.error(f"store not found: {store_path}")
+    out_path = Path(args.out) if args.out else store_path.with_suffix(".jsonl")
+    n = catalog_store.export_jsonl(store_path, out_path)
+    print(f"{store_path}: {n:,} rows -> {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,6 +13,9 @@ reproduces what the live pillar computes — no network, no rate-limit risk. Air
 feeds only total_score (not happiness/longevity/status), so the cascade is pillar
 contribution -> total_score, using each place's CURRENT weight (post education-enable).
 
+When the catalog has a current catalog_store .sqlite, only the air_travel_access pillar
+blobs are decoded and rewritten there and the JSONL is re-exported from the store.
+
 Backup .bakAir. Usage: python3 scripts/rescore_air_travel.py
 """
 from __future__ import annotations
@@ -24,6 +27,7 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import catalog_store  # noqa: E402
 from pillars.air_travel_access import get_air_travel_score  # noqa: E402
 
 CATALOGS = [
@@ -38,48 +42,76 @@ def area_type_of(sc: dict) -> str | None:
             .get("area_classification", {}).get("effective_area_type"))
 
 
+def rescore_row(row: dict) -> tuple | None:
+    """Rescore row's air_travel_access in place; (name, old, new) or None if not rescored."""
+    cat = row.get("catalog", {})
+    sc = row.get("score", {})
+    ta = sc.get("livability_pillars", {}).get(PILLAR)
+    try:
+        lat, lon = float(cat["lat"]), float(cat["lon"])
+    except (TypeError, ValueError, KeyError):
+        return None
+    if not ta:
+        return None
+    new, _det = get_air_travel_score(lat, lon, area_type=area_type_of(sc))
+    new = round(new, 1)
+    old = ta["score"]
+    w = ta.get("weight") or 0.0
+    ta["score"] = new
+    ta["contribution"] = round(new * w / 100.0, 4)
+    ta["_rescore_version"] = "air_travel_commute_bands"
+    tsb = sc.get("total_score_breakdown", {}).get(PILLAR)
+    if tsb:
+        oc = tsb["contribution"]
+        nc = round(new * (tsb.get("weight") or 0.0) / 100.0, 4)
+        tsb["score"] = new
+        tsb["contribution"] = nc
+        sc["total_score"] = round(sc["total_score"] - oc + nc, 4)
+    return cat.get("name", ""), old, new
+
+
+def rescore_store(fn: str, store: catalog_store.CatalogStore, shifts: list) -> int:
+    """Rewrite only the air_travel_access blobs in the store, then re-export the JSONL."""
+    shutil.copyfile(store.path, f"{store.path}.bakAir")
+    n = 0
+    with store:
+        for rec in store.rows(columns=(), pillars=[PILLAR]):
+            shift = rescore_row(rec["row"])
+            if shift:
+                store.put_row(rec["id"], rec["row"])
+                shifts.append(shift)
+                n += 1
+    catalog_store.export_jsonl(store.path, fn)
+    return n
+
+
+def rescore_jsonl(fn: str, shifts: list) -> int:
+    tmp = fn + ".new"
+    n = 0
+    with open(fn) as src, open(tmp, "w") as out:
+        for line in src:
+            try:
+                row = json.loads(line)
+            except Exception:
+                out.write(line)
+                continue
+            shift = rescore_row(row)
+            if shift:
+                shifts.append(shift)
+                n += 1
+            out.write(json.dumps(row) + "\n")
+    os.replace(tmp, fn)
+    return n
+
+
 def main():
     shifts = []
     for fn in CATALOGS:
         if not os.path.isfile(fn):
             continue
         shutil.copyfile(fn, fn + ".bakAir")
-        tmp = fn + ".new"
-        n = 0
-        with open(fn) as src, open(tmp, "w") as out:
-            for line in src:
-                try:
-                    row = json.loads(line)
-                except Exception:
-                    out.write(line)
-                    continue
-                cat = row.get("catalog", {})
-                sc = row.get("score", {})
-                ta = sc.get("livability_pillars", {}).get(PILLAR)
-                try:
-                    lat, lon = float(cat["lat"]), float(cat["lon"])
-                except (TypeError, ValueError, KeyError):
-                    out.write(json.dumps(row) + "\n")
-                    continue
-                if ta:
-                    new, _det = get_air_travel_score(lat, lon, area_type=area_type_of(sc))
-                    new = round(new, 1)
-                    old = ta["score"]
-                    w = ta.get("weight") or 0.0
-                    ta["score"] = new
-                    ta["contribution"] = round(new * w / 100.0, 4)
-                    ta["_rescore_version"] = "air_travel_commute_bands"
-                    tsb = sc.get("total_score_breakdown", {}).get(PILLAR)
-                    if tsb:
-                        oc = tsb["contribution"]
-                        nc = round(new * (tsb.get("weight") or 0.0) / 100.0, 4)
-                        tsb["score"] = new
-                        tsb["contribution"] = nc
-                        sc["total_score"] = round(sc["total_score"] - oc + nc, 4)
-                    shifts.append((cat.get("name", ""), old, new))
-                    n += 1
-                out.write(json.dumps(row) + "\n")
-        os.replace(tmp, fn)
+        store = catalog_store.open_catalog(fn, writable=True)
+        n = rescore_store(fn, store, shifts) if store is not None else rescore_jsonl(fn, shifts)
         print(f"{fn}: rescored {n} places (backup: {fn}.bakAir)", flush=True)
 
     import numpy as np
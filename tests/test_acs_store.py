@@ -0,0 +1,61 @@
+"""Bulk ACS store: Census-shaped answers from the local Arrow file (no api.census.gov)."""
+
+import pytest
+
+from data_sources import acs_store, census_api
+from pillars import status_signal
+from scripts.baselines.build_acs_store import write_store
+
+TRACT = {"state_fips": "36", "county_fips": "061", "tract_fips": "000100", "geoid": "36061000100"}
+ROWS = {
+    "tract:36061000100": {
+        "NAME": "Census Tract 1", "B01001_001E": "4210", "B08301_001E": "2000", "B08301_010E": "1300",
+        "DP03_0025E": "31.4", "B25077_001E": "-666666666",
+        "S2401_C01_001E": "1000", "S2401_C01_004E": "200", "S2401_C01_005E": "100", "S2401_C01_007E": "50",
+        "S2401_C01_008E": "50", "S2401_C01_012E": "25", "S2401_C01_013E": "75", "S2401_C01_017E": "100",
+    },
+    "place:3651000": {"NAME": "New York city, New York", "B01001_001E": "8622467"},
+}
+VARIABLES = sorted({v for r in ROWS.values() for v in r if v != "NAME"})
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    write_store(ROWS, VARIABLES, tmp_path / "acs5_2022.arrow")
+    monkeypatch.setenv("HOMEFIT_ACS_STORE_DIR", str(tmp_path))
+    acs_store.reset()
+    yield
+    acs_store.reset()
+
+
+@pytest.fixture
+def no_network(monkeypatch):
+    def fail(*a, **k):
+        raise AssertionError("network call")
+
+    monkeypatch.setattr(census_api.http_client, "get", fail)
+
+
+def test_query_returns_census_shaped_rows(store):
+    url = f"{census_api.CENSUS_BASE_URL}/2022/acs/acs5"
+    rows = acs_store.query(url, {"get": "B01001_001E,B25077_001E,NAME", "for": "tract:000100", "in": "state:36 county:061"})
+    assert rows == [
+        ["B01001_001E", "B25077_001E", "NAME", "state", "county", "tract"],
+        ["4210", "-666666666", "Census Tract 1", "36", "061", "000100"],
+    ]
+    place = acs_store.query(url, {"get": "B01001_001E", "for": "place:51000", "in": "state:36"})
+    assert place[1][0] == "8622467"
+    # Unknown variable, geography, vintage or wildcard: not served (caller hits the API).
+    assert acs_store.query(url, {"get": "B99999_001E", "for": "tract:000100", "in": "state:36 county:061"}) is None
+    assert acs_store.query(url, {"get": "B01001_001E", "for": "tract:000200", "in": "state:36 county:061"}) is None
+    assert acs_store.query(url.replace("2022", "2021"), {"get": "B01001_001E", "for": "place:51000", "in": "state:36"}) is None
+    assert acs_store.query(url, {"get": "B01001_001E", "for": "tract:*", "in": "state:36 county:061"}) is None
+
+
+def test_census_fetchers_read_the_store(store, no_network):
+    assert census_api.get_population(TRACT) == 4210
+    assert census_api.get_transit_mode_share(0, 0, tract=TRACT) == pytest.approx(0.65)
+    assert census_api.get_commute_time.__wrapped__(0, 0, tract=TRACT) == pytest.approx(31.4)
+    occ = status_signal._fetch_s2401_occupation_shares(TRACT)
+    assert occ["white_collar_pct"] == pytest.approx(60.0)
+    assert occ["management_legal_healthcare_pct"] == pytest.approx(32.5)
@@ -0,0 +1,126 @@
+"""Agent catalog index: vectorized pre-ranking matches the per-row scan; index tracks its sources."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+import agent_recommend as ar
+from climate_preferences import score_climate_match
+
+PRIORITIES = {"natural_beauty": "High", "housing_value": "Medium", "community_safety": "Low",
+              "political_lean": "Medium"}
+CLIMATE_PREFS = {"cold_tolerance": "dealbreaker", "rain_tolerance": "vibe", "seasons": "want_4"}
+
+
+def _climate_names():
+    names = []
+    with open(ar.CLIMATE_PROFILES_PATH, encoding="utf-8") as f:
+        for line in f:
+            names.append(json.loads(line)["name"])
+            if len(names) == 40:
+                break
+    return names
+
+
+def _write_catalog(path, n=300, seed=5):
+    rng = np.random.default_rng(seed)
+    names = _climate_names() + ["Nowhere In Particular"]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("not json\n\n")
+        for i in range(n):
+            pillars = {k: {"score": round(float(rng.uniform(0, 100)), 1)} for k in ar.PILLAR_KEYS}
+            pillars["political_lean"] = {"score": None, "breakdown": {"lean_2024": float(rng.uniform(-1, 1))}}
+            if i % 7 == 0:
+                pillars["political_lean"]["breakdown"] = {}
+                pillars["diversity"] = {"status": "failed", "score": 88.0}
+            row = {
+                "catalog": {"name": names[i % len(names)], "state_abbr": "NY", "search_query": f"Place {i}, NY"},
+                "score": {"livability_pillars": pillars, "total_score": i,
+                          "status_signal_breakdown": {"archetype": "Quiet", "status_label": "Top 20%"}},
+            }
+            f.write(json.dumps(row) + "\n")
+
+
+def _reference(records, priorities, top_n, political_preference=None, climate_preferences=None):
+    """Per-row pre-ranking (the loop the index replaces)."""
+    numeric = ar.priorities_to_numeric(priorities)
+    total_weight = sum(numeric.values()) or 1
+    climate_index = ar._load_climate_index() if climate_preferences else {}
+    active = sum(1 for k in ar._CLIMATE_AXES if climate_preferences and climate_preferences.get(k))
+    climate_weight = min(active * 0.08, 0.28) if active else 0.0
+    scored = []
+    for n in records:
+        ps = dict(n["pillar_scores"])
+        if numeric.get("political_lean", 0) > 0:
+            ps["political_lean"] = ar._political_lean_score_from_raw(n.get("lean_2024"), political_preference)
+        weighted = sum(numeric.get(p, 0) * ps.get(p, 0.0) for p in ar.PILLAR_KEYS) / total_weight
+        if climate_weight > 0:
+            cm = score_climate_match(climate_index.get(n.get("place_name", "")), climate_preferences or {})
+            weighted = (1 - climate_weight) * weighted + climate_weight * (cm["score"] if cm else 50.0)
+        scored.append({"neighborhood": n["neighborhood"], "pillar_scores": ps, "weighted_match": round(weighted, 2)})
+    scored.sort(key=lambda x: x["weighted_match"], reverse=True)
+    return scored[:top_n]
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    path = tmp_path / "catalog.jsonl"
+    _write_catalog(path)
+    monkeypatch.setenv("HOMEFIT_AGENT_CATALOG_JSONL", str(path))
+    monkeypatch.setenv("HOMEFIT_AGENT_CATALOG_INDEX", str(tmp_path / "index.npz"))
+    ar.reset_catalog_index()
+    yield path
+    ar.reset_catalog_index()
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"political_preference": "progressive"},
+    {"political_preference": "moderate", "climate_preferences": CLIMATE_PREFS},
+    {"climate_preferences": {"heat_tolerance": "love"}},
+])
+def test_prerank_matches_row_scan(catalog, kwargs):
+    index = ar.load_catalog_index()
+    records = tuple(row for _offset, row in ar._iter_catalog_lines(catalog))
+    assert len(index) == len(records) == 300
+    for top_n in (1, 10, 500):
+        got = ar.prerank_neighborhoods(index, PRIORITIES, top_n=top_n, **kwargs)
+        want = _reference(records, PRIORITIES, top_n, **kwargs)
+        assert [r["neighborhood"] for r in got] == [r["neighborhood"] for r in want]
+        assert [r["weighted_match"] for r in got] == pytest.approx([r["weighted_match"] for r in want], abs=0.011)
+        assert [r["pillar_scores"] for r in got] == [r["pillar_scores"] for r in want]
+    # Record tuples are still accepted.
+    assert ar.prerank_neighborhoods(records, PRIORITIES, top_n=3) == ar.prerank_neighborhoods(index, PRIORITIES, top_n=3)
+
+
+def test_index_saved_reloaded_and_recompiled_on_change(catalog, tmp_path):
+    index = ar.load_catalog_index()
+    assert (tmp_path / "index.npz").is_file()
+    i = index.row_index("Place 7, NY")
+    assert index.score_full(i)["total_score"] == 7
+
+    ar.reset_catalog_index()
+    loaded = ar.load_catalog_index()  # from the .npz: same stamp, no JSONL parse needed
+    assert loaded is not index and loaded.stamp == index.stamp
+    np.testing.assert_array_equal(loaded.pillars, index.pillars)
+    assert loaded.score_full(loaded.row_index("Place 7, NY"))["total_score"] == 7
+
+    _write_catalog(catalog, n=50, seed=9)
+    stat = os.stat(catalog)
+    os.utime(catalog, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert len(ar.load_catalog_index()) == 50
+
+
+def test_endpoint_counts_every_source_including_store_only(catalog, tmp_path, monkeypatch):
+    import catalog_store
+
+    second = tmp_path / "second.jsonl"
+    _write_catalog(second, n=9, seed=3)
+    catalog_store.import_jsonl(second)
+    second.unlink()  # only the .sqlite store is left
+    monkeypatch.setenv("HOMEFIT_AGENT_CATALOG_JSONL", f"{catalog},{second}")
+    monkeypatch.setattr(ar, "get_recommendations", lambda *a, **kw: [])
+    req = ar.RecommendRequest(priorities=dict(PRIORITIES))
+    assert ar.recommend_neighborhoods(req)["meta"]["neighborhoods_evaluated"] == 309
@@ -0,0 +1,83 @@
+"""Concurrent /batch scheduler and upstream token buckets (scoring is stubbed, no network)."""
+
+import json
+import threading
+import time
+
+import main
+from data_sources import rate_limits
+
+
+def _drain(gen):
+    return [json.loads(line) for line in gen]
+
+
+def test_token_bucket_waits_then_refills():
+    bucket = rate_limits.TokenBucket("t", rate_per_min=600.0, capacity=5.0)  # 10 tokens/s
+    assert bucket.wait_time(5) == 0.0
+    bucket.consume(5)
+    assert 0.05 < bucket.wait_time(1) <= 0.1
+    bucket.penalize(0.5)
+    assert bucket.snapshot()["rate_per_min"] == 300.0
+    bucket.relax(10.0)
+    assert bucket.snapshot()["scale"] == 1.0
+
+
+def test_batch_streams_in_completion_order_with_original_index(monkeypatch):
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+    delays = {"slow": 0.3, "fast": 0.0, "boom": 0.0}
+
+    def fake_score(location, **kwargs):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(delays[location])
+        with lock:
+            active["now"] -= 1
+        if location == "boom":
+            raise ValueError("geocode failed")
+        return {"location": location}
+
+    monkeypatch.setattr(main, "_compute_single_score_internal", fake_score)
+    monkeypatch.setattr(main, "schedule_catalog_contribution", None)
+    monkeypatch.setattr(main, "BATCH_CONCURRENCY", 3)
+    monkeypatch.setattr(main, "_get_optimal_delay", lambda stats=None: 0.0)
+    monkeypatch.setattr(rate_limits, "try_admit", lambda costs: 0.0)
+
+    req = main.BatchLocationRequest(locations=["slow", "fast", "boom"], adaptive_delays=False)
+    lines = _drain(main._generate_batch_results(req))
+
+    results = [l for l in lines if l.get("type") == "result"]
+    assert [r["result"]["location"] for r in results][-1] == "slow"
+    assert {r["result"]["location"]: r["index"] for r in results} == {"slow": 1, "fast": 2, "boom": 3}
+    boom = [r["result"] for r in results if r["result"]["location"] == "boom"][0]
+    assert boom["success"] is False and boom["retry_count"] == 2
+
+    summary = lines[-1]
+    assert summary["type"] == "complete"
+    assert summary["batch_summary"]["successful"] == 2
+    assert summary["batch_summary"]["concurrency"] == 3
+    assert active["peak"] >= 2
+
+
+def test_batch_admission_waits_for_budget(monkeypatch):
+    admitted = []
+    budget = {"free": 1}
+
+    def fake_admit(costs):
+        if budget["free"] > 0:
+            budget["free"] -= 1
+            return 0.0
+        budget["free"] = 1  # next poll succeeds
+        return 0.05
+
+    monkeypatch.setattr(main, "_compute_single_score_internal", lambda location, **kw: admitted.append(location) or {})
+    monkeypatch.setattr(main, "schedule_catalog_contribution", None)
+    monkeypatch.setattr(main, "BATCH_CONCURRENCY", 4)
+    monkeypatch.setattr(rate_limits, "try_admit", fake_admit)
+
+    req = main.BatchLocationRequest(locations=["a", "b", "c"], adaptive_delays=False)
+    lines = _drain(main._generate_batch_results(req))
+    assert sorted(admitted) == ["a", "b", "c"]
+    assert lines[-1]["batch_summary"]["successful"] == 3
@@ -0,0 +1,291 @@
+"""L1 in-process LRU in front of Redis: bounds, TTL sweep, and hot-path behaviour of @cached."""
+
+import json
+import time
+
+import pytest
+
+from data_sources import cache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.gets = 0
+        self.pings = 0
+
+    def ping(self):
+        self.pings += 1
+        return True
+
+    def get(self, key):
+        self.gets += 1
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    def exists(self, key):
+        return int(key in self.store)
+
+    def delete(self, *keys):
+        for k in keys:
+            self.store.pop(k, None)
+
+
+@pytest.fixture
+def fresh_l1(monkeypatch, tmp_path):
+    l1 = cache._LRUCache(max_entries=3, max_bytes=10_000, stale_grace_seconds=60)
+    monkeypatch.setattr(cache, "_l1", l1)
+    monkeypatch.setattr(cache, "_DISK_CACHE_DIR", str(tmp_path))
+    for k in cache._stats:
+        monkeypatch.setitem(cache._stats, k, 0)
+    return l1
+
+
+def test_lru_evicts_by_count_and_bytes():
+    l1 = cache._LRUCache(max_entries=2, max_bytes=100, stale_grace_seconds=0)
+    l1.set("a", 1, size=10)
+    l1.set("b", 2, size=10)
+    l1.get_entry("a")  # a is now most recent
+    l1.set("c", 3, size=10)
+    assert sorted(l1.keys()) == ["a", "c"]
+
+    l1.set("big", "x", size=95)
+    assert l1.keys() == ["big"]
+    assert l1.bytes == 95
+    assert l1.evictions == 3
+
+    l1.set("huge", "y", size=500)  # larger than the whole budget: not stored
+    assert "huge" not in l1.keys()
+
+
+def test_sweep_keeps_stale_grace_then_drops():
+    l1 = cache._LRUCache(max_entries=10, max_bytes=1000, stale_grace_seconds=100)
+    now = time.time()
+    l1.set("k", {"v": 1}, timestamp=now - 150, ttl=60)
+    assert l1.count_expired(now) == 1
+    assert l1.sweep(now) == 0  # past TTL but inside grace: still usable as stale fallback
+    assert l1.sweep(now + 100) == 1
+    assert len(l1) == 0
+
+
+def test_dict_views_used_by_callers(fresh_l1):
+    cache._cache["req"] = {"score": 1}
+    cache._cache_ttl["req"] = 123.0
+    assert "req" in cache._cache
+    assert cache._cache.get("req") == {"score": 1}
+    assert cache._cache_ttl.get("req") == 123.0
+    assert cache._cache.get("missing") is None
+    cache._cache.pop("req", None)
+    assert "req" not in cache._cache_ttl
+
+
+def test_fresh_l1_hit_skips_redis(fresh_l1, monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(cache, "_redis_client", fake)
+    monkeypatch.setattr(cache, "_redis_last_ok", time.time())
+    calls = []
+
+    @cache.cached(ttl_seconds=60)
+    def lookup(x):
+        calls.append(x)
+        return {"x": x}
+
+    assert lookup(1) == {"x": 1}
+    gets_after_miss = fake.gets
+    assert lookup(1) == {"x": 1}
+    assert lookup(1) == {"x": 1}
+    assert calls == [1]
+    assert fake.gets == gets_after_miss
+    assert fake.pings == 0  # health check is interval-based, not per call
+
+    stats = cache.get_cache_stats()
+    assert stats["l1"]["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_redis_hit_populates_l1(fresh_l1, monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(cache, "_redis_client", fake)
+    monkeypatch.setattr(cache, "_redis_last_ok", time.time())
+
+    @cache.cached(ttl_seconds=60)
+    def lookup(x):
+        raise AssertionError("should be served from Redis")
+
+    key = cache._generate_cache_key("lookup", 7)
+    fake.store[key] = json.dumps({"value": {"x": 7}, "timestamp": time.time()})
+    assert lookup(7) == {"x": 7}
+    assert fake.gets == 1
+    assert lookup(7) == {"x": 7}
+    assert fake.gets == 1
+    assert cache._stats["l2_hits"] == 1 and cache._stats["l1_hits"] == 1
+
+
+def test_stale_l1_entry_served_when_upstream_fails(fresh_l1, monkeypatch):
+    monkeypatch.setattr(cache, "_redis_client", None)
+    key = cache._generate_cache_key("flaky", 1)
+    fresh_l1.set(key, {"parks": 3}, timestamp=time.time() - 120, ttl=60)
+
+    @cache.cached(ttl_seconds=60)
+    def flaky(x):
+        return None
+
+    got = flaky(1)
+    assert got["parks"] == 3 and got["_stale_cache"] is True
+    assert cache._stats["stale_served"] == 1
+
+
+def test_concurrent_misses_share_one_call(fresh_l1, monkeypatch):
+    import threading
+
+    monkeypatch.setattr(cache, "_redis_client", None)
+    calls = []
+    gate = threading.Event()
+
+    @cache.cached(ttl_seconds=60)
+    def slow(x):
+        calls.append(x)
+        gate.wait(2)
+        return {"x": x}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(slow(5))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    gate.set()
+    for t in threads:
+        t.join(5)
+    assert calls == [5]
+    assert results == [{"x": 5}] * 5
+    assert cache._stats["coalesced"] == 4
+    assert cache._flights == {}
+
+
+def test_waiters_fetch_themselves_when_leader_raises(fresh_l1, monkeypatch):
+    import threading
+
+    monkeypatch.setattr(cache, "_redis_client", None)
+    calls = []
+    started = threading.Event()
+
+    @cache.cached(ttl_seconds=60)
+    def flaky(x):
+        calls.append(threading.get_ident())
+        if len(calls) == 1:
+            started.set()
+            time.sleep(0.2)
+            raise RuntimeError("upstream down")
+        return {"ok": True}
+
+    errors = []
+
+    def leader():
+        try:
+            flaky(1)
+        except RuntimeError as e:
+            errors.append(e)
+
+    t = threading.Thread(target=leader)
+    t.start()
+    started.wait(2)
+    assert flaky(1) == {"ok": True}
+    t.join(2)
+    assert len(errors) == 1 and len(calls) == 2
+
+
+def test_reentrant_same_key_does_not_deadlock(fresh_l1, monkeypatch):
+    monkeypatch.setattr(cache, "_redis_client", None)
+    depth = []
+
+    @cache.cached(ttl_seconds=60)
+    def recurse(x):
+        depth.append(x)
+        if len(depth) == 1:
+            # Same key from the leader's own thread runs directly instead of waiting on itself.
+            return {"inner": recurse(x)}
+        return {"leaf": True}
+
+    assert recurse(1) == {"inner": {"leaf": True}}
+    assert len(depth) == 2
+
+
+def test_redis_lease_waits_for_other_replica(fresh_l1, monkeypatch):
+    import threading
+
+    fake = FakeRedis()
+    monkeypatch.setattr(cache, "_redis_client", fake)
+    monkeypatch.setattr(cache, "_redis_last_ok", time.time())
+    monkeypatch.setattr(cache, "_SINGLEFLIGHT_REDIS", True)
+    monkeypatch.setattr(cache, "_SINGLEFLIGHT_POLL_SECONDS", 0.02)
+
+    @cache.cached(ttl_seconds=60)
+    def tract(x):
+        raise AssertionError("other replica is fetching this key")
+
+    key = cache._generate_cache_key("tract", 9)
+    fake.store[f"{cache.CACHE_KEY_PREFIX}:lock:{key}"] = "other-replica"
+
+    def other_replica_finishes():
+        time.sleep(0.1)
+        fake.store[key] = json.dumps({"value": {"geoid": "36047"}, "timestamp": time.time()})
+
+    threading.Thread(target=other_replica_finishes).start()
+    assert tract(9) == {"geoid": "36047"}
+    assert cache._stats["remote_coalesced"] == 1
+
+
+def test_spatial_bucket_shares_results_within_a_cell(fresh_l1, monkeypatch):
+    monkeypatch.setattr(cache, "_redis_client", None)
+    monkeypatch.setattr(cache, "SPATIAL_KEYS_ENABLED", True)
+    calls = []
+
+    @cache.cached(ttl_seconds=60, spatial=cache.SpatialBucket())
+    def features(lat, lon, radius_m=15000):
+        calls.append((lat, lon, radius_m))
+        return {"lat": lat, "lon": lon}
+
+    # 15 km radius -> H3 res 9 (~200 m edge): two points 5 m apart share the cell-centre call.
+    a = features(40.70001, -73.99001)
+    b = features(40.70005, -73.99003, radius_m=15000)
+    assert a == b and len(calls) == 1
+    assert calls[0][:2] != (40.70001, -73.99001)  # upstream saw the snapped coordinate
+    assert abs(calls[0][0] - 40.70001) < 0.005 and abs(calls[0][1] + 73.99001) < 0.005
+    assert cache.get_cache_stats()["spatial_snaps"] == 2
+
+    # Small radius: budget below the finest resolution, coordinates pass through unchanged.
+    features(40.70001, -73.99001, 200)
+    assert calls[-1] == (40.70001, -73.99001, 200)
+
+
+def test_spatial_bucket_drops_point_specific_args(fresh_l1, monkeypatch):
+    monkeypatch.setattr(cache, "_redis_client", None)
+    monkeypatch.setattr(cache, "SPATIAL_KEYS_ENABLED", True)
+    calls = []
+
+    @cache.cached(ttl_seconds=60, spatial=cache.SpatialBucket(point_args=("metrics",)))
+    def viewshed(lat, lon, radius_m=15000, metrics=None):
+        calls.append(metrics)
+        return {"metrics": metrics}
+
+    # Metrics computed at each exact point must not split the cell's entry.
+    a = viewshed(40.70001, -73.99001, metrics={"forest_pct": 10.0})
+    b = viewshed(40.70005, -73.99003, metrics={"forest_pct": 12.0})
+    assert a == b == {"metrics": None} and calls == [None]
+
+
+def test_spatial_bucket_resolution_tracks_radius():
+    bucket = cache.SpatialBucket()
+    assert bucket.resolution(15000) == 9
+    assert bucket.resolution(5000) == 10
+    assert bucket.resolution(None) is None
+    assert cache.SpatialBucket(radius_arg=None, max_offset_m=600).resolution(None) == 8
+    assert cache.SpatialBucket(max_offset_m=25).resolution(15000) == 12
@@ -0,0 +1,122 @@
+"""Cache warmer target selection, off-peak pacing, and @cached refresh-ahead (no network)."""
+
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+import cache_warmer
+from data_sources import cache, rate_limits
+
+
+def test_targets_rank_requests_then_catalog(tmp_path):
+    catalog = tmp_path / "x_place_catalog.csv"
+    catalog.write_text(
+        "name,type,county_borough,state_full,state_abbr,lat,lon,search_query\n"
+        "Park Slope,neighborhood,Brooklyn,New York,NY,40.671,-73.977,\"Park Slope, Brooklyn, New York\"\n"
+        "Astoria,neighborhood,Queens,New York,NY,40.764,-73.923,\"Astoria, Queens, New York\"\n"
+    )
+    log = tmp_path / "requests.jsonl"
+    lines = [{"location": "Astoria, Queens, New York"}] * 3 + [{"location": "Boise, ID"}] + [{"lat": 1.0, "lon": 2.0}] * 2
+    log.write_text("\n".join(json.dumps(l) for l in lines) + "\nnot json\n")
+
+    targets = cache_warmer.collect_targets([str(catalog)], [str(log)], top_n=10)
+    assert [(t.location, t.source, t.hits) for t in targets] == [
+        ("Astoria, Queens, New York", "request_log", 3),
+        ("", "request_log", 2),
+        ("Boise, ID", "request_log", 1),
+        ("Park Slope, Brooklyn, New York", "x_place_catalog", 0),
+    ]
+
+
+def test_telemetry_export_is_read(tmp_path):
+    export = tmp_path / "telemetry_export.json"
+    export.write_text(json.dumps({"raw_requests": [{"location": "A", "lat": 1, "lon": 2}] * 2}, indent=2))
+    targets = cache_warmer.load_request_log_targets([str(export)], top_n=5)
+    assert [(t.location, t.hits) for t in targets] == [("A", 2)]
+
+
+def test_off_peak_window_wraps_midnight():
+    window = cache_warmer.parse_hours("22-4")
+    at = lambda h, m=0: datetime(2026, 1, 5, h, m).timestamp()
+    assert cache_warmer.seconds_until_window(window, at(23)) == 0.0
+    assert cache_warmer.seconds_until_window(window, at(3, 30)) == 0.0
+    assert cache_warmer.seconds_until_window(window, at(12)) == 10 * 3600
+    assert cache_warmer.seconds_left_in_window(window, at(3)) == 3600
+    with pytest.raises(ValueError):
+        cache_warmer.parse_hours("5-5")
+
+
+def test_pass_paces_warmed_targets_and_defers_at_window_end(monkeypatch):
+    monkeypatch.setattr(rate_limits, "try_admit", lambda costs: 0.0)
+    clock = {"now": datetime(2026, 1, 5, 2, 0).timestamp()}
+    sleeps = []
+
+    def fake_sleep(s):
+        sleeps.append(s)
+        clock["now"] += s
+
+    def fake_warm(target, refresh_ahead, admit):
+        if target.location == "fresh":
+            return "fresh"
+        admit()
+        clock["now"] += 60
+        return "warmed"
+
+    targets = [cache_warmer.WarmTarget(name) for name in ["a", "fresh", "b", "c", "d", "e"]]
+    outcomes = cache_warmer.run_warm_pass(
+        targets, off_peak=(2, 3), warm=fake_warm, sleep=fake_sleep, clock=lambda: clock["now"],
+    )
+    # 1h window / 6 targets = 10 min slots; fresh targets do not use a slot.
+    assert sleeps[0] == pytest.approx(540)
+    assert outcomes == {"warmed": 5, "fresh": 1}
+
+
+def test_refresh_ahead_recomputes_entries_near_expiry(monkeypatch, tmp_path):
+    l1 = cache._LRUCache(max_entries=10, max_bytes=10_000, stale_grace_seconds=60)
+    monkeypatch.setattr(cache, "_l1", l1)
+    monkeypatch.setattr(cache, "_redis_client", None)
+    monkeypatch.setattr(cache, "_DISK_CACHE_DIR", str(tmp_path))
+    calls = []
+
+    @cache.cached(ttl_seconds=3600)
+    def canopy(x):
+        calls.append(x)
+        return {"canopy": len(calls)}
+
+    key = cache._generate_cache_key("canopy", 1)
+    l1.set(key, {"canopy": 0}, timestamp=time.time() - 3000, ttl=3600)  # expires in ~10 min
+    assert canopy(1) == {"canopy": 0}
+
+    monkeypatch.setattr(cache, "_refresh_ahead_fraction", 0.0)
+    cache.set_refresh_ahead(0.5)
+    try:
+        assert canopy(1) == {"canopy": 1}
+        assert canopy(1) == {"canopy": 1}  # rewritten entry is fresh again
+    finally:
+        cache.set_refresh_ahead(0)
+    assert calls == [1]
+
+
+def test_refresh_ahead_is_relative_to_each_ttl(monkeypatch, tmp_path):
+    l1 = cache._LRUCache(max_entries=10, max_bytes=10_000, stale_grace_seconds=60)
+    monkeypatch.setattr(cache, "_l1", l1)
+    monkeypatch.setattr(cache, "_redis_client", None)
+    monkeypatch.setattr(cache, "_DISK_CACHE_DIR", str(tmp_path))
+    calls = []
+
+    @cache.cached(ttl_seconds=1800)
+    def places(x):
+        calls.append(x)
+        return len(calls)
+
+    l1.set(cache._generate_cache_key("places", 1), 0, timestamp=time.time() - 600, ttl=1800)
+    monkeypatch.setattr(cache, "_refresh_ahead_fraction", 0.0)
+    cache.set_refresh_ahead(5)  # capped: a short TTL is never stale on arrival
+    try:
+        assert cache._refresh_ahead_fraction == 0.5
+        assert places(1) == 0
+    finally:
+        cache.set_refresh_ahead(0)
+    assert calls == []
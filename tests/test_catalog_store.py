@@ -0,0 +1,100 @@
+"""Catalog store: JSONL round-trips, projected reads match the JSONL fallback, partial writes keep pillars."""
+
+import json
+import os
+
+import pytest
+
+import catalog_store as cs
+
+
+def _row(i):
+    pillars = {
+        "natural_beauty": {"score": 50.0 + i, "v9_breakdown": {"canopy_score": i}},
+        "air_travel_access": {"score": 70.0, "weight": 5.0},
+        "political_lean": {"score": None, "breakdown": {"lean_2024": (i - 5) / 10}},
+        "diversity": {"status": "failed", "score": 10.0} if i % 3 == 0 else {"score": 40.0},
+    }
+    return {
+        "catalog": {"name": f"Place {i}", "county_borough": "Kings", "state_abbr": "NY",
+                    "lat": 40.6 + i / 100, "lon": -73.9, "search_query": f"Place {i}, NY"},
+        "success": i != 4,
+        "score": {
+            "total_score": 60.0 + i,
+            "livability_pillars": pillars,
+            "status_signal_breakdown": {"archetype": ["Elite", "Quiet", None][i % 3], "trajectory": "Arrived"},
+            "local_scene_bucket": ["High", "Low", "Some"][i % 3] if i != 7 else None,
+        },
+    }
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / "x_scores_merged.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("not json\n\n")
+        for i in range(10):
+            f.write(json.dumps(_row(i)) + "\n")
+    return path
+
+
+def test_import_export_round_trip(catalog, tmp_path):
+    assert cs.import_jsonl(catalog) == 10
+    store_path = cs.store_path_for(catalog)
+    out = tmp_path / "out.jsonl"
+    assert cs.export_jsonl(store_path, out) == 10
+    assert list(cs.read_jsonl(out)) == [_row(i) for i in range(10)]
+    assert out.read_text() == catalog.read_text()  # unparseable and blank lines kept in place
+    with cs.open_catalog(catalog) as store:
+        assert len(store) == 10 and store.row(3) == _row(2)
+
+
+@pytest.mark.parametrize("where", [
+    None,
+    [("archetype", "in", ["Elite", "Quiet"])],
+    [("local_scene_bucket", "!=", "Low"), ("success", "=", 1)],
+    [("lean_2024", "<", 0), ("diversity", "not_null")],
+    [("archetype", "is_null")],
+])
+def test_store_and_jsonl_reads_agree(catalog, where):
+    kwargs = dict(columns=("name", "lean_2024", "failed_pillars", "natural_beauty"), where=where,
+                  pillars=["natural_beauty", "political_lean"])
+    from_jsonl = list(cs.iter_rows(catalog, **kwargs))
+    cs.import_jsonl(catalog)
+    from_store = list(cs.iter_rows(catalog, **kwargs))
+    assert from_store == from_jsonl and from_store
+    assert set(from_store[0]["row"]["score"]["livability_pillars"]) == {"natural_beauty", "political_lean"}
+    failed = {r["name"]: r["failed_pillars"] for r in cs.iter_rows(catalog, columns=("name", "failed_pillars"))}
+    assert failed["Place 3"] == "diversity" and failed["Place 1"] == ""
+
+
+def test_partial_writes_keep_other_pillars(catalog):
+    cs.import_jsonl(catalog)
+    with cs.open_catalog(catalog, writable=True) as store:
+        rec = next(store.rows(columns=(), where=[("name", "=", "Place 2")], pillars=["air_travel_access"]))
+        rec["row"]["score"]["livability_pillars"]["air_travel_access"]["score"] = 12.5
+        rec["row"]["score"]["total_score"] = 1.0
+        store.put_row(rec["id"], rec["row"])
+        store.update_pillar(rec["id"], "diversity", {"score": 99.0})
+
+    row = next(cs.iter_rows(catalog, columns=("air_travel_access", "diversity", "total_score"),
+                            where=[("name", "=", "Place 2")], full=True))
+    lp = row["row"]["score"]["livability_pillars"]
+    assert list(lp) == ["natural_beauty", "air_travel_access", "political_lean", "diversity"]
+    assert lp["natural_beauty"] == _row(2)["score"]["livability_pillars"]["natural_beauty"]
+    assert (row["air_travel_access"], row["diversity"], row["total_score"]) == (12.5, 99.0, 1.0)
+
+
+def test_changed_jsonl_falls_back_until_reexported(catalog, tmp_path):
+    cs.import_jsonl(catalog)
+    assert cs.resolve_source(catalog) == cs.store_path_for(catalog)
+    with open(catalog, "a", encoding="utf-8") as f:
+        f.write(json.dumps(_row(10)) + "\n")
+    stat = os.stat(catalog)
+    os.utime(catalog, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cs.open_catalog(catalog) is None and cs.resolve_source(catalog) == catalog
+    assert len(list(cs.iter_rows(catalog, columns=()))) == 11
+
+    cs.export_jsonl(cs.store_path_for(catalog), catalog)  # store wins: JSONL rewritten from it
+    assert cs.resolve_source(catalog) == cs.store_path_for(catalog)
+    assert len(list(cs.iter_rows(catalog, columns=()))) == 10
@@ -0,0 +1,70 @@
+"""Local gazetteer: ZIP, "Town, ST" and catalog neighborhood queries resolve without a network geocoder."""
+
+import pytest
+
+from data_sources import gazetteer, geocoding
+from data_sources.data_quality import detect_location_scope
+from scripts.baselines.build_gazetteer import build_gazetteer
+
+CATALOG = (
+    "name,type,county_borough,state_full,state_abbr,lat,lon,search_query\n"
+    'Tribeca,neighborhood,Manhattan,New York,NY,40.7163,-74.0086,"Tribeca, Manhattan, New York"\n'
+    'Larchmont,suburb,Westchester,New York,NY,40.9276,-73.7518,"Larchmont, New York"\n'
+)
+PLACES = (
+    "USPS\tGEOID\tANSICODE\tNAME\tLSAD\tFUNCSTAT\tALAND\tAWATER\tALAND_SQMI\tAWATER_SQMI\tINTPTLAT\tINTPTLONG     \n"
+    "NY\t3641135\t02390945\tLarchmont village\t47\tA\t2770000\t0\t1.07\t0\t40.927\t-73.752\n"
+    "NY\t3651000\t02395220\tNew York city\t25\tA\t778000000\t0\t300\t0\t40.6635\t-73.9387\n"
+    "MO\t2965000\t00767557\tSt. Louis city\t25\tA\t160000000\t0\t61\t0\t38.6358\t-90.2451\n"
+    "OR\t4123850\t02410494\tFranklin CDP\t57\tS\t500000\t0\t0.2\t0\t44.0\t-123.3\n"
+    "NJ\t3424930\t00885225\tFranklin borough\t21\tA\t11000000\t0\t4.3\t0\t41.12\t-74.58\n"
+)
+ZCTAS = (
+    "GEOID\tALAND\tAWATER\tALAND_SQMI\tAWATER_SQMI\tINTPTLAT\tINTPTLONG     \n"
+    "10538\t7000000\t0\t2.7\t0\t40.934\t-73.757\n"
+)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    (tmp_path / "x_place_catalog.csv").write_text(CATALOG)
+    (tmp_path / "places.txt").write_text(PLACES)
+    (tmp_path / "zctas.txt").write_text(ZCTAS)
+    db = tmp_path / "gazetteer.sqlite"
+    total = build_gazetteer(db, [str(tmp_path / "x_place_catalog.csv")], str(tmp_path / "places.txt"),
+                            str(tmp_path / "zctas.txt"))
+    assert total == 8
+
+    monkeypatch.setenv("HOMEFIT_GAZETTEER_DB_PATH", str(db))
+    gazetteer.reset()
+    monkeypatch.setattr(geocoding.http_client, "get", lambda *a, **k: pytest.fail("no network"))
+    yield db
+    gazetteer.reset()
+
+
+def test_town_and_zip_queries(store):
+    lat, lon, zip_code, state, city, full = geocoding.geocode_with_full_result.__wrapped__("Larchmont, NY")
+    assert (lat, lon, city, state) == (40.9276, -73.7518, "Larchmont", "New York")  # catalog wins
+    assert full["address"]["town"] == "Larchmont" and full["source"] == "local_gazetteer"
+
+    assert geocoding.geocode.__wrapped__("10538") == (40.934, -73.757, "10538", "New York", "Larchmont")
+    assert geocoding.geocode.__wrapped__("Saint Louis, Missouri")[4] == "St. Louis"
+    assert geocoding.geocode.__wrapped__("New York, NY")[:2] == (40.6635, -73.9387)
+
+
+def test_neighborhood_context_and_scope(store):
+    lat, lon, _zip, state, city, full = geocoding.geocode_with_full_result.__wrapped__(
+        "Tribeca, Manhattan, New York"
+    )
+    assert (lat, lon, city) == (40.7163, -74.0086, "New York")
+    assert full["address"]["neighbourhood"] == "Tribeca"
+    assert detect_location_scope(lat, lon, full) == "neighborhood"
+    assert gazetteer.lookup("Tribeca, Brooklyn, NY") is None  # context mismatch -> network
+
+
+def test_ambiguous_and_unsupported_queries_fall_through(store):
+    assert gazetteer.lookup("Franklin") is None  # OR and NJ candidates, no state
+    assert gazetteer.lookup("Franklin, NJ")[4] == "Franklin"
+    assert gazetteer.lookup("10 Main St, Larchmont, NY") is None  # street address -> Census
+    assert gazetteer.lookup("New York") is None  # bare state
+    assert gazetteer.lookup("Springfield, IL") is None  # not indexed
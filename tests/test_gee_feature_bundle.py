@@ -0,0 +1,101 @@
+"""GEE feature bundle: natural beauty's GEE consumers read one resolved bundle (no Earth Engine calls)."""
+
+import pytest
+
+from data_sources import gee_api
+
+LAT, LON = 35.6, -82.55
+
+BUNDLE = {
+    "version": gee_api.GEE_FEATURE_BUNDLE_VERSION,
+    "nlcd_tcc_year": 2023,
+    "canopy": {
+        "1000": {"tcc": 20.0, "hansen": 30.0, "forest": 0.1},
+        "2000": {"tcc": 40.0, "hansen": 95.0, "forest": None},
+        "3000": {"tcc": None, "hansen": 12.0, "forest": 0.25},
+    },
+    "landcover": {"nlcd": {"41": 50, "11": 25, "21": 25}, "worldcover": None},
+    "topography": {
+        "dem": {"elevation_mean": 700.0, "elevation_min": 600.0, "elevation_max": 1100.0,
+                "elevation_p10": 620.0, "elevation_p90": 1000.0},
+        "slope": {"slope_mean": 12.0, "slope_max": 40.0, "slope_stdDev": 6.0, "slope_p85": 20.0},
+        "steep": {"slope": 0.3},
+        "dem_std": {"elevation": 90.0},
+        "center": {"elevation": 800.0},
+        "surrounding": {"elevation": 650.0},
+    },
+    "greenness": {
+        "size": 42,
+        "ndvi": {"mean": {"tree": 0.35, "ndvi": 0.5, "green": 0.6},
+                 "seasons": [0.3, None, 0.6, 0.5], "visible": 0.45},
+        "recent": {"health": {"NDVI": 0.5, "VARI": 0.15},
+                   "street": {"NDVI": 0.55, "vegetation_mask": 0.4}},
+    },
+}
+
+
+@pytest.fixture
+def bundle(monkeypatch):
+    calls = []
+
+    def fake_fetch(lat, lon, version):
+        calls.append((lat, lon, version))
+        return BUNDLE
+
+    monkeypatch.setattr(gee_api, "GEE_AVAILABLE", True)
+    monkeypatch.setattr(gee_api, "FEATURE_BUNDLE_ENABLED", True)
+    monkeypatch.setattr(gee_api, "_fetch_feature_bundle", fake_fetch)
+    monkeypatch.setattr(gee_api, "_bundle_failures", {})
+    monkeypatch.setattr(gee_api, "_nlcd_tcc_year_cache", None)
+    return calls
+
+
+def test_canopy_radii_read_the_bundle(bundle):
+    canopy = gee_api.get_tree_canopy_gee.__wrapped__
+    # Hansen 10 points above NLCD TCC: compensates for NLCD underestimation.
+    assert canopy(LAT, LON, 1000) == 30.0
+    # Hansen validation is capped at 90%.
+    assert canopy(LAT, LON, 2000) == 90.0
+    # No NLCD TCC: highest fallback source.
+    assert canopy(LAT, LON, 3000) == 25.0
+    assert bundle == [(LAT, LON, gee_api.GEE_FEATURE_BUNDLE_VERSION)] * 3
+    assert gee_api._nlcd_tcc_year_cache == 2023
+
+
+def test_landcover_topography_and_greenness_read_the_bundle(bundle):
+    landcover = gee_api.get_landcover_context_gee.__wrapped__(LAT, LON, 3000)
+    assert landcover["source"] == "NLCD 2021"
+    assert (landcover["forest_pct"], landcover["water_pct"], landcover["developed_pct"]) == (50.0, 25.0, 25.0)
+
+    topo = gee_api.get_topography_context(LAT, LON, 5000)
+    assert topo["relief_range_m"] == 500.0
+    assert topo["terrain_prominence_m"] == 150.0
+    assert topo["ruggedness_index_m"] == 90.0
+    assert topo["steep_fraction"] == 0.3
+
+    green = gee_api.get_urban_greenness_gee(LAT, LON, 1000)
+    assert green["tree_canopy_pct"] == pytest.approx(35.0)
+    assert green["seasonal_variation"] == pytest.approx(0.3)
+    assert green["street_level_ndvi"] == 0.55
+    assert green["semantic_gvi"] == 40.0
+    assert green["vegetation_health_vari"] == 0.15
+
+
+def test_greenness_without_scenes_returns_none(bundle, monkeypatch):
+    empty = dict(BUNDLE, greenness={"size": 0, "ndvi": None, "recent": None})
+    monkeypatch.setattr(gee_api, "_fetch_feature_bundle", lambda *a: empty)
+    assert gee_api.get_urban_greenness_gee(LAT, LON, 1000) is None
+
+
+def test_bundle_failures_expire_on_insert(bundle, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(gee_api.time, "time", lambda: now[0])
+    for i in range(50):
+        gee_api._note_bundle_failure(LAT + i / 1000, LON)
+    assert len(gee_api._bundle_failures) == 50
+    assert gee_api.get_feature_bundle(LAT, LON) is None  # within the retry window
+
+    now[0] += gee_api._FEATURE_BUNDLE_RETRY_SECONDS
+    gee_api._note_bundle_failure(0.0, 0.0)  # an outage keeps failing: old entries go
+    assert list(gee_api._bundle_failures) == [(0.0, 0.0)]
+    assert gee_api.get_feature_bundle(LAT, LON) == BUNDLE
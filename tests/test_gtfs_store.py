@@ -0,0 +1,153 @@
+"""Local GTFS store: stops, routes and per-stop schedule metrics from a GTFS zip (no Transitland)."""
+
+import zipfile
+from datetime import date
+
+import pytest
+
+from data_sources import gtfs_store, transitland_api
+from pillars import public_transit_access
+from scripts.baselines.build_gtfs_store import basic_route_type, build_store
+
+LAT, LON = 41.0, -73.8
+
+FEED = {
+    "agency.txt": "agency_id,agency_name\nMNR,Metro-North Railroad\n",
+    "routes.txt": (
+        "route_id,agency_id,route_short_name,route_long_name,route_type\n"
+        "HARLEM,MNR,,Harlem,2\n"
+        "BX1,MNR,1,Local Bus,700\n"
+    ),
+    "stops.txt": (
+        "stop_id,stop_name,stop_lat,stop_lon,location_type,parent_station\n"
+        "STA,Station,41.0,-73.8,1,\n"
+        "P1,Station Platform,41.001,-73.8,0,STA\n"
+        "B1,Main St,41.0,-73.79,0,\n"
+        "FAR,Far Away,41.2,-73.6,0,\n"
+        "SW,Southwest Yard,40.8,-74.0,0,\n"
+        "GCT,Grand Central Terminal,40.9,-73.9,1,\n"
+        "GCT1,Track 1,40.9,-73.9,0,GCT\n"
+    ),
+    "calendar.txt": (
+        "service_id,monday,tuesday,wednesday,thursday,friday,saturday,sunday,start_date,end_date\n"
+        "WK,1,1,1,1,1,0,0,20260101,20261231\n"
+        "SA,0,0,0,0,0,1,0,20260101,20261231\n"
+    ),
+    "trips.txt": (
+        "route_id,service_id,trip_id,trip_headsign\n"
+        + "".join(f"HARLEM,WK,w{i},Grand Central\n" for i in range(6))
+        + "HARLEM,SA,s0,Grand Central\nHARLEM,SA,s1,Southeast\n"
+        + "BX1,WK,b0,Downtown\n"
+    ),
+    "stop_times.txt": (
+        "trip_id,arrival_time,departure_time,stop_id,stop_sequence\n"
+        # Weekday platform departures 07:00-07:45 every 15 min, a midday train and one past midnight.
+        + "".join(f"w{i},07:{15 * i:02d}:00,07:{15 * i:02d}:00,P1,1\n" for i in range(4))
+        + "w4,12:00:00,12:00:00,P1,1\nw5,25:10:00,25:10:00,P1,1\n"
+        + "w0,07:50:00,07:50:00,GCT1,2\n"
+        + "s0,09:00:00,09:00:00,P1,1\ns1,10:00:00,10:00:00,P1,1\n"
+        + "b0,12:00:00,12:00:00,B1,1\nb0,12:30:00,12:30:00,FAR,2\n"
+    ),
+}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    feed = tmp_path / "mnr.zip"
+    with zipfile.ZipFile(feed, "w") as zf:
+        for name, text in FEED.items():
+            zf.writestr(name, text)
+    db = tmp_path / "gtfs.sqlite"
+    assert build_store([str(feed)], db, date(2026, 3, 9)) == 5
+
+    monkeypatch.setenv("HOMEFIT_GTFS_DB_PATH", str(db))
+    gtfs_store.reset()
+    yield db
+    gtfs_store.reset()
+
+
+def test_nearby_stops_match_transitland_shape(store, monkeypatch):
+    monkeypatch.setattr(transitland_api.http_client, "get", lambda *a, **k: pytest.fail("no network"))
+    result = transitland_api.get_nearby_transit_stops(LAT, LON, radius_m=1500)
+    assert [s["id"] for s in result["all_stops"]] == ["gtfs:mnr:P1", "gtfs:mnr:B1"]
+    assert result["stops"][0]["route_type"] == 2
+    assert result["stops"][1]["route_type"] == 3
+    assert result["summary"]["within_400m"] == 1
+    # Outside every feed extent: Transitland path.
+    assert gtfs_store.nearby_stops(LAT, LON, 50_000) is None
+
+
+def test_nearby_routes_located_at_nearest_stop(store):
+    routes = public_transit_access._get_nearby_routes(LAT, LON, radius_m=1500)
+    assert [(r["route_id"], r["route_type"], r["agency"]) for r in routes] == [
+        ("gtfs:mnr:HARLEM", 2, "Metro-North Railroad"),
+        ("gtfs:mnr:BX1", 3, "Metro-North Railroad"),
+    ]
+    assert routes[0]["distance_km"] == pytest.approx(0.111, abs=0.001)
+
+
+def test_stop_schedule_precomputed(store, monkeypatch):
+    monkeypatch.setattr(transitland_api.http_client, "get", lambda *a, **k: pytest.fail("no network"))
+    schedule = transitland_api.get_route_schedules("gtfs:mnr:HARLEM", sample_stop_id="gtfs:mnr:P1")
+    assert schedule["weekday_trips"] == 6
+    assert schedule["weekend_trips"] == 2
+    # Same rule as the Transitland path: gaps starting in 07-09 / 17-19 are peak.
+    assert schedule["peak_headway_minutes"] == 75.0
+    assert schedule["off_peak_headway_minutes"] == 790.0
+    assert (schedule["first_departure"], schedule["last_departure"]) == ("07:00", "25:10")
+    assert schedule["headsigns"] == ["Grand Central"]
+    assert transitland_api.get_stop_departures("gtfs:mnr:P1") is None
+
+
+def test_extended_route_types_map_to_basic():
+    assert [basic_route_type(v) for v in ("3", "109", "401", "700", "900", "1000", "x")] == [3, 2, 1, 3, 0, 4, None]
+
+
+def test_frequency_index_rows(store):
+    rows = gtfs_store.stop_frequency(["gtfs:mnr:P1", "gtfs:mnr:B1", "gtfs:mnr:SW", "s-transitland-id"])
+    assert sorted(rows) == ["gtfs:mnr:B1", "gtfs:mnr:P1"]  # SW has no weekday service
+    assert rows["gtfs:mnr:P1"]["destinations"] == ["Grand Central Terminal"]  # parent station name
+    assert rows["gtfs:mnr:P1"]["route_type_mix"] == {2: 6}
+    assert rows["gtfs:mnr:B1"]["destinations"] == ["Far Away"]
+    assert rows["gtfs:mnr:B1"]["route_type_mix"] == {3: 1}
+
+
+def test_commuter_rail_bonuses_skip_a_nearer_subway_stop(tmp_path, monkeypatch):
+    from data_sources import census_api, data_quality
+
+    # A subway-only stop (route_type 1) 22 m away, nearer than the commuter-rail platform P1.
+    feed = dict(FEED)
+    feed["routes.txt"] += "SUB,MNR,S,Shuttle,1\n"
+    feed["stops.txt"] += "SUBW,Shuttle Stop,41.0002,-73.8,0,\nYARD,Shuttle Yard,40.95,-73.85,0,\n"
+    feed["trips.txt"] += "".join(f"SUB,WK,u{i},Shuttle Yard\n" for i in range(40))
+    feed["stop_times.txt"] += "".join(
+        f"u{i},{6 + i // 4:02d}:{15 * (i % 4):02d}:00,{6 + i // 4:02d}:{15 * (i % 4):02d}:00,SUBW,1\n"
+        f"u{i},{7 + i // 4:02d}:{15 * (i % 4):02d}:00,{7 + i // 4:02d}:{15 * (i % 4):02d}:00,YARD,2\n"
+        for i in range(40)
+    )
+    path = tmp_path / "mnr.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, text in feed.items():
+            zf.writestr(name, text)
+    build_store([str(path)], tmp_path / "gtfs.sqlite", date(2026, 3, 9))
+    monkeypatch.setenv("HOMEFIT_GTFS_DB_PATH", str(tmp_path / "gtfs.sqlite"))
+    gtfs_store.reset()
+    monkeypatch.setattr(transitland_api.http_client, "get", lambda *a, **k: pytest.fail("no network"))
+    monkeypatch.setattr(data_quality, "get_population_density", lambda *a, **k: 2000.0)
+    for name in ("get_commute_time", "get_commute_time_stable"):
+        monkeypatch.setattr(census_api, name, lambda *a, **k: 25.0)
+    monkeypatch.setattr(census_api, "get_transit_mode_share", lambda *a, **k: 0.2)
+    try:
+        stops = transitland_api.get_nearby_transit_stops(LAT, LON, radius_m=1500)["stops"]
+        assert stops[0]["id"] == "gtfs:mnr:SUBW"
+
+        _, breakdown = public_transit_access.get_public_transit_score(
+            LAT, LON, area_type="suburban", city="Scarsdale", density=2000.0)
+    finally:
+        gtfs_store.reset()
+    bonuses = breakdown["breakdown"]
+    # P1's index row: 6 weekday trips at a 75 min peak headway, 2 on the weekend, to Grand Central.
+    assert bonuses["frequency_bonus"] == round(public_transit_access._calculate_frequency_bonus(6, 75.0), 1)
+    assert bonuses["weekend_service_bonus"] == 1.0
+    assert bonuses["hub_connectivity_bonus"] == 5.0
+    assert bonuses["destination_diversity_bonus"] == 0.4
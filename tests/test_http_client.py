@@ -0,0 +1,45 @@
+"""Pooled HTTP client against a local keep-alive server (no external network)."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data_sources import http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    peers = []
+
+    def do_GET(self):
+        self.peers.append(self.client_address[1])
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "sid=abc; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.peers = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    http_client.close_sync_session()
+
+
+def test_sync_calls_reuse_one_connection_and_drop_cookies(server):
+    assert http_client.get(f"{server}/a", timeout=5).json() == {"path": "/a"}
+    assert http_client.get(f"{server}/b", timeout=5).json() == {"path": "/b"}
+    assert len(set(_Handler.peers)) == 1  # second call reused the pooled socket
+    assert len(http_client.sync_session().cookies) == 0
+
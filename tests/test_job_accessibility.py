@@ -0,0 +1,66 @@
+"""Job accessibility: grid_disk neighbourhood lookup matches a full-grid gravity scan."""
+
+import math
+
+import h3
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from data_sources import job_accessibility as ja
+from data_sources import lodes_h8_table
+from data_sources.utils import haversine_distance
+
+
+@pytest.fixture
+def grid(tmp_path, monkeypatch):
+    rng = np.random.default_rng(7)
+    # Job hexes scattered over ~300 km around NYC, so some lie beyond the 75 km cutoff.
+    lats = 40.7 + rng.uniform(-1.4, 1.4, 3000)
+    lons = -74.0 + rng.uniform(-1.8, 1.8, 3000)
+    cells = sorted({h3.latlng_to_cell(a, b, 8) for a, b in zip(lats, lons)})
+    jobs = rng.integers(1, 5000, len(cells))
+    path = tmp_path / "lodes_h8_commuter.parquet"
+    pq.write_table(pa.table({"h8": cells, "workplace_jobs": jobs, "rac_c000": jobs, "wrr_jobs": [1.0] * len(cells)}), path)
+
+    monkeypatch.setenv("LODES_H8_COMMUTER_PARQUET", str(path))
+    monkeypatch.setenv("HOMEFIT_LODES_H8_DIR", str(tmp_path / "lodes_h8"))
+    lodes_h8_table.reset()
+    ja.reset()
+    yield cells, jobs
+    lodes_h8_table.reset()
+    ja.reset()
+
+
+def _full_scan(cells, jobs, lat, lon):
+    total, hit = 0.0, False
+    for c, j in zip(cells, jobs):
+        d = haversine_distance(lat, lon, *h3.cell_to_latlng(c)) / 1000.0
+        if d < ja.CUTOFF_KM:
+            hit = True
+            total += j * math.exp(-d / ja.D0_KM)
+    return total if hit else None
+
+
+POINTS = [(40.75, -73.99), (41.9, -72.4), (39.5, -75.5), (45.0, -70.0)]
+
+
+def test_neighbourhood_lookup_matches_full_scan(grid):
+    cells, jobs = grid
+    for lat, lon in POINTS:
+        expected = _full_scan(cells, jobs, lat, lon)
+        got = ja.gravity_jobs(lat, lon)
+        assert (got is None) == (expected is None)
+        if expected is not None:
+            assert got == pytest.approx(expected, rel=1e-9)
+    assert ja.gravity_jobs(45.0, -70.0) is None  # far outside the grid
+
+
+def test_batch_matches_single_and_reuses_export(grid, tmp_path):
+    single = [ja.job_access_score(lat, lon) for lat, lon in POINTS]
+    assert (tmp_path / "lodes_h8" / "manifest.json").exists()
+    lodes_h8_table.reset()
+    ja.reset()
+    assert ja.job_access_score_many(POINTS) == single
+    assert ja.gravity_jobs_many([]) == []
@@ -0,0 +1,62 @@
+"""LocalDB: per-thread read-only connections, closed on every thread by reset()."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from data_sources.local_sqlite import LocalDB, bbox
+from data_sources.utils import haversine_distance
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = tmp_path / "x.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t(v)")
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.commit()
+    conn.close()
+    monkeypatch.setenv("HOMEFIT_TEST_DB_PATH", str(path))
+    local = LocalDB("HOMEFIT_TEST_DB_PATH", tmp_path / "missing.sqlite", "test store")
+    yield local
+    local.reset()
+
+
+def test_reset_closes_connections_opened_on_other_threads(db):
+    main_conn = db.connect()
+    assert db.connect() is main_conn
+    worker = {}
+    ready, release = threading.Event(), threading.Event()
+
+    def run():
+        worker["conn"] = db.connect()
+        ready.set()
+        release.wait(5)
+
+    t = threading.Thread(target=run)
+    t.start()
+    ready.wait(5)
+    assert worker["conn"] is not main_conn
+    db.reset()
+    release.set()
+    t.join()
+    for conn in (main_conn, worker["conn"]):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert db.connect().execute("SELECT v FROM t").fetchone() == (1,)
+    with pytest.raises(sqlite3.OperationalError):
+        db.connect().execute("INSERT INTO t VALUES (2)")  # read-only
+
+
+def test_missing_file_disables_backend(db, monkeypatch):
+    monkeypatch.delenv("HOMEFIT_TEST_DB_PATH")
+    db.reset()
+    assert db.connect() is None
+
+
+def test_bbox_contains_radius():
+    lat, lon = 40.7, -74.0
+    min_lat, min_lon, max_lat, max_lon = bbox(lat, lon, 5000)
+    assert haversine_distance(lat, lon, max_lat, lon) >= 5000
+    assert haversine_distance(lat, lon, lat, max_lon) >= 5000
@@ -0,0 +1,70 @@
+"""Shared LODES H8 table: one memory-mapped export feeds the commuter boost lookup."""
+
+import h3
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from data_sources import lodes_h8_table
+from data_sources.lodes_h8_commuter_context import compute_commuter_denominator_boost
+
+CBD = (40.7075, -74.0113)
+SUBURB = (40.85, -73.80)
+
+
+@pytest.fixture
+def parquet(tmp_path, monkeypatch):
+    cells = [h3.latlng_to_cell(*CBD, 8), h3.latlng_to_cell(*SUBURB, 8), None]
+    path = tmp_path / "lodes_h8_commuter.parquet"
+    pq.write_table(
+        pa.table({
+            "h8": cells,
+            "workplace_jobs": pa.array([90_000, 300, 5], type=pa.int64()),
+            "rac_c000": pa.array([1_500, 1_200, 5], type=pa.int64()),
+            "wrr_jobs": [60.0, 0.25, 1.0],
+        }),
+        path,
+    )
+    monkeypatch.setenv("LODES_H8_COMMUTER_PARQUET", str(path))
+    monkeypatch.setenv("HOMEFIT_LODES_H8_DIR", str(tmp_path / "lodes_h8"))
+    lodes_h8_table.reset()
+    yield path
+    lodes_h8_table.reset()
+
+
+def test_export_is_sorted_and_memory_mapped(parquet, tmp_path):
+    table = lodes_h8_table.get_table()
+    assert len(table) == 2  # null cell ids dropped
+    assert list(table.h8) == sorted(table.h8)
+    assert table.workplace_jobs.filename is not None  # np.memmap, not an in-process copy
+    assert table.find(h3.latlng_to_cell(*CBD, 8)) is not None
+    assert table.find(h3.latlng_to_cell(34.05, -118.25, 8)) is None
+
+    lodes_h8_table.reset()
+    stamp = (tmp_path / "lodes_h8" / "h8.npy").stat().st_mtime_ns
+    assert len(lodes_h8_table.get_table()) == 2
+    assert (tmp_path / "lodes_h8" / "h8.npy").stat().st_mtime_ns == stamp  # reused, not re-exported
+
+
+def test_commuter_boost_reads_shared_table(parquet):
+    mult, meta = compute_commuter_denominator_boost(*CBD, violent_per_1k=5.0, property_per_1k=80.0)
+    assert meta["h8_available"] and meta["commuter_denominator_boost"]
+    assert meta["workplace_jobs"] == 90_000 and meta["rac_c000"] == 1_500
+    assert mult == pytest.approx(min(1.0 + 1.7781512503836436, 3.5))
+    assert "extreme_workplace_jobs_ratio" in meta["flags"]
+
+    mult, meta = compute_commuter_denominator_boost(*SUBURB, violent_per_1k=5.0, property_per_1k=80.0)
+    assert mult == 1.0 and meta["wrr_jobs"] == 0.25
+
+    _, meta = compute_commuter_denominator_boost(34.05, -118.25, violent_per_1k=5.0, property_per_1k=80.0)
+    assert meta["flags"] == ["h8_unknown_cell"]
+
+
+def test_missing_parquet_disables_table(tmp_path, monkeypatch):
+    monkeypatch.setenv("LODES_H8_COMMUTER_PARQUET", str(tmp_path / "absent.parquet"))
+    lodes_h8_table.reset()
+    assert lodes_h8_table.get_table() is None
+    assert compute_commuter_denominator_boost(*CBD, violent_per_1k=1.0, property_per_1k=1.0) == (
+        1.0, {"h8_available": False, "wrr_jobs": None, "commuter_denominator_boost": False, "flags": []}
+    )
+    lodes_h8_table.reset()
@@ -0,0 +1,59 @@
+"""NRHP lookup: exact radius filter and nearest distance in SQLite agree with haversine."""
+
+import sqlite3
+
+import pytest
+
+from data_sources import nrhp
+from data_sources.utils import haversine_distance
+from scripts.baselines.build_nrhp_db import _init_db, _insert_rows
+
+LAT, LON = 40.6782, -73.9442
+
+# Ring of listings at increasing distance, including bbox corners outside the radius.
+SITES = [
+    (LAT + 0.001, LON),
+    (LAT, LON + 0.01),
+    (LAT - 0.015, LON),
+    (LAT + 0.017, LON + 0.022),  # inside the bbox, ~2.6 km away
+    (LAT + 0.05, LON),
+]
+
+
+def _build(path, with_vectors=True):
+    conn = sqlite3.connect(str(path))
+    _init_db(conn)
+    rows = [(i + 1, f"ref{i}", f"Site {i}", "building", 0, "Listed", "NY", lat, lon) for i, (lat, lon) in enumerate(SITES)]
+    _insert_rows(conn, rows)
+    if not with_vectors:
+        conn.execute("CREATE TABLE legacy AS SELECT id, nris_refnum, name, res_type, is_nhl, status, state, lat, lon FROM nrhp")
+        conn.execute("DROP TABLE nrhp")
+        conn.execute("ALTER TABLE legacy RENAME TO nrhp")
+    conn.commit()
+    conn.execute("PRAGMA journal_mode=DELETE;")
+    conn.close()
+
+
+@pytest.fixture(params=[True, False], ids=["sql_filter", "legacy_db"])
+def db(request, tmp_path, monkeypatch):
+    path = tmp_path / "nrhp.sqlite"
+    _build(path, with_vectors=request.param)
+    monkeypatch.setenv("NRHP_DB_PATH", str(path))
+    nrhp.reset()
+    yield request.param
+    nrhp.reset()
+
+
+def test_radius_count_and_nearest_match_haversine(db):
+    assert nrhp._has_unit_vectors() is db
+    for radius in (500, 1000, 2000, 3000):
+        expected = [d for d in (haversine_distance(LAT, LON, la, lo) for la, lo in SITES) if d <= radius]
+        result = nrhp.query_nrhp(LAT, LON, radius_m=radius)
+        assert result["count"] == len(expected)
+        assert result["nearest_distance_m"] == round(min(expected), 0)
+
+
+def test_batch_matches_single_queries(db):
+    points = [(LAT, LON), (LAT + 0.05, LON), (10.0, 10.0)]
+    assert nrhp.query_nrhp_many(points, radius_m=2000) == [nrhp.query_nrhp(la, lo, 2000) for la, lo in points]
+    assert nrhp.query_nrhp_many([(10.0, 10.0)])[0]["nearest_distance_m"] is None
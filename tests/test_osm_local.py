@@ -0,0 +1,84 @@
+"""Local OSM extract backend: build a tiny store and answer consumer queries without Overpass."""
+
+import sqlite3
+
+import pytest
+
+from data_sources import osm_api, osm_local
+from scripts.baselines.build_osm_extract import OsmExtractWriter, _init_db, load_overpass_json
+
+LAT, LON = 40.6782, -73.9442
+
+
+@pytest.fixture
+def extract_db(tmp_path, monkeypatch):
+    elements = [
+        # Park way crossing the center; its corner nodes are ~1.1km away.
+        {"type": "way", "id": 100, "nodes": [1, 2], "tags": {"leisure": "park", "name": "Strip Park"}},
+        {"type": "node", "id": 1, "lat": LAT - 0.01, "lon": LON},
+        {"type": "node", "id": 2, "lat": LAT + 0.01, "lon": LON},
+        # Playground node ~1.7km north, and an untagged-for-parks cafe at the center.
+        {"type": "node", "id": 3, "lat": LAT + 0.015, "lon": LON, "tags": {"leisure": "playground"}},
+        {"type": "node", "id": 4, "lat": LAT, "lon": LON, "tags": {"amenity": "cafe"}},
+        # Multipolygon park whose outer way is untagged.
+        {"type": "way", "id": 200, "nodes": [5, 6, 7, 5]},
+        {"type": "node", "id": 5, "lat": LAT + 0.002, "lon": LON + 0.002},
+        {"type": "node", "id": 6, "lat": LAT + 0.003, "lon": LON + 0.002},
+        {"type": "node", "id": 7, "lat": LAT + 0.003, "lon": LON + 0.003},
+        {"type": "relation", "id": 300, "members": [{"type": "way", "ref": 200, "role": "outer"}],
+         "tags": {"type": "multipolygon", "leisure": "park"}},
+    ]
+    path = tmp_path / "osm_extract.sqlite"
+    conn = sqlite3.connect(str(path))
+    _init_db(conn)
+    writer = OsmExtractWriter(conn)
+    load_overpass_json(writer, elements)
+    writer.add_extent("test", LAT - 0.2, LON - 0.2, LAT + 0.2, LON + 0.2)
+    writer.finish()
+    conn.close()
+
+    monkeypatch.setenv("OSM_LOCAL_DB_PATH", str(path))
+    osm_local.reset()
+    yield path
+    osm_local.reset()
+
+
+def _ids(elements, etype):
+    return sorted(e["id"] for e in elements if e["type"] == etype and e.get("tags"))
+
+
+def test_green_spaces_answered_locally_with_radius_filter(extract_db):
+    got = osm_api._bundle_elements(osm_api._green_spaces_query(LAT, LON, 1000), LAT, LON)
+    assert _ids(got, "way") == [100]
+    assert _ids(got, "relation") == [300]
+    assert _ids(got, "node") == []
+
+    got = osm_api._bundle_elements(osm_api._green_spaces_query(LAT, LON, 2000), LAT, LON)
+    assert _ids(got, "node") == [3]
+
+
+def test_relation_center_and_body_from_member_ways(extract_db):
+    got = osm_local.local_elements(osm_api._green_spaces_query(LAT, LON, 1000), LAT, LON)
+    rel = [e for e in got if e["type"] == "relation"][0]
+    assert rel["center"]["lat"] == pytest.approx(LAT + 0.0025)
+    assert rel["members"][0]["ref"] == 200
+    # `out body center` keeps way node refs but, without `>;`, no skeleton nodes.
+    way = [e for e in got if e["type"] == "way"][0]
+    assert way["nodes"] == [1, 2]
+    assert [e for e in got if e["type"] == "node" and not e.get("tags")] == []
+
+
+def test_outside_extent_falls_back(extract_db):
+    assert osm_local.local_elements(osm_api._water_features_query(LAT, LON, 25000), LAT, LON) is None
+    assert osm_local.local_elements(osm_api._green_spaces_query(LAT + 1.0, LON, 1000), LAT + 1.0, LON) is None
+    assert osm_local.covers(LAT, LON, 15000)
+
+
+def test_disabled_without_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("OSM_LOCAL_DB_PATH", str(tmp_path / "missing.sqlite"))
+    osm_local.reset()
+    try:
+        assert osm_local.local_elements(osm_api._green_spaces_query(LAT, LON, 1000), LAT, LON) is None
+        assert not osm_local.covers(LAT, LON, 100)
+    finally:
+        osm_local.reset()
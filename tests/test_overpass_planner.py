@@ -0,0 +1,161 @@
+"""Unit tests for the per-location Overpass union planner (no live Overpass calls)."""
+
+import unittest
+from unittest.mock import patch
+
+from data_sources import osm_api, overpass_planner
+from data_sources.overpass_planner import LocationBundle, parse_query, plan_unions
+
+LAT, LON = 40.6782, -73.9442
+
+
+def _node(eid, lat, lon, **tags):
+    return {"type": "node", "id": eid, "lat": lat, "lon": lon, "tags": tags}
+
+
+class TestParseQuery(unittest.TestCase):
+    def test_every_statement_of_each_consumer_is_parsed(self):
+        for query in [
+            osm_api._green_spaces_query(LAT, LON, 1000),
+            osm_api._nature_features_query(LAT, LON, 15000, True),
+            osm_api._water_features_query(LAT, LON, 15000),
+            osm_api._charm_features_query(LAT, LON, 1000),
+            osm_api._civic_nodes_query(LAT, LON, 800),
+            osm_api._local_businesses_query(LAT, LON, 1500, False, True),
+            osm_api._railway_stations_query(LAT, LON, 2500),
+        ]:
+            expected = sum(
+                1 for ln in query.splitlines()
+                if "(around:" in ln and not ln.strip().startswith("//")
+            )
+            selectors, _ = parse_query(query)
+            self.assertEqual(len(selectors), expected)
+
+    def test_filters_and_output_mode(self):
+        selectors, mode = parse_query(osm_api._green_spaces_query(LAT, LON, 1000))
+        garden = [s for s, _ in selectors if s.key == 'way["leisure"="garden"]["garden:type"!="private"]']
+        self.assertEqual(len(garden), 1)
+        self.assertEqual(garden[0].filters, [("leisure", "=", "garden"), ("garden:type", "!=", "private")])
+        self.assertEqual(mode, {"body": True, "center": True, "recurse": False})
+
+        _, mode = parse_query(osm_api._nature_features_query(LAT, LON, 15000))
+        self.assertEqual(mode, {"body": False, "center": True, "recurse": False})
+
+    def test_negated_regex_matches_absent_key(self):
+        selectors, _ = parse_query(osm_api._local_businesses_query(LAT, LON, 1000, include_chains=False))
+        cafe = [s for s, _ in selectors if s.key.startswith('node["amenity"="cafe"]')][0]
+        self.assertTrue(cafe.matches(_node(1, LAT, LON, amenity="cafe")))
+        self.assertFalse(cafe.matches(_node(2, LAT, LON, amenity="cafe", brand="Starbucks")))
+
+
+class TestPlanUnions(unittest.TestCase):
+    def test_shared_selectors_collapse_to_largest_radius(self):
+        groups = plan_unions([
+            osm_api._green_spaces_query(LAT, LON, 800),
+            osm_api._green_spaces_query(LAT, LON, 2000),
+            osm_api._water_features_query(LAT, LON, 15000),
+        ])
+        self.assertEqual(len(groups), 2)
+        local, regional = groups
+        self.assertTrue(all(r == 2000 for _, r in local))
+        self.assertTrue(all(r == 15000 for _, r in regional))
+        keys = [s.key for s, _ in local]
+        self.assertEqual(len(keys), len(set(keys)))
+
+
+class TestLocationBundle(unittest.TestCase):
+    def setUp(self):
+        overpass_planner.clear_bundles()
+
+    def tearDown(self):
+        overpass_planner.clear_bundles()
+
+    def _bundle(self, query, elements):
+        selectors, _ = parse_query(query)
+        coverage = {s.key: (s, r) for s, r in selectors}
+        return LocationBundle(LAT, LON, elements, coverage)
+
+    def test_extract_filters_by_consumer_radius_and_tags(self):
+        near = _node(1, LAT + 0.001, LON, leisure="playground")      # ~110m
+        far = _node(2, LAT + 0.015, LON, leisure="playground")       # ~1.7km
+        cafe = _node(3, LAT, LON, amenity="cafe")
+        bundle = self._bundle(osm_api._green_spaces_query(LAT, LON, 2000), [near, far, cafe])
+        overpass_planner.register_bundle(bundle)
+
+        got = overpass_planner.planned_elements(osm_api._green_spaces_query(LAT, LON, 1000), LAT, LON)
+        self.assertEqual([e["id"] for e in got], [1])
+        got = overpass_planner.planned_elements(osm_api._green_spaces_query(LAT, LON, 2000), LAT, LON)
+        self.assertEqual(sorted(e["id"] for e in got), [1, 2])
+
+    def test_uncovered_radius_or_selector_falls_back(self):
+        bundle = self._bundle(osm_api._green_spaces_query(LAT, LON, 1000), [])
+        overpass_planner.register_bundle(bundle)
+        self.assertIsNone(overpass_planner.planned_elements(osm_api._green_spaces_query(LAT, LON, 2000), LAT, LON))
+        self.assertIsNone(overpass_planner.planned_elements(osm_api._charm_features_query(LAT, LON, 500), LAT, LON))
+
+    def test_chain_inclusive_fetch_answers_no_chain_query(self):
+        indie = _node(1, LAT, LON, amenity="cafe", name="Indie")
+        chain = _node(2, LAT, LON, amenity="cafe", brand="Starbucks")
+        bundle = self._bundle(osm_api._local_businesses_query(LAT, LON, 1500, True), [indie, chain])
+        overpass_planner.register_bundle(bundle)
+        got = overpass_planner.planned_elements(
+            osm_api._local_businesses_query(LAT, LON, 1000, include_chains=False), LAT, LON
+        )
+        self.assertEqual([e["id"] for e in got if e.get("tags")], [1])
+
+    def test_way_shape_follows_consumer_output_mode(self):
+        # Way crossing the center with nodes outside a 100m circle: segment distance, not nodes.
+        n1 = {"type": "node", "id": 10, "lat": LAT - 0.01, "lon": LON}
+        n2 = {"type": "node", "id": 11, "lat": LAT + 0.01, "lon": LON}
+        way = {"type": "way", "id": 20, "nodes": [10, 11], "center": {"lat": LAT, "lon": LON},
+               "tags": {"waterway": "river"}}
+        bundle = self._bundle(osm_api._water_features_query(LAT, LON, 15000), [way, n1, n2])
+        overpass_planner.register_bundle(bundle)
+
+        got = overpass_planner.planned_elements(osm_api._water_features_query(LAT, LON, 100), LAT, LON)
+        ways = [e for e in got if e["type"] == "way"]
+        self.assertEqual(len(ways), 1)
+        self.assertNotIn("center", ways[0])  # water query uses `out body`, no center
+        self.assertEqual(sorted(e["id"] for e in got if e["type"] == "node"), [10, 11])
+
+
+class TestPrefetch(unittest.TestCase):
+    def setUp(self):
+        overpass_planner.clear_bundles()
+
+    def tearDown(self):
+        overpass_planner.clear_bundles()
+
+    def test_prefetch_issues_one_request_per_group(self):
+        sent = []
+
+        class _Resp:
+            status_code = 200
+            headers = {}
+            text = '{"elements": []}'
+
+            def json(self):
+                return {"elements": []}
+
+        def _fake_post(url, data=None, timeout=None, headers=None):
+            sent.append(data["data"])
+            return _Resp()
+
+        needs = osm_api.bundle_needs_for({"active_outdoors", "neighborhood_amenities"})
+        with patch.object(osm_api.http_client, "post", side_effect=_fake_post), \
+                patch.object(osm_api, "_retry_overpass", side_effect=lambda fn, **kw: fn()):
+            self.assertTrue(osm_api.prefetch_location_bundle(LAT, LON, needs))
+        self.assertEqual(len(sent), 2)  # local (parks + businesses) and regional (nature)
+        self.assertEqual(
+            overpass_planner.planned_elements(osm_api._green_spaces_query(LAT, LON, 800), LAT, LON), []
+        )
+
+    def test_spatially_keyed_consumers_are_not_bundled(self):
+        # query_water_features runs at its H3 cell centre, so a bundle at (LAT, LON) is never read.
+        needs = dict(osm_api.bundle_needs_for(None))
+        self.assertNotIn("water_features", needs)
+        self.assertEqual(needs["green_spaces"], 2000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -373,3 +373,24 @@ def test_integration_ranking_stable():
     # Carroll Gardens should appear in top results with these filters
     names = [r["name"] for r in results[:10]]
     assert any("Carroll" in n for n in names), f"Carroll Gardens missing from top 10: {names}"
+
+
+def test_process_catalog_store_counts_match_jsonl(tmp_path):
+    import catalog_store
+
+    def _row(i):
+        return {"catalog": {"name": f"Place {i}", "state_abbr": "NY"}, "success": i != 4,
+                "score": {"livability_pillars": {"community_safety": {"score": 50.0 + i}},
+                          "status_signal_breakdown": {"archetype": ["Elite", "Quiet", None][i % 3]},
+                          "local_scene_bucket": ["High", "Low", "Some"][i % 3]}}
+
+    path = tmp_path / "x_scores_merged.jsonl"
+    path.write_text("".join(json.dumps(_row(i)) + "\n" for i in range(12)))
+    cfg = {"archetypes": ["Elite", "Quiet"], "local_scene": "Some"}
+    weights = resolve_weights({"community_safety": "High"})
+    from_jsonl: list = []
+    counts = process_catalog(path, cfg, weights, from_jsonl)
+    catalog_store.import_jsonl(path)
+    from_store: list = []
+    assert process_catalog(path, cfg, weights, from_store) == counts == (4, 7)
+    assert from_store == from_jsonl
@@ -0,0 +1,115 @@
+"""Local raster tiles: windowed reads over memmapped .npy tiles feed gee_api's summarizers (no Earth Engine)."""
+
+import json
+
+import numpy as np
+import pytest
+
+from data_sources import gee_api, raster_local
+
+LAT, LON = 40.0, -105.0
+PX = 0.001  # ~111 m x ~85 m pixels
+TILE = 64
+SIZE = 256  # 4 x 4 tiles, bounds +-0.128 deg around the point
+
+
+def _write_layer(root, name, grid, nodata=None, **extra):
+    d = root / name / "tiles"
+    d.mkdir(parents=True)
+    for tr in range(SIZE // TILE):
+        for tc in range(SIZE // TILE):
+            block = grid[tr * TILE:(tr + 1) * TILE, tc * TILE:(tc + 1) * TILE]
+            if nodata is not None and np.all(block == nodata):
+                continue
+            np.save(d / f"r{tr}_c{tc}.npy", block)
+    half = SIZE * PX / 2
+    manifest = {"origin": [LON - half, LAT + half], "pixel_size": [PX, PX], "width": SIZE, "height": SIZE,
+                "tile_size": TILE, "dtype": grid.dtype.name, "nodata": nodata, **extra}
+    with open(root / name / "manifest.json", "w") as f:
+        json.dump(manifest, f)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOMEFIT_RASTER_DIR", str(tmp_path))
+    monkeypatch.setattr(gee_api, "GEE_AVAILABLE", False)
+    raster_local.reset()
+    yield tmp_path
+    raster_local.reset()
+
+
+def test_canopy_and_landcover_from_tiles(store):
+    _write_layer(store, "nlcd_tcc", np.full((SIZE, SIZE), 20, dtype=np.uint8), nodata=255, year=2023)
+    _write_layer(store, "hansen_treecover", np.full((SIZE, SIZE), 30, dtype=np.uint8))
+    landcover = np.full((SIZE, SIZE), 21, dtype=np.uint8)
+    landcover[:, SIZE // 2:] = 41  # east half forest
+    _write_layer(store, "nlcd_landcover", landcover, nodata=0)
+
+    tcc, year, hansen, forest = raster_local.canopy_sources(LAT, LON, 1000)
+    assert (tcc, year, hansen) == (20.0, 2023, 30.0)
+    assert forest == pytest.approx(50.0, abs=5)
+    # Same multi-source validation as the GEE path: highest source compensates for NLCD TCC bias.
+    assert gee_api.get_tree_canopy_gee.__wrapped__(LAT, LON, 1000) == pytest.approx(forest)
+
+    lc = gee_api.get_landcover_context_gee.__wrapped__(LAT, LON, 3000)
+    assert lc["source"] == "NLCD 2021"
+    assert lc["forest_pct"] == pytest.approx(50.0, abs=3)
+    assert lc["forest_pct"] + lc["developed_pct"] == pytest.approx(100.0)
+
+
+def test_topography_slope_from_dem_plane(store):
+    # Elevation rises 1 m per row southwards: slope = atan(1 / 110.54 m) everywhere.
+    dem = np.repeat(np.arange(SIZE, dtype=np.int16)[:, None], SIZE, axis=1) + 1000
+    _write_layer(store, "srtm", dem, nodata=-32768)
+
+    topo = gee_api.get_topography_context(LAT, LON, 5000)
+    assert topo["slope_mean_deg"] == pytest.approx(np.degrees(np.arctan(1 / 110.54)), rel=1e-3)
+    assert topo["steep_fraction"] == 0.0
+    assert topo["relief_range_m"] == pytest.approx(2 * 5000 / 110.54, abs=2)
+    assert topo["elevation_mean_m"] == pytest.approx(1000 + SIZE / 2, abs=1)
+
+
+def test_ghsl_and_heat_exposure(store):
+    heights = np.zeros((SIZE, SIZE), dtype=np.float32)
+    heights[::2, :] = 10.0
+    _write_layer(store, "ghsl_built_height", heights)
+    lst = np.full((SIZE, SIZE), 31.5, dtype=np.float32)
+    lst[:SIZE // 2, :] = -9999  # north half is water
+    _write_layer(store, "lst_jja", lst, nodata=-9999)
+
+    ghsl = gee_api.get_building_height_diversity_ghsl.__wrapped__(LAT, LON, 1000)
+    assert ghsl["mean_height_m"] == pytest.approx(5.0, abs=0.5)
+    assert ghsl["p90_height_m"] == 10.0
+
+    heat = gee_api.get_heat_exposure_lst.__wrapped__(LAT, LON)
+    assert heat["local_lst_c"] == 31.5
+    assert heat["land_pixel_fraction"] == pytest.approx(0.5, abs=0.1)
+
+
+def test_uncovered_disc_falls_back(store):
+    _write_layer(store, "srtm", np.zeros((SIZE, SIZE), dtype=np.int16))
+    assert raster_local.topography_reductions(LAT, LON, 20000) is None  # disc exceeds layer bounds
+    assert raster_local.canopy_sources(LAT, LON, 1000) is None  # layers missing
+    assert gee_api.get_topography_context(LAT, LON, 20000) is None  # GEE unavailable
+
+
+def test_building_height_without_pixels_is_not_covered(store):
+    heights = np.full((SIZE, SIZE), -1.0, dtype=np.float32)  # all nodata: no tiles written
+    _write_layer(store, "ghsl_built_height", heights, nodata=-1.0)
+    assert raster_local.building_height_stats(LAT, LON, 1000) is None
+
+
+def test_built_bounds_are_clipped_to_the_source(store):
+    from scripts.baselines.build_raster_tiles import layer_bounds
+
+    half = SIZE * PX / 2
+    origin, px = (LON - half, LAT + half), (PX, PX)
+    inside = (LAT - 0.05, LON - 0.05, LAT + 0.05, LON + 0.05)
+    assert layer_bounds(inside, origin, px, SIZE, SIZE) == (LON - 0.05, LAT - 0.05, LON + 0.05, LAT + 0.05)
+
+    # Requested bbox reaches a degree past the source on every side: manifest keeps only the grid.
+    bounds = layer_bounds((LAT - 1, LON - 1, LAT + 1, LON + 1), origin, px, SIZE, SIZE)
+    assert bounds == pytest.approx((LON - half, LAT - half, LON + half, LAT + half))
+    _write_layer(store, "srtm", np.full((SIZE, SIZE), 100.0, dtype=np.float32), bounds=list(bounds))
+    layer = raster_local.get_layer("srtm")
+    assert layer.covers(LAT, LON, 5000) and not layer.covers(LAT + 0.12, LON, 5000)
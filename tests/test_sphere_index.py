@@ -0,0 +1,57 @@
+"""SphereIndex: KD-tree nearest / radius queries match a linear haversine scan."""
+
+import numpy as np
+
+from data_sources.regional_baselines import RegionalBaselineManager
+from data_sources.utils import SphereIndex, haversine_distance
+from pillars import healthcare_access
+
+
+def _points(n=2000, seed=7):
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(24.0, 49.0, n).tolist()
+    lons = rng.uniform(-125.0, -67.0, n).tolist()
+    lats[5], lons[5] = None, -100.0  # missing coordinate: skipped
+    lats[6], lons[6] = float("nan"), -100.0
+    lats[8], lons[8] = lats[7], lons[7]  # exact duplicate: ties keep table order
+    return lats, lons
+
+
+def _scan(lats, lons, lat, lon):
+    return [(i, haversine_distance(lat, lon, a, b)) for i, (a, b) in enumerate(zip(lats, lons))
+            if a is not None and np.isfinite(a)]
+
+
+def test_within_and_nearest_match_linear_scan():
+    lats, lons = _points()
+    index = SphereIndex(lats, lons, leaf_size=8)
+    assert len(index) == len(lats) - 2
+    rng = np.random.default_rng(11)
+    queries = [(lats[7], lons[7])] + list(zip(rng.uniform(20, 52, 40), rng.uniform(-130, -60, 40)))
+    for lat, lon in queries:
+        scan = _scan(lats, lons, lat, lon)
+        for radius_m in (0.0, 25_000, 150_000, 600_000):
+            assert index.within(lat, lon, radius_m) == [(i, d) for i, d in scan if d <= radius_m]
+        ranked = sorted(scan, key=lambda item: (item[1], item[0]))
+        assert index.nearest(lat, lon, k=5) == ranked[:5]
+        assert index.nearest(lat, lon, k=3, max_distance_m=60_000) == [r for r in ranked[:3] if r[1] <= 60_000]
+    assert index.nearest(lats[7], lons[7], k=2) == [(7, 0.0), (8, 0.0)]
+
+
+def test_empty_index():
+    index = SphereIndex([], [])
+    assert index.nearest(40.0, -74.0) == [] and index.within(40.0, -74.0, 1e6) == []
+
+
+def test_table_consumers():
+    manager = RegionalBaselineManager()
+    assert manager._detect_metro_area(None, 40.75, -73.98) == "New York"
+    assert manager._detect_metro_area(None, 44.0, -103.0) is None  # no principal city within 50km
+
+    lat, lon = 42.36, -71.06
+    expected = [h[0] for h in healthcare_access.MAJOR_HOSPITALS
+                if haversine_distance(lat, lon, h[1], h[2]) <= 60_000]
+    assert [h["name"] for h in healthcare_access._get_fallback_hospitals(lat, lon)] == expected
+    _score, nearest = healthcare_access._score_hospitals(lat, lon)
+    assert nearest["name"] == min(healthcare_access.MAJOR_HOSPITALS,
+                                  key=lambda h: haversine_distance(lat, lon, h[1], h[2]))[0]
@@ -0,0 +1,84 @@
+"""Street geometry engine: form metrics from one shared OSM payload (no network)."""
+
+import numpy as np
+import pytest
+
+from data_sources import street_geometry as sg
+
+LAT, LON = 40.70, -73.95
+SPACING_M = 80.0
+
+
+def _grid_osm(n=8):
+    """n x n street grid; one 10m square building per block face, set back 5m / 7m alternately."""
+    dlat = 1 / 111_195.0
+    dlon = dlat / 0.75756  # cos(40.7)
+    nodes, ways = {}, []
+    grid = {}
+    for i in range(n):
+        for j in range(n):
+            nid = len(nodes) + 1
+            grid[i, j] = nid
+            nodes[nid] = {"type": "node", "id": nid,
+                          "lat": LAT + (i - n / 2) * SPACING_M * dlat,
+                          "lon": LON + (j - n / 2) * SPACING_M * dlon}
+    for i in range(n):
+        ways.append({"type": "way", "id": 1000 + i, "nodes": [grid[i, j] for j in range(n)], "tags": {"highway": "residential"}})
+        ways.append({"type": "way", "id": 2000 + i, "nodes": [grid[j, i] for j in range(n)], "tags": {"highway": "residential"}})
+    buildings = []
+    for i in range(n):
+        for j in range(n - 1):
+            south = LAT + (i - n / 2) * SPACING_M * dlat + (5.0 if j % 2 == 0 else 7.0) * dlat
+            west = LON + ((j - n / 2) * SPACING_M + 35) * dlon
+            ids = []
+            for dy, dx in [(0, 0), (0, 10), (10, 10), (10, 0)]:
+                nid = len(nodes) + 1
+                nodes[nid] = {"type": "node", "id": nid, "lat": south + dy * dlat, "lon": west + dx * dlon}
+                ids.append(nid)
+            buildings.append({"type": "way", "id": 5000 + len(buildings), "nodes": ids + ids[:1], "tags": {"building": "yes"}})
+    return {"nodes_dict": nodes, "road_ways": ways, "building_ways": buildings, "elements": []}
+
+
+def test_metrics_share_one_geometry_build(monkeypatch):
+    osm = _grid_osm()
+    builds = []
+    real = sg._StreetGeometry
+
+    def counting(*args):
+        builds.append(args)
+        return real(*args)
+
+    monkeypatch.setattr(sg, "_StreetGeometry", counting)
+    monkeypatch.setattr(sg, "_fetch_roads_and_buildings", lambda *a: pytest.fail("shared data should be used"))
+
+    grain = sg.compute_block_grain.__wrapped__(LAT, LON, 1000, osm)
+    wall = sg.compute_streetwall_continuity.__wrapped__(LAT, LON, 1000, osm)
+    setback = sg.compute_setback_consistency.__wrapped__(LAT, LON, 1000, osm)
+    facade = sg.compute_facade_rhythm.__wrapped__(LAT, LON, 1000, osm)
+    assert len(builds) == 1
+
+    assert grain["total_intersections"] == 64
+    assert grain["total_blocks"] > 0
+    assert wall["street_frontage_m"] == pytest.approx(2 * 16 * 7 * SPACING_M, rel=0.01)
+    assert wall["built_frontage_m"] > 0
+    # Four of seven buildings per road at 5m, three at 7m: ~1m spread, all within facade tolerance.
+    assert setback["mean_setback_m"] == pytest.approx(41 / 7, abs=0.05)
+    assert setback["setback_std_dev_m"] == pytest.approx(0.99, abs=0.02)
+    assert setback["setback_consistency"] == pytest.approx(95.0, abs=0.2)
+    assert setback["buildings_analyzed"] == 56
+    assert facade["facade_rhythm"] == 100.0 and facade["buildings_analyzed"] == 56
+
+
+def test_point_segment_distance_clamps_to_endpoints():
+    p = np.array([[5.0, 3.0], [-4.0, 3.0], [1.0, 1.0]])
+    a = np.array([[0.0, 0.0], [0.0, 0.0], [2.0, 2.0]])
+    b = np.array([[10.0, 0.0], [10.0, 0.0], [2.0, 2.0]])  # last segment has zero length
+    assert sg._point_segment_distance(p, a, b) == pytest.approx([3.0, 5.0, 2 ** 0.5])
+
+
+def test_missing_roads_or_buildings_return_empty_metrics():
+    osm = _grid_osm()
+    no_buildings = dict(osm, building_ways=[])
+    assert sg.compute_setback_consistency.__wrapped__(LAT, LON, 1000, no_buildings)["setback_consistency"] == 0.0
+    assert sg.compute_streetwall_continuity.__wrapped__(LAT, LON, 1000, no_buildings)["built_frontage_m"] == 0.0
+    assert sg.compute_block_grain.__wrapped__(LAT, LON, 1000, dict(osm, road_ways=[]))["block_grain"] == 0.0
@@ -0,0 +1,74 @@
+"""Stale-while-revalidate helpers for the location / shared pre-pillar caches (no network)."""
+
+import time
+
+import main
+from data_sources import cache
+
+
+class _DeferredExecutor:
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.jobs.append((fn, args, kwargs))
+
+    def run_all(self):
+        jobs, self.jobs = self.jobs, []
+        for fn, args, kwargs in jobs:
+            fn(*args, **kwargs)
+
+
+def test_stamp_and_age_round_trip(monkeypatch):
+    blob = {"livability_pillars": {}}
+    stamped = main._swr_stamp(blob)
+    assert main._SWR_WRITTEN_AT_FIELD not in blob  # caller's response is not mutated
+
+    stamped[main._SWR_WRITTEN_AT_FIELD] -= 3600
+    age = main._swr_age(stamped)
+    assert 3599 <= age < 3700
+    assert main._SWR_WRITTEN_AT_FIELD not in stamped  # popped before the template is used
+
+    assert main._swr_age({"livability_pillars": {}}) is None  # pre-SWR entries count as fresh
+    assert main._swr_age(None) is None
+
+
+def test_refresh_is_scheduled_once_per_key(monkeypatch):
+    executor = _DeferredExecutor()
+    calls = []
+    monkeypatch.setattr(main, "_SCORE_JOB_EXECUTOR", executor)
+    monkeypatch.setattr(main, "_compute_single_score_internal", lambda **kw: calls.append(kw) or {})
+    monkeypatch.setattr(cache, "_redis_client", None)
+
+    assert main._schedule_swr_refresh("loc:k", location="Austin, TX") is True
+    assert main._schedule_swr_refresh("loc:k", location="Austin, TX") is False
+    assert len(executor.jobs) == 1
+
+    executor.run_all()
+    assert calls == [{"cache_refresh": True, "location": "Austin, TX"}]
+    assert "loc:k" not in main._SWR_REFRESH_INFLIGHT
+    assert main._schedule_swr_refresh("loc:k", location="Austin, TX") is True  # next stale read may refresh again
+    executor.run_all()
+
+
+def test_refresh_skipped_when_another_replica_holds_marker(monkeypatch):
+    class MarkerRedis:
+        def __init__(self):
+            self.keys = {f"{main.CACHE_KEY_PREFIX}:swr_refresh:loc:busy": "1"}
+
+        def set(self, key, value, nx=False, ex=None):
+            if nx and key in self.keys:
+                return None
+            self.keys[key] = value
+            return True
+
+    executor = _DeferredExecutor()
+    monkeypatch.setattr(main, "_SCORE_JOB_EXECUTOR", executor)
+    monkeypatch.setattr(cache, "_redis_client", MarkerRedis())
+    monkeypatch.setattr(cache, "_redis_last_ok", time.time())
+
+    assert main._schedule_swr_refresh("loc:busy", location="x") is False
+    assert executor.jobs == []
+    assert "loc:busy" not in main._SWR_REFRESH_INFLIGHT
+    assert main._schedule_swr_refresh("loc:free", location="x") is True
+    main._SWR_REFRESH_INFLIGHT.discard("loc:free")
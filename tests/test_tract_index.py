@@ -0,0 +1,71 @@
+"""Local tract index: point -> tract and disk -> tracts from packed TIGER polygons (no network)."""
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import MultiPolygon, box
+
+from data_sources import census_api, tract_index
+from scripts.baselines.build_tract_index import build_index
+
+# Two 0.1-degree tracts side by side; the east one has a detached island part.
+WEST = box(-74.10, 40.60, -74.00, 40.80)
+EAST = MultiPolygon([box(-74.00, 40.60, -73.90, 40.80), box(-73.88, 40.60, -73.86, 40.65)])
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    gdf = gpd.GeoDataFrame(
+        {
+            "GEOID": ["36061000100", "36061000200"],
+            "NAME": ["1", "2"],
+            "NAMELSAD": ["Census Tract 1", "Census Tract 2"],
+            "ALAND": [3_000_000, 3_500_000],
+            "AWATER": [0, 10],
+        },
+        geometry=[WEST, EAST],
+        crs="EPSG:4326",
+    )
+    src = tmp_path / "tracts.geojson"
+    gdf.to_file(src)
+    counties = {"36061": {"cbsa_code": "35620", "cbsa_name": "New York-Newark-Jersey City, NY-NJ Metro Area"}}
+    build_index([str(src)], tmp_path / "idx", "2022", counties)
+
+    monkeypatch.setenv("HOMEFIT_TRACT_INDEX_DIR", str(tmp_path / "idx"))
+    tract_index.reset()
+    yield
+    tract_index.reset()
+
+
+def test_point_lookup_matches_geocoder_shape(index):
+    t = tract_index.lookup_tract(40.70, -73.95)
+    assert t == {
+        "state_fips": "36", "county_fips": "061", "tract_fips": "000200", "geoid": "36061000200",
+        "name": "Census Tract 2", "basename": "2",
+        "cbsa_code": "35620", "cbsa_name": "New York-Newark-Jersey City, NY-NJ Metro Area",
+    }
+    assert tract_index.lookup_tract(40.62, -73.87)["geoid"] == "36061000200"  # island part
+    assert tract_index.lookup_tract(40.70, -73.89) is None  # water gap: caller falls back
+
+
+def test_census_tract_uses_index(index, monkeypatch):
+    monkeypatch.setattr(census_api, "_make_request_with_retry", lambda *a, **k: pytest.fail("no network"))
+    assert census_api.get_census_tract.__wrapped__(40.70, -74.05)["geoid"] == "36061000100"
+
+
+def test_disk_payload_feeds_areal_weighting(index, monkeypatch):
+    monkeypatch.setattr(census_api, "_make_post_request_with_retry", lambda *a, **k: pytest.fail("no network"))
+    payload = census_api._tigerweb_tracts_intersecting_disk.__wrapped__(40.70, -74.0, 500)
+    geoids = sorted({f["attributes"]["GEOID"] for f in payload["features"]})
+    assert geoids == ["36061000100", "36061000200"]
+    assert payload["features"][0]["attributes"]["AREALAND"] == 3_000_000
+    # Disk reaching past the indexed extent is left to TIGERweb.
+    assert tract_index.tracts_intersecting_disk(40.70, -74.0, 20000) is None
+
+
+def test_populated_tract_walks_nearest_first(index, monkeypatch):
+    pops = {"000100": 0, "000200": 1200}
+    assert [t["tract_fips"] for t in tract_index.nearest_tracts(40.70, -74.01, 2500)] == ["000100", "000200"]
+    monkeypatch.setattr(census_api, "get_population", lambda t: pops[t["tract_fips"]])
+    monkeypatch.setattr(census_api, "get_census_tract", lambda lat, lon: tract_index.lookup_tract(lat, lon))
+    t = census_api.get_census_tract_populated.__wrapped__(40.70, -74.01)
+    assert t["tract_fips"] == "000200"